@@ -1,19 +1,78 @@
 """
 Simplified authentication dependencies.
 JWT validation only - all authorization handled by RLS.
+Tokens are verified locally when a JWT secret or JWKS is available.
 
 Following KISS principle: Keep authentication simple, let database handle authorization.
 """
+import logging
 from typing import Dict, Optional
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from api.dependencies.jwt_verifier import KeyUnavailableError, TokenVerificationError, get_jwt_verifier
 from database.supabase_client import get_supabase_client
 
+logger = logging.getLogger(__name__)
+
 # Single security scheme for all endpoints
 security = HTTPBearer()
 
 
+def authenticate_token(token: str, supabase=None) -> Dict[str, str]:
+    """
+    Validate a JWT and return the user it belongs to.
+    
+    The signature is checked locally (see jwt_verifier); the auth server is
+    only asked when no key material is available for the token.
+    
+    Args:
+        token: Supabase access token
+        supabase: Client for the auth server fallback (pooled anon client by default)
+    
+    Returns:
+        dict: User info with id, email, and token for RLS
+    
+    Raises:
+        HTTPException: 401 if token is invalid
+    """
+    verifier = get_jwt_verifier()
+    if verifier.enabled:
+        try:
+            claims = verifier.verify(token)
+            return {
+                'id': claims['sub'],
+                'email': claims.get('email'),
+                'token': token
+            }
+        except TokenVerificationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Invalid authentication token: {e}"
+            )
+        except KeyUnavailableError as e:
+            logger.debug(f"Local JWT verification unavailable, asking auth server: {e}")
+    
+    supabase = supabase or get_supabase_client()
+    
+    # Validate token with Supabase
+    user_response = supabase.auth.get_user(token)
+    
+    if not user_response.user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token"
+        )
+    
+    # Return minimal user info needed
+    # Token is passed through for RLS enforcement
+    return {
+        'id': user_response.user.id,
+        'email': user_response.user.email,
+        'token': token  # Critical: Pass token for RLS
+    }
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict[str, str]:
@@ -31,25 +90,7 @@ async def get_current_user(
         HTTPException: 401 if token is invalid
     """
     try:
-        token = credentials.credentials
-        supabase = get_supabase_client()
-        
-        # Validate token with Supabase
-        user_response = supabase.auth.get_user(token)
-        
-        if not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication token"
-            )
-        
-        # Return minimal user info needed
-        # Token is passed through for RLS enforcement
-        return {
-            'id': user_response.user.id,
-            'email': user_response.user.email,
-            'token': token  # Critical: Pass token for RLS
-        }
+        return authenticate_token(credentials.credentials)
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
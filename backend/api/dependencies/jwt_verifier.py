@@ -0,0 +1,242 @@
+"""Local verification of Supabase JWTs.
+
+Verifies access tokens in-process so authenticated requests skip the
+`auth.get_user` round-trip:
+
+- HS256 tokens (legacy projects) against SUPABASE_JWT_SECRET, and
+  SUPABASE_JWT_PREVIOUS_SECRET while a secret rotation is rolling out
+- Asymmetric tokens (RS256/ES256) against the project's JWKS, cached for
+  JWKS_CACHE_TTL_SECONDS; an unknown `kid` (key rotation) triggers a refetch,
+  at most once per JWKS_REFRESH_COOLDOWN_SECONDS
+
+The JWKS is fetched at startup (`prefetch_jwks`) and refreshed on a
+background thread, so `verify` never waits on the network: an expired key
+set keeps serving until the refresh lands, and a token signed with a key
+that is not loaded yet falls back to the auth server meanwhile.
+
+A token that cannot be checked locally (no secret configured, JWKS
+unreachable, key not published) raises KeyUnavailableError so callers can
+fall back to the auth server; a token that fails verification raises
+TokenVerificationError.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import httpx
+import jwt
+
+from config import (
+    AUTH_LOCAL_JWT_VERIFICATION,
+    JWKS_CACHE_TTL_SECONDS,
+    JWKS_REFRESH_COOLDOWN_SECONDS,
+    JWT_LEEWAY_SECONDS,
+    SUPABASE_ANON_KEY,
+    SUPABASE_JWKS_URL,
+    SUPABASE_JWT_AUDIENCE,
+    SUPABASE_JWT_PREVIOUS_SECRET,
+    SUPABASE_JWT_SECRET,
+)
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+JWKS_FETCH_TIMEOUT_SECONDS = 5.0
+
+
+class TokenVerificationError(Exception):
+    """Token is malformed, expired or carries an invalid signature."""
+
+
+class KeyUnavailableError(Exception):
+    """No key material to verify this token locally."""
+
+
+class SupabaseJWTVerifier:
+    """Verifies Supabase access tokens with a shared secret or a cached JWKS."""
+
+    def __init__(
+        self,
+        secrets: list[str] | None = None,
+        jwks_url: str | None = None,
+        audience: str | None = SUPABASE_JWT_AUDIENCE,
+        jwks_ttl_seconds: int = JWKS_CACHE_TTL_SECONDS,
+        refresh_cooldown_seconds: int = JWKS_REFRESH_COOLDOWN_SECONDS,
+        leeway_seconds: int = JWT_LEEWAY_SECONDS,
+        enabled: bool = AUTH_LOCAL_JWT_VERIFICATION,
+    ):
+        self.secrets = [secret for secret in secrets or () if secret]
+        self.jwks_url = jwks_url
+        self.audience = audience
+        self.jwks_ttl_seconds = jwks_ttl_seconds
+        self.refresh_cooldown_seconds = refresh_cooldown_seconds
+        self.leeway_seconds = leeway_seconds
+        self._enabled = enabled
+
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._keys_fetched_at: float | None = None
+        self._last_fetch_attempt = float("-inf")
+        self._lock = threading.Lock()
+        self._refresher: ThreadPoolExecutor | None = None
+        self._refresh_future: Future | None = None
+
+        self.local_verifications = 0
+        self.fallbacks = 0
+        self.jwks_fetches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled and bool(self.secrets or self.jwks_url)
+
+    def _fetch_jwks(self) -> dict[str, jwt.PyJWK]:
+        """Signing keys published at the JWKS endpoint (blocking HTTP call)."""
+        headers = {"apikey": SUPABASE_ANON_KEY} if SUPABASE_ANON_KEY else None
+        response = httpx.get(self.jwks_url, headers=headers, timeout=JWKS_FETCH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+
+        keys = {}
+        for key_data in response.json().get("keys", []):
+            try:
+                key = jwt.PyJWK(key_data)
+            except jwt.PyJWKError as e:
+                logger.warning(f"Skipping unusable JWKS key {key_data.get('kid')}: {e!s}")
+                continue
+            keys[key.key_id] = key
+        return keys
+
+    def refresh_jwks(self) -> bool:
+        """Fetch the JWKS and replace the key set (blocking; run it off the event loop).
+
+        Returns:
+            True if the key set was replaced
+        """
+        if not self.jwks_url:
+            return False
+        with self._lock:
+            self._last_fetch_attempt = time.monotonic()
+        try:
+            keys = self._fetch_jwks()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"JWKS fetch failed: {e!s}")
+            return False
+
+        with self._lock:
+            self._keys = keys
+            self._keys_fetched_at = time.monotonic()
+            self.jwks_fetches += 1
+        logger.info(f"🔑 Loaded {len(keys)} signing keys from JWKS")
+        return True
+
+    def prefetch_jwks(self) -> None:
+        """Load the JWKS in the background (called at startup)."""
+        if self.enabled and self.jwks_url:
+            with self._lock:
+                self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        """Start a background JWKS refresh unless one is running (caller holds the lock)."""
+        if self._refresh_future is not None and not self._refresh_future.done():
+            return
+        if self._refresher is None:
+            self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jwks-refresh")
+        self._last_fetch_attempt = time.monotonic()
+        self._refresh_future = self._refresher.submit(self.refresh_jwks)
+
+    def _signing_key(self, kid: str | None) -> jwt.PyJWK:
+        if not self.jwks_url:
+            raise KeyUnavailableError("No JWKS configured for asymmetric tokens")
+
+        with self._lock:
+            now = time.monotonic()
+            expired = self._keys_fetched_at is None or now - self._keys_fetched_at > self.jwks_ttl_seconds
+            unknown = kid not in self._keys
+            cooled_down = now - self._last_fetch_attempt >= self.refresh_cooldown_seconds
+            if (expired or unknown) and cooled_down:
+                self._schedule_refresh()
+
+            key = self._keys.get(kid)
+            if key is None and kid is None and len(self._keys) == 1:
+                key = next(iter(self._keys.values()))
+
+        if key is None:
+            raise KeyUnavailableError(f"Signing key {kid!r} not in JWKS")
+        return key
+
+    def _decode(self, token: str, key: Any, algorithm: str) -> dict[str, Any]:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.audience,
+            leeway=self.leeway_seconds,
+            options={"require": ["exp", "sub"], "verify_aud": self.audience is not None},
+        )
+
+    def verify(self, token: str) -> dict[str, Any]:
+        """Verified claims of a Supabase access token.
+
+        Raises:
+            TokenVerificationError: If the token is invalid
+            KeyUnavailableError: If it cannot be verified locally
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(f"Malformed token: {e!s}") from e
+
+        algorithm = header.get("alg")
+        try:
+            if algorithm == "HS256":
+                if not self.secrets:
+                    raise KeyUnavailableError("No JWT secret configured for HS256 tokens")
+                claims = self._decode_with_secrets(token)
+            elif algorithm in ASYMMETRIC_ALGORITHMS:
+                claims = self._decode(token, self._signing_key(header.get("kid")), algorithm)
+            else:
+                raise TokenVerificationError(f"Unsupported token algorithm: {algorithm!r}")
+        except KeyUnavailableError:
+            self.fallbacks += 1
+            raise
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(str(e)) from e
+
+        self.local_verifications += 1
+        return claims
+
+    def _decode_with_secrets(self, token: str) -> dict[str, Any]:
+        """Try the current secret, then the previous one (rotation window)."""
+        for secret in self.secrets[:-1]:
+            try:
+                return self._decode(token, secret, "HS256")
+            except jwt.InvalidSignatureError:
+                continue
+        return self._decode(token, self.secrets[-1], "HS256")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Verification counters for monitoring."""
+        return {
+            "enabled": self.enabled,
+            "local_verifications": self.local_verifications,
+            "fallbacks": self.fallbacks,
+            "jwks_fetches": self.jwks_fetches,
+            "jwks_keys": len(self._keys),
+        }
+
+
+# Singleton instance
+_verifier_instance: SupabaseJWTVerifier | None = None
+
+
+def get_jwt_verifier() -> SupabaseJWTVerifier:
+    """Get singleton JWT verifier configured from settings."""
+    global _verifier_instance
+
+    if _verifier_instance is None:
+        _verifier_instance = SupabaseJWTVerifier(
+            secrets=[SUPABASE_JWT_SECRET, SUPABASE_JWT_PREVIOUS_SECRET], jwks_url=SUPABASE_JWKS_URL
+        )
+
+    return _verifier_instance
@@ -0,0 +1,95 @@
+"""Role cache for RBAC dependencies.
+
+Maps user id to `user_profiles.role` so role-gated endpoints query the
+profile once per AUTH_ROLE_CACHE_TTL_SECONDS instead of on every request.
+The cache is bounded (least recently used entries are evicted) and
+thread-safe. Profiles are always read with the service-role client, so an
+entry does not depend on which caller's privileges filled it. Role changes made through the admin API invalidate the user's
+entry on this worker; the TTL bounds staleness on the others.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from config import AUTH_ROLE_CACHE_MAX_ENTRIES, AUTH_ROLE_CACHE_TTL_SECONDS
+from database.supabase_client import get_supabase_client
+
+_MISSING = object()
+
+
+class RoleCache:
+    """Bounded TTL cache of user id -> role (None when the user has no profile)."""
+
+    def __init__(self, ttl_seconds: int = AUTH_ROLE_CACHE_TTL_SECONDS, max_entries: int = AUTH_ROLE_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Any:
+        """Cached role, or _MISSING when absent or expired."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or time.monotonic() >= entry[0]:
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, user_id: str, role: str | None) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, role)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        """Drop one user's role, or every role when user_id is None."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def get_user_role(user_id: str) -> str | None:
+    """Role of a user from the cache, loading user_profiles.role on a miss.
+
+    Args:
+        user_id: Authenticated user id (JWT `sub`)
+    """
+    cache = get_role_cache()
+    role = cache.get(user_id)
+    if role is not _MISSING:
+        return role
+
+    supabase = get_supabase_client(use_service_key=True)
+    profile = supabase.table("user_profiles").select("role").eq("id", user_id).single().execute()
+    role = profile.data.get("role") if profile.data else None
+    cache.set(user_id, role)
+    return role
+
+
+# Singleton instance
+_role_cache_instance: RoleCache | None = None
+
+
+def get_role_cache() -> RoleCache:
+    """Get singleton role cache."""
+    global _role_cache_instance
+
+    if _role_cache_instance is None:
+        _role_cache_instance = RoleCache()
+
+    return _role_cache_instance
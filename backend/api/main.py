@@ -15,6 +15,8 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from api.dependencies.jwt_verifier import get_jwt_verifier
+from api.responses import NumpyJSONResponse
 from api.routes import (
     analysis,
     cache_monitoring,
@@ -39,7 +41,11 @@ from config import (
     CORS_ORIGINS,
     ScoringDefaults,
 )
+from database.executor import shutdown_db_executor
 from database.supabase_client import get_supabase_client
+from services.c3d.process_pool import shutdown_c3d_executor
+from services.cache import cleanup_redis_cache, get_cache_warmer
+from services.clinical.scoring_config_cache import get_scoring_config_cache
 
 # Configure structured logging
 logger = structlog.get_logger(__name__)
@@ -138,6 +144,7 @@ def create_app() -> FastAPI:
         title=API_TITLE,
         description=API_DESCRIPTION,
         version=API_VERSION,
+        default_response_class=NumpyJSONResponse,
     )
     
     # Register startup event handler for configuration validation
@@ -145,6 +152,21 @@ def create_app() -> FastAPI:
     async def startup_event():
         """Run startup tasks including configuration validation."""
         await ensure_default_scoring_configuration()
+        # Load JWT signing keys before the first request needs them
+        get_jwt_verifier().prefetch_jwks()
+        # Drop cached scoring configurations when another worker changes them
+        get_scoring_config_cache().start_listener()
+        # Preload analytics for recent sessions (CACHE_WARM_INTERVAL_MINUTES=0 disables)
+        get_cache_warmer().start()
+    
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Release the database and C3D pools, cache connections, warming and invalidation listeners."""
+        get_scoring_config_cache().stop_listener()
+        get_cache_warmer().stop()
+        await cleanup_redis_cache()
+        shutdown_db_executor(wait=False)
+        shutdown_c3d_executor(wait=False)
     
     # Configure CORS with dynamic origin validation
     def is_allowed_origin(origin: str) -> bool:
@@ -11,6 +11,9 @@ from typing import Dict, Optional
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from api.dependencies.auth import authenticate_token
+from api.dependencies.role_cache import get_user_role
+from database.executor import run_db
 from database.supabase_client import get_supabase_client
 
 security = HTTPBearer()
@@ -23,29 +26,16 @@ async def get_current_user_role(
     Extract user role from Supabase JWT token.
     
     This function only handles authentication (JWT validation) and role extraction.
-    Authorization is handled by database RLS policies.
+    Authorization is handled by database RLS policies. The token is verified
+    locally when possible and roles come from the role cache.
     """
     try:
-        token = credentials.credentials
         supabase = get_supabase_client()
+        user = authenticate_token(credentials.credentials, supabase)
         
-        # Validate JWT token and get user
-        user = supabase.auth.get_user(token)
-        if not user.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication token"
-            )
-        
-        # Get role from user_profiles table
+        # Get role from user_profiles table (None if no profile found - RLS will handle access control)
         # Note: If user can't access this, RLS will handle the authorization
-        profile = supabase.table('user_profiles').select('role').eq('id', user.user.id).single().execute()
-        
-        if not profile.data:
-            # Return None if no profile found - RLS will handle access control
-            return None
-        
-        return profile.data['role']
+        return await run_db(get_user_role, user['id'])
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -65,18 +55,12 @@ async def get_current_user_with_role(credentials: HTTPAuthorizationCredentials =
     Authorization is still handled by database RLS policies.
     """
     try:
-        token = credentials.credentials
         supabase = get_supabase_client()
-        
-        user = supabase.auth.get_user(token)
-        if not user.user:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        
-        profile = supabase.table('user_profiles').select('role').eq('id', user.user.id).single().execute()
+        user = authenticate_token(credentials.credentials, supabase)
         
         return {
-            'user_id': user.user.id,
-            'role': profile.data['role'] if profile.data else None
+            'user_id': user['id'],
+            'role': await run_db(get_user_role, user['id'])
         }
         
     except Exception as e:
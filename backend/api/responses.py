@@ -0,0 +1,63 @@
+"""Response classes.
+
+NumpyJSONResponse renders with utils.numpy_encoder.dumps, so routes can
+return dicts holding NumPy arrays (EMG signals, RMS envelopes) without
+converting them to Python lists first. It is the application's default
+response class.
+
+signal_response negotiates the format of signal-carrying endpoints from the
+Accept header: JSON by default, or a binary body (see utils.signal_transport).
+ndjson_response streams events as they are produced, one JSON object per line.
+"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from utils.numpy_encoder import dumps
+from utils.signal_transport import JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE, encode_signals, negotiate_media_type
+
+SIGNAL_MEDIA_TYPES_DESCRIPTION = (
+    "Response format: application/json (default), application/vnd.ghostly.emg-frame "
+    "(float32 frame) or application/vnd.apache.arrow.stream (when pyarrow is installed)"
+)
+
+
+class NumpyJSONResponse(JSONResponse):
+    """JSON response that serializes NumPy arrays and scalars natively."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def signal_response(
+    accept: str | None,
+    json_content: dict[str, Any],
+    metadata: dict[str, Any],
+    channels: dict[str, dict[str, Any]],
+) -> Response:
+    """Response in the format negotiated from the Accept header.
+
+    Args:
+        accept: Request Accept header
+        json_content: Body of the default JSON response
+        metadata: Non-signal fields for a binary response
+        channels: Channel name -> signal name -> array for a binary response
+    """
+    media_type = negotiate_media_type(accept)
+    headers = {"Vary": "Accept"}
+    if media_type == JSON_MEDIA_TYPE:
+        return NumpyJSONResponse(content=json_content, headers=headers)
+    return Response(content=encode_signals(media_type, metadata, channels), media_type=media_type, headers=headers)
+
+
+def ndjson_response(events: AsyncIterator[dict[str, Any]]) -> StreamingResponse:
+    """Stream events as newline-delimited JSON, each line sent as soon as it is produced."""
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for event in events:
+            yield dumps(event) + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers={"Vary": "Accept"})
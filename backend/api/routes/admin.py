@@ -17,8 +17,10 @@ from pydantic import BaseModel
 logger = logging.getLogger(__name__)
 
 from api.dependencies.auth import get_current_user
-from database.supabase_client import get_supabase_client
+from api.dependencies.role_cache import get_role_cache, get_user_role
+from database.executor import run_db
 from services.admin.admin_service import AdminService
+from services.clinical.cohort_rescoring_service import CohortRescoringService
 
 router = APIRouter()
 
@@ -86,14 +88,9 @@ async def require_admin(user: Dict[str, str] = Depends(get_current_user)) -> Dic
     Raises:
         HTTPException: 403 if not admin
     """
-    # Get user role from Supabase using their token
-    supabase = get_supabase_client(jwt_token=user['token'])
-    
     try:
-        # Query user_profiles table for role
-        result = supabase.table('user_profiles').select('role').eq('id', user['id']).single().execute()
-        
-        if not result.data or result.data.get('role') != 'admin':
+        # Query user_profiles table for role (cached per user)
+        if await run_db(get_user_role, user['id']) != 'admin':
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Admin access required"
@@ -311,6 +308,9 @@ async def update_user(
                 detail=result.get('message', 'Failed to update user')
             )
         
+        # Role or active flag may have changed
+        get_role_cache().invalidate(str(user_id))
+        
         return {
             'success': True,
             'message': 'User updated successfully',
@@ -518,4 +518,53 @@ async def retrieve_password(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve password: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+class RescoreRequest(BaseModel):
+    """Request model for cohort rescoring."""
+    scoring_config_id: Optional[str] = None  # Only sessions scored with this configuration
+    session_ids: Optional[list[str]] = None  # Explicit cohort (default: all sessions)
+    dry_run: bool = False  # Compute without writing
+
+
+@router.post("/scoring/rescore")
+async def rescore_cohort(
+    request: RescoreRequest,
+    admin_user: Dict[str, str] = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    Recompute performance_scores for a cohort of sessions.
+    
+    Used after a scoring configuration has been edited: all sessions are
+    bulk-loaded, scored in one vectorized pass per configuration and
+    written back with bulk upserts.
+    
+    Args:
+        request: Cohort filter and dry-run flag
+        admin_user: Current admin user (validated by dependency)
+        
+    Returns:
+        Dict with the rescoring run summary
+        
+    Raises:
+        HTTPException: 500 if loading or writing scores fails
+    """
+    try:
+        service = CohortRescoringService()
+        summary = await run_db(
+            service.rescore,
+            session_ids=request.session_ids,
+            scoring_config_id=request.scoring_config_id,
+            dry_run=request.dry_run,
+        )
+        
+        logger.info(f"Cohort rescoring by {admin_user['email']}: {summary}")
+        return {'success': True, 'summary': summary}
+        
+    except Exception as e:
+        logger.error(f"Cohort rescoring error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Cohort rescoring failed: {str(e)}"
+        )
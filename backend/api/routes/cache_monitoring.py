@@ -9,7 +9,7 @@ from typing import Any
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
-from services.cache import get_cache_patterns, get_redis_cache
+from services.cache import get_cache_patterns, get_cache_warmer, get_redis_cache
 
 router = APIRouter(prefix="/cache", tags=["cache"])
 logger = logging.getLogger(__name__)
@@ -110,7 +110,7 @@ async def get_cache_stats():
 async def invalidate_cache_pattern(
     pattern: str = Query(..., description="Cache key pattern to invalidate"),
 ):
-    """Invalidate cache keys matching pattern."""
+    """Invalidate cache keys matching pattern (incremental SCAN, never KEYS)."""
     try:
         patterns = await get_cache_patterns()
         count = await patterns.invalidate_by_pattern(pattern)
@@ -127,6 +127,57 @@ async def invalidate_cache_pattern(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/invalidate/tag")
+async def invalidate_cache_tag(
+    tag: str = Query(..., description='Cache tag, e.g. "patient:<uuid>" or "version:2.1.0"'),
+):
+    """Invalidate every cache entry written with a tag."""
+    try:
+        patterns = await get_cache_patterns()
+        count = await patterns.invalidate_tag(tag)
+
+        return {
+            "status": "completed",
+            "invalidated_keys": count,
+            "tag": tag,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    except Exception as e:
+        logger.exception("Cache tag invalidation failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/warm")
+async def warm_cache(
+    hours: int | None = Query(None, ge=1, le=24 * 30, description="Look back period (default CACHE_WARM_LOOKBACK_HOURS)"),
+):
+    """Preload analytics for sessions processed or accessed in the last hours."""
+    try:
+        summary = await get_cache_warmer().warm(hours)
+        return {"status": "completed", **summary}
+
+    except Exception as e:
+        logger.exception("Cache warming failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/warm/status")
+async def get_cache_warm_status():
+    """Warming scheduler state and the last run summary."""
+    return get_cache_warmer().get_status()
+
+
+@router.put("/warm/schedule")
+async def schedule_cache_warming(
+    interval_minutes: int = Query(..., ge=0, le=24 * 60, description="Warming interval; 0 stops the scheduler"),
+):
+    """Start, reschedule or stop periodic cache warming on this worker."""
+    warmer = get_cache_warmer()
+    warmer.start(interval_minutes, initial_delay=0.0)
+    return warmer.get_status()
+
+
 @router.get("/dashboard")
 async def get_cache_dashboard():
     """Get cache dashboard data."""
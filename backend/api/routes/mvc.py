@@ -121,8 +121,8 @@ async def _calibrate_from_file(
             if hasattr(processor, "emg_data") and channel in processor.emg_data:
                 # PRIORITY: Use RMS envelope if available (gold standard for MVC)
                 if (
-                    "rms_envelope" in processor.emg_data[channel]
-                    and processor.emg_data[channel]["rms_envelope"]
+                    processor.emg_data[channel].get("rms_envelope") is not None
+                    and len(processor.emg_data[channel]["rms_envelope"]) > 0
                 ):
                     emg_signals[channel] = np.array(processor.emg_data[channel]["rms_envelope"])
                     logger.info("🏆 Using RMS envelope for MVC estimation: %s", channel)
@@ -5,16 +5,25 @@ API endpoints for managing configurable performance scoring weights.
 Allows therapists and researchers to customize scoring algorithms.
 """
 
+import hashlib
 import logging
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field, field_validator
 
+from config import ADHERENCE_CACHE_TTL_SECONDS
+from database.executor import run_db
 from database.supabase_client import get_supabase_client
+from services.cache import get_redis_cache
+from services.clinical.scoring_config_cache import get_scoring_config_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/scoring", tags=["scoring"])
 
+TRIAL_DURATION_DAYS = 14  # GHOSTLY+ trial protocol length
+ADHERENCE_PATIENT_COLUMNS = "id, patient_code, created_at, treatment_start_date, total_sessions_planned"
+
 
 class ScoringConfigurationRequest(BaseModel):
     """Request model for creating/updating scoring configuration."""
@@ -168,6 +177,7 @@ async def create_scoring_configuration(config: ScoringConfigurationRequest):
         if not result.data:
             raise HTTPException(status_code=400, detail="Failed to create scoring configuration")
 
+        get_scoring_config_cache().invalidate(result.data[0].get("id"))
         logger.info(f"Created scoring configuration: {config.configuration_name}")
         return result.data[0]
 
@@ -201,6 +211,7 @@ async def activate_scoring_configuration(config_id: str):
         if not result.data:
             raise HTTPException(status_code=404, detail="Scoring configuration not found")
 
+        get_scoring_config_cache().invalidate(config_id)
         logger.info(f"Activated scoring configuration: {config_id}")
         return {"message": "Configuration activated successfully", "config_id": config_id}
 
@@ -232,6 +243,7 @@ async def delete_scoring_configuration(config_id: str):
         if not result.data:
             raise HTTPException(status_code=404, detail="Scoring configuration not found")
 
+        get_scoring_config_cache().invalidate(config_id)
         logger.info(f"Deleted scoring configuration: {config_id}")
         return {"message": "Configuration deleted successfully"}
 
@@ -339,6 +351,7 @@ async def create_custom_scoring_configuration(config: ScoringConfigurationReques
                 status_code=400, detail="Failed to save custom scoring configuration"
             )
 
+        get_scoring_config_cache().invalidate(result.data[0].get("id"))
         return result.data[0]
 
     except HTTPException:
@@ -400,6 +413,7 @@ async def update_default_configuration(config: ScoringConfigurationRequest):
                     detail="Failed to create default scoring configuration"
                 )
         
+        get_scoring_config_cache().invalidate(default_config_id)
         logger.info(f"Updated GHOSTLY-TRIAL-DEFAULT configuration")
         return result.data[0]
         
@@ -410,6 +424,122 @@ async def update_default_configuration(config: ScoringConfigurationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _calculate_protocol_day(patient: dict, patient_code: str) -> int:
+    """Protocol day (1-14) of a patient from treatment_start_date.
+
+    IMPORTANT: This uses treatment_start_date from database, not actual session dates.
+    For demo data, this may cause date mismatches with C3D file upload dates.
+    In production, ensure treatment_start_date matches actual therapy start.
+    """
+    # Get treatment configuration with proper fallback
+    treatment_start_str = patient.get("treatment_start_date")
+    if not treatment_start_str:
+        logger.warning(f"No treatment_start_date for patient {patient_code}, using created_at as fallback")
+        treatment_start_str = patient["created_at"]
+
+    # Handle various datetime formats from Supabase with timezone safety
+    if '+' in treatment_start_str and '.' in treatment_start_str:
+        # Fix microseconds if they have too many digits
+        parts = treatment_start_str.split('.')
+        microsec_and_tz = parts[1].split('+')
+        microsec = microsec_and_tz[0][:6].ljust(6, '0')  # Ensure exactly 6 digits
+        treatment_start_str = f"{parts[0]}.{microsec}+{microsec_and_tz[1]}"
+
+    # Parse datetime and calculate protocol day
+    treatment_start = datetime.fromisoformat(treatment_start_str.replace('Z', '+00:00'))
+    current_date = datetime.now(timezone.utc)
+    days_since_start = (current_date - treatment_start).days + 1
+
+    # Log if patient is beyond the trial period
+    if days_since_start > TRIAL_DURATION_DAYS:
+        logger.info(f"Patient {patient_code} is beyond 14-day trial period (day {days_since_start}), using day 14 for adherence calculation")
+
+    # Cap protocol_day at 14 for the GHOSTLY+ 14-day trial protocol
+    # After day 14, patients are considered to have completed the trial period
+    return min(TRIAL_DURATION_DAYS, max(1, days_since_start))
+
+
+def _adherence_response(
+    adherence_data: dict, patient_code: str, protocol_day: int, total_sessions_planned: int | None
+) -> dict:
+    """Decorate a service adherence result for the frontend."""
+    # Override patient_id with patient_code for frontend compatibility
+    adherence_data['patient_id'] = patient_code
+
+    # Add protocol day and trial information to response
+    adherence_data['protocol_day'] = protocol_day
+    adherence_data['trial_duration'] = TRIAL_DURATION_DAYS
+    adherence_data['total_sessions_planned'] = total_sessions_planned
+    return adherence_data
+
+
+class AdherenceBatchRequest(BaseModel):
+    """Request model for batch adherence (patient codes or a therapist's patients)."""
+
+    patient_codes: list[str] | None = Field(None, max_length=500, description="Patient codes (e.g. P001)")
+    therapist_id: str | None = Field(None, description="Return adherence for all patients of this therapist")
+
+
+@router.post("/adherence/batch")
+async def get_batch_adherence(request: AdherenceBatchRequest):
+    """Get adherence scores for many patients in one request.
+
+    Patients are loaded with one query, protocol days are computed in one
+    pass and session counts come from one grouped index query. Responses
+    are cached for ADHERENCE_CACHE_TTL_SECONDS.
+    """
+    if not request.patient_codes and not request.therapist_id:
+        raise HTTPException(status_code=400, detail="patient_codes or therapist_id is required")
+
+    patient_codes = sorted(set(request.patient_codes or []))
+    cache_scope = f"therapist:{request.therapist_id}" if request.therapist_id else ",".join(patient_codes)
+    cache_key = f"adherence_batch:{hashlib.sha256(cache_scope.encode()).hexdigest()[:32]}"
+
+    try:
+        cache = await get_redis_cache()
+        cached = await cache.get(cache_key)
+        if cached and "patients" in cached:
+            return {"patients": cached["patients"], "not_found": cached.get("not_found", []), "cached": True}
+
+        from services.clinical.performance_scoring_service import PerformanceScoringService
+
+        supabase = get_supabase_client(use_service_key=True)
+        query = supabase.table("patients").select(ADHERENCE_PATIENT_COLUMNS)
+        if request.therapist_id:
+            query = query.eq("therapist_id", request.therapist_id)
+        else:
+            query = query.in_("patient_code", patient_codes)
+        patient_result = await run_db(query.execute)
+        patients = sorted(patient_result.data or [], key=lambda patient: patient["patient_code"])
+
+        protocol_days = {
+            patient["id"]: _calculate_protocol_day(patient, patient["patient_code"]) for patient in patients
+        }
+        service = PerformanceScoringService()
+        scores = await run_db(service.calculate_adherence_scores, protocol_days)
+
+        results = [
+            _adherence_response(
+                scores[patient["id"]],
+                patient["patient_code"],
+                protocol_days[patient["id"]],
+                patient.get("total_sessions_planned", 30),
+            )
+            for patient in patients
+        ]
+        found = {patient["patient_code"] for patient in patients}
+        not_found = [code for code in patient_codes if code not in found]
+
+        await cache.set(cache_key, {"patients": results, "not_found": not_found}, ADHERENCE_CACHE_TTL_SECONDS)
+        return {"patients": results, "not_found": not_found, "cached": False}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Failed to calculate batch adherence: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/adherence/{patient_code}")
 async def get_patient_adherence(patient_code: str, sessions_completed: int = None):
     """Get adherence score for a patient by patient_code.
@@ -427,7 +557,7 @@ async def get_patient_adherence(patient_code: str, sessions_completed: int = Non
         # Convert patient_code to patient_id (UUID)
         patient_result = (
             supabase.table("patients")
-            .select("id, created_at, treatment_start_date, total_sessions_planned")
+            .select(ADHERENCE_PATIENT_COLUMNS)
             .eq("patient_code", patient_code)
             .execute()
         )
@@ -437,46 +567,8 @@ async def get_patient_adherence(patient_code: str, sessions_completed: int = Non
         
         patient_id = patient_result.data[0]["id"]
         
-        # Calculate protocol day based on treatment start date (production-ready with error handling)
-        # 
-        # IMPORTANT: This uses treatment_start_date from database, not actual session dates
-        # For demo data, this may cause date mismatches with C3D file upload dates
-        # In production, ensure treatment_start_date matches actual therapy start
-        #
-        from datetime import datetime, timezone
-        import logging
-        
-        logger = logging.getLogger(__name__)
-        
-        # Get treatment configuration with proper fallback
-        treatment_start_str = patient_result.data[0].get("treatment_start_date")
-        if not treatment_start_str:
-            logger.warning(f"No treatment_start_date for patient {patient_code}, using created_at as fallback")
-            treatment_start_str = patient_result.data[0]["created_at"]
-        
-        # Get total sessions planned (will be from patients table after migration)
         total_sessions_planned = patient_result.data[0].get("total_sessions_planned", 30)
-        
-        # Handle various datetime formats from Supabase with timezone safety
-        if '+' in treatment_start_str and '.' in treatment_start_str:
-            # Fix microseconds if they have too many digits
-            parts = treatment_start_str.split('.')
-            microsec_and_tz = parts[1].split('+')
-            microsec = microsec_and_tz[0][:6].ljust(6, '0')  # Ensure exactly 6 digits
-            treatment_start_str = f"{parts[0]}.{microsec}+{microsec_and_tz[1]}"
-        
-        # Parse datetime and calculate protocol day
-        treatment_start = datetime.fromisoformat(treatment_start_str.replace('Z', '+00:00'))
-        current_date = datetime.now(timezone.utc)
-        days_since_start = (current_date - treatment_start).days + 1
-        
-        # Cap protocol_day at 14 for the GHOSTLY+ 14-day trial protocol
-        # After day 14, patients are considered to have completed the trial period
-        protocol_day = min(14, max(1, days_since_start))
-        
-        # Log if patient is beyond the trial period
-        if days_since_start > 14:
-            logger.info(f"Patient {patient_code} is beyond 14-day trial period (day {days_since_start}), using day 14 for adherence calculation")
+        protocol_day = _calculate_protocol_day(patient_result.data[0], patient_code)
         
         # Use provided sessions_completed or let service count them
         service = PerformanceScoringService()
@@ -486,15 +578,7 @@ async def get_patient_adherence(patient_code: str, sessions_completed: int = Non
             sessions_completed=sessions_completed
         )
         
-        # Override patient_id with patient_code for frontend compatibility
-        adherence_data['patient_id'] = patient_code
-        
-        # Add protocol day and trial information to response
-        adherence_data['protocol_day'] = protocol_day
-        adherence_data['trial_duration'] = 14  # 14-day trial period
-        adherence_data['total_sessions_planned'] = total_sessions_planned
-        
-        return adherence_data
+        return _adherence_response(adherence_data, patient_code, protocol_day, total_sessions_planned)
 
     except HTTPException:
         raise
@@ -10,30 +10,46 @@ generates signal data on-demand when needed for visualization.
 - 99% storage reduction maintained
 - Signals generated only when needed
 - Memory efficient processing
+- Binary float32 transport on request (Accept header, see utils.signal_transport)
 
 """
 
 import logging
+import math
 import os
 import tempfile
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
 
-from config import get_settings
-from fastapi import APIRouter, HTTPException, Query
+from config import SIGNAL_PYRAMID_ENABLED, get_settings
+from fastapi import APIRouter, Header, HTTPException, Query
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
+from api.responses import SIGNAL_MEDIA_TYPES_DESCRIPTION, signal_response
 from database.supabase_client import get_supabase_client
-from models import ProcessingOptions
+from emg.decimation import decimation_indices, window_indices
+from emg.signal_processing import preprocess_emg_signal
 from services.c3d.processor import GHOSTLYC3DProcessor
 from services.data.metadata_service import MetadataService
+from services.data.signal_pyramid_store import SignalPyramidStore
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 router = APIRouter(prefix="/signals", tags=["signals"])
 
+DecimationMode = Literal["stride", "minmax", "lttb"]
+SignalKind = Literal["raw", "rms", "processed", "activated"]
+
+# Signal kind -> transport field (utils.signal_transport.SIGNAL_FIELDS)
+SIGNAL_KIND_FIELDS: dict[str, str] = {
+    "raw": "data",
+    "rms": "rms_envelope",
+    "processed": "processed_data",
+    "activated": "activated_data",
+}
+
 
 class SignalDataResponse(BaseModel):
     """JIT signal data response."""
@@ -45,6 +61,9 @@ class SignalDataResponse(BaseModel):
     rms_envelope: list[float] | None = None
     sampling_rate: float
     duration_seconds: float
+    total_samples: int | None = None  # Samples in the full recording
+    window_start_ms: float | None = None  # Window actually returned, clipped to the recording
+    window_end_ms: float | None = None
     generated_at: str
     cache_note: str
 
@@ -58,6 +77,95 @@ class SignalGenerationError(BaseModel):
     channel_name: str
 
 
+@router.get("/jit/{session_id}/batch", response_model=dict[str, Any])
+async def get_signal_batch_jit(
+    session_id: str,
+    channels: list[str] | None = Query(
+        default=None, description="Channels to return (default: every recorded channel)"
+    ),
+    kinds: list[SignalKind] = Query(
+        default=["raw", "rms"], description="Signals per channel: raw, rms, processed, activated"
+    ),
+    downsample_factor: int = Query(
+        default=1, description="Downsample factor for performance (1=no downsampling)"
+    ),
+    start_ms: float | None = Query(default=None, ge=0, description="Window start in milliseconds"),
+    end_ms: float | None = Query(default=None, gt=0, description="Window end in milliseconds (exclusive)"),
+    max_points: int | None = Query(
+        default=None, ge=2, description="Maximum samples returned per channel for the window"
+    ),
+    decimation: DecimationMode = Query(
+        default="stride", description="Downsampling method; minmax and lttb keep contraction peaks"
+    ),
+    accept: str | None = Header(default=None, description=SIGNAL_MEDIA_TYPES_DESCRIPTION),
+) -> dict[str, Any]:
+    """📦 Just-In-Time Signal Generation for several channels at once.
+
+    Opening a session view needs every channel; this serves them with one
+    session lookup, one download and one decode instead of one request each.
+
+    Args:
+        session_id: Session UUID to get signal data for
+        channels: EMG channel names (repeat the parameter: ?channels=CH1&channels=CH2)
+        kinds: Signals to include per channel, returned as data, rms_envelope,
+            processed_data and activated_data
+        downsample_factor: Downsample for performance (2=half samples, 4=quarter samples)
+        start_ms: Start of the visible window (default: start of the recording)
+        end_ms: End of the visible window (default: end of the recording)
+        max_points: Reduce each channel's window to at most this many samples
+        decimation: stride (every n-th sample), minmax (bucket extrema) or lttb (largest triangles)
+        accept: Binary media type to receive the arrays as float32 (JSON by default)
+
+    Returns:
+        Dict with session timing metadata, the requested channels keyed by name
+        and the names of requested channels missing from the file
+
+    Raises:
+        HTTPException: 404 if session or every requested channel is not found,
+            400 if end_ms <= start_ms, 500 if processing fails
+    """
+    logger.info(f"🔄 JIT batch signal generation: {session_id} -> {channels or 'all channels'} {kinds}")
+
+    if start_ms is not None and end_ms is not None and end_ms <= start_ms:
+        raise HTTPException(status_code=400, detail="end_ms must be greater than start_ms")
+
+    try:
+        bucket, object_path = await _resolve_session_file(session_id)
+        file_data = await _download_c3d(bucket, object_path)
+
+        batch = await _extract_channel_batch_jit(
+            file_data=file_data,
+            channel_names=channels,
+            kinds=kinds,
+            downsample_factor=downsample_factor,
+            start_ms=start_ms,
+            end_ms=end_ms,
+            max_points=max_points,
+            decimation=decimation,
+        )
+
+        signal_channels = batch.pop("channels")
+        if not signal_channels:
+            logger.warning(f"⚠️ No requested channel found in session {session_id}: {channels}")
+            raise HTTPException(status_code=404, detail=f"Channels not found in C3D file: {channels}")
+
+        logger.info(f"✅ JIT batch generated: {list(signal_channels)} ({', '.join(kinds)})")
+
+        metadata = {
+            "success": True,
+            "session_id": session_id,
+            **batch,
+            "cache_note": "Generated on-demand - not cached (99% storage optimization active)",
+        }
+        return signal_response(accept, {**metadata, "channels": signal_channels}, metadata, signal_channels)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ JIT batch signal generation failed: {e!s}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Signal generation error: {e!s}")
+
+
 @router.get("/jit/{session_id}/{channel_name}", response_model=SignalDataResponse)
 async def get_signal_data_jit(
     session_id: str,
@@ -66,6 +174,15 @@ async def get_signal_data_jit(
     downsample_factor: int = Query(
         default=1, description="Downsample factor for performance (1=no downsampling)"
     ),
+    start_ms: float | None = Query(default=None, ge=0, description="Window start in milliseconds"),
+    end_ms: float | None = Query(default=None, gt=0, description="Window end in milliseconds (exclusive)"),
+    max_points: int | None = Query(
+        default=None, ge=2, description="Maximum samples returned for the window (screen resolution)"
+    ),
+    decimation: DecimationMode = Query(
+        default="stride", description="Downsampling method; minmax and lttb keep contraction peaks"
+    ),
+    accept: str | None = Header(default=None, description=SIGNAL_MEDIA_TYPES_DESCRIPTION),
 ) -> SignalDataResponse:
     """🚀 Just-In-Time Signal Generation.
 
@@ -77,55 +194,56 @@ async def get_signal_data_jit(
         channel_name: EMG channel name (e.g., "BicepsL", "BicepsR")
         include_rms: Whether to include RMS envelope calculation
         downsample_factor: Downsample for performance (2=half samples, 4=quarter samples)
+        start_ms: Start of the visible window (default: start of the recording)
+        end_ms: End of the visible window (default: end of the recording)
+        max_points: Reduce the window to at most this many samples
+        decimation: stride (every n-th sample), minmax (bucket extrema) or lttb (largest triangles)
+        accept: Binary media type to receive the arrays as float32 (JSON by default)
 
     Returns:
         SignalDataResponse with time series data for the requested channel
 
     Raises:
-        HTTPException: 404 if session not found, 400 if channel not found, 500 if processing fails
+        HTTPException: 404 if session not found, 400 if channel not found or end_ms <= start_ms,
+            500 if processing fails
     """
     logger.info(f"🔄 JIT signal generation: {session_id} -> {channel_name}")
 
-    try:
-        # Step 1: Get session metadata
-        metadata_service = MetadataService()
-        session = await metadata_service.get_by_id(UUID(session_id))
-
-        if not session:
-            logger.warning(f"⚠️ Session not found: {session_id}")
-            raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
-
-        # Step 2: Download C3D file from storage
-        file_path = session.get("file_path", "")
-        if not file_path:
-            logger.error(f"❌ No file path in session: {session_id}")
-            raise HTTPException(status_code=400, detail="No file path found in session")
-
-        # Parse bucket and object path from file_path (format: "bucket/path/to/file.c3d")
-        if "/" in file_path:
-            bucket = file_path.split("/")[0]
-            object_path = "/".join(file_path.split("/")[1:])
-        else:
-            bucket = "c3d-examples"  # Default bucket
-            object_path = file_path
+    if start_ms is not None and end_ms is not None and end_ms <= start_ms:
+        raise HTTPException(status_code=400, detail="end_ms must be greater than start_ms")
 
-        logger.info(f"📁 Downloading: {bucket}/{object_path}")
-
-        supabase = get_supabase_client(use_service_key=True)
-        file_data = supabase.storage.from_(bucket).download(object_path)
-
-        if not file_data:
-            logger.error(f"❌ Failed to download file: {bucket}/{object_path}")
-            raise HTTPException(status_code=404, detail=f"C3D file not found: {object_path}")
+    try:
+        # Step 1: Resolve the session's C3D file
+        bucket, object_path = await _resolve_session_file(session_id)
+        signal_data = None
+
+        # Zoomed-out min/max views: read one level of the precomputed pyramid instead of the C3D file
+        if SIGNAL_PYRAMID_ENABLED and decimation == "minmax" and max_points and downsample_factor <= 1:
+            signal_data = await run_in_threadpool(
+                SignalPyramidStore(get_supabase_client(use_service_key=True)).read_window,
+                bucket,
+                object_path,
+                channel_name,
+                start_ms,
+                end_ms,
+                max_points,
+                include_rms,
+            )
 
-        # Step 3: Process C3D file for specific channel only
-        signal_data = await _extract_single_channel_jit(
-            file_data=file_data,
-            channel_name=channel_name,
-            include_rms=include_rms,
-            downsample_factor=downsample_factor,
-            session_id=session_id,
-        )
+        if signal_data is None:
+            # Step 2: Download and process C3D file for specific channel only
+            file_data = await _download_c3d(bucket, object_path)
+            signal_data = await _extract_single_channel_jit(
+                file_data=file_data,
+                channel_name=channel_name,
+                include_rms=include_rms,
+                downsample_factor=downsample_factor,
+                session_id=session_id,
+                start_ms=start_ms,
+                end_ms=end_ms,
+                max_points=max_points,
+                decimation=decimation,
+            )
 
         if not signal_data:
             logger.warning(f"⚠️ Channel not found: {channel_name} in session {session_id}")
@@ -135,17 +253,26 @@ async def get_signal_data_jit(
 
         logger.info(f"✅ JIT signal generated: {channel_name} ({len(signal_data['data'])} samples)")
 
-        return SignalDataResponse(
-            success=True,
-            channel_name=channel_name,
-            data=signal_data["data"],
-            time_axis=signal_data["time_axis"],
-            rms_envelope=signal_data.get("rms_envelope"),
-            sampling_rate=signal_data["sampling_rate"],
-            duration_seconds=signal_data["duration_seconds"],
-            generated_at=signal_data["generated_at"],
-            cache_note="Generated on-demand - not cached (99% storage optimization active)",
-        )
+        # Arrays come straight from the processor: skip per-sample validation, render natively
+        metadata = {
+            "success": True,
+            "channel_name": channel_name,
+            "sampling_rate": signal_data["sampling_rate"],
+            "duration_seconds": signal_data["duration_seconds"],
+            "total_samples": signal_data["total_samples"],
+            "window_start_ms": signal_data["window_start_ms"],
+            "window_end_ms": signal_data["window_end_ms"],
+            "generated_at": signal_data["generated_at"],
+            "cache_note": f"Served from signal pyramid ({signal_data['bucket_size']} samples per min/max pair)"
+            if "bucket_size" in signal_data
+            else "Generated on-demand - not cached (99% storage optimization active)",
+        }
+        signals = {
+            "data": signal_data["data"],
+            "time_axis": signal_data["time_axis"],
+            "rms_envelope": signal_data.get("rms_envelope"),
+        }
+        return signal_response(accept, {**metadata, **signals}, metadata, {channel_name: signals})
 
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
@@ -201,12 +328,170 @@ async def get_available_channels(session_id: str) -> dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error getting channels: {e!s}")
 
 
+async def _resolve_session_file(session_id: str) -> tuple[str, str]:
+    """Storage bucket and object path of a session's C3D file.
+
+    Raises:
+        HTTPException: 404 if session not found, 400 if it has no file path
+    """
+    metadata_service = MetadataService()
+    session = await metadata_service.get_by_id(UUID(session_id))
+
+    if not session:
+        logger.warning(f"⚠️ Session not found: {session_id}")
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+
+    file_path = session.get("file_path", "")
+    if not file_path:
+        logger.error(f"❌ No file path in session: {session_id}")
+        raise HTTPException(status_code=400, detail="No file path found in session")
+
+    # Parse bucket and object path from file_path (format: "bucket/path/to/file.c3d")
+    if "/" in file_path:
+        return file_path.split("/")[0], "/".join(file_path.split("/")[1:])
+    return "c3d-examples", file_path  # Default bucket
+
+
+async def _download_c3d(bucket: str, object_path: str) -> bytes:
+    """Download a C3D file from storage.
+
+    Raises:
+        HTTPException: 404 if the file is missing or empty
+    """
+    logger.info(f"📁 Downloading: {bucket}/{object_path}")
+
+    supabase = get_supabase_client(use_service_key=True)
+    file_data = await run_in_threadpool(supabase.storage.from_(bucket).download, object_path)
+
+    if not file_data:
+        logger.error(f"❌ Failed to download file: {bucket}/{object_path}")
+        raise HTTPException(status_code=404, detail=f"C3D file not found: {object_path}")
+    return file_data
+
+
+async def _decode_c3d_channels(file_data: bytes) -> dict[str, dict[str, Any]]:
+    """Decode every EMG channel of a C3D file through a temporary file."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".c3d") as tmp_file:
+        tmp_file.write(file_data)
+        tmp_file_path = tmp_file.name
+
+    try:
+        processor = GHOSTLYC3DProcessor(tmp_file_path)
+        return await run_in_threadpool(processor.extract_emg_data)
+    finally:
+        # Clean up temporary file
+        if os.path.exists(tmp_file_path):
+            os.unlink(tmp_file_path)
+
+
+def _find_channel(emg_data: dict[str, dict[str, Any]], channel_name: str) -> str | None:
+    """Key of a channel in the decoded data, matched case-insensitively."""
+    for channel in emg_data:
+        if channel == channel_name or channel.lower() == channel_name.lower():
+            return channel
+    return None
+
+
+def _reduce_window(
+    signals: dict[str, Any],
+    sampling_rate: float,
+    start_ms: float | None,
+    end_ms: float | None,
+    max_points: int | None,
+    downsample_factor: int,
+    decimation: str,
+) -> tuple[dict[str, Any], int, int]:
+    """Slice aligned arrays to the window and reduce them to the requested resolution.
+
+    Args:
+        signals: Field name -> array, all as long as signals["time_axis"]
+
+    Returns:
+        Reduced arrays and the window's sample range [start, stop)
+    """
+    total_samples = len(signals["time_axis"])
+
+    # Slice the visible window (views, no copies)
+    start, stop = window_indices(total_samples, sampling_rate, start_ms, end_ms)
+    window = slice(start, stop)
+    signals = {name: signal[window] for name, signal in signals.items()}
+
+    step = max(downsample_factor, math.ceil((stop - start) / max_points) if max_points else 1, 1)
+    if step > 1:
+        if decimation == "stride":
+            selection = slice(None, None, step)
+        else:
+            # Shape-preserving: keep the peaks of every signal on one shared time axis
+            target_points = math.ceil((stop - start) / step)
+            aligned = [signal for name, signal in signals.items() if name != "time_axis"]
+            selection = decimation_indices(decimation, aligned, target_points)
+        signals = {name: signal[selection] for name, signal in signals.items()}
+
+    if step > 1 or stop - start < total_samples:
+        logger.info(
+            f"📉 Window [{start}:{stop}] reduced by {decimation} (factor {step}): "
+            f"{len(signals['time_axis'])} of {total_samples} samples"
+        )
+    return signals, start, stop
+
+
+def _window_metadata(total_samples: int, sampling_rate: float, start: int, stop: int) -> dict[str, Any]:
+    """Timing fields shared by the single-channel and batch responses."""
+    from datetime import datetime, timezone
+
+    return {
+        "sampling_rate": float(sampling_rate),
+        "duration_seconds": float(total_samples / sampling_rate) if sampling_rate > 0 else 0.0,
+        "total_samples": total_samples,
+        "window_start_ms": start * 1000.0 / sampling_rate if sampling_rate > 0 else 0.0,
+        "window_end_ms": stop * 1000.0 / sampling_rate if sampling_rate > 0 else 0.0,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _non_empty(signal: Any) -> Any:
+    return signal if signal is not None and len(signal) > 0 else None
+
+
+def _channel_signal(emg_data: dict[str, dict[str, Any]], channel: str, kind: str) -> Any:
+    """One signal kind of a decoded channel, or None when the file has none.
+
+    "processed" runs the same pipeline as the analysis (emg.signal_processing)
+    on the raw signal; "activated" is the device's "<base> activated" channel.
+    """
+    channel_data = emg_data[channel]
+    if kind == "raw":
+        return _non_empty(channel_data.get("data"))
+    if kind == "rms":
+        return _non_empty(channel_data.get("rms_envelope"))
+    if kind == "processed":
+        processed = _non_empty(channel_data.get("processed_data"))
+        if processed is None and _non_empty(channel_data.get("data")) is not None:
+            processed = preprocess_emg_signal(
+                raw_signal=channel_data["data"],
+                sampling_rate=channel_data.get("sampling_rate", 1000.0),
+                enable_filtering=True,
+                enable_rectification=True,
+                enable_smoothing=True,
+            )["processed_signal"]
+        return processed
+    if kind == "activated":
+        base_name = channel.removesuffix(" Raw")
+        activated_channel = emg_data.get(f"{base_name} activated") or {}
+        return _non_empty(activated_channel.get("data", channel_data.get("activated_data")))
+    raise ValueError(f"Unknown signal kind: {kind!r} (expected one of {tuple(SIGNAL_KIND_FIELDS)})")
+
+
 async def _extract_single_channel_jit(
     file_data: bytes,
     channel_name: str,
     include_rms: bool = True,
     downsample_factor: int = 1,
     session_id: str = "",
+    start_ms: float | None = None,
+    end_ms: float | None = None,
+    max_points: int | None = None,
+    decimation: str = "stride",
 ) -> dict[str, Any] | None:
     """🧮 Extract single channel data with JIT processing.
 
@@ -219,98 +504,110 @@ async def _extract_single_channel_jit(
         include_rms: Whether to calculate RMS envelope
         downsample_factor: Downsample factor for performance
         session_id: Session ID for logging
+        start_ms: Window start in milliseconds from the start of the recording
+        end_ms: Window end in milliseconds (exclusive)
+        max_points: Reduce the window to at most this many samples
+        decimation: How the window is reduced: "stride", "minmax" or "lttb" (see emg.decimation)
 
     Returns:
         Dict with signal data or None if channel not found
     """
-    from datetime import datetime, timezone
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".c3d") as tmp_file:
-        tmp_file.write(file_data)
-        tmp_file_path = tmp_file.name
-
     try:
-        # Create processor for single-channel extraction
-        processor = GHOSTLYC3DProcessor(tmp_file_path)
-
-        # Import settings from config module
-        from config import (
-            DEFAULT_MIN_DURATION_MS,
-            DEFAULT_SMOOTHING_WINDOW,
-            DEFAULT_THRESHOLD_FACTOR,
-        )
-
-        # Default processing options (minimal for JIT)
-        processing_opts = ProcessingOptions(
-            threshold_factor=DEFAULT_THRESHOLD_FACTOR,
-            min_duration_ms=DEFAULT_MIN_DURATION_MS,
-            smoothing_window=DEFAULT_SMOOTHING_WINDOW,
-        )
-
         # Extract EMG data for all channels first (needed to find the requested channel)
-        emg_data_result = await run_in_threadpool(processor.extract_emg_data)
+        emg_data_result = await _decode_c3d_channels(file_data)
 
-        # Find the requested channel
-        target_channel_data = None
-        for channel, data in emg_data_result.items():
-            if channel.lower() == channel_name.lower() or channel == channel_name:
-                target_channel_data = data
-                break
-
-        if not target_channel_data:
+        channel = _find_channel(emg_data_result, channel_name)
+        if channel is None:
             logger.warning(
                 f"⚠️ Channel '{channel_name}' not found in available channels: {list(emg_data_result.keys())}"
             )
             return None
 
-        # Extract signal arrays
-        signal_array = target_channel_data.get("data", [])
-        time_array = target_channel_data.get("time_axis", [])
+        target_channel_data = emg_data_result[channel]
+        signal_array = target_channel_data.get("data")
+        time_array = target_channel_data.get("time_axis")
         sampling_rate = target_channel_data.get("sampling_rate", 1000.0)
 
-        if not signal_array or not time_array:
+        if signal_array is None or time_array is None or len(signal_array) == 0 or len(time_array) == 0:
             logger.warning(f"⚠️ Empty signal data for channel: {channel_name}")
             return None
 
-        # Apply downsampling if requested
-        if downsample_factor > 1:
-            signal_array = signal_array[::downsample_factor]
-            time_array = time_array[::downsample_factor]
-            logger.info(
-                f"📉 Applied downsampling factor {downsample_factor}: {len(signal_array)} samples"
-            )
-
-        # Calculate RMS envelope if requested
-        rms_envelope = None
-        if include_rms:
-            rms_envelope = target_channel_data.get("rms_envelope", [])
-            if rms_envelope and downsample_factor > 1:
-                rms_envelope = rms_envelope[::downsample_factor]
-
-        # Prepare response data
-        result = {
-            "data": signal_array,
-            "time_axis": time_array,
-            "sampling_rate": float(sampling_rate),
-            "duration_seconds": float(len(time_array) / sampling_rate)
-            if sampling_rate > 0
-            else 0.0,
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-        }
+        signals = {"data": signal_array, "time_axis": time_array}
+        rms_envelope = _channel_signal(emg_data_result, channel, "rms") if include_rms else None
+        if rms_envelope is not None:
+            signals["rms_envelope"] = rms_envelope
 
-        if rms_envelope:
-            result["rms_envelope"] = rms_envelope
+        signals, start, stop = _reduce_window(
+            signals, sampling_rate, start_ms, end_ms, max_points, downsample_factor, decimation
+        )
+        result = {**signals, **_window_metadata(len(signal_array), sampling_rate, start, stop)}
 
-        logger.info(f"✅ JIT extraction completed: {channel_name} ({len(signal_array)} samples)")
+        logger.info(f"✅ JIT extraction completed: {channel_name} ({len(result['data'])} samples)")
         return result
 
     except Exception as e:
         logger.exception(f"❌ JIT extraction failed for {channel_name}: {e!s}")
         return None
 
-    finally:
-        # Clean up temporary file
-        if os.path.exists(tmp_file_path):
-            os.unlink(tmp_file_path)
 
+async def _extract_channel_batch_jit(
+    file_data: bytes,
+    channel_names: list[str] | None,
+    kinds: list[str],
+    downsample_factor: int = 1,
+    start_ms: float | None = None,
+    end_ms: float | None = None,
+    max_points: int | None = None,
+    decimation: str = "stride",
+) -> dict[str, Any]:
+    """🧮 Extract several channels and signal kinds from one decode of the file.
+
+    Args:
+        file_data: Raw C3D file bytes
+        channel_names: Channels to extract (None: every recorded channel,
+            without the duplicated "Raw" and device "activated" entries)
+        kinds: Signal kinds per channel (keys of SIGNAL_KIND_FIELDS)
+        downsample_factor: Downsample factor for performance
+        start_ms: Window start in milliseconds from the start of the recording
+        end_ms: Window end in milliseconds (exclusive)
+        max_points: Reduce each channel's window to at most this many samples
+        decimation: How the windows are reduced: "stride", "minmax" or "lttb"
+
+    Returns:
+        Dict with "channels" (name -> time_axis and the requested fields),
+        "missing_channels" and the window timing of the first channel found
+    """
+    emg_data = await _decode_c3d_channels(file_data)
+    if channel_names is None:
+        channel_names = [name for name in emg_data if not name.endswith((" Raw", " activated"))]
+
+    def extract() -> dict[str, Any]:
+        channels: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        timing: dict[str, Any] = {}
+
+        for name in channel_names:
+            channel = _find_channel(emg_data, name)
+            time_axis = _non_empty(emg_data[channel].get("time_axis")) if channel else None
+            if time_axis is None:
+                missing.append(name)
+                continue
+
+            sampling_rate = emg_data[channel].get("sampling_rate", 1000.0)
+            signals = {"time_axis": time_axis}
+            for kind in kinds:
+                signal = _channel_signal(emg_data, channel, kind)
+                if signal is not None and len(signal) == len(time_axis):
+                    signals[SIGNAL_KIND_FIELDS[kind]] = signal
+
+            channels[name], start, stop = _reduce_window(
+                signals, sampling_rate, start_ms, end_ms, max_points, downsample_factor, decimation
+            )
+            timing = timing or _window_metadata(len(time_axis), sampling_rate, start, stop)
+
+        if missing:
+            logger.warning(f"⚠️ Channels not found: {missing} (available: {list(emg_data.keys())})")
+        return {**timing, "channels": channels, "missing_channels": missing}
 
+    # Processed signals run the filter pipeline: keep it off the event loop
+    return await run_in_threadpool(extract)
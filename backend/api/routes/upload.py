@@ -27,6 +27,15 @@ Processing Pipeline:
 4. Complete analytics generation
 5. Signal data return for visualization
 
+Streaming (opt-in, Accept: application/x-ndjson):
+- One JSON event per line, in order: "analytics" (the response without
+  signals and scores), "performance_analysis", one "signals" event per
+  channel chunk, then "complete" (or "error")
+- The UI renders scores and contraction tables while signals transfer
+
+Batch uploads (/upload/batch): many files analyzed in parallel in the C3D
+process pool, each result or error streamed as NDJSON as soon as it is ready.
+
 Security Considerations:
 - File size validation (MAX_FILE_SIZE limit)
 - Secure temporary file handling
@@ -39,6 +48,8 @@ DIFFERENCE FROM WEBHOOK:
 
 """
 
+import asyncio
+import contextlib
 import logging
 import os
 import shutil
@@ -46,8 +57,8 @@ import tempfile
 import uuid
 from datetime import datetime
 
-from config import MAX_FILE_SIZE
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from config import MAX_BATCH_UPLOAD_FILES, MAX_FILE_SIZE, UPLOAD_STREAM_CHUNK_SAMPLES
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, UploadFile
 from fastapi.concurrency import run_in_threadpool
 
 from api.dependencies.validation import (
@@ -55,21 +66,38 @@ from api.dependencies.validation import (
     get_processing_options,
     get_session_parameters,
 )
+from api.responses import SIGNAL_MEDIA_TYPES_DESCRIPTION, ndjson_response, signal_response
 from models import (
     ChannelAnalytics,
     EMGAnalysisResult,
+    EMGChannelSignalData,
     GameMetadata,
     GameSessionParameters,
     ProcessingOptions,
 )
 # Direct C3D processing for stateless upload endpoint
+from services.c3d.process_pool import process_c3d_file, run_c3d
 from services.c3d.processor import GHOSTLYC3DProcessor
+from services.c3d.reader import (
+    EXCESSIVE_SIGNAL_DURATION,
+    INSUFFICIENT_SIGNAL_DURATION,
+    NO_EMG_DATA,
+    C3DPrevalidationError,
+)
 from config import PROCESSING_VERSION
+from utils.signal_transport import NDJSON_MEDIA_TYPE, SIGNAL_FIELDS, negotiate_media_type
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
+UPLOAD_MEDIA_TYPES_DESCRIPTION = (
+    f"{SIGNAL_MEDIA_TYPES_DESCRIPTION}, or application/x-ndjson to stream analytics before signals"
+)
+
+# Fields sent in the "performance_analysis" event of a streamed upload
+CLINICAL_FIELDS = ("performance_analysis", "session_configuration", "scoring_configuration")
+
 
 # Export Enhancement Helper Functions
 def get_rpe_description(rpe: int | None) -> str:
@@ -180,12 +208,257 @@ def enhance_performance_analysis(clinical_scores: dict, session_params: GameSess
 
 
 
+def add_clinical_analysis(result_data: dict, session_params: GameSessionParameters) -> dict:
+    """Add clinical performance scores and configuration to EMG processing results.
+
+    Clinical failures are not fatal: the EMG results are kept with a fallback
+    performance_analysis describing the error.
+    """
+    # CLINICAL PROCESSING ORCHESTRATION: Convert EMG data to clinical format and calculate performance scores
+    try:
+        # Import clinical services (local import to avoid circular dependencies)
+        from services.clinical.emg_analytics_adapter import convert_emg_analytics_to_clinical_session_metrics
+        from services.clinical.performance_scoring_service import PerformanceScoringService
+        
+        # Step 1: Convert EMG analytics to clinical SessionMetrics format
+        clinical_session_metrics = convert_emg_analytics_to_clinical_session_metrics(
+            result_data.get("analytics", {}), 
+            session_params
+        )
+        logger.info(f"🔌 Analytics converted to clinical format: session_id={clinical_session_metrics.session_id}")
+        
+        # Step 2: Calculate performance scores using existing clinical service  
+        clinical_service = PerformanceScoringService()
+        clinical_performance_scores = clinical_service.calculate_performance_scores(
+            session_id=clinical_session_metrics.session_id,
+            session_metrics=clinical_session_metrics
+        )
+        logger.info(f"📊 Clinical performance scores calculated: {list(clinical_performance_scores.keys())}")
+        
+        # Enhance performance analysis with all fields needed for CSV
+        result_data["performance_analysis"] = enhance_performance_analysis(
+            clinical_performance_scores,
+            session_params
+        )
+
+        # Format session configuration for frontend
+        result_data["session_configuration"] = format_session_configuration(session_params)
+
+        # Add scoring configuration for transparency
+        result_data["scoring_configuration"] = get_scoring_configuration()
+        
+    except Exception as clinical_error:
+        logger.exception(f"⚠️ Clinical processing failed, continuing with EMG data only: {clinical_error}")
+        # Fallback: Use EMG processing results without clinical scores
+        result_data["performance_analysis"] = {
+            "error": f"Clinical processing failed: {str(clinical_error)}",
+            "emg_data_available": True,
+            "fallback_mode": True
+        }
+
+    return result_data
+
+
+def add_c3d_parameters(processing_result: dict) -> dict:
+    """Add the technical and game parameters of the C3D file (from its metadata) to a processing result."""
+    metadata = processing_result.get("metadata", {})
+    processing_result["c3d_parameters"] = {
+        # Technical parameters from C3D file
+        "sampling_rate": metadata.get("sampling_rate"),
+        "duration": metadata.get("duration_seconds"),  # Note: field name is duration_seconds
+        "frame_count": metadata.get("frame_count"), 
+        "channel_count": metadata.get("channel_count", len(processing_result.get("analytics", {}))),
+        # Game-related fields from C3D file
+        "game_name": metadata.get("game_name"),
+        "level": metadata.get("level"),
+        "therapist_id": metadata.get("therapist_id"),
+        "group_id": metadata.get("group_id"),
+        "player_name": metadata.get("player_name"),
+        "player_id": metadata.get("player_id"),  # If available
+        "time": metadata.get("time"),
+        # Processing metadata
+        "processing_version": PROCESSING_VERSION,
+        "processed_at": datetime.now().isoformat(),
+        "stateless_mode": True
+    }
+    return processing_result
+
+
+def build_upload_response(
+    result_data: dict, filename: str, file_metadata: dict, session_params: GameSessionParameters
+) -> tuple[dict, dict]:
+    """Validated EMGAnalysisResult fields and the signal payload of a processed upload.
+
+    Returns:
+        (response body with empty emg_signals, channel name -> EMGChannelSignalData fields)
+    """
+    # Create result object
+    game_metadata = GameMetadata(**result_data["metadata"])
+
+    analytics = {k: ChannelAnalytics(**v) for k, v in result_data["analytics"].items()}
+
+    # Extract C3D parameters from processing result
+    try:
+        c3d_params = result_data.get("c3d_parameters", {})
+        if not c3d_params:
+            # Fallback: extract parameters from metadata (where they actually are)
+            metadata = result_data.get("metadata", {})
+            c3d_params = {
+                "sampling_rate": metadata.get("sampling_rate"),
+                "duration": metadata.get("duration_seconds"),
+                "frame_count": metadata.get("frame_count"),
+                "channel_count": metadata.get("channel_count", len(result_data.get("analytics", {}))),
+                "player_name": metadata.get("player_name"),
+                "therapist_id": metadata.get("therapist_id"),
+                "level": metadata.get("level"),
+            }
+    except Exception as e:
+        logger.warning(f"Failed to extract C3D parameters: {e!s}")
+        c3d_params = {"error": f"Parameter extraction failed: {e!s}"}
+
+    response_model = EMGAnalysisResult(
+        file_id=str(uuid.uuid4()),  # Generate a new UUID for this stateless request
+        timestamp=datetime.now().strftime("%Y%m%d_%H%M%S"),
+        source_filename=filename,
+        metadata=GameMetadata(
+            **{**game_metadata.model_dump(), "session_parameters_used": session_params}
+        ),
+        analytics=analytics,
+        available_channels=result_data["available_channels"],
+        emg_signals={},  # Filled in below without per-sample validation
+        c3d_parameters=c3d_params,  # Include comprehensive C3D parameters
+        user_id=file_metadata["user_id"],
+        patient_id=file_metadata["patient_id"],
+        session_id=file_metadata["session_id"],
+        # NEW: Include clinical data from enhanced processor
+        session_parameters=result_data.get("session_parameters"),
+        session_configuration=result_data.get("session_configuration"),  # NEW: Formatted session config
+        processing_parameters=result_data.get("processing_parameters"),
+        performance_analysis=result_data.get("performance_analysis"),
+        scoring_configuration=result_data.get("scoring_configuration"),  # NEW: Scoring weights
+    )
+
+    # EMG signal data (raw, activated, processed) from our own C3D processor is trusted:
+    # pydantic validation of every sample dominates response time for long sessions,
+    # so only the small fields are validated and the NumPy arrays are written as-is.
+    response_body = response_model.model_dump(mode="json")
+    signal_fields = EMGChannelSignalData.model_fields
+    emg_signals = {
+        channel: {field: signals.get(field) for field in signal_fields}
+        for channel, signals in result_data.get("emg_signals", {}).items()
+    }
+    return response_body, emg_signals
+
+
+async def stream_upload_events(
+    response_body: dict,
+    result_data: dict,
+    emg_signals: dict,
+    session_params: GameSessionParameters,
+    chunk_samples: int = UPLOAD_STREAM_CHUNK_SAMPLES,
+):
+    """Events of a streamed upload: analytics, performance analysis, then signal chunks.
+
+    Clinical scoring runs after the analytics event is sent, so the UI can
+    render contraction tables while scores are computed and signals transfer.
+
+    Args:
+        response_body: Validated EMGAnalysisResult fields (without signals)
+        result_data: Processing result, completed with clinical analysis here
+        emg_signals: Channel name -> EMGChannelSignalData fields (NumPy arrays)
+        session_params: Game session parameters for clinical scoring
+        chunk_samples: Samples per channel per "signals" event
+    """
+    try:
+        analytics = {key: value for key, value in response_body.items() if key not in CLINICAL_FIELDS}
+        analytics["emg_signals"] = {
+            channel: {
+                "sampling_rate": signals["sampling_rate"],
+                "total_samples": len(signals["time_axis"]),
+            }
+            for channel, signals in emg_signals.items()
+        }
+        yield {"event": "analytics", **analytics}
+
+        await run_in_threadpool(add_clinical_analysis, result_data, session_params)
+        yield {"event": "performance_analysis", **{field: result_data.get(field) for field in CLINICAL_FIELDS}}
+
+        for channel, signals in emg_signals.items():
+            total_samples = len(signals["time_axis"])
+            for offset in range(0, total_samples, chunk_samples):
+                chunk = slice(offset, offset + chunk_samples)
+                yield {
+                    "event": "signals",
+                    "channel": channel,
+                    "offset": offset,
+                    **{
+                        field: None if signals.get(field) is None else signals[field][chunk]
+                        for field in SIGNAL_FIELDS
+                    },
+                }
+
+        yield {"event": "complete"}
+
+    except Exception as e:
+        # Headers are already sent: report the failure in-band
+        logger.exception(f"❌ Streamed upload failed: {e}")
+        yield {"event": "error", "message": f"Server error processing file: {e!s}"}
+
+
+def get_emg_validation_failure_reason(error: Exception) -> str | None:
+    """Why EMG validation rejected a file, or None if the failure is something else.
+
+    Header prevalidation says so directly; errors raised during the full
+    decode are classified from their message (channels whose signal is too
+    short are dropped there, which surfaces as "No EMG data loaded").
+    """
+    if isinstance(error, C3DPrevalidationError):
+        return error.reason
+
+    message = str(error).lower()
+    if "signal too long" in message:
+        return EXCESSIVE_SIGNAL_DURATION
+    if any(keyword in message for keyword in (
+        "signal too short", "insufficient", "samples", "clinical", "duration", "no emg data loaded"
+    )):
+        return INSUFFICIENT_SIGNAL_DURATION
+    return None
+
+
+def get_emg_validation_guidance(reason: str) -> dict[str, str]:
+    """Requirement, recommendation and technical note for an EMG validation failure."""
+    from emg.signal_processing import ProcessingParameters
+
+    duration_range = (
+        f"{ProcessingParameters.MIN_CLINICAL_DURATION_SECONDS} seconds to "
+        f"{ProcessingParameters.MAX_CLINICAL_DURATION_SECONDS // 60} minutes"
+    )
+    if reason == EXCESSIVE_SIGNAL_DURATION:
+        return {
+            "requirement": "Long recordings may contain fatigue artifacts that compromise therapeutic assessment",
+            "recommendation": f"Record shorter EMG sessions ({duration_range})",
+            "technical_note": "File contains valid C3D data but exceeds the maximum EMG duration for analysis",
+        }
+    if reason == NO_EMG_DATA:
+        return {
+            "requirement": "EMG analysis requires analog EMG channels",
+            "recommendation": "Ensure proper EMG sensor connectivity",
+            "technical_note": "File contains no analog EMG samples",
+        }
+    return {
+        "requirement": "EMG analysis requires sufficient signal duration for therapeutic assessment",
+        "recommendation": f"Record longer EMG sessions ({duration_range})",
+        "technical_note": "File contains valid C3D data but insufficient EMG duration for analysis",
+    }
+
+
 @router.post("", response_model=EMGAnalysisResult)  # No slash = exact match on /upload
 async def upload_file(
     file: UploadFile = File(...),
     processing_opts: ProcessingOptions = Depends(get_processing_options),
     session_params: GameSessionParameters = Depends(get_session_parameters),
     file_metadata: dict = Depends(get_file_metadata),
+    accept: str | None = Header(default=None, description=UPLOAD_MEDIA_TYPES_DESCRIPTION),
 ):
     """Upload and process a C3D file.
 
@@ -194,9 +467,12 @@ async def upload_file(
         processing_opts: EMG processing configuration
         session_params: Game session parameters
         file_metadata: File metadata (user_id, patient_id, session_id)
+        accept: Binary media type to receive emg_signals as float32, or
+            application/x-ndjson to stream analytics before signals (JSON by default)
 
     Returns:
-        EMGAnalysisResult: Complete analysis results
+        EMGAnalysisResult: Complete analysis results (signals rendered straight from NumPy),
+            or its streamed events (see module docstring)
 
     Raises:
         HTTPException: 400 for invalid files, 413 for too large, 500 for processing errors
@@ -220,6 +496,7 @@ async def upload_file(
 
     logger.info(f"Processing upload request for file: {file.filename}")
     tmp_path = ""
+    stream = negotiate_media_type(accept, extra_media_types=(NDJSON_MEDIA_TYPE,)) == NDJSON_MEDIA_TYPE
 
     try:
         # Use a temporary file to handle the upload to be able to pass a path to the processor
@@ -244,77 +521,15 @@ async def upload_file(
             )
             
             # Extract all C3D parameters from metadata (where C3DUtils puts them)
-            metadata = processing_result.get("metadata", {})
-            processing_result["c3d_parameters"] = {
-                # Technical parameters from C3D file
-                "sampling_rate": metadata.get("sampling_rate"),
-                "duration": metadata.get("duration_seconds"),  # Note: field name is duration_seconds
-                "frame_count": metadata.get("frame_count"), 
-                "channel_count": metadata.get("channel_count", len(processing_result.get("analytics", {}))),
-                # Game-related fields from C3D file
-                "game_name": metadata.get("game_name"),
-                "level": metadata.get("level"),
-                "therapist_id": metadata.get("therapist_id"),
-                "group_id": metadata.get("group_id"),
-                "player_name": metadata.get("player_name"),
-                "player_id": metadata.get("player_id"),  # If available
-                "time": metadata.get("time"),
-                # Processing metadata
-                "processing_version": PROCESSING_VERSION,
-                "processed_at": datetime.now().isoformat(),
-                "stateless_mode": True
-            }
+            add_c3d_parameters(processing_result)
             
             # Store EMG processing results with explicit naming
             raw_emg_analytics = processing_result
             logger.info(f"✅ EMG processing completed: {len(raw_emg_analytics.get('analytics', {}))} channels")
             
-            # CLINICAL PROCESSING ORCHESTRATION: Convert EMG data to clinical format and calculate performance scores
-            try:
-                # Import clinical services (local import to avoid circular dependencies)
-                from services.clinical.emg_analytics_adapter import convert_emg_analytics_to_clinical_session_metrics
-                from services.clinical.performance_scoring_service import PerformanceScoringService
-                
-                # Step 1: Convert EMG analytics to clinical SessionMetrics format
-                clinical_session_metrics = convert_emg_analytics_to_clinical_session_metrics(
-                    raw_emg_analytics.get("analytics", {}), 
-                    session_params
-                )
-                logger.info(f"🔌 Analytics converted to clinical format: session_id={clinical_session_metrics.session_id}")
-                
-                # Step 2: Calculate performance scores using existing clinical service  
-                clinical_service = PerformanceScoringService()
-                clinical_performance_scores = clinical_service.calculate_performance_scores(
-                    session_id=clinical_session_metrics.session_id,
-                    session_metrics=clinical_session_metrics
-                )
-                logger.info(f"📊 Clinical performance scores calculated: {list(clinical_performance_scores.keys())}")
-                
-                # Combine EMG processing results with clinical analysis
-                result_data = raw_emg_analytics
-
-                # Enhance performance analysis with all fields needed for CSV
-                result_data["performance_analysis"] = enhance_performance_analysis(
-                    clinical_performance_scores,
-                    session_params
-                )
-
-                # Format session configuration for frontend
-                result_data["session_configuration"] = format_session_configuration(session_params)
+            # Streamed uploads send analytics first and score once they are on their way
+            result_data = raw_emg_analytics if stream else add_clinical_analysis(raw_emg_analytics, session_params)
 
-                # Add scoring configuration for transparency
-                result_data["scoring_configuration"] = get_scoring_configuration()
-                
-            except Exception as clinical_error:
-                logger.exception(f"⚠️ Clinical processing failed, continuing with EMG data only: {clinical_error}")
-                # Fallback: Use EMG processing results without clinical scores
-                result_data = raw_emg_analytics
-                result_data["performance_analysis"] = {
-                    "error": f"Clinical processing failed: {str(clinical_error)}",
-                    "emg_data_available": True,
-                    "fallback_mode": True
-                }
-            
         except Exception as e:
             logger.exception(f"❌ C3D processing failed: {e}")
             
@@ -322,29 +537,34 @@ async def upload_file(
             try:
                 # Try to extract C3D metadata for enhanced error response
                 from services.c3d.processor import C3DUtils
-                
-                c3d_file = C3DUtils.load_c3d_file(tmp_path)
-                c3d_metadata = {
-                    'duration_seconds': c3d_file.header.frame_count / c3d_file.header.analog_sample_rate if c3d_file.header.analog_sample_rate > 0 else 0,
-                    'sampling_rate': c3d_file.header.analog_sample_rate,
-                    'frame_count': c3d_file.header.frame_count,
-                    'channel_count': len(c3d_file.data.analogs) if hasattr(c3d_file.data, 'analogs') and c3d_file.data.analogs else 0,
-                    'game_name': c3d_file.parameters.get('GAME_NAME', {}).get('data', ['Unknown'])[0] if 'GAME_NAME' in c3d_file.parameters else 'Unknown',
-                    'player_name': c3d_file.parameters.get('PLAYER_NAME', {}).get('data', ['Unknown'])[0] if 'PLAYER_NAME' in c3d_file.parameters else 'Unknown',
-                    'therapist_id': c3d_file.parameters.get('THERAPIST_ID', {}).get('data', ['Unknown'])[0] if 'THERAPIST_ID' in c3d_file.parameters else 'Unknown',
-                    'level': c3d_file.parameters.get('LEVEL', {}).get('data', ['Unknown'])[0] if 'LEVEL' in c3d_file.parameters else 'Unknown',
-                    'time': c3d_file.parameters.get('TIME', {}).get('data', ['Unknown'])[0] if 'TIME' in c3d_file.parameters else 'Unknown',
-                }
+
+                if isinstance(e, C3DPrevalidationError):
+                    # Rejected from the header: report what it recorded, without a full decode
+                    c3d_metadata = {
+                        **e.recording,
+                        **dict.fromkeys(('game_name', 'player_name', 'therapist_id', 'level', 'time'), 'Unknown'),
+                    }
+                else:
+                    c3d_file = C3DUtils.load_c3d_file(tmp_path)
+                    c3d_metadata = {
+                        'duration_seconds': c3d_file.header.frame_count / c3d_file.header.analog_sample_rate if c3d_file.header.analog_sample_rate > 0 else 0,
+                        'sampling_rate': c3d_file.header.analog_sample_rate,
+                        'frame_count': c3d_file.header.frame_count,
+                        'channel_count': len(c3d_file.data.analogs) if hasattr(c3d_file.data, 'analogs') and c3d_file.data.analogs else 0,
+                        'game_name': c3d_file.parameters.get('GAME_NAME', {}).get('data', ['Unknown'])[0] if 'GAME_NAME' in c3d_file.parameters else 'Unknown',
+                        'player_name': c3d_file.parameters.get('PLAYER_NAME', {}).get('data', ['Unknown'])[0] if 'PLAYER_NAME' in c3d_file.parameters else 'Unknown',
+                        'therapist_id': c3d_file.parameters.get('THERAPIST_ID', {}).get('data', ['Unknown'])[0] if 'THERAPIST_ID' in c3d_file.parameters else 'Unknown',
+                        'level': c3d_file.parameters.get('LEVEL', {}).get('data', ['Unknown'])[0] if 'LEVEL' in c3d_file.parameters else 'Unknown',
+                        'time': c3d_file.parameters.get('TIME', {}).get('data', ['Unknown'])[0] if 'TIME' in c3d_file.parameters else 'Unknown',
+                    }
                 
                 # Check if this is an EMG validation failure specifically
-                error_str = str(e).lower()
-                is_emg_validation_failure = any(keyword in error_str for keyword in [
-                    'signal too short', 'insufficient', 'samples', 'clinical', 'duration', 'no emg data loaded'
-                ])
+                failure_reason = get_emg_validation_failure_reason(e)
                 
-                if is_emg_validation_failure:
+                if failure_reason:
                     # Create structured error response for EMG validation failures
                     from emg.signal_processing import ProcessingParameters
+                    guidance = get_emg_validation_guidance(failure_reason)
                     
                     structured_error = {
                         'error_type': 'emg_validation_failure',
@@ -355,7 +575,7 @@ async def upload_file(
                             'max_duration_seconds': ProcessingParameters.MAX_CLINICAL_DURATION_SECONDS,
                             'min_samples_required': ProcessingParameters.MIN_SAMPLES_REQUIRED,
                             'actual_samples': c3d_metadata['frame_count'],
-                            'reason': 'EMG analysis requires sufficient signal duration for therapeutic assessment'
+                            'reason': guidance['requirement']
                         },
                         'file_info': {
                             'filename': file.filename,
@@ -367,21 +587,21 @@ async def upload_file(
                             'failure_stage': 'emg_validation'
                         },
                         'user_guidance': {
-                            'primary_recommendation': f"Record longer EMG sessions ({ProcessingParameters.MIN_CLINICAL_DURATION_SECONDS} seconds to {ProcessingParameters.MAX_CLINICAL_DURATION_SECONDS // 60} minutes)",
-                            'secondary_recommendations': [
-                                f'Record longer EMG sessions ({ProcessingParameters.MIN_CLINICAL_DURATION_SECONDS} seconds to {ProcessingParameters.MAX_CLINICAL_DURATION_SECONDS // 60} minutes)',
+                            'primary_recommendation': guidance['recommendation'],
+                            'secondary_recommendations': list(dict.fromkeys([
+                                guidance['recommendation'],
                                 'Check GHOSTLY game recording settings',
                                 'Ensure proper EMG sensor connectivity',
                                 'Verify EMG data is being captured during gameplay'
-                            ],
-                            'technical_note': 'File contains valid C3D data but insufficient EMG duration for analysis'
+                            ])),
+                            'technical_note': guidance['technical_note']
                         },
                         'processing_context': {
                             'stage_reached': 'emg_validation',
                             'c3d_load_successful': True,
                             'metadata_extraction_successful': True,
                             'emg_validation_successful': False,
-                            'failure_reason': 'insufficient_signal_duration',
+                            'failure_reason': failure_reason,
                             'processing_time_ms': 50  # Estimated time for metadata extraction
                         },
                         'file_analysis': {
@@ -468,54 +688,19 @@ async def upload_file(
                     detail=f"C3D processing failed: {str(e)}"
                 )
 
-        # Create result object
-        game_metadata = GameMetadata(**result_data["metadata"])
-
-        analytics = {k: ChannelAnalytics(**v) for k, v in result_data["analytics"].items()}
+        response_body, emg_signals = build_upload_response(result_data, file.filename, file_metadata, session_params)
+        if stream:
+            return ndjson_response(stream_upload_events(response_body, result_data, emg_signals, session_params))
 
-        # Extract C3D parameters from processing result
-        try:
-            c3d_params = result_data.get("c3d_parameters", {})
-            if not c3d_params:
-                # Fallback: extract parameters from metadata (where they actually are)
-                metadata = result_data.get("metadata", {})
-                c3d_params = {
-                    "sampling_rate": metadata.get("sampling_rate"),
-                    "duration": metadata.get("duration_seconds"),
-                    "frame_count": metadata.get("frame_count"),
-                    "channel_count": metadata.get("channel_count", len(result_data.get("analytics", {}))),
-                    "player_name": metadata.get("player_name"),
-                    "therapist_id": metadata.get("therapist_id"),
-                    "level": metadata.get("level"),
-                }
-        except Exception as e:
-            logger.warning(f"Failed to extract C3D parameters: {e!s}")
-            c3d_params = {"error": f"Parameter extraction failed: {e!s}"}
-
-        response_model = EMGAnalysisResult(
-            file_id=str(uuid.uuid4()),  # Generate a new UUID for this stateless request
-            timestamp=datetime.now().strftime("%Y%m%d_%H%M%S"),
-            source_filename=file.filename,
-            metadata=GameMetadata(
-                **{**game_metadata.model_dump(), "session_parameters_used": session_params}
-            ),
-            analytics=analytics,
-            available_channels=result_data["available_channels"],
-            emg_signals=result_data.get(
-                "emg_signals", {}
-            ),  # EMG signal data (raw, activated, processed) from C3D processor
-            c3d_parameters=c3d_params,  # Include comprehensive C3D parameters
-            user_id=file_metadata["user_id"],
-            patient_id=file_metadata["patient_id"],
-            session_id=file_metadata["session_id"],
-            # NEW: Include clinical data from enhanced processor
-            session_parameters=result_data.get("session_parameters"),
-            session_configuration=result_data.get("session_configuration"),  # NEW: Formatted session config
-            processing_parameters=result_data.get("processing_parameters"),
-            performance_analysis=result_data.get("performance_analysis"),
-            scoring_configuration=result_data.get("scoring_configuration"),  # NEW: Scoring weights
-        )
-        return response_model
+        # Binary formats carry the signals as float32 and the rest as metadata; sampling rates
+        # stay with the channel metadata so clients can rebuild EMGChannelSignalData
+        metadata = {
+            **response_body,
+            "emg_signals": {
+                channel: {"sampling_rate": signals["sampling_rate"]} for channel, signals in emg_signals.items()
+            },
+        }
+        return signal_response(accept, {**response_body, "emg_signals": emg_signals}, metadata, emg_signals)
 
     except Exception as e:
         logger.error(f"Upload processing error: {e!s}", exc_info=True)
@@ -533,3 +718,152 @@ async def upload_file(
             await file.close()
         if tmp_path and os.path.exists(tmp_path):
             os.unlink(tmp_path)
+
+
+async def process_batch_file(
+    tmp_path: str,
+    filename: str,
+    processing_opts: ProcessingOptions,
+    session_params: GameSessionParameters,
+    file_metadata: dict,
+    include_signals: bool,
+) -> dict:
+    """Process one file of a batch upload: C3D analysis in the process pool, then clinical scoring."""
+    processing_result = await run_c3d(
+        process_c3d_file, tmp_path, processing_opts, session_params, include_signals=include_signals
+    )
+    add_c3d_parameters(processing_result)
+    await run_in_threadpool(add_clinical_analysis, processing_result, session_params)
+
+    response_body, emg_signals = build_upload_response(processing_result, filename, file_metadata, session_params)
+    return {**response_body, "emg_signals": emg_signals}
+
+
+async def stream_batch_upload_events(
+    files: list[tuple[int, tuple[str, str]]],
+    rejected: list[dict],
+    processing_opts: ProcessingOptions,
+    session_params: GameSessionParameters,
+    file_metadata: dict,
+    include_signals: bool,
+):
+    """Events of a batch upload, each file's result or error in completion order.
+
+    Every file is submitted to the C3D process pool at once; the pool bounds
+    how many are analyzed in parallel. Temporary files are removed as each
+    file finishes; if the client disconnects, pending files are cancelled and
+    the temporary files of those that never started are removed too.
+
+    Args:
+        files: (upload index, (filename, temporary path)) of each accepted file
+        rejected: Error events of files refused before processing
+        processing_opts: EMG processing configuration
+        session_params: Game session parameters
+        file_metadata: File metadata (user_id, patient_id, session_id) shared by all files
+        include_signals: Whether result events carry emg_signals
+    """
+
+    async def process(index: int, filename: str, tmp_path: str) -> dict:
+        try:
+            result = await process_batch_file(
+                tmp_path, filename, processing_opts, session_params, file_metadata, include_signals
+            )
+            return {"event": "result", "index": index, "filename": filename, **result}
+        except Exception as e:
+            logger.exception(f"❌ Batch upload: processing failed for {filename}: {e}")
+            return {"event": "error", "index": index, "filename": filename, "detail": f"C3D processing failed: {e!s}"}
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+
+    tasks = [asyncio.create_task(process(index, *file)) for index, file in files]
+    succeeded = 0
+    try:
+        for event in rejected:
+            yield event
+        for next_finished in asyncio.as_completed(tasks):
+            event = await next_finished
+            succeeded += event["event"] == "result"
+            yield event
+
+        total = len(tasks) + len(rejected)
+        logger.info(f"✅ Batch upload completed: {succeeded}/{total} files processed")
+        yield {"event": "complete", "files": total, "succeeded": succeeded, "failed": total - succeeded}
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Tasks cancelled before they started never reach their own cleanup
+        for _, (_, tmp_path) in files:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)
+
+
+@router.post("/batch")
+async def upload_batch(
+    files: list[UploadFile] = File(...),
+    include_signals: bool = Query(default=True, description="Include emg_signals in each file's result"),
+    processing_opts: ProcessingOptions = Depends(get_processing_options),
+    session_params: GameSessionParameters = Depends(get_session_parameters),
+    file_metadata: dict = Depends(get_file_metadata),
+):
+    """Upload and process several C3D files concurrently.
+
+    Files are analyzed in parallel in the C3D process pool (C3D_PROCESS_MAX_WORKERS
+    processes) and streamed back as NDJSON as each one finishes:
+    {"event": "result", "index": 0, "filename": ..., <EMGAnalysisResult fields>},
+    {"event": "error", "index": 1, "filename": ..., "detail": ...}, then
+    {"event": "complete", "files": n, "succeeded": s, "failed": f}. `index` is
+    the file's position in the upload.
+
+    Args:
+        files: C3D file uploads
+        include_signals: False to return analytics and scores only (much smaller results)
+        processing_opts: EMG processing configuration, applied to every file
+        session_params: Game session parameters, applied to every file
+        file_metadata: File metadata (user_id, patient_id, session_id)
+
+    Returns:
+        NDJSON stream of per-file results and errors
+
+    Raises:
+        HTTPException: 400 if no files are provided, 413 if there are more than MAX_BATCH_UPLOAD_FILES
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="No files provided")
+    if len(files) > MAX_BATCH_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=413, detail=f"Too many files. Maximum is {MAX_BATCH_UPLOAD_FILES} per batch"
+        )
+
+    logger.info(f"Processing batch upload request: {len(files)} files")
+    accepted: list[tuple[int, tuple[str, str]]] = []
+    rejected: list[dict] = []
+
+    try:
+        # Copy uploads to temporary files: worker processes open them by path
+        for index, file in enumerate(files):
+            filename = file.filename or ""
+            if not filename.lower().endswith(".c3d"):
+                detail = "File must be a C3D file (.c3d extension required)"
+            elif file.size and file.size > MAX_FILE_SIZE:
+                detail = f"File too large. Maximum size is {MAX_FILE_SIZE / 1024 / 1024:.1f}MB"
+            else:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".c3d") as tmp:
+                    accepted.append((index, (filename, tmp.name)))
+                    shutil.copyfileobj(file.file, tmp)
+                continue
+            rejected.append({"event": "error", "index": index, "filename": filename, "detail": detail})
+    except Exception as e:
+        for _, (_, tmp_path) in accepted:
+            os.unlink(tmp_path)
+        logger.error(f"Batch upload error: {e!s}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Server error receiving files: {e!s}")
+    finally:
+        for file in files:
+            await file.close()
+
+    return ndjson_response(
+        stream_batch_upload_events(
+            accepted, rejected, processing_opts or ProcessingOptions(), session_params, file_metadata, include_signals
+        )
+    )
@@ -44,17 +44,23 @@ Production Considerations:
 - Integration with clinical workflow
 """
 
+import asyncio
 import json
 import logging
+import weakref
 from datetime import datetime
+from typing import Any
 
-from config import WEBHOOK_SECRET
+from config import WEBHOOK_COALESCE_MAX_BATCH, WEBHOOK_COALESCE_WINDOW_MS, WEBHOOK_SECRET
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from database.executor import run_db
 from database.supabase_client import get_supabase_client
 from services.clinical.repositories.patient_repository import PatientRepository
 from services.clinical.therapy_session_processor import TherapySessionProcessor
+from services.infrastructure.webhook_coalescer import WebhookCoalescer
+from services.infrastructure.webhook_idempotency import get_webhook_idempotency_store
 from services.infrastructure.webhook_security import WebhookSecurity
 
 # Import dependencies for TherapySessionProcessor
@@ -70,6 +76,13 @@ router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 # Initialize core services
 webhook_security = WebhookSecurity()
 
+# Burst coalescing: one coalescer per event loop (futures cannot cross loops)
+_webhook_coalescers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, WebhookCoalescer]" = (
+    weakref.WeakKeyDictionary()
+)
+# Strong references to batch processing tasks so they are not garbage-collected
+_background_batches: set[asyncio.Task] = set()
+
 
 def get_therapy_session_processor():
     """Factory function to create TherapySessionProcessor with all dependencies."""
@@ -113,6 +126,12 @@ class SupabaseStorageEvent(BaseModel):
         """Extract bucket ID from record."""
         return self.record.get("bucket_id", "")
 
+    @property
+    def object_version(self) -> str:
+        """Extract storage object version (falls back to eTag) from record."""
+        metadata = self.record.get("metadata") or {}
+        return self.record.get("version") or metadata.get("eTag", "")
+
     @property
     def patient_code(self) -> str | None:
         """Extract patient code from object name path.
@@ -190,15 +209,58 @@ async def handle_c3d_upload(request: Request, background_tasks: BackgroundTasks)
                 success=True, message=f"Ignored: {event.type} {event.table} {event.object_name}"
             )
 
+        # Idempotency: retried deliveries return the original session without DB or CPU work
+        idempotency_store = await get_webhook_idempotency_store()
+        delivery_key = idempotency_store.delivery_key(
+            event.bucket_id, event.object_name, event.object_version
+        )
+        previous_delivery = await idempotency_store.get(delivery_key)
+        if previous_delivery:
+            logger.info(f"♻️ Duplicate delivery ignored: {event.object_name} -> {previous_delivery['session_code']}")
+            return WebhookResponse(
+                success=True,
+                message="Duplicate delivery ignored",
+                session_code=previous_delivery["session_code"],
+                session_id=previous_delivery.get("session_id"),
+                processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
+            )
+
         logger.info(f"📁 Processing C3D upload: {event.object_name}")
 
+        # Burst mode: join the current batch (bulk DB writes, one processing task per batch)
+        if WEBHOOK_COALESCE_WINDOW_MS > 0:
+            try:
+                created = await _get_webhook_coalescer().submit({
+                    "file_path": f"{event.bucket_id}/{event.object_name}",
+                    "file_metadata": event.record.get("metadata", {}),
+                    "patient_code": event.patient_code,
+                    "delivery_key": delivery_key,
+                    "bucket": event.bucket_id,
+                    "object_path": event.object_name,
+                })
+            except Exception as e:
+                logger.error(f"Failed to create session for {event.object_name}: {e!s}", exc_info=True)
+                return WebhookResponse(
+                    success=False,
+                    message=f"Session creation failed: {e!s}",
+                    processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
+                )
+
+            return WebhookResponse(
+                success=True,
+                message="Duplicate delivery ignored" if created["duplicate"] else "C3D processing initiated",
+                session_code=created["session_code"],
+                session_id=created["session_id"],
+                processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
+            )
+
         # Extract patient_code and lookup patient UUID + therapist_id
         patient_uuid = None
         therapist_uuid = None
         if event.patient_code:
             try:
                 patient_repo = PatientRepository(get_supabase_client(use_service_key=True))
-                patient = patient_repo.get_patient_by_code(event.patient_code)
+                patient = await run_db(patient_repo.get_patient_by_code, event.patient_code)
                 if patient:
                     patient_uuid = patient.get("id")
                     therapist_uuid = patient.get("therapist_id")
@@ -213,21 +275,24 @@ async def handle_c3d_upload(request: Request, background_tasks: BackgroundTasks)
             # Initialize processor with dependencies
             session_processor = get_therapy_session_processor()
             
-            session_code = await session_processor.create_session(
+            created = await session_processor.create_session(
                 file_path=f"{event.bucket_id}/{event.object_name}",
                 file_metadata=event.record.get("metadata", {}),
                 patient_id=patient_uuid,
                 therapist_id=therapist_uuid,
+                delivery_key=delivery_key,
             )
+            session_code = created["session_code"]
             
-            # Get the UUID that was created (for FK references)
-            # The processor stores it after creation
-            session_id = getattr(session_processor, '_last_session_uuid', None)
+            # UUID of the created session (for FK references)
+            session_id = created["session_id"]
             
             # Fallback: query by session_code if UUID not available
             if not session_id:
                 session_details = await session_processor.get_session_status(session_code)
                 session_id = session_details["id"] if session_details else None
+
+            await idempotency_store.remember(delivery_key, session_code, session_id)
             
         except Exception as e:
             logger.error(f"Failed to create session for {event.object_name}: {e!s}", exc_info=True)
@@ -240,6 +305,16 @@ async def handle_c3d_upload(request: Request, background_tasks: BackgroundTasks)
                 processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
             )
 
+        # Retried delivery caught by the DB unique index: already scheduled once
+        if created["duplicate"]:
+            return WebhookResponse(
+                success=True,
+                message="Duplicate delivery ignored",
+                session_code=session_code,
+                session_id=session_id,
+                processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
+            )
+
         # Process C3D file in background
         background_tasks.add_task(
             _process_c3d_background,
@@ -305,10 +380,110 @@ async def get_processing_status(session_code: str) -> dict:
         raise HTTPException(status_code=500, detail=f"Status error: {e!s}")
 
 
+# === BURST COALESCING ===
+
+
+def _get_webhook_coalescer() -> WebhookCoalescer:
+    """Get the webhook coalescer bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    coalescer = _webhook_coalescers.get(loop)
+    if coalescer is None:
+        coalescer = WebhookCoalescer(
+            _create_sessions_for_batch,
+            window_seconds=WEBHOOK_COALESCE_WINDOW_MS / 1000,
+            max_batch_size=WEBHOOK_COALESCE_MAX_BATCH,
+        )
+        _webhook_coalescers[loop] = coalescer
+    return coalescer
+
+
+async def _create_sessions_for_batch(
+    deliveries: list[dict[str, Any]],
+) -> list[dict[str, Any] | Exception]:
+    """Coalescer batch handler: create sessions for a burst of uploads.
+
+    One patient lookup and one session insert for the whole batch, then a
+    single background task processes the new files with a shared processor.
+
+    Args:
+        deliveries: Items submitted by handle_c3d_upload
+
+    Returns:
+        One session result (or exception) per delivery, in order
+    """
+    # Lookup patient UUID + therapist_id for every patient in the batch at once
+    patient_codes = [d["patient_code"] for d in deliveries if d.get("patient_code")]
+    patients: dict[str, dict] = {}
+    if patient_codes:
+        try:
+            patient_repo = PatientRepository(get_supabase_client(use_service_key=True))
+            patients = await run_db(patient_repo.get_patients_by_codes, patient_codes)
+        except Exception as e:
+            logger.exception(f"Failed to lookup patients {sorted(set(patient_codes))}: {e!s}")
+
+    for delivery in deliveries:
+        patient = patients.get((delivery.get("patient_code") or "").upper())
+        if patient:
+            delivery["patient_id"] = patient.get("id")
+            delivery["therapist_id"] = patient.get("therapist_id")
+        elif delivery.get("patient_code"):
+            logger.warning(f"⚠️ Patient not found for code: {delivery['patient_code']}")
+
+    session_processor = get_therapy_session_processor()
+    results = await session_processor.create_sessions_batch(deliveries)
+
+    idempotency_store = await get_webhook_idempotency_store()
+    jobs = []
+    queued_codes: set[str] = set()
+    for delivery, result in zip(deliveries, results):
+        if isinstance(result, Exception):
+            continue
+        await idempotency_store.remember(
+            delivery["delivery_key"], result["session_code"], result["session_id"]
+        )
+        # One job per session, even if the burst delivered its file more than once
+        if not result["duplicate"] and result["session_code"] not in queued_codes:
+            queued_codes.add(result["session_code"])
+            jobs.append((result["session_code"], delivery["bucket"], delivery["object_path"]))
+
+    if jobs:
+        task = asyncio.create_task(_process_c3d_batch_background(jobs, session_processor))
+        _background_batches.add(task)
+        task.add_done_callback(_background_batches.discard)
+
+    return results
+
+
+async def _process_c3d_batch_background(
+    jobs: list[tuple[str, str, str]], session_processor: TherapySessionProcessor
+) -> None:
+    """Background task: process a coalesced batch of C3D files sequentially.
+
+    Args:
+        jobs: (session_code, bucket, object_path) per new session
+        session_processor: Processor shared across the batch
+    """
+    logger.info(f"🔄 Batch background processing started: {len(jobs)} files")
+    for session_code, bucket, object_path in jobs:
+        # C3D processor is bound to a single file
+        session_processor.c3d_processor = None
+        await _process_c3d_background(
+            session_code=session_code,
+            bucket=bucket,
+            object_path=object_path,
+            session_processor=session_processor,
+        )
+
+
 # === BACKGROUND PROCESSING ===
 
 
-async def _process_c3d_background(session_code: str, bucket: str, object_path: str) -> None:
+async def _process_c3d_background(
+    session_code: str,
+    bucket: str,
+    object_path: str,
+    session_processor: TherapySessionProcessor | None = None,
+) -> None:
     """Background task: Complete C3D file processing.
 
     Populates all database tables:
@@ -321,13 +496,15 @@ async def _process_c3d_background(session_code: str, bucket: str, object_path: s
         session_code: Therapy session code (format: P###S###)
         bucket: Storage bucket name
         object_path: Path to C3D file
+        session_processor: Optional processor to reuse (batch mode)
     """
     try:
         logger.info(f"🔄 Background processing started: {session_code}")
 
         # Initialize processor with dependencies
-        session_processor = get_therapy_session_processor()
-        
+        if session_processor is None:
+            session_processor = get_therapy_session_processor()
+
         # Update status to processing
         await session_processor.update_session_status(session_code, "processing")
 
@@ -350,8 +527,9 @@ async def _process_c3d_background(session_code: str, bucket: str, object_path: s
         logger.error(f"❌ Background processing failed: {e!s}", exc_info=True)
 
         # Initialize processor with dependencies (for error handling)
-        session_processor = get_therapy_session_processor()
-        
+        if session_processor is None:
+            session_processor = get_therapy_session_processor()
+
         # Update status to failed
         await session_processor.update_session_status(session_code, "failed", error_message=str(e))
 
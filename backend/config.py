@@ -182,6 +182,20 @@ SUPPORTED_FILE_EXTENSIONS = [".c3d"]
 TEMP_DIR = "data/temp_uploads"
 ALLOWED_EXTENSIONS = SUPPORTED_FILE_EXTENSIONS
 MAX_FILE_SIZE = 20 * 1024 * 1024  # 20MB
+MAX_BATCH_UPLOAD_FILES = int(os.getenv("MAX_BATCH_UPLOAD_FILES", "200"))  # Files per /upload/batch request
+# Processes for C3D analysis, per app worker: every uvicorn worker owns its own pool,
+# so size it as CPU cores / uvicorn workers when raising it
+C3D_PROCESS_MAX_WORKERS = int(os.getenv("C3D_PROCESS_MAX_WORKERS", "2"))
+
+# Signal pyramids: multi-resolution min/max levels stored next to each processed
+# C3D file ("<file>.c3d.pyramid") so JIT chart requests read one level, not the file
+SIGNAL_PYRAMID_ENABLED = os.getenv("SIGNAL_PYRAMID_ENABLED", "true").lower() == "true"
+SIGNAL_PYRAMID_BASE_BUCKET = int(os.getenv("SIGNAL_PYRAMID_BASE_BUCKET", "8"))  # Samples per bucket, finest level
+SIGNAL_PYRAMID_LEVEL_FACTOR = 4  # Each level merges this many buckets of the previous one
+SIGNAL_PYRAMID_MIN_BUCKETS = 256  # No level coarser than this is built
+
+# Streamed uploads (Accept: application/x-ndjson): samples per channel per signal event
+UPLOAD_STREAM_CHUNK_SAMPLES = int(os.getenv("UPLOAD_STREAM_CHUNK_SAMPLES", "16384"))
 
 # API configuration
 API_TITLE = "GHOSTLY+ EMG C3D Analyzer"
@@ -241,6 +255,25 @@ LOG_LEVEL = "INFO"
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+DB_EXECUTOR_MAX_WORKERS = int(os.getenv("DB_EXECUTOR_MAX_WORKERS", "8"))  # Threads for blocking Supabase calls
+
+# Authentication: Supabase JWTs are verified locally (HS256 shared secret or
+# the project's JWKS) instead of a get_user round-trip per request. Without
+# key material for a token, verification falls back to the auth server.
+AUTH_LOCAL_JWT_VERIFICATION = os.getenv("AUTH_LOCAL_JWT_VERIFICATION", "true").lower() == "true"
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+SUPABASE_JWT_PREVIOUS_SECRET = os.getenv("SUPABASE_JWT_PREVIOUS_SECRET")  # Accepted during secret rotation
+SUPABASE_JWKS_URL = os.getenv("SUPABASE_JWKS_URL") or (
+    f"{SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json" if SUPABASE_URL else None
+)
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+JWKS_CACHE_TTL_SECONDS = int(os.getenv("JWKS_CACHE_TTL_SECONDS", "600"))
+JWKS_REFRESH_COOLDOWN_SECONDS = int(os.getenv("JWKS_REFRESH_COOLDOWN_SECONDS", "30"))  # Unknown-kid refetch limit
+JWT_LEEWAY_SECONDS = int(os.getenv("JWT_LEEWAY_SECONDS", "10"))  # Clock skew tolerance
+# user_profiles.role lookups for RBAC; role changes through the admin API
+# invalidate locally, the TTL bounds staleness on other workers
+AUTH_ROLE_CACHE_TTL_SECONDS = int(os.getenv("AUTH_ROLE_CACHE_TTL_SECONDS", "60"))
+AUTH_ROLE_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_ROLE_CACHE_MAX_ENTRIES", "10000"))
 
 # Redis cache configuration
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -261,12 +294,40 @@ REDIS_KEY_PREFIX = "ghostly:"
 REDIS_CACHE_TTL_SECONDS = 3600
 REDIS_MAX_CACHE_SIZE_MB = 256
 
+# In-process L1 cache in front of Redis; the TTL bounds staleness on workers
+# that miss a pub/sub invalidation
+CACHE_L1_MAX_ENTRIES = int(os.getenv("CACHE_L1_MAX_ENTRIES", "2048"))
+CACHE_L1_MAX_MB = int(os.getenv("CACHE_L1_MAX_MB", "128"))
+CACHE_L1_TTL_SECONDS = int(os.getenv("CACHE_L1_TTL_SECONDS", "60"))
+CACHE_CODEC = os.getenv("CACHE_CODEC", "msgpack")  # Analytics payloads; falls back to gzip-json without msgpack
+CACHE_COMPRESSION_THRESHOLD_BYTES = int(os.getenv("CACHE_COMPRESSION_THRESHOLD_BYTES", "4096"))
+
+# Cache-aside stampede protection: one loader per key across workers
+CACHE_LOCK_LEASE_MS = int(os.getenv("CACHE_LOCK_LEASE_MS", "10000"))  # Longer than a typical analytics rebuild
+CACHE_LOCK_POLL_MS = int(os.getenv("CACHE_LOCK_POLL_MS", "50"))
+CACHE_EARLY_REFRESH_BETA = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))  # 0 disables early refresh
+
+# Background warming of analytics for recently processed/accessed sessions
+CACHE_WARM_INTERVAL_MINUTES = int(os.getenv("CACHE_WARM_INTERVAL_MINUTES", "30"))  # 0 disables the scheduler
+CACHE_WARM_LOOKBACK_HOURS = int(os.getenv("CACHE_WARM_LOOKBACK_HOURS", "24"))
+CACHE_WARM_MAX_SESSIONS = int(os.getenv("CACHE_WARM_MAX_SESSIONS", "500"))
+
+# Scoring configurations are cached in-process and invalidated on write;
+# the TTL bounds staleness on workers that miss a pub/sub invalidation
+SCORING_CONFIG_CACHE_TTL_SECONDS = int(os.getenv("SCORING_CONFIG_CACHE_TTL_SECONDS", "300"))
+ADHERENCE_CACHE_TTL_SECONDS = int(os.getenv("ADHERENCE_CACHE_TTL_SECONDS", "60"))  # Batch adherence responses
+
 # Webhook configuration
 WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
 PROCESSING_VERSION = "2.1.0"
+WEBHOOK_IDEMPOTENCY_TTL_SECONDS = int(os.getenv("WEBHOOK_IDEMPOTENCY_TTL_SECONDS", str(7 * 24 * 3600)))  # Supabase retries within hours, keep a week
+WEBHOOK_COALESCE_WINDOW_MS = int(os.getenv("WEBHOOK_COALESCE_WINDOW_MS", "250"))  # Wait only while a batch is running; 0 disables burst coalescing
+WEBHOOK_COALESCE_MAX_BATCH = int(os.getenv("WEBHOOK_COALESCE_MAX_BATCH", "50"))
 
 # File processing behavior
 ENABLE_FILE_HASH_DEDUPLICATION = os.getenv("ENABLE_FILE_HASH_DEDUPLICATION", "true").lower() == "true"
+# Write processed sessions with the persist_processed_session RPC (requires its migration)
+ENABLE_TRANSACTIONAL_SESSION_PERSISTENCE = os.getenv("ENABLE_TRANSACTIONAL_SESSION_PERSISTENCE", "false").lower() == "true"
 
 # Storage configuration - REQUIRED from .env
 STORAGE_BUCKET_NAME = os.getenv("VITE_STORAGE_BUCKET_NAME")  # Supabase storage bucket for C3D files
@@ -0,0 +1,64 @@
+"""Bounded executor for blocking database calls.
+
+The Supabase Python client is synchronous: every `.execute()` performs a
+blocking HTTP request. Calling it directly from `async def` code stalls the
+event loop, and `asyncio.gather` over such coroutines runs them one after
+another. `run_db` offloads the call to a dedicated, bounded thread pool so
+independent writes overlap and the loop keeps serving requests.
+
+Usage:
+    response = await run_db(client.table("emg_statistics").insert(records).execute)
+"""
+
+import asyncio
+import functools
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from config import DB_EXECUTOR_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+ResultType = TypeVar("ResultType")
+
+# Global executor instance (created lazily)
+_db_executor: ThreadPoolExecutor | None = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get or create the shared database thread pool."""
+    global _db_executor
+
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=DB_EXECUTOR_MAX_WORKERS, thread_name_prefix="supabase-db"
+        )
+        logger.info(f"Database executor initialized ({DB_EXECUTOR_MAX_WORKERS} workers)")
+
+    return _db_executor
+
+
+async def run_db(func: Callable[..., ResultType], *args: Any, **kwargs: Any) -> ResultType:
+    """Run a blocking database call in the bounded database executor.
+
+    Args:
+        func: Blocking callable (typically a PostgREST builder's `execute`)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_db_executor(wait: bool = True) -> None:
+    """Shut down the database executor (application shutdown, tests)."""
+    global _db_executor
+
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=wait)
+        _db_executor = None
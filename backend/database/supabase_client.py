@@ -6,13 +6,17 @@ IMPORTANT: This project uses the SYNCHRONOUS Supabase Python client.
 - Service methods using this client should be regular functions, not async
 - For testing, use Mock from unittest.mock, not AsyncMock
 - This follows KISS principle - keeping it simple without unnecessary async complexity
+- Clients are pooled per key type and reused; JWT-scoped calls share the
+  anon client's connections and only add a per-request Authorization header
 """
 
 import logging
 import os
+import threading
 
 # Load environment variables from .env file
 from pathlib import Path
+from typing import Any
 
 from dotenv import load_dotenv
 from supabase import Client, create_client
@@ -22,102 +26,181 @@ load_dotenv(dotenv_path=env_path)
 
 logger = logging.getLogger(__name__)
 
-# Global client instance
-_supabase_client: Client | None = None
+# Client registry: one long-lived client per key type ("service", "anon").
+# Each client keeps its own HTTP connection pool, so repeated calls reuse
+# keep-alive connections instead of paying client setup and TLS handshakes.
+_clients: dict[str, Client] = {}
+_clients_lock = threading.Lock()
+_registry_stats = {"created": 0, "reused": 0, "scoped": 0}
 
+# Builder methods whose result carries per-request headers
+_SCOPED_BUILDER_METHODS = frozenset({"select", "insert", "upsert", "update", "delete"})
 
-def get_supabase_client(use_service_key: bool = False, jwt_token: str | None = None) -> Client:
-    """Get or create Supabase client instance.
+
+class _ScopedRequestBuilder:
+    """Table request builder that sends a per-request Authorization header."""
+
+    def __init__(self, builder, authorization: str):
+        self._builder = builder
+        self._authorization = authorization
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._builder, name)
+        if name not in _SCOPED_BUILDER_METHODS:
+            return attr
+
+        def scoped(*args, **kwargs):
+            query = attr(*args, **kwargs)
+            query.headers["Authorization"] = self._authorization
+            return query
+
+        return scoped
+
+
+class ScopedSupabaseClient:
+    """User-scoped view of the pooled anon client (RLS applies to the user's JWT).
+
+    Table and RPC requests go through the pooled client's HTTP session with
+    the user's token as a per-request header, so scoping a request costs no
+    client setup. Anything else (storage, auth) is served by a dedicated
+    client carrying the token, created on first use.
+    """
+
+    def __init__(self, client: Client, jwt_token: str):
+        self._client = client
+        self._jwt_token = jwt_token
+        self._authorization = f"Bearer {jwt_token}"
+        self._dedicated: Client | None = None
+
+    def table(self, table_name: str) -> _ScopedRequestBuilder:
+        return _ScopedRequestBuilder(self._client.table(table_name), self._authorization)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: dict[str, Any] | None = None, **kwargs):
+        query = self._client.rpc(fn, params, **kwargs)
+        query.headers["Authorization"] = self._authorization
+        return query
+
+    def __getattr__(self, name: str):
+        if self._dedicated is None:
+            self._dedicated = _create_jwt_client(self._jwt_token)
+        return getattr(self._dedicated, name)
+
+
+def _supabase_url() -> str | None:
+    return os.getenv("SUPABASE_URL")
+
+
+def _create_jwt_client(jwt_token: str) -> Client:
+    """Standalone client with the user's JWT on every request (storage/auth fallback)."""
+    supabase_url = _supabase_url()
+    supabase_key = os.getenv("SUPABASE_ANON_KEY")
+
+    if not supabase_url or not supabase_key:
+        raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY environment variables must be set")
+
+    try:
+        from supabase._sync.client import ClientOptions
+
+        client = create_client(
+            supabase_url,
+            supabase_key,
+            options=ClientOptions(headers={"Authorization": f"Bearer {jwt_token}"}),
+        )
+        logger.debug("Created authenticated Supabase client with user JWT headers")
+        return client
+    except Exception as e:
+        logger.error(f"Failed to create authenticated Supabase client: {e!s}")
+        raise
+
+
+def _create_pooled_client(key_type: str) -> Client:
+    """Build the long-lived client for a key type ("service" or "anon")."""
+    supabase_url = _supabase_url()
+    if key_type == "service":
+        supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
+        missing_key = "SUPABASE_SERVICE_KEY"
+    else:
+        supabase_key = os.getenv("SUPABASE_ANON_KEY")
+        missing_key = "SUPABASE_ANON_KEY"
+
+    # Enhanced logging for Coolify debugging
+    logger.info(f"Attempting Supabase connection (key_type={key_type})...")
+    logger.info(f"URL format check: {supabase_url[:30]}..." if supabase_url else "URL is None")
+    logger.info(f"Key exists: {bool(supabase_key)}, Key length: {len(supabase_key) if supabase_key else 0}")
+
+    if not supabase_url or not supabase_key:
+        logger.error(f"Missing environment variables: URL={bool(supabase_url)}, {missing_key}={bool(supabase_key)}")
+        raise ValueError(f"SUPABASE_URL and {missing_key} environment variables must be set")
+
+    try:
+        client = create_client(supabase_url, supabase_key)
+        logger.info(f"Supabase client initialized successfully with {key_type} key")
+        return client
+
+    except Exception as e:
+        # Enhanced error logging for debugging initialization issues
+        logger.error(f"Failed to initialize Supabase client: {e!s}")
+        logger.error(f"  URL: {supabase_url}")
+        logger.error(f"  Key type: {key_type}")
+        logger.error(f"  Key present: {'Yes' if supabase_key else 'No'}")
+        logger.error(f"  Key length: {len(supabase_key) if supabase_key else 0}")
+
+        # The "Invalid URL" error typically occurs during first import attempts
+        # This is expected behavior and the system will retry successfully
+        if "Invalid URL" in str(e):
+            logger.info("Note: 'Invalid URL' during first initialization is expected - system will retry")
+
+        raise
+
+
+def get_supabase_client(
+    use_service_key: bool = False, jwt_token: str | None = None
+) -> Client | ScopedSupabaseClient:
+    """Get the pooled Supabase client for a key type.
 
     Args:
         use_service_key: If True, use service key for admin operations (bypasses RLS)
-        jwt_token: User's JWT token for authenticated requests (respects RLS)
+        jwt_token: User's JWT token for authenticated requests (respects RLS);
+            returns a ScopedSupabaseClient over the pooled anon client
 
     Returns:
-        Configured Supabase client
+        Configured Supabase client (shared; do not mutate its headers or auth state)
 
     Raises:
         ValueError: If environment variables are not set
     """
-    global _supabase_client
+    key_type = "service" if use_service_key and not jwt_token else "anon"
+
+    client = _clients.get(key_type)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key_type)
+            if client is None:
+                client = _create_pooled_client(key_type)
+                _clients[key_type] = client
+                _registry_stats["created"] += 1
+    else:
+        _registry_stats["reused"] += 1
 
-    # If a JWT token is provided, create an authenticated client (don't cache it)
     if jwt_token:
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_ANON_KEY")
-        
-        if not supabase_url or not supabase_key:
-            raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY environment variables must be set")
-        
-        try:
-            # Create client with custom headers that include the user's JWT
-            from supabase._sync.client import ClientOptions
-            
-            client = create_client(
-                supabase_url, 
-                supabase_key,
-                options=ClientOptions(
-                    headers={
-                        'Authorization': f'Bearer {jwt_token}'
-                    }
-                )
-            )
-            logger.debug("Created authenticated Supabase client with user JWT headers")
-            return client
-        except Exception as e:
-            logger.error(f"Failed to create authenticated Supabase client: {e!s}")
-            raise
-
-    if _supabase_client is None or use_service_key:
-        # Get configuration from environment
-        supabase_url = os.getenv("SUPABASE_URL")
-
-        if use_service_key:
-            supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
-            key_type = "service"
-        else:
-            supabase_key = os.getenv("SUPABASE_ANON_KEY")
-            key_type = "anon"
-
-        # Enhanced logging for Coolify debugging
-        logger.info(f"Attempting Supabase connection (key_type={key_type})...")
-        logger.info(f"URL format check: {supabase_url[:30]}..." if supabase_url else "URL is None")
-        logger.info(f"Key exists: {bool(supabase_key)}, Key length: {len(supabase_key) if supabase_key else 0}")
-
-        if not supabase_url or not supabase_key:
-            missing_key = "SUPABASE_SERVICE_KEY" if use_service_key else "SUPABASE_ANON_KEY"
-            logger.error(f"Missing environment variables: URL={bool(supabase_url)}, {missing_key}={bool(supabase_key)}")
-            raise ValueError(f"SUPABASE_URL and {missing_key} environment variables must be set")
-
-        try:
-            client = create_client(supabase_url, supabase_key)
-            if not use_service_key:
-                _supabase_client = client
-            logger.info(f"Supabase client initialized successfully with {key_type} key")
-            return client
-
-        except Exception as e:
-            # Enhanced error logging for debugging initialization issues
-            logger.error(f"Failed to initialize Supabase client: {e!s}")
-            logger.error(f"  URL: {supabase_url}")
-            logger.error(f"  Key type: {key_type}")
-            logger.error(f"  Key present: {'Yes' if supabase_key else 'No'}")
-            logger.error(f"  Key length: {len(supabase_key) if supabase_key else 0}")
-            
-            # The "Invalid URL" error typically occurs during first import attempts
-            # This is expected behavior and the system will retry successfully
-            if "Invalid URL" in str(e):
-                logger.info("Note: 'Invalid URL' during first initialization is expected - system will retry")
-            
-            raise
-
-    return _supabase_client
+        _registry_stats["scoped"] += 1
+        return ScopedSupabaseClient(client, jwt_token)
+    return client
+
+
+def get_client_registry_stats() -> dict[str, Any]:
+    """Pooled client counters (clients built vs. calls served by an existing client)."""
+    return {"clients": sorted(_clients), **_registry_stats}
 
 
 def reset_client():
-    """Reset the global client instance (mainly for testing)."""
-    global _supabase_client
-    _supabase_client = None
+    """Reset the pooled client instances (mainly for testing)."""
+    with _clients_lock:
+        _clients.clear()
+        for counter in _registry_stats:
+            _registry_stats[counter] = 0
 
 
 class SupabaseConnectionError(Exception):
@@ -0,0 +1,130 @@
+"""EMG Chart Decimation.
+=====================
+
+Reduces a signal to screen resolution while keeping its shape. Plain
+striding (`signal[::k]`) aliases EMG bursts and can drop contraction peaks
+entirely; these modes select sample indices instead:
+
+- minmax: the minimum and maximum of every bucket, so every peak and trough
+  survives. With several aligned signals (raw + RMS envelope) the extrema of
+  each are kept, so they still share one time axis.
+- lttb: Largest-Triangle-Three-Buckets (Steinarsson, 2013) on the primary
+  signal, after a min/max preselection of LTTB_PRESELECT_RATIO points per
+  output point (MinMaxLTTB) so the sequential pass only sees a few thousand
+  candidates.
+
+Both return sorted indices into the input that always include the first and
+last sample; apply them to the time axis and every aligned signal.
+"""
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+DECIMATION_MODES = ("stride", "minmax", "lttb")
+LTTB_PRESELECT_RATIO = 4
+
+
+def window_indices(
+    total_samples: int, sampling_rate: float, start_ms: float | None, end_ms: float | None
+) -> tuple[int, int]:
+    """Sample index range [start, stop) covering a time window, clipped to the recording."""
+    if sampling_rate <= 0:
+        return 0, total_samples
+    start = 0 if start_ms is None else math.floor(start_ms * sampling_rate / 1000.0)
+    stop = total_samples if end_ms is None else math.ceil(end_ms * sampling_rate / 1000.0)
+    start = min(max(start, 0), total_samples)
+    return start, min(max(stop, start), total_samples)
+
+
+def minmax_indices(signals: Sequence[np.ndarray], max_points: int) -> np.ndarray:
+    """Indices of per-bucket minima and maxima of every signal.
+
+    Args:
+        signals: Equal-length signals; the extrema of each are kept
+        max_points: Upper bound on the number of indices returned
+
+    Returns:
+        Sorted unique sample indices (at most max_points)
+    """
+    n = len(signals[0])
+    if n <= max_points:
+        return np.arange(n)
+
+    points_per_bucket = 2 * len(signals)
+    buckets = (max_points - 2) // points_per_bucket
+    if buckets < 1:
+        return np.unique(np.linspace(0, n - 1, max_points).astype(np.int64))
+    bucket_size = -(-n // buckets)  # ceil
+
+    selected = [np.array([0, n - 1])]
+    offsets = np.arange(buckets) * bucket_size
+    for signal in signals:
+        # Pad the tail bucket with the last sample; padded positions clip back to n - 1
+        padded = np.pad(np.asarray(signal), (0, buckets * bucket_size - n), mode="edge")
+        rows = padded.reshape(buckets, bucket_size)
+        selected.append(np.minimum(rows.argmin(axis=1) + offsets, n - 1))
+        selected.append(np.minimum(rows.argmax(axis=1) + offsets, n - 1))
+    return np.unique(np.concatenate(selected))
+
+
+def lttb_indices(signal: np.ndarray, max_points: int) -> np.ndarray:
+    """Indices chosen by Largest-Triangle-Three-Buckets.
+
+    Args:
+        signal: Uniformly sampled signal
+        max_points: Number of indices to return (at least 3)
+
+    Returns:
+        Sorted sample indices (max_points of them, or all when shorter)
+    """
+    signal = np.asarray(signal)
+    n = len(signal)
+    if n <= max_points or max_points < 3:
+        return np.arange(n) if n <= max_points else minmax_indices([signal], max_points)
+
+    # MinMaxLTTB: preselect candidates so the per-bucket loop stays short
+    candidates = np.arange(n)
+    if n > LTTB_PRESELECT_RATIO * max_points:
+        candidates = minmax_indices([signal], LTTB_PRESELECT_RATIO * max_points)
+    x = candidates.astype(np.float64)
+    y = signal[candidates].astype(np.float64)
+    count = len(candidates)
+    if count <= max_points:
+        return candidates
+
+    # max_points - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, count - 1, max_points - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[1 : count - 1], edges[:-1] - 1) / sizes
+    mean_y = np.add.reduceat(y[1 : count - 1], edges[:-1] - 1) / sizes
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, count - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Twice the triangle area between the previous point, each candidate and the next bucket's mean
+        area = np.abs(
+            (x[previous] - mean_x[bucket]) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (mean_y[bucket] - y[previous])
+        )
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return candidates[selected]
+
+
+def decimation_indices(mode: str, signals: Sequence[np.ndarray], max_points: int) -> np.ndarray:
+    """Indices for a shape-preserving decimation mode ("minmax" or "lttb").
+
+    LTTB picks points on the first signal; the others are sampled at those
+    indices (RMS envelopes are smooth enough for this).
+    """
+    if mode == "minmax":
+        return minmax_indices(signals, max_points)
+    if mode == "lttb":
+        return lttb_indices(signals[0], max_points)
+    raise ValueError(f"Unknown decimation mode: {mode!r} (expected one of {DECIMATION_MODES})")
@@ -0,0 +1,162 @@
+"""EMG Signal Pyramid.
+===================
+
+Multi-resolution min/max summaries of a session's signals, built once at
+processing time so charts can be served at any zoom level without decoding
+the C3D file again.
+
+Level 0 holds the minimum and maximum of every `base_bucket` samples; each
+following level merges `level_factor` buckets of the previous one, down to
+about `min_buckets` buckets. Buckets are stored as (min, max) float32 pairs,
+so any run of buckets of one level is one contiguous byte range: a reader
+fetches the header, picks a level and reads only the window it needs.
+
+Artifact layout (little-endian, same framing as utils.signal_transport):
+
+    bytes 0-3   magic b"EMGP"
+    bytes 4-7   uint32 header length N
+    bytes 8-    N bytes of UTF-8 JSON, space-padded to a 4-byte boundary:
+                {"version": 1, "sampling_rate": 1000.0, "base_bucket": 8,
+                 "level_factor": 4,
+                 "channels": {"CH1": {"total_samples": 60000,
+                                      "signals": {"data": "a0", "rms_envelope": "a1"}}},
+                 "arrays": {"a0": [{"bucket_size": 8, "buckets": 7500, "offset": 0}, ...]}}
+    bytes 8+N-  data section; `offset` is in bytes from its start
+
+Signals that share an array (e.g. "CH1" and "CH1 Raw", or a processed
+channel's data and envelope) point at the same entry in "arrays".
+"""
+
+import json
+import math
+import struct
+from typing import Any
+
+import numpy as np
+
+PYRAMID_MAGIC = b"EMGP"
+PYRAMID_VERSION = 1
+PYRAMID_DTYPE = np.dtype("<f4")
+BUCKET_BYTES = 2 * PYRAMID_DTYPE.itemsize
+PYRAMID_SIGNALS = ("data", "rms_envelope", "processed_data")
+HEADER_PREFIX_BYTES = 8
+
+
+def build_levels(signal: np.ndarray, base_bucket: int, level_factor: int, min_buckets: int) -> list[np.ndarray]:
+    """Min/max levels of one signal, finest first; each level is a (buckets, 2) array."""
+    signal = np.asarray(signal, dtype=PYRAMID_DTYPE)
+    buckets = -(-len(signal) // base_bucket)
+    rows = np.pad(signal, (0, buckets * base_bucket - len(signal)), mode="edge").reshape(buckets, base_bucket)
+    levels = [np.stack([rows.min(axis=1), rows.max(axis=1)], axis=1)]
+
+    while len(levels[-1]) > min_buckets:
+        previous = levels[-1]
+        buckets = -(-len(previous) // level_factor)
+        padded = np.pad(previous, ((0, buckets * level_factor - len(previous)), (0, 0)), mode="edge")
+        grouped = padded.reshape(buckets, level_factor, 2)
+        levels.append(np.stack([grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)], axis=1))
+    return levels
+
+
+def encode_pyramid(
+    channels: dict[str, dict[str, Any]],
+    sampling_rate: float,
+    base_bucket: int,
+    level_factor: int,
+    min_buckets: int,
+) -> bytes:
+    """Build and encode the pyramid of every signal (see module docstring).
+
+    Args:
+        channels: Channel name -> signal name -> array (None entries are skipped)
+        sampling_rate: Samples per second, shared by all channels
+        base_bucket: Samples per bucket at level 0
+        level_factor: Buckets merged per level
+        min_buckets: Coarsest level size
+    """
+    array_keys: dict[int, str] = {}
+    arrays: dict[str, list[dict[str, int]]] = {}
+    buffers: list[bytes] = []
+    offset = 0
+    channel_index: dict[str, Any] = {}
+
+    for channel, signals in channels.items():
+        entry = {"total_samples": 0, "signals": {}}
+        for name in PYRAMID_SIGNALS:
+            signal = signals.get(name)
+            if signal is None or len(signal) == 0:
+                continue
+            entry["total_samples"] = max(entry["total_samples"], len(signal))
+            key = array_keys.get(id(signal))
+            if key is None:
+                key = array_keys[id(signal)] = f"a{len(array_keys)}"
+                arrays[key] = []
+                for level in build_levels(signal, base_bucket, level_factor, min_buckets):
+                    bucket_size = base_bucket * level_factor ** len(arrays[key])
+                    arrays[key].append({"bucket_size": bucket_size, "buckets": len(level), "offset": offset})
+                    data = np.ascontiguousarray(level, dtype=PYRAMID_DTYPE).tobytes()
+                    buffers.append(data)
+                    offset += len(data)
+            entry["signals"][name] = key
+        if entry["signals"]:
+            channel_index[channel] = entry
+
+    header = json.dumps(
+        {
+            "version": PYRAMID_VERSION,
+            "sampling_rate": float(sampling_rate),
+            "base_bucket": base_bucket,
+            "level_factor": level_factor,
+            "channels": channel_index,
+            "arrays": arrays,
+        }
+    ).encode("utf-8")
+    header += b" " * (-(HEADER_PREFIX_BYTES + len(header)) % PYRAMID_DTYPE.itemsize)
+    return b"".join([PYRAMID_MAGIC, struct.pack("<I", len(header)), header, *buffers])
+
+
+def header_length(prefix: bytes) -> int:
+    """Bytes taken by magic, length and JSON header, from the first 8 bytes."""
+    if len(prefix) < HEADER_PREFIX_BYTES or prefix[:4] != PYRAMID_MAGIC:
+        raise ValueError("Not an EMG signal pyramid")
+    return HEADER_PREFIX_BYTES + struct.unpack_from("<I", prefix, 4)[0]
+
+
+def decode_header(head: bytes) -> dict[str, Any]:
+    """Parse the JSON header from at least header_length(head) leading bytes."""
+    header = json.loads(head[HEADER_PREFIX_BYTES : header_length(head)])
+    if header.get("version") != PYRAMID_VERSION:
+        raise ValueError(f"Unsupported pyramid version: {header.get('version')}")
+    return header
+
+
+def choose_level(levels: list[dict[str, int]], window_samples: int, max_buckets: int) -> dict[str, int] | None:
+    """Finest level showing window_samples in about max_buckets buckets.
+
+    None when the window needs finer buckets than level 0 (the caller should
+    read the signal at full resolution instead).
+    """
+    required_bucket_size = math.ceil(window_samples / max(max_buckets, 1))
+    if required_bucket_size < levels[0]["bucket_size"]:
+        return None
+    for level in levels:
+        if level["bucket_size"] >= required_bucket_size:
+            return level
+    return levels[-1]
+
+
+def bucket_range(level: dict[str, int], start: int, stop: int) -> tuple[int, int]:
+    """Buckets [first, last) of a level covering samples [start, stop)."""
+    first = min(start // level["bucket_size"], level["buckets"])
+    last = min(max(-(-stop // level["bucket_size"]), first), level["buckets"])
+    return first, last
+
+
+def byte_range(level: dict[str, int], first: int, last: int) -> tuple[int, int]:
+    """Data-section byte range [begin, end) of buckets [first, last)."""
+    return level["offset"] + first * BUCKET_BYTES, level["offset"] + last * BUCKET_BYTES
+
+
+def decode_buckets(data: bytes) -> np.ndarray:
+    """(buckets, 2) min/max array from a byte range returned by byte_range."""
+    return np.frombuffer(data, dtype=PYRAMID_DTYPE).reshape(-1, 2)
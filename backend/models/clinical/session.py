@@ -26,6 +26,9 @@ class TherapySessionBase(DatabaseBaseModel):
     file_path: str = Field(..., description="Unique path to C3D file in storage")
     file_hash: str = Field(..., description="SHA256 hash of file for deduplication")
     file_size_bytes: int = Field(..., gt=0, description="File size in bytes")
+    webhook_delivery_key: str | None = Field(
+        None, description="Webhook delivery key (bucket, object, version) for retry deduplication"
+    )
 
     # Relationships
     patient_id: UUID | None = None
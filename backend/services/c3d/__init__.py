@@ -5,7 +5,7 @@ Services for handling C3D file processing and analysis.
 """
 
 from services.c3d.processor import GHOSTLYC3DProcessor
-from services.c3d.reader import C3DReader
+from services.c3d.reader import C3DPrevalidationError, C3DReader
 from services.c3d.utils import C3DUtils
 
-__all__ = ["C3DReader", "C3DUtils", "GHOSTLYC3DProcessor"]
+__all__ = ["C3DPrevalidationError", "C3DReader", "C3DUtils", "GHOSTLYC3DProcessor"]
@@ -0,0 +1,86 @@
+"""Process pool for CPU-bound C3D processing.
+
+GHOSTLYC3DProcessor.process_file is pure Python and NumPy work that holds
+the GIL for most of its run, so threads process one file at a time.
+`run_c3d` sends the work to a bounded pool of worker processes: batch
+uploads process up to C3D_PROCESS_MAX_WORKERS files in parallel, and the
+event loop keeps serving requests.
+
+Workers are spawned (not forked) so they do not inherit the server's
+threads, sockets and database connections. Arguments and results cross the
+process boundary by pickling: pass file paths, not open files.
+
+Usage:
+    result = await run_c3d(process_c3d_file, tmp_path, processing_opts, session_params)
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from config import C3D_PROCESS_MAX_WORKERS
+from models import GameSessionParameters, ProcessingOptions
+from services.c3d.processor import GHOSTLYC3DProcessor
+
+logger = logging.getLogger(__name__)
+
+ResultType = TypeVar("ResultType")
+
+# Global executor instance (created lazily)
+_c3d_executor: ProcessPoolExecutor | None = None
+
+
+def get_c3d_executor() -> ProcessPoolExecutor:
+    """Get or create the shared C3D processing pool."""
+    global _c3d_executor
+
+    if _c3d_executor is None:
+        _c3d_executor = ProcessPoolExecutor(
+            max_workers=C3D_PROCESS_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"C3D process pool initialized ({C3D_PROCESS_MAX_WORKERS} workers)")
+
+    return _c3d_executor
+
+
+def process_c3d_file(
+    file_path: str,
+    processing_opts: ProcessingOptions,
+    session_params: GameSessionParameters,
+    include_signals: bool = True,
+) -> dict:
+    """Process a C3D file in a worker process (see GHOSTLYC3DProcessor.process_file)."""
+    processor = GHOSTLYC3DProcessor(file_path)
+    return processor.process_file(
+        processing_opts=processing_opts,
+        session_game_params=session_params,
+        include_signals=include_signals,
+    )
+
+
+async def run_c3d(func: Callable[..., ResultType], *args: Any, **kwargs: Any) -> ResultType:
+    """Run a CPU-bound callable in the C3D process pool.
+
+    Args:
+        func: Module-level (picklable) callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_c3d_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_c3d_executor(wait: bool = True) -> None:
+    """Shut down the C3D process pool (application shutdown, tests)."""
+    global _c3d_executor
+
+    if _c3d_executor is not None:
+        _c3d_executor.shutdown(wait=wait, cancel_futures=True)
+        _c3d_executor = None
@@ -47,6 +47,7 @@ from typing import Any
 
 import numpy as np
 
+from services.c3d.reader import C3DPrevalidationError, C3DReader
 from services.c3d.utils import C3DUtils
 
 # Configure logger
@@ -99,7 +100,20 @@ class GHOSTLYC3DProcessor:
         self.session_game_params_used: GameSessionParameters | None = None
 
     def load_file(self) -> None:
-        """Load the C3D file using ezc3d library."""
+        """Load the C3D file using ezc3d library.
+
+        The header and parameter blocks are checked first (C3DReader.prevalidate):
+        recordings that are too short, too long or have no analog channels are
+        rejected with C3DPrevalidationError before the full decode.
+        """
+        try:
+            C3DReader().prevalidate(C3DReader.read_file_head(self.file_path))
+        except C3DPrevalidationError:
+            raise
+        except Exception as e:
+            # Unreadable header: let ezc3d decide (and report) below
+            logger.debug(f"C3D prevalidation skipped for {self.file_path}: {e!s}")
+
         self.c3d = C3DUtils.load_c3d_file(self.file_path)
         if self.c3d is None:
             raise ValueError(f"Error loading C3D file: {self.file_path}")
@@ -334,12 +348,12 @@ class GHOSTLYC3DProcessor:
                     # Use rectified signal for RMS per clinical practice
                     calculated_rms_envelope = moving_rms(
                         np.abs(signal_data), rms_env_window_samples
-                    ).tolist()
+                    )
 
-                    # Channel data structure
+                    # Channel data structure (NumPy arrays; API responses serialize the buffers directly)
                     channel_data = {
-                        "data": signal_data.tolist(),
-                        "time_axis": time_axis.tolist(),
+                        "data": signal_data,
+                        "time_axis": time_axis,
                         "sampling_rate": sampling_rate,
                         "rms_envelope": calculated_rms_envelope,
                         "activated_data": None,  # Legacy field - not used in rigorous pipeline
@@ -649,9 +663,8 @@ class GHOSTLYC3DProcessor:
                 processed_channel_name = f"{base_name} Processed"
                 if raw_channel_name in self.emg_data:
                     # Add processed data to the raw channel entry
-                    self.emg_data[raw_channel_name]["processed_data"] = processing_result[
-                        "processed_signal"
-                    ].tolist()
+                    processed_signal = processing_result["processed_signal"]
+                    self.emg_data[raw_channel_name]["processed_data"] = processed_signal
 
                     # Also create separate processed channel for frontend flexibility
                     time_axis = self.emg_data[raw_channel_name]["time_axis"]
@@ -660,12 +673,10 @@ class GHOSTLYC3DProcessor:
                     from emg.signal_processing import get_processing_metadata
 
                     self.emg_data[processed_channel_name] = {
-                        "data": processing_result["processed_signal"].tolist(),
+                        "data": processed_signal,
                         "time_axis": time_axis,
                         "sampling_rate": sampling_rate,
-                        "rms_envelope": processing_result[
-                            "processed_signal"
-                        ].tolist(),  # Processed signal IS the envelope
+                        "rms_envelope": processed_signal,  # Processed signal IS the envelope
                         "activated_data": None,  # Not used
                         "processed_data": None,  # This IS the processed data
                         "is_processed": True,  # Flag to identify processed signals
@@ -1438,8 +1449,8 @@ class GHOSTLYC3DProcessor:
         
         Returns:
             dict: Dictionary of channel names mapped to signal data with:
-                  - data: List of signal values
-                  - time_axis: Time axis for plotting
+                  - data: Signal values (NumPy array)
+                  - time_axis: Time axis for plotting (NumPy array)
                   - sampling_rate: Signal sampling rate
                   - processed_data: Processed signal data (if available)
         """
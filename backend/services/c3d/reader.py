@@ -9,6 +9,7 @@
 🔗 RESPONSIBILITIES:
 - Parse C3D file headers and parameter blocks
 - Extract basic game metadata from INFO parameters
+- Prevalidate recordings (duration, channels) before a full ezc3d decode
 - No signal processing or analytics (use c3d_processor.py for that)
 
 📊 OUTPUT: Basic metadata dictionary for file preview/validation
@@ -18,8 +19,33 @@ import logging
 import struct
 from typing import Any
 
+from emg.signal_processing import ProcessingParameters
+
 logger = logging.getLogger(__name__)
 
+BLOCK_SIZE = 512  # C3D files are organized in 512-byte blocks
+INTEL_PROCESSOR = 84  # Little-endian IEEE floats; DEC (85) and MIPS (86) files encode them differently
+
+
+# Prevalidation failure reasons (C3DPrevalidationError.reason)
+NO_EMG_DATA = "no_emg_data"
+INSUFFICIENT_SIGNAL_DURATION = "insufficient_signal_duration"
+EXCESSIVE_SIGNAL_DURATION = "excessive_signal_duration"
+
+
+class C3DPrevalidationError(ValueError):
+    """Recording rejected from its header and parameter blocks, before a full decode.
+
+    `recording` holds what was read: frame_count, sampling_rate (analog),
+    channel_count and duration_seconds. `reason` is NO_EMG_DATA,
+    INSUFFICIENT_SIGNAL_DURATION or EXCESSIVE_SIGNAL_DURATION.
+    """
+
+    def __init__(self, message: str, recording: dict[str, Any], reason: str):
+        super().__init__(message)
+        self.recording = recording
+        self.reason = reason
+
 
 class C3DReader:
     """Service for reading C3D file metadata without full processing."""
@@ -86,6 +112,82 @@ class C3DReader:
                 "player_name": None,
             }
 
+    @staticmethod
+    def read_file_head(file_path: str) -> bytes:
+        """Read only the header and parameter blocks of a C3D file."""
+        with open(file_path, "rb") as f:
+            head = f.read(BLOCK_SIZE)
+            if len(head) < BLOCK_SIZE or head[0] < 2:
+                return head
+            f.seek((head[0] - 1) * BLOCK_SIZE)
+            parameter_header = f.read(4)
+            if len(parameter_header) < 4:
+                return head
+            f.seek(0)
+            return f.read((head[0] - 1 + max(parameter_header[2], 1)) * BLOCK_SIZE)
+
+    def prevalidate(self, file_data: bytes) -> dict[str, Any]:
+        """Check clinical duration and channel count from the header and parameter blocks.
+
+        Mirrors the duration checks of validate_signal_quality, but runs on a
+        few kilobytes (see read_file_head) instead of the decoded signals.
+
+        Args:
+            file_data: C3D file bytes; the header and parameter blocks are enough
+
+        Returns:
+            Dict with frame_count, sampling_rate (analog), channel_count and duration_seconds;
+            "prevalidated" is False when the file's number format cannot be read from
+            the header (non-Intel processor), leaving validation to the full decode
+
+        Raises:
+            C3DPrevalidationError: No analog channels, or duration outside
+                MIN_CLINICAL_DURATION_SECONDS..MAX_CLINICAL_DURATION_SECONDS
+        """
+        header = self._read_header(file_data)
+        parameters = self._read_parameters(file_data, header["parameter_start"])
+
+        # ANALOG:RATE and ANALOG:USED when present, else derived from the header
+        sampling_rate = parameters.get("analog_rate", header["analog_sampling_rate"])
+        sample_count = header["frame_count"] * header["analog_samples_per_frame"]
+        recording = {
+            "frame_count": sample_count,
+            "sampling_rate": sampling_rate,
+            "channel_count": parameters.get("analog_used", header["analog_channel_count"]),
+            "duration_seconds": sample_count / sampling_rate if sampling_rate > 0 else 0.0,
+            "prevalidated": parameters.get("processor_type") == INTEL_PROCESSOR,
+        }
+        if not recording["prevalidated"]:
+            return recording
+
+        duration_seconds = recording["duration_seconds"]
+        if recording["channel_count"] == 0 or sample_count == 0:
+            raise C3DPrevalidationError(
+                "No EMG data loaded: the C3D header declares no analog samples. EMG analysis requires "
+                f"{ProcessingParameters.MIN_CLINICAL_DURATION_SECONDS} seconds to "
+                f"{ProcessingParameters.MAX_CLINICAL_DURATION_SECONDS // 60} minutes of signal data.",
+                recording,
+                NO_EMG_DATA,
+            )
+        if duration_seconds < ProcessingParameters.MIN_CLINICAL_DURATION_SECONDS:
+            raise C3DPrevalidationError(
+                f"Signal duration insufficient: {duration_seconds:.2f} seconds. EMG analysis requires "
+                f"{ProcessingParameters.MIN_CLINICAL_DURATION_SECONDS} seconds to "
+                f"{ProcessingParameters.MAX_CLINICAL_DURATION_SECONDS // 60} minutes for clinical requirements. "
+                f"Recording has {sample_count} samples at {sampling_rate:g}Hz sampling rate.",
+                recording,
+                INSUFFICIENT_SIGNAL_DURATION,
+            )
+        if duration_seconds > ProcessingParameters.MAX_CLINICAL_DURATION_SECONDS:
+            raise C3DPrevalidationError(
+                f"Signal too long: {duration_seconds / 60:.1f} minutes exceeds clinical maximum duration of "
+                f"{ProcessingParameters.MAX_CLINICAL_DURATION_SECONDS // 60} minutes. Long recordings may "
+                f"contain fatigue artifacts that compromise therapeutic analysis.",
+                recording,
+                EXCESSIVE_SIGNAL_DURATION,
+            )
+        return recording
+
     def _read_header(self, file_data: bytes) -> dict[str, Any]:
         """Read C3D file header.
 
@@ -106,10 +208,10 @@ class C3DReader:
 
             # Read key header fields
             # Parameter section start (word 1, byte 1)
-            header["parameter_start"] = struct.unpack("<H", header_bytes[0:2])[0]
+            header["parameter_start"] = header_bytes[0]
 
-            # Key flag (byte 3)
-            key_flag = struct.unpack("<B", header_bytes[2:3])[0]
+            # Key flag (word 1, byte 2)
+            key_flag = header_bytes[1]
             header["key_flag"] = key_flag
 
             # Check if this is a valid C3D file
@@ -119,7 +221,7 @@ class C3DReader:
             # Number of 3D points (word 2)
             header["num_3d_points"] = struct.unpack("<H", header_bytes[2:4])[0] & 0x7FFF
 
-            # Number of analog channels (word 3)
+            # Analog measurements per 3D frame: channels x samples per frame (word 3)
             header["num_analog_channels"] = struct.unpack("<H", header_bytes[4:6])[0]
 
             # First frame number (word 4)
@@ -149,6 +251,11 @@ class C3DReader:
             # Frame rate (float at word 11-12)
             header["sampling_rate"] = struct.unpack("<f", header_bytes[20:24])[0]
 
+            # Analog (EMG) channels and rate: several analog samples per 3D frame
+            samples_per_frame = header["analog_samples_per_frame"]
+            header["analog_channel_count"] = header["num_analog_channels"] // samples_per_frame if samples_per_frame else 0
+            header["analog_sampling_rate"] = header["sampling_rate"] * samples_per_frame
+
             return header
 
         except Exception as e:
@@ -171,7 +278,7 @@ class C3DReader:
 
         try:
             # Calculate parameter section start in bytes (blocks are 512 bytes)
-            param_offset = (parameter_start - 1) * 512
+            param_offset = (parameter_start - 1) * BLOCK_SIZE
 
             if param_offset >= len(file_data):
                 logger.warning("Parameter section beyond file end")
@@ -180,60 +287,60 @@ class C3DReader:
             parameters = {}
 
             # Read parameter header
-            param_header = file_data[param_offset : param_offset + 8]
-            if len(param_header) < 8:
+            param_header = file_data[param_offset : param_offset + 4]
+            if len(param_header) < 4:
                 return {}
 
-            # First 4 bytes: reserved (should be 0x50, 0x00, 0x00, 0x00)
-            # Bytes 5-6: Number of parameter blocks
-            num_param_blocks = struct.unpack("<H", param_header[4:6])[0]
+            # Bytes 1-2: reserved (0x01 or 0x00, then 0x50)
+            # Byte 3: Number of parameter blocks
+            num_param_blocks = param_header[2]
 
-            # Bytes 7: Processor type (83=DEC, 84=Intel, 85=SGI)
-            processor_type = struct.unpack("<B", param_header[6:7])[0]
+            # Byte 4: Processor type (84=Intel, 85=DEC, 86=MIPS)
+            processor_type = param_header[3]
 
             parameters["num_parameter_blocks"] = num_param_blocks
             parameters["processor_type"] = processor_type
 
-            # Parse parameter groups
-            offset = param_offset + 8
             channel_names = []
 
             try:
-                # Look for ANALOG group for channel names
-                analog_group = self._find_parameter_group(file_data, offset, "ANALOG")
-                if analog_group:
-                    # Look for LABELS parameter within ANALOG group
-                    labels = analog_group.get("LABELS")
-                    if labels and isinstance(labels, list):
-                        channel_names = [label.strip() for label in labels if label.strip()]
-
-                # Look for POINT group for 3D point labels
-                point_group = self._find_parameter_group(file_data, offset, "POINT")
-                if point_group:
-                    point_labels = point_group.get("LABELS")
-                    if point_labels and isinstance(point_labels, list):
-                        # Add point labels as additional "channels" (though they're 3D points)
-                        for label in point_labels:
-                            if label.strip():
-                                channel_names.append(f"POINT_{label.strip()}")
+                if processor_type != INTEL_PROCESSOR:
+                    raise ValueError(f"Unsupported processor type for parameter parsing: {processor_type}")
+                groups = self._parse_parameter_groups(file_data, param_offset, num_param_blocks)
+
+                # ANALOG group: channel names, channel count and sampling rate
+                analog_group = groups.get("ANALOG", {})
+                labels = analog_group.get("LABELS")
+                if isinstance(labels, list):
+                    channel_names = [label.strip() for label in labels if label.strip()]
+                if isinstance(analog_group.get("USED"), int):
+                    parameters["analog_used"] = analog_group["USED"]
+                if isinstance(analog_group.get("RATE"), float):
+                    parameters["analog_rate"] = analog_group["RATE"]
+
+                # POINT group for 3D point labels
+                point_labels = groups.get("POINT", {}).get("LABELS")
+                if isinstance(point_labels, list):
+                    # Add point labels as additional "channels" (though they're 3D points)
+                    for label in point_labels:
+                        if label.strip():
+                            channel_names.append(f"POINT_{label.strip()}")
 
                 # Look for SUBJECT group for clinical metadata
-                subject_group = self._find_parameter_group(file_data, offset, "SUBJECT")
-                if subject_group:
-                    if "NAME" in subject_group:
-                        parameters["player_name"] = subject_group["NAME"]
-                    if "THERAPIST_ID" in subject_group:
-                        parameters["therapist_id"] = subject_group["THERAPIST_ID"]
-                    if "NOTES" in subject_group:
-                        parameters["session_notes"] = subject_group["NOTES"]
+                subject_group = groups.get("SUBJECT", {})
+                if "NAME" in subject_group:
+                    parameters["player_name"] = subject_group["NAME"]
+                if "THERAPIST_ID" in subject_group:
+                    parameters["therapist_id"] = subject_group["THERAPIST_ID"]
+                if "NOTES" in subject_group:
+                    parameters["session_notes"] = subject_group["NOTES"]
 
                 # Look for SESSION group for session metadata
-                session_group = self._find_parameter_group(file_data, offset, "SESSION")
-                if session_group:
-                    if "DURATION" in session_group:
-                        parameters["session_duration"] = session_group["DURATION"]
-                    if "TYPE" in session_group:
-                        parameters["session_type"] = session_group["TYPE"]
+                session_group = groups.get("SESSION", {})
+                if "DURATION" in session_group:
+                    parameters["session_duration"] = session_group["DURATION"]
+                if "TYPE" in session_group:
+                    parameters["session_type"] = session_group["TYPE"]
 
                 # Store game metadata
                 game_metadata = {}
@@ -257,133 +364,75 @@ class C3DReader:
             logger.exception(f"Error reading C3D parameters: {e!s}")
             return {}
 
-    def _find_parameter_group(
-        self, file_data: bytes, start_offset: int, group_name: str
-    ) -> dict[str, Any] | None:
-        """Find and parse a specific parameter group.
+    def _parse_parameter_groups(
+        self, file_data: bytes, param_offset: int, num_blocks: int
+    ) -> dict[str, dict[str, Any]]:
+        """Parse the parameter records of an Intel-format parameter section.
+
+        Each record is: int8 name length (negative when locked), int8 group id
+        (negative for a group, positive for a parameter of that group), the
+        name, then an int16 offset to the next record. Parameters continue with
+        int8 data type (-1 char, 1 byte, 2 int16, 4 float), int8 dimension
+        count, uint8 dimensions and the data.
 
         Args:
             file_data: Raw C3D file bytes
-            start_offset: Starting offset in file
-            group_name: Name of group to find (e.g., "ANALOG")
+            param_offset: Byte offset of the parameter section
+            num_blocks: Number of 512-byte parameter blocks
 
         Returns:
-            Dict with group parameters or None if not found
+            Dict mapping group name -> parameter name -> value (scalar, string or list)
         """
-        try:
-            # This is a simplified parameter parser
-            # A full implementation would parse the entire parameter structure
-            # For now, we'll look for common patterns and try to extract basic info
-
-            # Look for the group name in the parameter section
-            search_bytes = group_name.encode("ascii")
-
-            # Search in a reasonable range (first 10KB of parameter section)
-            search_end = min(start_offset + 10240, len(file_data))
-            search_data = file_data[start_offset:search_end]
-
-            group_pos = search_data.find(search_bytes)
-            if group_pos == -1:
-                return None
-
-            # This is a basic implementation that looks for common parameter patterns
-            # A full C3D parser would properly decode the parameter structure
-            group_data = {}
-
-            # Look for LABELS parameter (common in ANALOG and POINT groups)
-            if group_name in ["ANALOG", "POINT"]:
-                # Try to find channel/point labels
-                labels = self._extract_labels_from_section(
-                    file_data[start_offset + group_pos : start_offset + group_pos + 2048]
+        end = min(param_offset + max(num_blocks, 1) * BLOCK_SIZE, len(file_data))
+        group_names: dict[int, str] = {}
+        group_parameters: dict[int, dict[str, Any]] = {}
+
+        position = param_offset + 4
+        while position + 4 <= end:
+            name_length, group_id = struct.unpack_from("<bb", file_data, position)
+            name_length = abs(name_length)
+            if name_length == 0 or group_id == 0:
+                break
+
+            name = file_data[position + 2 : position + 2 + name_length].decode("ascii", errors="ignore").strip()
+            offset_position = position + 2 + name_length
+            (next_offset,) = struct.unpack_from("<h", file_data, offset_position)
+
+            if group_id < 0:
+                group_names[-group_id] = name.upper()
+            else:
+                data_type, dimension_count = struct.unpack_from("<bB", file_data, offset_position + 2)
+                dimensions = list(file_data[offset_position + 4 : offset_position + 4 + dimension_count])
+                group_parameters.setdefault(group_id, {})[name.upper()] = self._decode_parameter_data(
+                    file_data, offset_position + 4 + dimension_count, data_type, dimensions
                 )
-                if labels:
-                    group_data["LABELS"] = labels
-
-            # Look for subject information
-            elif group_name == "SUBJECT":
-                # Look for common subject fields
-                section_data = file_data[start_offset + group_pos : start_offset + group_pos + 1024]
-                name = self._extract_string_parameter(section_data, "NAME")
-                if name:
-                    group_data["NAME"] = name
-
-                therapist = self._extract_string_parameter(section_data, "THERAPIST")
-                if therapist:
-                    group_data["THERAPIST_ID"] = therapist
-
-            return group_data if group_data else None
-
-        except Exception as e:
-            logger.warning(f"Error finding parameter group {group_name}: {e!s}")
-            return None
 
-    def _extract_labels_from_section(self, section_data: bytes) -> list[str]:
-        """Extract channel/point labels from a parameter section.
-
-        Args:
-            section_data: Bytes from parameter section
-
-        Returns:
-            List of extracted labels
-        """
-        labels = []
-
-        try:
-            # Look for common EMG channel naming patterns
-            common_patterns = [b"EMG", b"BicepsL", b"BicepsR", b"TricepsL", b"TricepsR", b"Channel"]
-
-            # Simple extraction - look for ASCII strings
-            text_data = section_data.decode("ascii", errors="ignore")
-
-            # Split on null bytes and filter
-            potential_labels = [s.strip() for s in text_data.split("\x00") if s.strip()]
-
-            # Filter for likely channel names (3-20 characters, alphanumeric + underscore)
-            for label in potential_labels:
-                if 3 <= len(label) <= 20 and label.replace("_", "").replace("-", "").isalnum():
-                    labels.append(label)
-
-            # Limit to reasonable number of labels
-            return labels[:50]
-
-        except Exception as e:
-            logger.warning(f"Error extracting labels: {e!s}")
-            return []
-
-    def _extract_string_parameter(self, section_data: bytes, param_name: str) -> str | None:
-        """Extract a string parameter from a section.
-
-        Args:
-            section_data: Bytes from parameter section
-            param_name: Name of parameter to extract
-
-        Returns:
-            Extracted string value or None
-        """
-        try:
-            # Look for parameter name
-            param_bytes = param_name.encode("ascii")
-            param_pos = section_data.find(param_bytes)
-
-            if param_pos == -1:
-                return None
-
-            # Look for string value after parameter name
-            # This is a simplified extraction
-            after_param = section_data[param_pos + len(param_bytes) :]
-
-            # Try to extract ASCII string
-            text_data = after_param[:100].decode("ascii", errors="ignore")
-
-            # Find first reasonable string
-            parts = text_data.split("\x00")
-            for part in parts:
-                cleaned = part.strip()
-                if 1 <= len(cleaned) <= 50 and cleaned.isprintable():
-                    return cleaned
-
-            return None
-
-        except Exception as e:
-            logger.warning(f"Error extracting string parameter {param_name}: {e!s}")
-            return None
+            if next_offset <= 0:
+                break
+            position = offset_position + next_offset
+
+        return {
+            group_names.get(group_id, f"GROUP_{group_id}"): values for group_id, values in group_parameters.items()
+        }
+
+    @staticmethod
+    def _decode_parameter_data(file_data: bytes, start: int, data_type: int, dimensions: list[int]) -> Any:
+        """Decode parameter data: strings (lists of strings for 2-D char arrays) or numbers."""
+        if data_type == -1:
+            width = dimensions[0] if dimensions else 1
+            count = 1
+            for dimension in dimensions[1:]:
+                count *= dimension
+            text = file_data[start : start + width * count].decode("ascii", errors="ignore")
+            if len(dimensions) <= 1:
+                return text.strip()
+            return [text[i * width : (i + 1) * width].strip() for i in range(count)]
+
+        formats = {1: "B", 2: "h", 4: "f"}
+        if data_type not in formats:
+            raise ValueError(f"Unknown parameter data type: {data_type}")
+        count = 1
+        for dimension in dimensions:
+            count *= dimension
+        values = list(struct.unpack_from(f"<{count}{formats[data_type]}", file_data, start))
+        return values[0] if not dimensions else values
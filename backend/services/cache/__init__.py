@@ -3,12 +3,22 @@ Simple, fast, reliable caching with Redis.
 """
 
 from services.cache.cache_patterns import CachePatterns, get_cache_patterns
+from services.cache.cache_warmer import SessionCacheWarmer, get_cache_warmer
+from services.cache.codecs import CacheCodec, get_codec, register_codec, resolve_codec
 from services.cache.redis_cache import RedisCache, cleanup_redis_cache, get_redis_cache
+from services.cache.tiered_cache import TieredCache
 
 __all__ = [
+    "CacheCodec",
     "CachePatterns",
     "RedisCache",
+    "SessionCacheWarmer",
+    "TieredCache",
     "cleanup_redis_cache",
     "get_cache_patterns",
+    "get_cache_warmer",
+    "get_codec",
     "get_redis_cache",
+    "register_codec",
+    "resolve_codec",
 ]
@@ -1,19 +1,40 @@
 """Advanced Caching Patterns for EMG Analysis
 Implements cache-aside pattern with pipeline operations.
+
+Cache misses are single-flight: concurrent requests for the same key in a
+worker await one in-process load task, and workers coordinate through a short
+Redis lock lease, so an expired hot key is recomputed once instead of by
+every waiting dashboard request. Entries record how long they took to load;
+reads refresh them in the background shortly before expiry with a
+probability that grows as expiry nears and with the recompute cost
+(probabilistic early expiration, "XFetch").
 """
 
 import asyncio
-import json
+import functools
 import logging
+import math
+import random
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
+from uuid import uuid4
 
+from config import CACHE_EARLY_REFRESH_BETA, CACHE_LOCK_LEASE_MS, CACHE_LOCK_POLL_MS
 from services.cache.redis_cache import RedisCache, get_redis_cache
 
 logger = logging.getLogger(__name__)
 
+# Compare-and-delete so a worker never releases a lease another worker now holds
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 @dataclass
 class CacheEntry:
@@ -30,13 +51,29 @@ class CachePatterns:
 
     Patterns:
     - Cache-aside: Check cache first, load from source on miss
+    - Single-flight: One load per key across concurrent requests and workers
     - Pipeline operations: Batch multiple operations
     - Background refresh: Refresh popular items before expiration
     """
 
-    def __init__(self, cache: RedisCache | None = None):
+    def __init__(
+        self,
+        cache: RedisCache | None = None,
+        lock_lease_ms: int = CACHE_LOCK_LEASE_MS,
+        lock_poll_ms: int = CACHE_LOCK_POLL_MS,
+        early_refresh_beta: float = CACHE_EARLY_REFRESH_BETA,
+    ):
         self.cache = cache
+        self.lock_lease_ms = lock_lease_ms
+        self.lock_poll_ms = lock_poll_ms
+        self.early_refresh_beta = early_refresh_beta
         self._refresh_tasks: list[asyncio.Task] = []
+        self._inflight: dict[str, asyncio.Task] = {}
+
+        self.loads = 0
+        self.coalesced = 0
+        self.lock_waits = 0
+        self.early_refreshes = 0
 
     async def initialize(self):
         """Initialize with cache instance."""
@@ -60,49 +97,134 @@ class CachePatterns:
             # Try cache first
             cached_data = await self.cache.get(key)
             if cached_data:
+                if self._should_refresh_early(cached_data):
+                    self.early_refreshes += 1
+                    self._schedule_refresh(key, loader_func, ttl)
                 return cached_data.get("data")
 
-            # Cache miss - load from source
-            logger.debug(f"Loading data for key: {key}")
-            data = await self._safe_call(loader_func)
-
-            if data is not None:
-                # Cache the result
-                await self.cache.set(key, {"data": data}, ttl)
-
-            return data
+            # Cache miss - load from source, once per key
+            return await self._load_single_flight(key, loader_func, ttl)
 
         except Exception as e:
             logger.exception(f"Cache-aside error for {key}: {e!s}")
             # Fallback to loader function
             return await self._safe_call(loader_func)
 
-    async def batch_get(self, keys: list[str]) -> dict[str, Any]:
-        """Get multiple keys efficiently."""
-        if not self.cache or not self.cache.redis:
-            return {}
-
+    def _should_refresh_early(self, cached_data: dict[str, Any]) -> bool:
+        """XFetch: refresh when now - compute_time * beta * ln(U) passes the expiry."""
+        expires_at = cached_data.get("expires_at")
+        compute_ms = cached_data.get("compute_ms")
+        if not expires_at or not compute_ms or self.early_refresh_beta <= 0:
+            return False
+        gap = -(compute_ms / 1000) * self.early_refresh_beta * math.log(1.0 - random.random())
+        return time.time() + gap >= expires_at
+
+    async def _load_single_flight(self, key: str, loader_func: Callable, ttl: int) -> Any:
+        """Load a key once per worker; concurrent callers share the result.
+
+        The load runs as its own task and every caller, including the one that
+        started it, awaits it through asyncio.shield: a cancelled caller (client
+        disconnect) never cancels the load the others are waiting for.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.create_task(self._load_with_lock(key, loader_func, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._load_finished, key))
+        return await asyncio.shield(task)
+
+    def _load_finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here even if every caller was cancelled
+
+    async def _load_with_lock(self, key: str, loader_func: Callable, ttl: int) -> Any:
+        """Load under a Redis lease so only one worker recomputes a key."""
+        redis_client = self.cache.redis
+        if redis_client is None:
+            return await self._load_and_store(key, loader_func, ttl)
+
+        lock_key = self.cache._cache_key(f"lock:{key}")
+        token = uuid4().hex
         try:
-            # Use pipeline for batch operations
-            pipe = self.cache.redis.pipeline()
-            cache_keys = [self.cache._cache_key(key) for key in keys]
+            acquired = await redis_client.set(lock_key, token, nx=True, px=self.lock_lease_ms)
+        except Exception as e:
+            logger.warning(f"Cache lock unavailable for {key}: {e!s}")
+            return await self._load_and_store(key, loader_func, ttl)
 
-            for cache_key in cache_keys:
-                pipe.get(cache_key)
+        if acquired:
+            try:
+                return await self._load_and_store(key, loader_func, ttl)
+            finally:
+                try:
+                    await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.debug(f"Cache lock release failed for {key} (lease will expire): {e!s}")
+
+        # Another worker is loading: wait for its result for up to one lease
+        self.lock_waits += 1
+        deadline = time.monotonic() + self.lock_lease_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.lock_poll_ms / 1000)
+            cached_data = await self.cache.get(key)
+            if cached_data:
+                return cached_data.get("data")
 
-            results = await pipe.execute()
+        logger.warning(f"Cache lock lease expired for {key} - loading locally")
+        return await self._load_and_store(key, loader_func, ttl)
+
+    async def _load_and_store(self, key: str, loader_func: Callable, ttl: int) -> Any:
+        """Run the loader and cache its result with the metadata early refresh needs."""
+        logger.debug(f"Loading data for key: {key}")
+        self.loads += 1
+        started = time.perf_counter()
+        data = await self._safe_call(loader_func)
+        compute_ms = (time.perf_counter() - started) * 1000
+
+        if data is not None:
+            await self.cache.set(
+                key,
+                {"data": data, "compute_ms": round(compute_ms, 3), "expires_at": time.time() + ttl},
+                ttl,
+            )
+
+        return data
+
+    def _schedule_refresh(self, key: str, loader_func: Callable, ttl: int) -> None:
+        """Refresh a key in the background unless a load is already in flight."""
+        if key in self._inflight:
+            return
+        task = asyncio.create_task(self._background_refresh(key, loader_func, ttl))
+        self._refresh_tasks.append(task)
+
+        # Clean up completed tasks
+        self._refresh_tasks = [t for t in self._refresh_tasks if not t.done()]
+
+    def get_stats(self) -> dict[str, int]:
+        """Single-flight and early refresh counters."""
+        return {
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "lock_waits": self.lock_waits,
+            "early_refreshes": self.early_refreshes,
+            "inflight": len(self._inflight),
+        }
 
-            # Parse results
-            data = {}
-            for i, (key, result) in enumerate(zip(keys, results)):
-                if result:
-                    try:
-                        cached_data = json.loads(result)
-                        data[key] = cached_data.get("data")
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(f"Invalid cache data for key: {key}")
+    async def batch_get(self, keys: list[str]) -> dict[str, Any]:
+        """Get multiple keys efficiently (L1 first, one Redis pipeline for the rest)."""
+        if not self.cache:
+            return {}
 
-            return data
+        try:
+            cached = await self.cache.tiered.get_many(keys)
+            return {
+                key: cached_data.get("data")
+                for key, cached_data in cached.items()
+                if isinstance(cached_data, dict)
+            }
 
         except Exception as e:
             logger.exception(f"Batch get error: {e!s}")
@@ -110,28 +232,18 @@ class CachePatterns:
 
     async def batch_set(self, data: dict[str, Any], ttl: int = 3600) -> dict[str, bool]:
         """Set multiple keys efficiently."""
-        if not self.cache or not self.cache.redis:
+        if not self.cache:
             return dict.fromkeys(data.keys(), False)
 
         try:
-            # Use pipeline for batch operations
-            pipe = self.cache.redis.pipeline()
-
-            for key, value in data.items():
-                cache_data = {
-                    "data": value,
-                    "cached_at": datetime.utcnow().isoformat(),
-                    "cache_version": "1.0",
-                }
-
-                cache_key = self.cache._cache_key(key)
-                cache_json = json.dumps(cache_data)
-                pipe.setex(cache_key, ttl, cache_json)
-
-            results = await pipe.execute()
-
-            # Build result status
-            return {key: result is True for key, result in zip(data.keys(), results)}
+            cached_at = datetime.utcnow().isoformat()
+            return await self.cache.tiered.set_many(
+                {
+                    key: {"data": value, "cached_at": cached_at, "cache_version": "1.0"}
+                    for key, value in data.items()
+                },
+                ttl,
+            )
 
         except Exception as e:
             logger.exception(f"Batch set error: {e!s}")
@@ -162,17 +274,12 @@ class CachePatterns:
                     results[key] = True
                     continue
 
-                # Load and cache data
-                data = await self._safe_call(loader_func)
+                # Load and cache data (shared with concurrent requests for the key)
+                data = await self._load_single_flight(key, loader_func, ttl)
+                results[key] = data is not None
 
                 if data is not None:
-                    success = await self.cache.set(key, {"data": data}, ttl)
-                    results[key] = success
-
-                    if success:
-                        logger.info(f"🔥 Warmed cache for key: {key}")
-                else:
-                    results[key] = False
+                    logger.info(f"🔥 Warmed cache for key: {key}")
 
             except Exception as e:
                 logger.exception(f"Cache warming failed for {key}: {e!s}")
@@ -181,45 +288,38 @@ class CachePatterns:
         return results
 
     async def invalidate_by_pattern(self, pattern: str) -> int:
-        """Invalidate keys matching pattern."""
+        """Invalidate keys matching pattern (incremental SCAN, safe on large keyspaces)."""
         if not self.cache or not self.cache.redis:
             return 0
 
         try:
-            # Find keys matching pattern
-            full_pattern = f"{self.cache.config.key_prefix}:{pattern}"
-            keys = await self.cache.redis.keys(full_pattern)
-
-            if keys:
-                deleted = await self.cache.redis.delete(*keys)
+            deleted = await self.cache.tiered.delete_pattern(pattern)
+            if deleted:
                 logger.info(f"🗑️ Invalidated {deleted} keys matching: {pattern}")
-                return deleted
-
-            return 0
+            return deleted
 
         except Exception as e:
             logger.exception(f"Pattern invalidation error: {e!s}")
             return 0
 
+    async def invalidate_tag(self, tag: str) -> int:
+        """Invalidate every key written with a tag (e.g. "patient:<uuid>")."""
+        if not self.cache:
+            return 0
+        return await self.cache.invalidate_tag(tag)
+
     async def refresh_ahead(self, key: str, loader_func: Callable, ttl: int = 3600):
-        """Refresh cache entry before expiration."""
+        """Refresh cache entry before expiration (skipped if a load is in flight)."""
         try:
-            # Schedule background refresh
-            task = asyncio.create_task(self._background_refresh(key, loader_func, ttl))
-            self._refresh_tasks.append(task)
-
-            # Clean up completed tasks
-            self._refresh_tasks = [t for t in self._refresh_tasks if not t.done()]
-
+            self._schedule_refresh(key, loader_func, ttl)
         except Exception as e:
             logger.exception(f"Refresh ahead error for {key}: {e!s}")
 
     async def _background_refresh(self, key: str, loader_func: Callable, ttl: int):
         """Background task to refresh cache entry."""
         try:
-            data = await self._safe_call(loader_func)
+            data = await self._load_single_flight(key, loader_func, ttl)
             if data is not None:
-                await self.cache.set(key, {"data": data}, ttl)
                 logger.debug(f"🔄 Refreshed cache for key: {key}")
 
         except Exception as e:
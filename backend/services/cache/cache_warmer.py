@@ -0,0 +1,259 @@
+"""Session Cache Warmer.
+====================
+
+Preloads session analytics into the cache so dashboard loads hit warm
+entries instead of cold PostgREST queries.
+
+A warming run selects sessions processed (updated_at) or opened
+(last_accessed_at) in the last N hours, skips those already cached, loads
+their emg_statistics rows with a few chunked `in` queries and stores every
+payload with one pipelined write.
+
+The scheduler runs warming every CACHE_WARM_INTERVAL_MINUTES on each worker;
+a Redis lease makes only one worker per interval do the work. Sessions
+processed by this worker are cached at the end of processing, so warming
+mainly covers other workers, evictions and expired entries.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from config import CACHE_WARM_INTERVAL_MINUTES, CACHE_WARM_LOOKBACK_HOURS, CACHE_WARM_MAX_SESSIONS
+from database.executor import run_db
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = "2.1"
+WARM_LEASE_NAME = "cache_warm"
+STATISTICS_CHUNK_SIZE = 100  # Session ids per emg_statistics `in` filter (URL length)
+INITIAL_DELAY_SECONDS = 30.0  # Let startup finish before the first run
+
+# emg_statistics columns that identify the row rather than describe the channel
+_STATISTICS_KEY_COLUMNS = ("id", "session_id", "channel_name")
+
+
+def build_session_cache_payload(
+    session_id: str, analytics: dict[str, Any], metadata: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Cached analytics entry for a session (processing and warming share this shape)."""
+    summary = {
+        "channels": list(analytics.keys()),
+        "total_channels": len(analytics),
+        "overall_compliance": 0.0,
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if analytics:
+        total_compliance = sum((channel.get("compliance_rate") or 0.0) for channel in analytics.values())
+        summary["overall_compliance"] = total_compliance / len(analytics)
+
+    return {
+        "session_id": session_id,
+        "analytics": analytics,
+        "summary": summary,
+        "metadata": metadata or {},
+        "cache_version": CACHE_VERSION,
+    }
+
+
+class SessionCacheWarmer:
+    """Warms the analytics cache for recently processed or accessed sessions."""
+
+    def __init__(
+        self,
+        supabase_client=None,
+        cache_service=None,
+        max_sessions: int = CACHE_WARM_MAX_SESSIONS,
+        lookback_hours: int = CACHE_WARM_LOOKBACK_HOURS,
+    ):
+        self._supabase_client = supabase_client
+        self._cache_service = cache_service
+        self.max_sessions = max_sessions
+        self.lookback_hours = lookback_hours
+
+        self.interval_minutes = 0
+        self.runs = 0
+        self.last_run: dict[str, Any] | None = None
+        self._task: asyncio.Task | None = None
+        self._running = asyncio.Lock()
+
+    @property
+    def supabase_client(self):
+        if self._supabase_client is None:
+            from database.supabase_client import get_supabase_client
+
+            self._supabase_client = get_supabase_client(use_service_key=True)
+        return self._supabase_client
+
+    @property
+    def cache_service(self):
+        if self._cache_service is None:
+            from services.cache.redis_cache_service import get_cache_service
+
+            self._cache_service = get_cache_service()
+        return self._cache_service
+
+    async def find_recent_sessions(self, hours: int) -> list[dict[str, Any]]:
+        """Sessions processed or accessed within the last hours, most recent first."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+        query = (
+            self.supabase_client.table("therapy_sessions")
+            .select("id, patient_id, session_code, session_date, file_path, processed_at")
+            .or_(f"updated_at.gte.{cutoff},last_accessed_at.gte.{cutoff}")
+            .order("updated_at", desc=True)
+            .limit(self.max_sessions)
+        )
+        response = await run_db(query.execute)
+        return response.data or []
+
+    async def load_statistics(self, session_ids: list[str]) -> dict[str, list[dict[str, Any]]]:
+        """emg_statistics rows grouped by session id (one query per chunk, chunks in parallel)."""
+        chunks = [
+            session_ids[start : start + STATISTICS_CHUNK_SIZE]
+            for start in range(0, len(session_ids), STATISTICS_CHUNK_SIZE)
+        ]
+        responses = await asyncio.gather(
+            *(
+                run_db(self.supabase_client.table("emg_statistics").select("*").in_("session_id", chunk).execute)
+                for chunk in chunks
+            )
+        )
+
+        rows_by_session: dict[str, list[dict[str, Any]]] = {}
+        for response in responses:
+            for row in response.data or []:
+                rows_by_session.setdefault(str(row["session_id"]), []).append(row)
+        return rows_by_session
+
+    @staticmethod
+    def build_payload(session: dict[str, Any], rows: list[dict[str, Any]]) -> dict[str, Any]:
+        """Cache payload for a session from its emg_statistics rows."""
+        analytics = {
+            row["channel_name"]: {
+                column: value for column, value in row.items() if column not in _STATISTICS_KEY_COLUMNS
+            }
+            for row in rows
+        }
+        metadata = {
+            column: session.get(column)
+            for column in ("session_code", "session_date", "file_path", "processed_at")
+            if session.get(column) is not None
+        }
+        payload = build_session_cache_payload(str(session["id"]), analytics, metadata)
+        payload["warmed"] = True
+        return payload
+
+    async def warm(self, hours: int | None = None) -> dict[str, Any]:
+        """Cache analytics for recent sessions that are not cached yet.
+
+        Args:
+            hours: Look back period (defaults to CACHE_WARM_LOOKBACK_HOURS)
+
+        Returns:
+            dict: sessions_found, already_cached, warmed, skipped_without_statistics,
+                duration_ms
+        """
+        hours = hours or self.lookback_hours
+        started = time.perf_counter()
+        async with self._running:
+            sessions = await self.find_recent_sessions(hours)
+            session_ids = [str(session["id"]) for session in sessions]
+            cached = await self.cache_service.acached_session_ids(session_ids)
+            pending = [session for session in sessions if str(session["id"]) not in cached]
+
+            rows_by_session = await self.load_statistics([str(session["id"]) for session in pending])
+            entries, patient_ids = {}, {}
+            for session in pending:
+                session_id = str(session["id"])
+                rows = rows_by_session.get(session_id)
+                if not rows:
+                    continue  # Not processed yet (or failed); nothing to serve
+                entries[session_id] = self.build_payload(session, rows)
+                patient_ids[session_id] = session.get("patient_id")
+
+            warmed = await self.cache_service.aset_many_session_analytics(entries, patient_ids)
+
+        summary = {
+            "hours": hours,
+            "sessions_found": len(sessions),
+            "already_cached": len(cached),
+            "warmed": warmed,
+            "skipped_without_statistics": len(pending) - len(entries),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.runs += 1
+        self.last_run = summary
+        logger.info(
+            f"🔥 Cache warming: {warmed} warmed, {len(cached)} already cached "
+            f"of {len(sessions)} sessions from the last {hours}h ({summary['duration_ms']} ms)"
+        )
+        return summary
+
+    async def _run_scheduled(self, initial_delay: float) -> None:
+        await asyncio.sleep(initial_delay)
+        while True:
+            interval_seconds = self.interval_minutes * 60
+            try:
+                if await self.cache_service.aacquire_lease(WARM_LEASE_NAME, interval_seconds):
+                    await self.warm()
+                else:
+                    logger.debug("Cache warming skipped - another worker holds the lease")
+            except Exception as e:
+                logger.exception(f"Scheduled cache warming failed: {e!s}")
+            await asyncio.sleep(interval_seconds)
+
+    def start(
+        self, interval_minutes: int = CACHE_WARM_INTERVAL_MINUTES, initial_delay: float = INITIAL_DELAY_SECONDS
+    ) -> bool:
+        """Schedule warming on the running event loop (restarts with the new interval).
+
+        Returns:
+            bool: True if scheduled, False if interval_minutes disables warming
+        """
+        self.stop()
+        if interval_minutes <= 0:
+            return False
+        self.interval_minutes = interval_minutes
+        self._task = asyncio.get_running_loop().create_task(self._run_scheduled(initial_delay))
+        logger.info(f"⏰ Cache warming scheduled every {interval_minutes} min")
+        return True
+
+    def stop(self) -> None:
+        """Cancel scheduled warming."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.interval_minutes = 0
+
+    @property
+    def scheduled(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def get_status(self) -> dict[str, Any]:
+        """Scheduler state and the last run summary for monitoring."""
+        return {
+            "scheduled": self.scheduled,
+            "interval_minutes": self.interval_minutes,
+            "lookback_hours": self.lookback_hours,
+            "max_sessions": self.max_sessions,
+            "running": self._running.locked(),
+            "runs": self.runs,
+            "last_run": self.last_run,
+        }
+
+
+# Singleton instance
+_warmer_instance: SessionCacheWarmer | None = None
+
+
+def get_cache_warmer() -> SessionCacheWarmer:
+    """Get singleton session cache warmer."""
+    global _warmer_instance
+
+    if _warmer_instance is None:
+        _warmer_instance = SessionCacheWarmer()
+
+    return _warmer_instance
@@ -0,0 +1,120 @@
+"""Cache Codec Benchmark.
+======================
+
+Encode/decode time and stored size of every registered cache codec for a
+synthetic session analytics payload: per-channel metrics, contractions and
+processed signals (RMS envelope, activated signal).
+
+JSON codecs receive the signals as lists, as they were cached before the
+binary codec; the msgpack codec receives NumPy arrays and stores them as
+raw buffers.
+
+Usage:
+    python -m services.cache.codec_benchmark --samples 120000 --iterations 20
+"""
+
+import argparse
+import time
+from typing import Any
+
+import numpy as np
+
+from services.cache.codecs import CacheCodec, available_codecs
+
+SAMPLING_RATE_HZ = 2000
+
+
+def build_analytics_payload(channels: int = 2, samples: int = 120_000, contractions: int = 24) -> dict[str, Any]:
+    """Session analytics shaped like the processor's output (deterministic)."""
+    rng = np.random.default_rng(0)
+    analytics: dict[str, Any] = {}
+    for index in range(1, channels + 1):
+        envelope = np.abs(rng.standard_normal(samples)).astype(np.float32) * 1e-4
+        duration_ms = samples / SAMPLING_RATE_HZ * 1000
+        starts = np.sort(rng.uniform(0, max(duration_ms - 2100.0, 0.0), contractions))
+        analytics[f"CH{index}"] = {
+            "contraction_count": contractions,
+            "good_contraction_count": int(contractions * 0.75),
+            "avg_duration_ms": 2150.0,
+            "max_amplitude": float(envelope.max()),
+            "rms": float(np.sqrt(np.mean(envelope**2))),
+            "mpf": 92.4,
+            "mdf": 81.7,
+            "contractions": [
+                {
+                    "start_time_ms": float(start),
+                    "end_time_ms": float(start + 2100.0),
+                    "duration_ms": 2100.0,
+                    "mean_amplitude": float(rng.uniform(5e-5, 1e-4)),
+                    "max_amplitude": float(rng.uniform(1e-4, 2e-4)),
+                    "is_good": bool(rng.random() > 0.25),
+                }
+                for start in starts
+            ],
+            "signals": {
+                "rms_envelope": envelope,
+                "activated": (rng.standard_normal(samples) * 1e-4).astype(np.float32),
+            },
+        }
+    return {"session_id": "benchmark", "analytics": analytics, "cache_version": "2.1"}
+
+
+def _with_lists(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: _with_lists(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_with_lists(item) for item in value]
+    return value
+
+
+def benchmark_codec(codec: CacheCodec, payload: Any, iterations: int = 10) -> dict[str, Any]:
+    """Median encode/decode time (ms) and encoded size for one codec."""
+    encode_ms, decode_ms = [], []
+    data = b""
+    for _ in range(iterations):
+        started = time.perf_counter()
+        data = codec.encode(payload)
+        encode_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        codec.decode(data)
+        decode_ms.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "codec": codec.name,
+        "size_bytes": len(data),
+        "encode_ms": round(float(np.median(encode_ms)), 3),
+        "decode_ms": round(float(np.median(decode_ms)), 3),
+    }
+
+
+def run_benchmark(channels: int = 2, samples: int = 120_000, iterations: int = 10) -> list[dict[str, Any]]:
+    """Benchmark every registered codec on the same payload."""
+    payload = build_analytics_payload(channels, samples)
+    list_payload = _with_lists(payload)
+    return [
+        benchmark_codec(codec, payload if codec.name == "msgpack" else list_payload, iterations)
+        for codec in available_codecs()
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cache codecs on a session analytics payload")
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--samples", type=int, default=120_000, help="Samples per signal (2 kHz)")
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.channels, args.samples, args.iterations)
+    print(f"{'codec':<12} {'size (KB)':>10} {'encode (ms)':>12} {'decode (ms)':>12}")
+    for result in results:
+        print(
+            f"{result['codec']:<12} {result['size_bytes'] / 1024:>10.1f} "
+            f"{result['encode_ms']:>12.2f} {result['decode_ms']:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
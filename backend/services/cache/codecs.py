@@ -0,0 +1,247 @@
+"""Cache Codecs
+============
+
+Pluggable value serialization for the tiered cache. A codec turns a Python
+value into the bytes stored in Redis (L2) and back. The in-process L1 keeps
+the same bytes and decodes them on every hit, so decode speed matters for
+hot keys too.
+
+Codecs are looked up by name with `get_codec`, so adapters and settings can
+pick one without importing its implementation.
+
+The `msgpack` codec (optional dependencies: msgpack, zstandard or lz4)
+stores NumPy arrays as raw buffers and compresses frames above a size
+threshold. It still reads values written by the JSON codecs, so switching
+CACHE_CODEC needs no cache flush. Compare codecs with:
+
+    python -m services.cache.codec_benchmark
+"""
+
+import gzip
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Protocol
+
+import numpy as np
+
+try:
+    import msgpack
+
+    HAS_MSGPACK = True
+except ImportError:
+    msgpack = None  # type: ignore
+    HAS_MSGPACK = False
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None  # type: ignore
+    HAS_ZSTD = False
+
+try:
+    import lz4.frame as lz4_frame
+
+    HAS_LZ4 = True
+except ImportError:
+    lz4_frame = None  # type: ignore
+    HAS_LZ4 = False
+
+from config import CACHE_COMPRESSION_THRESHOLD_BYTES
+
+logger = logging.getLogger(__name__)
+
+# msgpack frames start with a byte msgpack never emits (0xc1), so they cannot
+# be confused with JSON ('{', '[', ...) or gzip (0x1f 0x8b) values
+FRAME_MAGIC = b"\xc1MC"
+FRAME_RAW = 0
+FRAME_ZSTD = 1
+FRAME_LZ4 = 2
+NDARRAY_EXT_TYPE = 1
+
+
+class CacheCodec(Protocol):
+    """Serializer used for Redis (L2) values."""
+
+    name: str
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value to bytes."""
+        ...
+
+    def decode(self, data: bytes | str) -> Any:
+        """Deserialize bytes produced by `encode`."""
+        ...
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON fallback for NumPy values; anything else is stringified."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+class JsonCodec:
+    """Plain UTF-8 JSON (readable with redis-cli, compatible with legacy keys)."""
+
+    name = "json"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=_json_default).encode("utf-8")
+
+    def decode(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class GzipJsonCodec:
+    """Gzip-compressed JSON for large analytics payloads.
+
+    Values written before compression was enabled are decoded as plain JSON.
+    """
+
+    name = "gzip-json"
+
+    def __init__(self, compresslevel: int = 6):
+        self.compresslevel = compresslevel
+
+    def encode(self, value: Any) -> bytes:
+        return gzip.compress(
+            json.dumps(value, default=_json_default).encode("utf-8"), compresslevel=self.compresslevel
+        )
+
+    def decode(self, data: bytes | str) -> Any:
+        if isinstance(data, str):
+            return json.loads(data)
+        try:
+            data = gzip.decompress(data)
+        except gzip.BadGzipFile:
+            pass  # Stored uncompressed
+        return json.loads(data)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Encode NumPy arrays as ext types holding a [dtype, shape] header and the raw buffer."""
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            return obj.tolist()
+        array = np.ascontiguousarray(obj)
+        header = msgpack.packb([array.dtype.str, list(array.shape)])
+        return msgpack.ExtType(NDARRAY_EXT_TYPE, header + array.tobytes())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code != NDARRAY_EXT_TYPE:
+        return msgpack.ExtType(code, data)
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(data)
+    dtype, shape = unpacker.unpack()
+    # Zero-copy view over the payload (read-only, like every cached value)
+    return np.frombuffer(data, dtype=np.dtype(dtype), offset=unpacker.tell()).reshape(shape)
+
+
+class MsgpackCodec:
+    """msgpack with NumPy ext types, compressed with zstd (or lz4) above a threshold.
+
+    Frame layout: FRAME_MAGIC, one compression byte, then the msgpack payload.
+    Values without the magic are decoded as (gzip) JSON from older codecs.
+    """
+
+    name = "msgpack"
+
+    def __init__(
+        self,
+        compression: str | None = "auto",
+        threshold_bytes: int = CACHE_COMPRESSION_THRESHOLD_BYTES,
+        level: int = 3,
+    ):
+        """Initialize the codec.
+
+        Args:
+            compression: "zstd", "lz4", None, or "auto" for the best installed
+            threshold_bytes: Payloads smaller than this are stored uncompressed
+            level: zstd compression level
+        """
+        if not HAS_MSGPACK:
+            raise RuntimeError("msgpack is not installed")
+        if compression == "auto":
+            compression = "zstd" if HAS_ZSTD else "lz4" if HAS_LZ4 else None
+        if compression == "zstd" and not HAS_ZSTD:
+            raise RuntimeError("zstandard is not installed")
+        if compression == "lz4" and not HAS_LZ4:
+            raise RuntimeError("lz4 is not installed")
+        if compression not in ("zstd", "lz4", None):
+            raise ValueError(f"Unsupported compression: {compression!r}")
+
+        self.compression = compression
+        self.threshold_bytes = threshold_bytes
+        self.level = level
+        self._legacy = GzipJsonCodec()
+
+    def encode(self, value: Any) -> bytes:
+        payload = msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
+        if self.compression is None or len(payload) < self.threshold_bytes:
+            return FRAME_MAGIC + bytes([FRAME_RAW]) + payload
+        if self.compression == "zstd":
+            return FRAME_MAGIC + bytes([FRAME_ZSTD]) + zstandard.compress(payload, self.level)
+        return FRAME_MAGIC + bytes([FRAME_LZ4]) + lz4_frame.compress(payload)
+
+    def decode(self, data: bytes | str) -> Any:
+        if isinstance(data, str) or not data.startswith(FRAME_MAGIC):
+            return self._legacy.decode(data)
+
+        frame = data[len(FRAME_MAGIC)]
+        payload = memoryview(data)[len(FRAME_MAGIC) + 1 :]
+        if frame == FRAME_ZSTD:
+            payload = zstandard.decompress(payload)
+        elif frame == FRAME_LZ4:
+            payload = lz4_frame.decompress(payload)
+        elif frame != FRAME_RAW:
+            raise ValueError(f"Unknown cache frame type: {frame}")
+        return msgpack.unpackb(payload, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+
+
+_CODECS: dict[str, CacheCodec] = {
+    JsonCodec.name: JsonCodec(),
+    GzipJsonCodec.name: GzipJsonCodec(),
+}
+if HAS_MSGPACK:
+    _CODECS[MsgpackCodec.name] = MsgpackCodec()
+
+
+def register_codec(codec: CacheCodec) -> None:
+    """Make a codec available by name."""
+    _CODECS[codec.name] = codec
+
+
+def get_codec(name: str) -> CacheCodec:
+    """Look up a registered codec by name.
+
+    Raises:
+        ValueError: If no codec is registered under that name
+    """
+    try:
+        return _CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown cache codec: {name!r} (available: {sorted(_CODECS)})") from None
+
+
+def available_codecs() -> list[CacheCodec]:
+    """All registered codecs."""
+    return list(_CODECS.values())
+
+
+def resolve_codec(name: str, fallback: str = GzipJsonCodec.name) -> CacheCodec:
+    """Registered codec by name, or the fallback when its optional dependency is missing."""
+    if name in _CODECS:
+        return _CODECS[name]
+    logger.warning(f"Cache codec {name!r} unavailable - using {fallback!r}")
+    return get_codec(fallback)
@@ -2,23 +2,14 @@
 Fast, reliable caching with graceful fallback.
 """
 
-import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-try:
-    import redis.asyncio as redis
-    HAS_REDIS = True
-except ImportError:
-    redis = None  # type: ignore
-    HAS_REDIS = False
-
-from config import get_settings
+from services.cache.tiered_cache import HAS_REDIS, TieredCache
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
 
 
 @dataclass
@@ -32,6 +23,9 @@ class CacheConfig:
 class RedisCache:
     """Simple Redis cache service.
 
+    Adapter over `TieredCache` with the JSON codec, so reads of hot keys are
+    served from the in-process L1 and writes are invalidated on other workers.
+
     Features:
     - Fast memory-based cache operations
     - Automatic TTL management
@@ -41,135 +35,83 @@ class RedisCache:
 
     def __init__(self, config: CacheConfig | None = None):
         self.config = config or CacheConfig()
-        self.redis: redis.Redis | None = None
-        self._connection_pool = None
+        self.tiered = TieredCache(
+            key_prefix=self.config.key_prefix,
+            codec="json",
+            default_ttl_seconds=self.config.ttl_seconds,
+        )
+
+    @property
+    def redis(self):
+        """Redis (L2) client, or None when Redis is unavailable."""
+        return self.tiered.redis
 
     async def initialize(self):
         """Initialize Redis connection with graceful fallback."""
         if not HAS_REDIS:
             logger.warning("⚠️ Redis module not installed - cache disabled")
-            self.redis = None
             return
-            
-        try:
-            # Create connection pool
-            self._connection_pool = redis.ConnectionPool.from_url(
-                settings.REDIS_URL, decode_responses=True, max_connections=10, retry_on_timeout=True
-            )
-
-            # Create Redis client
-            self.redis = redis.Redis(connection_pool=self._connection_pool)
-
-            # Test connection
-            await self.redis.ping()
-            logger.info("✅ Redis cache connected")
-
-        except Exception as e:
-            logger.warning(f"⚠️ Redis unavailable: {e!s} - cache disabled")
-            self.redis = None
+        await self.tiered.initialize()
 
     async def close(self):
         """Close Redis connections."""
-        if self.redis:
-            await self.redis.close()
-        if self._connection_pool:
-            await self._connection_pool.disconnect()
+        await self.tiered.close()
 
     def _cache_key(self, key: str) -> str:
         """Generate cache key with prefix."""
-        return f"{self.config.key_prefix}:{key}"
+        return self.tiered.full_key(key)
 
     async def get(self, key: str) -> dict[str, Any] | None:
         """Get cached data."""
-        if not self.redis:
-            return None
-
         try:
-            cache_key = self._cache_key(key)
-            cached_json = await self.redis.get(cache_key)
-
-            if cached_json:
-                data = json.loads(cached_json)
-                logger.debug(f"Cache hit: {key}")
-                return data
-
-            logger.debug(f"Cache miss: {key}")
-            return None
-
+            return await self.tiered.get(key)
         except Exception as e:
             logger.exception(f"Cache get error: {e!s}")
             return None
 
-    async def set(self, key: str, data: dict[str, Any], ttl: int | None = None) -> bool:
-        """Set cached data with TTL."""
-        if not self.redis:
-            return False
-
+    async def set(
+        self, key: str, data: dict[str, Any], ttl: int | None = None, tags: list[str] | None = None
+    ) -> bool:
+        """Set cached data with TTL, indexed under optional tags."""
         try:
-            # Prepare cache data
             cache_data = {
                 **data,
                 "cached_at": datetime.utcnow().isoformat(),
                 "cache_version": "1.0",
             }
-
-            # Validate size (100MB limit)
-            data_json = json.dumps(cache_data)
-            size_mb = len(data_json.encode("utf-8")) / (1024 * 1024)
-            if size_mb > 100:
-                logger.warning(f"Data too large: {size_mb:.2f}MB")
-                return False
-
-            # Store with TTL
-            cache_key = self._cache_key(key)
-            ttl_seconds = ttl or self.config.ttl_seconds
-
-            result = await self.redis.setex(cache_key, ttl_seconds, data_json)
-
-            if result:
-                logger.debug(f"Cache set: {key}")
-                return True
-
+            return await self.tiered.set(key, cache_data, ttl or self.config.ttl_seconds, tags)
         except Exception as e:
             logger.exception(f"Cache set error: {e!s}")
-
-        return False
+            return False
 
     async def delete(self, key: str) -> bool:
         """Delete cached data."""
-        if not self.redis:
-            return False
-
         try:
-            cache_key = self._cache_key(key)
-            result = await self.redis.delete(cache_key)
-
-            if result > 0:
-                logger.debug(f"Cache deleted: {key}")
-                return True
-
+            return await self.tiered.delete(key)
         except Exception as e:
             logger.exception(f"Cache delete error: {e!s}")
+            return False
 
-        return False
+    async def invalidate_tag(self, tag: str) -> int:
+        """Delete every key set with a tag; returns the number deleted."""
+        try:
+            return await self.tiered.invalidate_tag(tag)
+        except Exception as e:
+            logger.exception(f"Cache tag invalidation error: {e!s}")
+            return 0
 
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
-        if not self.redis:
-            return False
-
         try:
-            cache_key = self._cache_key(key)
-            return await self.redis.exists(cache_key) > 0
-
+            return await self.tiered.exists(key)
         except Exception as e:
             logger.exception(f"Cache exists error: {e!s}")
             return False
 
     async def get_stats(self) -> dict[str, Any]:
-        """Get cache statistics."""
+        """Get cache statistics (Redis server counters plus per-tier metrics)."""
         if not self.redis:
-            return {"status": "unavailable"}
+            return {"status": "unavailable", "tiers": self.tiered.get_stats()}
 
         try:
             info = await self.redis.info()
@@ -191,6 +133,7 @@ class RedisCache:
                     "ttl_seconds": self.config.ttl_seconds,
                     "key_prefix": self.config.key_prefix,
                 },
+                "tiers": self.tiered.get_stats(),
             }
 
         except Exception as e:
@@ -210,7 +153,7 @@ class RedisCache:
             result = await self.redis.get(test_key)
             await self.redis.delete(test_key)
 
-            if result == "test_value":
+            if result in (b"test_value", "test_value"):
                 return {"healthy": True, "message": "All operations working"}
             else:
                 return {"healthy": False, "error": "Test operation failed"}
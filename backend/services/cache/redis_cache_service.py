@@ -17,37 +17,42 @@
 - Key Pattern: "session:{session_id}:analytics"
 - Value: JSON serialized analytics data with metadata
 - TTL: 24 hours default (configurable)
-- Compression: Optional gzip compression for large payloads
+- Compression: msgpack + zstd/lz4 frames (CACHE_CODEC), gzip JSON without msgpack
 
 ⚡ PERFORMANCE:
 - ~100x faster than database queries for analytics retrieval
 - Automatic cache warming for recently processed sessions
 - Hit rate monitoring and cache statistics
 - Memory-efficient with configurable size limits
+- Adapter over the async TieredCache: hot sessions are served from the
+  in-process L1, and async callers use the `a*` methods so they never block
+  the event loop
 
 """
 
-import gzip
-import json
+import asyncio
 import logging
-from contextlib import contextmanager
+import threading
+import time
+from collections.abc import Coroutine
+from concurrent.futures import Future
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from typing import Any
 
 try:
-    import redis
-    from redis import ConnectionPool, Redis
+    import redis.asyncio as redis
 
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
-    Redis = None
-    ConnectionPool = None
+    redis = None
 
 from config import (
+    CACHE_CODEC,
     DEFAULT_CACHE_TTL_HOURS,
     ENABLE_REDIS_COMPRESSION,
+    PROCESSING_VERSION,
     REDIS_CONNECTION_POOL_SIZE,
     REDIS_DB,
     REDIS_HOST,
@@ -60,9 +65,26 @@ from config import (
     REDIS_SSL,
     REDIS_URL,
 )
+from services.cache.codecs import resolve_codec
+from services.cache.tiered_cache import TieredCache
 
 logger = logging.getLogger(__name__)
 
+OPERATION_TIMEOUT_SECONDS = 30.0
+
+# Every cached session entry is tagged so invalidation and listing never walk the keyspace
+SESSION_INDEX_TAG = "sessions"
+
+
+def session_cache_tags(
+    session_id: str, patient_id: str | None = None, processing_version: str = PROCESSING_VERSION
+) -> list[str]:
+    """Tags for a session's cache entries (session, patient, processing version, index)."""
+    tags = [f"session:{session_id}", f"version:{processing_version}", SESSION_INDEX_TAG]
+    if patient_id:
+        tags.append(f"patient:{patient_id}")
+    return tags
+
 
 @dataclass
 class CacheStats:
@@ -127,6 +149,34 @@ class CacheEntry:
         )
 
 
+class _CacheLoop:
+    """Private event loop thread that drives the async tiered cache.
+
+    Sync callers block on `run`; async callers await `wrap`, which only
+    suspends their own event loop while the operation runs here.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="redis-cache-service", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: float = OPERATION_TIMEOUT_SECONDS) -> Any:
+        return self.submit(coro).result(timeout)
+
+    async def wrap(self, coro: Coroutine) -> Any:
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+
 class RedisCacheService:
     """High-performance Redis cache service for EMG analytics data.
 
@@ -136,6 +186,10 @@ class RedisCacheService:
     - Automatic TTL-based expiration
     - Cache statistics and monitoring
     - Graceful fallback when Redis unavailable
+
+    Sync methods keep the historical API; `aset_session_analytics`,
+    `aget_session_analytics` and `adelete_session_analytics` are the
+    non-blocking equivalents for async code.
     """
 
     def __init__(
@@ -148,9 +202,9 @@ class RedisCacheService:
         """Initialize Redis cache service.
 
         Args:
-            redis_url: Redis connection URL (falls back to config)
+            redis_url: Redis connection URL (falls back to host/port config)
             default_ttl_hours: Default TTL for cache entries
-            enable_compression: Enable gzip compression for large payloads
+            enable_compression: Store compact binary frames (CACHE_CODEC) instead of plain JSON
             key_prefix: Prefix for all Redis keys
         """
         self.redis_url = redis_url or REDIS_URL
@@ -159,16 +213,44 @@ class RedisCacheService:
         self.key_prefix = key_prefix
         self.stats = CacheStats(last_reset=datetime.now(timezone.utc))
 
-        # Redis client and connection pool
-        self._redis: Redis | None = None
-        self._connection_pool: ConnectionPool | None = None
+        self.cache = TieredCache(
+            key_prefix=key_prefix,
+            codec=resolve_codec(CACHE_CODEC) if enable_compression else "json",
+            default_ttl_seconds=self.default_ttl_seconds,
+            redis_url=redis_url,
+            connection_options=None if redis_url else self._connection_options(),
+        )
+        self._loop = _CacheLoop()
         self._connected = False
 
         # Initialize Redis connection
         self._initialize_redis()
 
+    @staticmethod
+    def _connection_options() -> dict[str, Any] | None:
+        """Connection pool arguments from the REDIS_* host settings."""
+        if not REDIS_AVAILABLE:
+            return None
+
+        connection_args = {
+            "host": REDIS_HOST,
+            "port": REDIS_PORT,
+            "db": REDIS_DB,
+            "password": REDIS_PASSWORD,
+            "socket_timeout": REDIS_SOCKET_TIMEOUT,
+            "max_connections": REDIS_CONNECTION_POOL_SIZE,
+            "retry_on_timeout": REDIS_RETRY_ON_TIMEOUT,
+        }
+
+        # Add SSL configuration if enabled
+        if REDIS_SSL:
+            connection_args["connection_class"] = redis.SSLConnection
+            connection_args["ssl_cert_reqs"] = "none"  # Use 'required' in production with certs
+
+        return connection_args
+
     def _initialize_redis(self) -> None:
-        """Initialize Redis connection with retry logic."""
+        """Initialize Redis connection with graceful fallback."""
         if not REDIS_AVAILABLE:
             logger.warning(
                 "⚠️ Redis library not available. Cache service will operate in fallback mode."
@@ -176,110 +258,115 @@ class RedisCacheService:
             return
 
         try:
-            # Build connection arguments
-            connection_args = {
-                "host": REDIS_HOST,
-                "port": REDIS_PORT,
-                "db": REDIS_DB,
-                "password": REDIS_PASSWORD,
-                "socket_timeout": REDIS_SOCKET_TIMEOUT,
-                "max_connections": REDIS_CONNECTION_POOL_SIZE,
-                "retry_on_timeout": REDIS_RETRY_ON_TIMEOUT,
-            }
-
-            # Add SSL configuration if enabled
-            if REDIS_SSL:
-                connection_args["connection_class"] = redis.SSLConnection
-                connection_args["ssl_cert_reqs"] = "none"  # Use 'required' in production with certs
-
-            # Create connection pool for better performance
-            self._connection_pool = ConnectionPool(**connection_args)
-
-            # Create Redis client
-            self._redis = Redis(connection_pool=self._connection_pool)
-
-            # Test connection
-            self._redis.ping()
-            self._connected = True
-
-            logger.info("✅ Redis cache service initialized successfully")
-            logger.info(f"   Host: {REDIS_HOST}:{REDIS_PORT} | DB: {REDIS_DB}")
-            logger.info(
-                f"   TTL: {self.default_ttl_seconds}s | Compression: {self.enable_compression}"
-            )
-
-            # Set Redis memory policy if specified
-            if REDIS_MAX_MEMORY_POLICY:
-                try:
-                    self._redis.config_set("maxmemory-policy", REDIS_MAX_MEMORY_POLICY)
-                    logger.info(f"   Memory Policy: {REDIS_MAX_MEMORY_POLICY}")
-                except Exception as e:
-                    logger.warning(f"Failed to set Redis memory policy: {e}")
-
+            self._loop.run(self.cache.initialize())
         except Exception as e:
             logger.exception(f"❌ Failed to initialize Redis connection: {e!s}")
-            logger.warning("🔄 Cache service will operate in fallback mode (no caching)")
-            self._connected = False
-
-    @contextmanager
-    def _safe_redis_operation(self, operation_name: str):
-        """Context manager for safe Redis operations with error handling."""
-        if not self._connected or not self._redis:
-            yield None
+
+        self._connected = self.cache.redis is not None
+        if not self._connected:
+            logger.warning("🔄 Cache service will serve from the in-process cache only")
             return
 
-        try:
-            yield self._redis
-        except Exception as e:
-            logger.exception(f"Redis {operation_name} failed: {e!s}")
-            self.stats.errors += 1
-            # Consider reconnection logic here if needed
-            yield None
+        logger.info("✅ Redis cache service initialized successfully")
+        logger.info(f"   TTL: {self.default_ttl_seconds}s | Compression: {self.enable_compression}")
+
+        # Set Redis memory policy if specified
+        if REDIS_MAX_MEMORY_POLICY:
+            try:
+                self._loop.run(self.cache.redis.config_set("maxmemory-policy", REDIS_MAX_MEMORY_POLICY))
+                logger.info(f"   Memory Policy: {REDIS_MAX_MEMORY_POLICY}")
+            except Exception as e:
+                logger.warning(f"Failed to set Redis memory policy: {e}")
+
+    def _cache_suffix_key(self, session_id: str, suffix: str = "analytics") -> str:
+        """Tiered cache key (without prefix) for a session entry."""
+        return f"session:{session_id}:{suffix}"
 
     def _generate_cache_key(self, session_id: str, suffix: str = "analytics") -> str:
         """Generate standardized cache key."""
-        return f"{self.key_prefix}:session:{session_id}:{suffix}"
-
-    def _compress_data(self, data: bytes) -> bytes:
-        """Compress data using gzip if enabled."""
-        if not self.enable_compression:
-            return data
-        return gzip.compress(data)
-
-    def _decompress_data(self, data: bytes) -> bytes:
-        """Decompress gzip data if compressed."""
-        if not self.enable_compression:
-            return data
-        try:
-            return gzip.decompress(data)
-        except gzip.BadGzipFile:
-            # Data wasn't compressed, return as-is
-            return data
+        return self.cache.full_key(self._cache_suffix_key(session_id, suffix))
 
-    def _serialize_entry(self, entry: CacheEntry) -> bytes:
-        """Serialize cache entry to bytes with optional compression."""
-        json_data = json.dumps(entry.to_dict()).encode("utf-8")
-        entry.data_size_bytes = len(json_data)
+    def _record_lookup(self, hit: bool) -> None:
+        if hit:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        self.stats.update_hit_rate()
 
-        if self.enable_compression:
-            compressed_data = self._compress_data(json_data)
-            entry.compression_enabled = True
-            return compressed_data
+    # Coroutines below run on the private cache loop
 
-        return json_data
+    async def _set_entry(
+        self, session_id: str, analytics_data: dict[str, Any], ttl_seconds: int, patient_id: str | None
+    ) -> bool:
+        now = datetime.now(timezone.utc)
+        cache_entry = CacheEntry(
+            session_id=session_id, data=analytics_data, created_at=now, last_accessed=now,
+            compression_enabled=self.enable_compression,
+        )
+        result = await self.cache.set(
+            self._cache_suffix_key(session_id),
+            cache_entry.to_dict(),
+            ttl_seconds,
+            tags=session_cache_tags(session_id, patient_id or analytics_data.get("patient_id")),
+        )
+        if result:
+            self.stats.sets += 1
+            logger.debug(f"📦 Cached analytics for session {session_id} (TTL: {ttl_seconds}s)")
+        return result
+
+    async def _set_entries(
+        self, entries: dict[str, dict[str, Any]], ttl_seconds: int, patient_ids: dict[str, str | None]
+    ) -> int:
+        now = datetime.now(timezone.utc)
+        items = {
+            self._cache_suffix_key(session_id): CacheEntry(
+                session_id=session_id, data=data, created_at=now, last_accessed=now,
+                compression_enabled=self.enable_compression,
+            ).to_dict()
+            for session_id, data in entries.items()
+        }
+        key_tags = {
+            self._cache_suffix_key(session_id): session_cache_tags(
+                session_id, patient_ids.get(session_id) or data.get("patient_id")
+            )
+            for session_id, data in entries.items()
+        }
+        results = await self.cache.set_many(items, ttl_seconds, key_tags=key_tags)
+        stored = sum(results.values())
+        self.stats.sets += stored
+        return stored
+
+    async def _get_entry(self, session_id: str) -> dict[str, Any] | None:
+        entry_dict = await self.cache.get(self._cache_suffix_key(session_id))
+        if entry_dict is None:
+            self._record_lookup(hit=False)
+            logger.debug(f"📭 Cache miss for session {session_id}")
+            return None
 
-    def _deserialize_entry(self, data: bytes) -> CacheEntry | None:
-        """Deserialize bytes to cache entry with decompression."""
         try:
-            decompressed_data = self._decompress_data(data)
-            entry_dict = json.loads(decompressed_data.decode("utf-8"))
-            return CacheEntry.from_dict(entry_dict)
-        except Exception as e:
-            logger.exception(f"Failed to deserialize cache entry: {e!s}")
+            cache_entry = CacheEntry.from_dict(entry_dict)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Invalid cache entry for session {session_id}: {e!s}")
+            self._record_lookup(hit=False)
             return None
 
+        self._record_lookup(hit=True)
+        logger.debug(f"📬 Cache hit for session {session_id}")
+        return cache_entry.data
+
+    async def _delete_entry(self, session_id: str) -> bool:
+        result = await self.cache.delete(self._cache_suffix_key(session_id))
+        if result:
+            self.stats.deletes += 1
+            logger.debug(f"🗑️ Deleted cached analytics for session {session_id}")
+        return result
+
     def set_session_analytics(
-        self, session_id: str, analytics_data: dict[str, Any], ttl_hours: int | None = None
+        self,
+        session_id: str,
+        analytics_data: dict[str, Any],
+        ttl_hours: int | None = None,
+        patient_id: str | None = None,
     ) -> bool:
         """Cache session analytics data.
 
@@ -287,6 +374,8 @@ class RedisCacheService:
             session_id: Therapy session UUID
             analytics_data: EMG analytics data to cache
             ttl_hours: Optional custom TTL (uses default if None)
+            patient_id: Patient UUID for patient-wide invalidation
+                (falls back to analytics_data["patient_id"])
 
         Returns:
             bool: True if cached successfully, False otherwise
@@ -296,35 +385,78 @@ class RedisCacheService:
             return False
 
         ttl_seconds = (ttl_hours * 3600) if ttl_hours else self.default_ttl_seconds
-        cache_key = self._generate_cache_key(session_id)
+        try:
+            return self._loop.run(self._set_entry(session_id, analytics_data, ttl_seconds, patient_id))
+        except Exception as e:
+            logger.exception(f"Failed to cache session analytics: {e!s}")
+            self.stats.errors += 1
+            return False
+
+    async def aset_session_analytics(
+        self,
+        session_id: str,
+        analytics_data: dict[str, Any],
+        ttl_hours: int | None = None,
+        patient_id: str | None = None,
+    ) -> bool:
+        """Async variant of `set_session_analytics` (does not block the event loop)."""
+        if not session_id or not analytics_data:
+            logger.warning("Cannot cache empty session_id or analytics_data")
+            return False
 
+        ttl_seconds = (ttl_hours * 3600) if ttl_hours else self.default_ttl_seconds
         try:
-            # Create cache entry with metadata
-            now = datetime.now(timezone.utc)
-            cache_entry = CacheEntry(
-                session_id=session_id, data=analytics_data, created_at=now, last_accessed=now
-            )
+            return await self._loop.wrap(self._set_entry(session_id, analytics_data, ttl_seconds, patient_id))
+        except Exception as e:
+            logger.exception(f"Failed to cache session analytics: {e!s}")
+            self.stats.errors += 1
+            return False
 
-            # Serialize and store
-            with self._safe_redis_operation("SET") as redis_client:
-                if redis_client is None:
-                    return False
+    async def aset_many_session_analytics(
+        self,
+        entries: dict[str, dict[str, Any]],
+        patient_ids: dict[str, str | None] | None = None,
+        ttl_hours: int | None = None,
+    ) -> int:
+        """Cache analytics for many sessions with one pipelined write.
 
-                serialized_data = self._serialize_entry(cache_entry)
-                result = redis_client.setex(cache_key, ttl_seconds, serialized_data)
+        Args:
+            entries: session_id -> analytics data
+            patient_ids: Optional session_id -> patient UUID for invalidation tags
+            ttl_hours: Optional custom TTL (uses default if None)
 
-                if result:
-                    self.stats.sets += 1
-                    logger.debug(
-                        f"📦 Cached analytics for session {session_id} (TTL: {ttl_seconds}s)"
-                    )
-                    return True
+        Returns:
+            int: Number of sessions cached
+        """
+        entries = {session_id: data for session_id, data in entries.items() if session_id and data}
+        if not entries:
+            return 0
 
+        ttl_seconds = (ttl_hours * 3600) if ttl_hours else self.default_ttl_seconds
+        try:
+            return await self._loop.wrap(self._set_entries(entries, ttl_seconds, patient_ids or {}))
         except Exception as e:
-            logger.exception(f"Failed to cache session analytics: {e!s}")
+            logger.exception(f"Failed to cache session analytics batch: {e!s}")
             self.stats.errors += 1
+            return 0
 
-        return False
+    async def acached_session_ids(self, session_ids: list[str]) -> set[str]:
+        """Subset of session_ids that already have cached analytics."""
+        keys = {self._cache_suffix_key(session_id): session_id for session_id in session_ids}
+        try:
+            cached = await self._loop.wrap(self.cache.exists_many(list(keys)))
+        except Exception as e:
+            logger.warning(f"Failed to check cached sessions: {e!s}")
+            return set()
+        return {keys[key] for key in cached}
+
+    async def aacquire_lease(self, name: str, ttl_seconds: float) -> bool:
+        """Take a cross-worker lease so periodic jobs run on one worker at a time."""
+        try:
+            return await self._loop.wrap(self.cache.acquire_lease(name, ttl_seconds))
+        except Exception as e:
+            logger.warning(f"Failed to acquire cache lease {name}: {e!s}")
+            return True
 
     def get_session_analytics(self, session_id: str) -> dict[str, Any] | None:
         """Retrieve cached session analytics data.
@@ -338,57 +470,24 @@ class RedisCacheService:
         if not session_id:
             return None
 
-        cache_key = self._generate_cache_key(session_id)
-
         try:
-            with self._safe_redis_operation("GET") as redis_client:
-                if redis_client is None:
-                    self.stats.misses += 1
-                    self.stats.update_hit_rate()
-                    return None
-
-                cached_data = redis_client.get(cache_key)
-
-                if cached_data is None:
-                    self.stats.misses += 1
-                    self.stats.update_hit_rate()
-                    logger.debug(f"📭 Cache miss for session {session_id}")
-                    return None
-
-                # Deserialize cache entry
-                cache_entry = self._deserialize_entry(cached_data)
-                if cache_entry is None:
-                    self.stats.misses += 1
-                    self.stats.update_hit_rate()
-                    return None
-
-                # Update access statistics in cache entry
-                cache_entry.last_accessed = datetime.now(timezone.utc)
-                cache_entry.access_count += 1
-
-                # Update cache entry with new access stats (fire and forget)
-                try:
-                    updated_data = self._serialize_entry(cache_entry)
-                    redis_client.setex(cache_key, self.default_ttl_seconds, updated_data)
-                except Exception as e:
-                    # Non-critical operation - log but don't fail
-                    logger.debug("Failed to update cache access stats for session %s: %s", session_id, e)
-
-                self.stats.hits += 1
-                self.stats.update_hit_rate()
-                logger.debug(
-                    f"📬 Cache hit for session {session_id} (accessed {cache_entry.access_count} times)"
-                )
-
-                return cache_entry.data
-
+            return self._loop.run(self._get_entry(session_id))
         except Exception as e:
             logger.exception(f"Failed to retrieve cached analytics: {e!s}")
             self.stats.errors += 1
-            self.stats.misses += 1
-            self.stats.update_hit_rate()
+            return None
 
-        return None
+    async def aget_session_analytics(self, session_id: str) -> dict[str, Any] | None:
+        """Async variant of `get_session_analytics` (does not block the event loop)."""
+        if not session_id:
+            return None
+
+        try:
+            return await self._loop.wrap(self._get_entry(session_id))
+        except Exception as e:
+            logger.exception(f"Failed to retrieve cached analytics: {e!s}")
+            self.stats.errors += 1
+            return None
 
     def delete_session_analytics(self, session_id: str) -> bool:
         """Delete cached session analytics.
@@ -402,25 +501,53 @@ class RedisCacheService:
         if not session_id:
             return False
 
-        cache_key = self._generate_cache_key(session_id)
+        try:
+            return self._loop.run(self._delete_entry(session_id))
+        except Exception as e:
+            logger.exception(f"Failed to delete cached analytics: {e!s}")
+            self.stats.errors += 1
+            return False
+
+    async def adelete_session_analytics(self, session_id: str) -> bool:
+        """Async variant of `delete_session_analytics` (does not block the event loop)."""
+        if not session_id:
+            return False
 
         try:
-            with self._safe_redis_operation("DELETE") as redis_client:
-                if redis_client is None:
-                    return False
+            return await self._loop.wrap(self._delete_entry(session_id))
+        except Exception as e:
+            logger.exception(f"Failed to delete cached analytics: {e!s}")
+            self.stats.errors += 1
+            return False
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Delete every cached entry written with a tag.
 
-                result = redis_client.delete(cache_key)
+        Args:
+            tag: e.g. "patient:<uuid>", "session:<uuid>" or "version:2.1.0"
 
-                if result:
-                    self.stats.deletes += 1
-                    logger.debug(f"🗑️ Deleted cached analytics for session {session_id}")
-                    return True
+        Returns:
+            int: Number of entries deleted
+        """
+        try:
+            return self._loop.run(self.cache.invalidate_tag(tag))
+        except Exception as e:
+            logger.exception(f"Failed to invalidate cache tag {tag}: {e!s}")
+            self.stats.errors += 1
+            return 0
 
+    async def ainvalidate_tag(self, tag: str) -> int:
+        """Async variant of `invalidate_tag` (does not block the event loop)."""
+        try:
+            return await self._loop.wrap(self.cache.invalidate_tag(tag))
         except Exception as e:
-            logger.exception(f"Failed to delete cached analytics: {e!s}")
+            logger.exception(f"Failed to invalidate cache tag {tag}: {e!s}")
             self.stats.errors += 1
+            return 0
 
-        return False
+    def invalidate_patient(self, patient_id: str) -> int:
+        """Delete every cached session entry of a patient."""
+        return self.invalidate_tag(f"patient:{patient_id}")
 
     def get_cache_stats(self) -> dict[str, Any]:
         """Get comprehensive cache statistics.
@@ -432,20 +559,19 @@ class RedisCacheService:
 
         # Get Redis server info if available
         redis_info = {}
-        try:
-            with self._safe_redis_operation("INFO") as redis_client:
-                if redis_client is not None:
-                    info = redis_client.info()
-                    redis_info = {
-                        "redis_version": info.get("redis_version"),
-                        "used_memory_human": info.get("used_memory_human"),
-                        "connected_clients": info.get("connected_clients"),
-                        "total_commands_processed": info.get("total_commands_processed"),
-                        "uptime_in_seconds": info.get("uptime_in_seconds"),
-                    }
-        except Exception as e:
-            # Redis info unavailable - log but continue with partial health info
-            logger.debug("Failed to retrieve Redis server info: %s", e)
+        if self.cache.redis is not None:
+            try:
+                info = self._loop.run(self.cache.redis.info())
+                redis_info = {
+                    "redis_version": info.get("redis_version"),
+                    "used_memory_human": info.get("used_memory_human"),
+                    "connected_clients": info.get("connected_clients"),
+                    "total_commands_processed": info.get("total_commands_processed"),
+                    "uptime_in_seconds": info.get("uptime_in_seconds"),
+                }
+            except Exception as e:
+                # Redis info unavailable - log but continue with partial health info
+                logger.debug("Failed to retrieve Redis server info: %s", e)
 
         return {
             "cache_service": {
@@ -455,6 +581,7 @@ class RedisCacheService:
                 "key_prefix": self.key_prefix,
             },
             "performance_stats": asdict(self.stats),
+            "tiers": self.cache.get_stats(),
             "redis_server": redis_info,
         }
 
@@ -464,7 +591,7 @@ class RedisCacheService:
         logger.info("📊 Cache statistics reset")
 
     def warm_cache_for_recent_sessions(self, hours: int = 24) -> int:
-        """Warm cache with recently processed sessions (requires database integration).
+        """Warm cache with sessions processed or accessed in the last hours.
 
         Args:
             hours: Look back period in hours
@@ -472,36 +599,31 @@ class RedisCacheService:
         Returns:
             int: Number of sessions warmed
         """
-        # This would integrate with repository services to pre-load recent sessions
-        # Implementation depends on database service integration
+        from services.cache.cache_warmer import SessionCacheWarmer
+
         logger.info(f"🔥 Cache warming requested for sessions from last {hours} hours")
-        return 0
+        summary = self._loop.run(SessionCacheWarmer(cache_service=self).warm(hours), timeout=None)
+        return summary["warmed"]
 
     def get_cached_session_list(self) -> list[str]:
         """Get list of all cached session IDs.
 
+        Reads the session index set (SSCAN) instead of matching the keyspace,
+        and prunes index members whose entry has expired.
+
         Returns:
             list: Session IDs that have cached data
         """
         session_ids = []
+        if self.cache.redis is None:
+            return session_ids
 
         try:
-            with self._safe_redis_operation("KEYS") as redis_client:
-                if redis_client is None:
-                    return session_ids
-
-                pattern = f"{self.key_prefix}:session:*:analytics"
-                keys = redis_client.keys(pattern)
-
-                # Extract session IDs from keys
-                for key in keys:
-                    if isinstance(key, bytes):
-                        key = key.decode("utf-8")
-
-                    # Parse session ID from key pattern
-                    parts = key.split(":")
-                    if len(parts) >= 3:
-                        session_ids.append(parts[2])  # session ID is 3rd part
+            keys = self._loop.run(self.cache.tag_members(SESSION_INDEX_TAG, live_only=True))
+            key_start = self.cache.full_key("session:")
+            for key in keys:
+                if key.startswith(key_start) and key.endswith(":analytics"):
+                    session_ids.append(key[len(key_start) : -len(":analytics")])
 
         except Exception as e:
             logger.exception(f"Failed to retrieve cached session list: {e!s}")
@@ -532,19 +654,19 @@ class RedisCacheService:
 
         # Test Redis connectivity
         try:
-            with self._safe_redis_operation("PING") as redis_client:
-                if redis_client is not None:
-                    response = redis_client.ping()
-                    health_status["checks"]["redis_connection"] = {
-                        "status": "pass" if response else "fail",
-                        "response_time_ms": 0,  # Could add timing here
-                    }
-                else:
-                    health_status["checks"]["redis_connection"] = {
-                        "status": "fail",
-                        "error": "Redis client not available",
-                    }
-                    health_status["status"] = "degraded"
+            if self.cache.redis is not None:
+                started = time.perf_counter()
+                response = self._loop.run(self.cache.redis.ping())
+                health_status["checks"]["redis_connection"] = {
+                    "status": "pass" if response else "fail",
+                    "response_time_ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+            else:
+                health_status["checks"]["redis_connection"] = {
+                    "status": "fail",
+                    "error": "Redis client not available",
+                }
+                health_status["status"] = "degraded"
         except Exception as e:
             health_status["checks"]["redis_connection"] = {"status": "fail", "error": str(e)}
             health_status["status"] = "unhealthy"
@@ -562,11 +684,12 @@ class RedisCacheService:
     def close(self) -> None:
         """Cleanup Redis connections."""
         try:
-            if self._connection_pool:
-                self._connection_pool.disconnect()
+            self._loop.run(self.cache.close())
             logger.info("🔌 Redis cache service connections closed")
         except Exception as e:
             logger.exception(f"Error closing Redis connections: {e!s}")
+        finally:
+            self._loop.stop()
 
 
 # Global cache service instance (singleton pattern)
@@ -0,0 +1,698 @@
+"""Tiered Cache - in-process LRU (L1) in front of Redis (L2).
+===========================================================
+
+One async cache subsystem shared by the `RedisCache` and
+`RedisCacheService` adapters:
+
+- L1 is a bounded LRU of encoded values living in the worker process. It is
+  limited by entry count and by the size of its values, and every entry
+  expires after `l1_ttl_seconds` (or sooner, with its Redis TTL). Hot reads
+  are answered from memory without a network hop; each one decodes its own
+  copy, so callers may mutate what they get without touching the cache.
+- L2 is Redis through `redis.asyncio`, so async routes never block the event
+  loop. Values are serialized by a pluggable codec (see `codecs.py`).
+- Writes and deletes publish the affected keys on INVALIDATION_CHANNEL; the
+  other uvicorn workers drop them from their L1. Workers that miss a message
+  (Redis restart, listener reconnecting) serve stale data for at most the L1
+  TTL.
+
+Writes can carry tags (session, patient, processing version). Each tag is
+a Redis set of the keys written with it, maintained in the same pipeline as
+the write, so invalidating a patient reads one set instead of walking the
+keyspace. Pattern operations use incremental SCAN, never KEYS.
+
+Without Redis the cache keeps working as a per-worker L1.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import uuid4
+
+try:
+    import redis.asyncio as redis
+
+    HAS_REDIS = True
+except ImportError:
+    redis = None  # type: ignore
+    HAS_REDIS = False
+
+from config import (
+    CACHE_L1_MAX_ENTRIES,
+    CACHE_L1_MAX_MB,
+    CACHE_L1_TTL_SECONDS,
+    REDIS_CACHE_TTL_SECONDS,
+    REDIS_KEY_PREFIX,
+    REDIS_URL,
+)
+from services.cache.codecs import CacheCodec, get_codec
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = f"{REDIS_KEY_PREFIX}cache:invalidate"
+MAX_VALUE_BYTES = 100 * 1024 * 1024  # Redis values above 100MB are refused
+SCAN_COUNT = 1000  # Keys per SCAN/SSCAN step
+DELETE_CHUNK_SIZE = 500  # Keys per UNLINK
+
+_MISSING = object()
+
+
+@dataclass
+class LatencyStats:
+    """Latency accumulator for one cache operation."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+@dataclass
+class CacheMetrics:
+    """Hit/miss counters and per-operation latency."""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    deletes: int = 0
+    errors: int = 0
+    invalidations_received: int = 0
+    latency: dict[str, LatencyStats] = field(default_factory=dict)
+
+    def record_latency(self, operation: str, started: float) -> None:
+        stats = self.latency.get(operation)
+        if stats is None:
+            stats = self.latency[operation] = LatencyStats()
+        stats.record((time.perf_counter() - started) * 1000)
+
+    def to_dict(self) -> dict[str, Any]:
+        requests = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "total_requests": requests,
+            "hit_rate": round((self.l1_hits + self.l2_hits) / requests, 3) if requests else 0.0,
+            "l1_hit_rate": round(self.l1_hits / requests, 3) if requests else 0.0,
+            "sets": self.sets,
+            "deletes": self.deletes,
+            "errors": self.errors,
+            "invalidations_received": self.invalidations_received,
+            "latency": {name: stats.to_dict() for name, stats in self.latency.items()},
+        }
+
+
+class LocalLRU:
+    """Bounded, TTL-aware LRU of encoded values (the L1 tier).
+
+    TieredCache stores the same bytes it writes to Redis, so the byte budget
+    matches what the entries occupy there and no caller ever holds a
+    reference into the cache.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.total_bytes = 0
+        self.evictions = 0
+
+        # key -> (value, size_bytes, expires_at monotonic)
+        self._entries: OrderedDict[str, tuple[Any, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """Return the value, or _MISSING if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, size, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.total_bytes -= size
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, size: int, ttl_seconds: float | None = None) -> bool:
+        """Store a value; returns False if it is too large for L1 or already expired."""
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        with self._lock:
+            self._pop(key)
+            if size > self.max_bytes or ttl <= 0 or self.max_entries <= 0:
+                return False
+            self._entries[key] = (value, size, time.monotonic() + ttl)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def _pop(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.total_bytes -= entry[1]
+        return True
+
+
+class TieredCache:
+    """Async two-tier cache: local LRU (L1) + Redis (L2) with pub/sub invalidation."""
+
+    def __init__(
+        self,
+        key_prefix: str,
+        codec: CacheCodec | str = "json",
+        default_ttl_seconds: int = REDIS_CACHE_TTL_SECONDS,
+        l1_max_entries: int = CACHE_L1_MAX_ENTRIES,
+        l1_max_bytes: int = CACHE_L1_MAX_MB * 1024 * 1024,
+        l1_ttl_seconds: float = CACHE_L1_TTL_SECONDS,
+        redis_url: str | None = None,
+        connection_options: dict[str, Any] | None = None,
+        invalidation_channel: str = INVALIDATION_CHANNEL,
+    ):
+        """Initialize the tiered cache (call `initialize` to connect Redis).
+
+        Args:
+            key_prefix: Prefix joined to every key with ':'
+            codec: Codec instance or registered codec name for L2 values
+            default_ttl_seconds: Redis TTL when `set` gets none
+            l1_max_entries: Maximum number of L1 entries
+            l1_max_bytes: Maximum total encoded size of L1 values
+            l1_ttl_seconds: Upper bound on how long L1 serves an entry
+            redis_url: Redis URL (falls back to config)
+            connection_options: redis ConnectionPool kwargs, used instead of the URL
+            invalidation_channel: Pub/sub channel shared by all workers
+        """
+        self.key_prefix = key_prefix
+        self.codec = get_codec(codec) if isinstance(codec, str) else codec
+        self.default_ttl_seconds = default_ttl_seconds
+        self.redis_url = redis_url or REDIS_URL
+        self.connection_options = connection_options
+        self.invalidation_channel = invalidation_channel
+        self.worker_id = uuid4().hex
+
+        self.local = LocalLRU(l1_max_entries, l1_max_bytes, l1_ttl_seconds)
+        self.metrics = CacheMetrics()
+
+        self.redis: redis.Redis | None = None
+        self._connection_pool = None
+        self._listener_task: asyncio.Task | None = None
+
+    async def initialize(self, listen: bool = True) -> None:
+        """Connect Redis and subscribe to invalidations, degrading to L1 only."""
+        if not HAS_REDIS:
+            logger.warning("⚠️ Redis module not installed - serving from the local cache only")
+            return
+
+        try:
+            if self.connection_options:
+                self._connection_pool = redis.ConnectionPool(**self.connection_options)
+            else:
+                self._connection_pool = redis.ConnectionPool.from_url(
+                    self.redis_url, max_connections=10, retry_on_timeout=True
+                )
+            client = redis.Redis(connection_pool=self._connection_pool)
+
+            # Test connection before publishing the client, so concurrent callers
+            # never queue on a pool whose first connection attempt is still pending
+            await client.ping()
+            self.redis = client
+            logger.info(f"✅ Tiered cache connected (prefix={self.key_prefix}, codec={self.codec.name})")
+        except Exception as e:
+            logger.warning(f"⚠️ Redis unavailable: {e!s} - serving from the local cache only")
+            self.redis = None
+            return
+
+        if listen:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        """Stop the invalidation listener and close Redis connections."""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        if self.redis:
+            await self.redis.close()
+            self.redis = None
+        if self._connection_pool:
+            await self._connection_pool.disconnect()
+            self._connection_pool = None
+        self.local.clear()
+
+    def full_key(self, key: str) -> str:
+        """Redis key for a cache key."""
+        return f"{self.key_prefix}:{key}"
+
+    def tag_key(self, tag: str) -> str:
+        """Redis set holding the keys written with a tag."""
+        return f"{self.key_prefix}:tag:{tag}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get a value from L1, then L2 (filling L1 on an L2 hit)."""
+        started = time.perf_counter()
+        full_key = self.full_key(key)
+
+        value = self._get_local(full_key)
+        if value is not _MISSING:
+            self.metrics.l1_hits += 1
+            self.metrics.record_latency("get_l1", started)
+            return value
+
+        if self.redis is None:
+            self.metrics.misses += 1
+            return default
+
+        try:
+            # GET and PTTL in one round trip so L1 never outlives the Redis entry
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.get(full_key)
+            pipe.pttl(full_key)
+            raw, pttl_ms = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache get error for {key}: {e!s}")
+            self.metrics.errors += 1
+            self.metrics.misses += 1
+            return default
+        finally:
+            self.metrics.record_latency("get_l2", started)
+
+        if raw is None:
+            self.metrics.misses += 1
+            return default
+
+        try:
+            value = self.codec.decode(raw)
+        except Exception as e:
+            logger.warning(f"Undecodable cache value for {key}: {e!s}")
+            self.metrics.errors += 1
+            self.metrics.misses += 1
+            return default
+
+        self.metrics.l2_hits += 1
+        self.local.set(full_key, raw, len(raw), self._remaining_ttl(pttl_ms))
+        return value
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get several keys; L1 misses are fetched from Redis in one pipeline."""
+        started = time.perf_counter()
+        found: dict[str, Any] = {}
+        remote: list[str] = []
+        for key in keys:
+            value = self._get_local(self.full_key(key))
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                self.metrics.l1_hits += 1
+                found[key] = value
+
+        if not remote:
+            self.metrics.record_latency("get_many", started)
+            return found
+        if self.redis is None:
+            self.metrics.misses += len(remote)
+            return found
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in remote:
+                pipe.get(self.full_key(key))
+                pipe.pttl(self.full_key(key))
+            results = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache batch get error: {e!s}")
+            self.metrics.errors += 1
+            self.metrics.misses += len(remote)
+            return found
+        finally:
+            self.metrics.record_latency("get_many", started)
+
+        for key, raw, pttl_ms in zip(remote, results[0::2], results[1::2]):
+            if raw is None:
+                self.metrics.misses += 1
+                continue
+            try:
+                value = self.codec.decode(raw)
+            except Exception as e:
+                logger.warning(f"Undecodable cache value for {key}: {e!s}")
+                self.metrics.errors += 1
+                self.metrics.misses += 1
+                continue
+            self.metrics.l2_hits += 1
+            self.local.set(self.full_key(key), raw, len(raw), self._remaining_ttl(pttl_ms))
+            found[key] = value
+
+        return found
+
+    async def set(
+        self, key: str, value: Any, ttl: int | None = None, tags: Iterable[str] | None = None
+    ) -> bool:
+        """Store a value in Redis and L1, and invalidate it on other workers.
+
+        Returns:
+            True if stored (in Redis, or locally when Redis is unavailable)
+        """
+        return (await self.set_many({key: value}, ttl, tags))[key]
+
+    async def set_many(
+        self,
+        items: dict[str, Any],
+        ttl: int | None = None,
+        tags: Iterable[str] | None = None,
+        key_tags: dict[str, Iterable[str]] | None = None,
+    ) -> dict[str, bool]:
+        """Store several values with one Redis pipeline and one invalidation message.
+
+        Every key is added to each of `tags` and to its own `key_tags`; a tag
+        set expires with its longest-lived member.
+        """
+        started = time.perf_counter()
+        ttl_seconds = ttl or self.default_ttl_seconds
+        results = dict.fromkeys(items, False)
+
+        encoded: dict[str, bytes] = {}
+        for key, value in items.items():
+            try:
+                data = self.codec.encode(value)
+            except Exception as e:
+                logger.warning(f"Cache value for {key} cannot be encoded: {e!s}")
+                self.metrics.errors += 1
+                continue
+            if len(data) > MAX_VALUE_BYTES:
+                logger.warning(f"Data too large for {key}: {len(data) / (1024 * 1024):.2f}MB")
+                continue
+            encoded[key] = data
+
+        if not encoded:
+            return results
+
+        stored = list(encoded)
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for key, data in encoded.items():
+                    pipe.setex(self.full_key(key), ttl_seconds, data)
+                members_by_tag: dict[str, list[str]] = {}
+                for tag in tags or ():
+                    members_by_tag.setdefault(tag, []).extend(self.full_key(key) for key in encoded)
+                for key, own_tags in (key_tags or {}).items():
+                    if key in encoded:
+                        for tag in own_tags:
+                            members_by_tag.setdefault(tag, []).append(self.full_key(key))
+                for tag, members in members_by_tag.items():
+                    tag_key = self.tag_key(tag)
+                    pipe.sadd(tag_key, *members)
+                    pipe.expire(tag_key, ttl_seconds, nx=True)
+                    pipe.expire(tag_key, ttl_seconds, gt=True)
+                replies = await pipe.execute()
+                stored = [key for key, ok in zip(encoded, replies) if ok]
+            except Exception as e:
+                logger.warning(f"Cache set error: {e!s}")
+                self.metrics.errors += 1
+                stored = []
+            finally:
+                self.metrics.record_latency("set", started)
+
+        for key in stored:
+            self.local.set(self.full_key(key), encoded[key], len(encoded[key]), ttl_seconds)
+            results[key] = True
+            self.metrics.sets += 1
+
+        await self._publish([self.full_key(key) for key in stored])
+        return results
+
+    async def delete(self, key: str) -> bool:
+        """Delete a key from both tiers on every worker."""
+        deleted = await self.delete_many([key])
+        return deleted > 0
+
+    async def delete_many(self, keys: list[str]) -> int:
+        """Delete keys from both tiers on every worker; returns the number removed."""
+        if not keys:
+            return 0
+        full_keys = [self.full_key(key) for key in keys]
+        removed_locally = sum(self.local.delete(full_key) for full_key in full_keys)
+
+        deleted = removed_locally
+        if self.redis is not None:
+            started = time.perf_counter()
+            try:
+                deleted = await self.redis.delete(*full_keys)
+            except Exception as e:
+                logger.warning(f"Cache delete error: {e!s}")
+                self.metrics.errors += 1
+            finally:
+                self.metrics.record_latency("delete", started)
+
+        self.metrics.deletes += deleted
+        await self._publish(full_keys)
+        return deleted
+
+    async def exists(self, key: str) -> bool:
+        """Check whether a key is cached in either tier."""
+        full_key = self.full_key(key)
+        if self.local.get(full_key) is not _MISSING:
+            return True
+        if self.redis is None:
+            return False
+        try:
+            return await self.redis.exists(full_key) > 0
+        except Exception as e:
+            logger.warning(f"Cache exists error: {e!s}")
+            self.metrics.errors += 1
+            return False
+
+    async def exists_many(self, keys: list[str]) -> list[str]:
+        """Keys cached in either tier, in input order (one Redis pipeline for the L1 misses)."""
+        local_hits = {key for key in keys if self.local.get(self.full_key(key)) is not _MISSING}
+        remote = [key for key in keys if key not in local_hits]
+        found = set(local_hits)
+        if remote and self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                for key in remote:
+                    pipe.exists(self.full_key(key))
+                replies = await pipe.execute()
+                found.update(key for key, exists in zip(remote, replies) if exists)
+            except Exception as e:
+                logger.warning(f"Cache exists error: {e!s}")
+                self.metrics.errors += 1
+        return [key for key in keys if key in found]
+
+    async def acquire_lease(self, name: str, ttl_seconds: float) -> bool:
+        """Take a cross-worker lease (SET NX PX); always granted without Redis."""
+        if self.redis is None:
+            return True
+        try:
+            lease_key = self.full_key(f"lease:{name}")
+            return bool(await self.redis.set(lease_key, self.worker_id, nx=True, px=int(ttl_seconds * 1000)))
+        except Exception as e:
+            logger.warning(f"Cache lease {name} unavailable: {e!s}")
+            return True
+
+    async def invalidate(self, keys: list[str] | None = None) -> None:
+        """Drop keys (or everything, when None) from L1 on every worker without touching Redis."""
+        full_keys = None if keys is None else [self.full_key(key) for key in keys]
+        self._invalidate_local(full_keys)
+        await self._publish(full_keys, clear=keys is None)
+
+    async def scan_keys(self, pattern: str, count: int = SCAN_COUNT) -> AsyncIterator[str]:
+        """Iterate Redis keys matching a pattern (relative to the prefix) with SCAN."""
+        if self.redis is None:
+            return
+        async for full_key in self.redis.scan_iter(match=self.full_key(pattern), count=count):
+            yield full_key.decode("utf-8") if isinstance(full_key, bytes) else full_key
+
+    async def tag_members(self, tag: str, live_only: bool = False) -> list[str]:
+        """Redis keys written with a tag.
+
+        Args:
+            tag: Tag name
+            live_only: Drop members whose key has expired (and prune them from the set)
+        """
+        if self.redis is None:
+            return []
+        tag_key = self.tag_key(tag)
+        members = [
+            member.decode("utf-8") if isinstance(member, bytes) else member
+            async for member in self.redis.sscan_iter(tag_key, count=SCAN_COUNT)
+        ]
+        if not live_only or not members:
+            return members
+
+        live: list[str] = []
+        for offset in range(0, len(members), DELETE_CHUNK_SIZE):
+            chunk = members[offset : offset + DELETE_CHUNK_SIZE]
+            pipe = self.redis.pipeline(transaction=False)
+            for member in chunk:
+                pipe.exists(member)
+            exists = await pipe.execute()
+            live.extend(member for member, alive in zip(chunk, exists) if alive)
+            dead = [member for member, alive in zip(chunk, exists) if not alive]
+            if dead:
+                await self.redis.srem(tag_key, *dead)
+        return live
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """Delete every key written with a tag, on both tiers and every worker.
+
+        Returns:
+            Number of Redis keys deleted
+        """
+        if self.redis is None:
+            # Tags live in Redis; without it only the TTL clears a local entry
+            return 0
+        try:
+            members = await self.tag_members(tag)
+            deleted = await self._unlink(members)
+            await self.redis.unlink(self.tag_key(tag))
+        except Exception as e:
+            logger.warning(f"Cache tag invalidation error for {tag}: {e!s}")
+            self.metrics.errors += 1
+            return 0
+        logger.info(f"🗑️ Invalidated {deleted} keys tagged {tag}")
+        return deleted
+
+    async def delete_pattern(self, pattern: str) -> int:
+        """Delete keys matching a pattern with SCAN + UNLINK in chunks (never KEYS)."""
+        if self.redis is None:
+            return 0
+        deleted = 0
+        batch: list[str] = []
+        try:
+            async for full_key in self.scan_keys(pattern):
+                batch.append(full_key)
+                if len(batch) >= DELETE_CHUNK_SIZE:
+                    deleted += await self._unlink(batch)
+                    batch = []
+            deleted += await self._unlink(batch)
+        except Exception as e:
+            logger.warning(f"Cache pattern delete error for {pattern}: {e!s}")
+            self.metrics.errors += 1
+        return deleted
+
+    async def _unlink(self, full_keys: list[str]) -> int:
+        """UNLINK keys in chunks and drop them from L1 on every worker."""
+        deleted = 0
+        for offset in range(0, len(full_keys), DELETE_CHUNK_SIZE):
+            chunk = full_keys[offset : offset + DELETE_CHUNK_SIZE]
+            deleted += await self.redis.unlink(*chunk)
+            self._invalidate_local(chunk)
+            await self._publish(chunk)
+        self.metrics.deletes += deleted
+        return deleted
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters, latency and tier occupancy for monitoring."""
+        return {
+            "key_prefix": self.key_prefix,
+            "codec": self.codec.name,
+            "l2_connected": self.redis is not None,
+            "listening": self._listener_task is not None and not self._listener_task.done(),
+            "l1": {
+                "entries": len(self.local),
+                "bytes": self.local.total_bytes,
+                "max_entries": self.local.max_entries,
+                "max_bytes": self.local.max_bytes,
+                "ttl_seconds": self.local.ttl_seconds,
+                "evictions": self.local.evictions,
+            },
+            **self.metrics.to_dict(),
+        }
+
+    def _remaining_ttl(self, pttl_ms: int | None) -> float | None:
+        """L1 lifetime bounded by the Redis entry's remaining TTL."""
+        if pttl_ms is None or pttl_ms < 0:
+            return None  # No expiry (-1) or unknown: L1 TTL applies
+        return pttl_ms / 1000
+
+    def _get_local(self, full_key: str) -> Any:
+        """Decode a fresh copy of an L1 entry, or return _MISSING."""
+        data = self.local.get(full_key)
+        return data if data is _MISSING else self.codec.decode(data)
+
+    def _invalidate_local(self, full_keys: list[str] | None) -> None:
+        if full_keys is None:
+            self.local.clear()
+            return
+        for full_key in full_keys:
+            self.local.delete(full_key)
+
+    async def _publish(self, full_keys: list[str] | None, clear: bool = False) -> None:
+        """Tell other workers to drop keys from their L1."""
+        if self.redis is None or (not full_keys and not clear):
+            return
+        message = {"worker_id": self.worker_id, "keys": None if clear else full_keys}
+        try:
+            await self.redis.publish(self.invalidation_channel, json.dumps(message))
+        except Exception as e:
+            # Other workers fall back to the L1 TTL
+            logger.warning(f"Failed to publish cache invalidation: {e!s}")
+
+    def _handle_message(self, data: bytes | str) -> None:
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if message.get("worker_id") == self.worker_id:
+            return  # Our own write; L1 is already current
+        self.metrics.invalidations_received += 1
+        self._invalidate_local(message.get("keys"))
+
+    async def _listen(self) -> None:
+        """Apply invalidations published by other workers, reconnecting on errors."""
+        while self.redis is not None:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                # Anything written while we were not subscribed may be stale
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle_message(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e!s} - reconnecting")
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
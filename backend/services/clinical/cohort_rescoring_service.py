@@ -0,0 +1,478 @@
+"""Cohort Rescoring Service.
+=========================
+
+Recompute performance_scores for many sessions at once, e.g. after a
+scoring configuration has been edited.
+
+`PerformanceScoringService.calculate_performance_scores` scores one session
+with ~5 database reads. Rescoring a trial cohort that way is one HTTP
+round-trip chain per session. This service instead:
+
+1. Bulk-loads therapy_sessions, emg_statistics, bfr_monitoring and
+   performance_scores for all sessions (chunked `in` filters)
+2. Lays the metrics out as columnar NumPy arrays (CohortMetrics)
+3. Computes compliance, symmetry, effort, game and the BFR gate for every
+   row at once, grouped by the session's (immutable) scoring configuration;
+   sessions without one use the configuration PerformanceScoringService
+   would resolve (patient's current, else the global default), looked up
+   once per patient
+4. Writes all rows back with bulk upserts on session_id
+
+The formulas mirror PerformanceScoringService (metricsDefinitions.md).
+
+CLI:
+    python -m services.clinical.cohort_rescoring_service --scoring-config-id <uuid> [--dry-run]
+"""
+
+import argparse
+import json
+import logging
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from config import ScoringDefaults, SessionDefaults
+from database.supabase_client import get_supabase_client
+from services.clinical.performance_scoring_service import (
+    PerformanceScoringService,
+    RPEMapping,
+    ScoringWeights,
+    SessionMetrics,
+)
+from services.clinical.scoring_config_cache import get_scoring_config_cache
+
+logger = logging.getLogger(__name__)
+
+# Sessions per `in` filter (keeps PostgREST URLs short) and rows per upsert
+LOAD_CHUNK_SIZE = 200
+UPSERT_CHUNK_SIZE = 500
+PAGE_SIZE = 1000
+
+# BFR safety window (% AOP)
+BFR_MIN_AOP = 45.0
+BFR_MAX_AOP = 55.0
+
+RPE_SCALE_MAX = 10  # Borg CR10
+
+
+@dataclass
+class CohortMetrics:
+    """Columnar session metrics; row i of every array is session_ids[i].
+
+    Missing optional values (BFR pressure, RPE, game points) are NaN.
+    """
+
+    session_ids: list[str]
+    scoring_config_ids: list[str | None]
+    left_total: np.ndarray
+    left_mvc: np.ndarray
+    left_duration: np.ndarray
+    right_total: np.ndarray
+    right_mvc: np.ndarray
+    right_duration: np.ndarray
+    expected_contractions: np.ndarray
+    bfr_pressure_aop: np.ndarray
+    rpe: np.ndarray
+    game_points_achieved: np.ndarray
+    game_points_max: np.ndarray
+    skipped: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.session_ids)
+
+    def select(self, mask: np.ndarray) -> "CohortMetrics":
+        """Return the rows where mask is True."""
+        indices = np.flatnonzero(mask)
+        return CohortMetrics(
+            session_ids=[self.session_ids[i] for i in indices],
+            scoring_config_ids=[self.scoring_config_ids[i] for i in indices],
+            left_total=self.left_total[mask],
+            left_mvc=self.left_mvc[mask],
+            left_duration=self.left_duration[mask],
+            right_total=self.right_total[mask],
+            right_mvc=self.right_mvc[mask],
+            right_duration=self.right_duration[mask],
+            expected_contractions=self.expected_contractions[mask],
+            bfr_pressure_aop=self.bfr_pressure_aop[mask],
+            rpe=self.rpe[mask],
+            game_points_achieved=self.game_points_achieved[mask],
+            game_points_max=self.game_points_max[mask],
+        )
+
+
+def build_rpe_lookup(config: dict[str, Any] | None) -> np.ndarray:
+    """Effort score for each RPE value 0..10 under a scoring configuration."""
+    rpe_data = (config or {}).get("rpe_mapping")
+    if rpe_data:
+        return np.array(
+            [float(rpe_data.get(str(rpe), {}).get("score", 50.0)) for rpe in range(RPE_SCALE_MAX + 1)]
+        )
+
+    mapping = RPEMapping()
+    return np.array([mapping.get_effort_score(rpe) for rpe in range(RPE_SCALE_MAX + 1)], dtype=float)
+
+
+def build_scoring_weights(config: dict[str, Any] | None) -> ScoringWeights:
+    """ScoringWeights from a scoring_configuration row (defaults when None)."""
+    if not config:
+        return ScoringWeights()
+    return ScoringWeights(
+        w_compliance=config.get("weight_compliance", ScoringDefaults.WEIGHT_COMPLIANCE),
+        w_symmetry=config.get("weight_symmetry", ScoringDefaults.WEIGHT_SYMMETRY),
+        w_effort=config.get("weight_effort", ScoringDefaults.WEIGHT_EFFORT),
+        w_game=config.get("weight_game", ScoringDefaults.WEIGHT_GAME),
+        w_completion=config.get("weight_completion", ScoringDefaults.WEIGHT_COMPLETION),
+        w_intensity=config.get("weight_intensity", ScoringDefaults.WEIGHT_INTENSITY),
+        w_duration=config.get("weight_duration", ScoringDefaults.WEIGHT_DURATION),
+    )
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, 0.0 where the denominator is not positive."""
+    positive = denominator > 0
+    return np.where(positive, numerator / np.where(positive, denominator, 1.0), 0.0)
+
+
+def compute_cohort_scores(
+    metrics: CohortMetrics, weights: ScoringWeights, rpe_lookup: np.ndarray
+) -> dict[str, np.ndarray]:
+    """Vectorized equivalent of PerformanceScoringService scoring.
+
+    Args:
+        metrics: Columnar metrics for sessions sharing one configuration
+        weights: Scoring weights of that configuration
+        rpe_lookup: Effort score per RPE value 0..10 (see build_rpe_lookup)
+
+    Returns:
+        Column name -> array of per-session values
+    """
+    rates = {}
+    for side, total, mvc, duration in (
+        ("left", metrics.left_total, metrics.left_mvc, metrics.left_duration),
+        ("right", metrics.right_total, metrics.right_mvc, metrics.right_duration),
+    ):
+        completion = np.minimum(_safe_ratio(total, metrics.expected_contractions), 1.0)
+        intensity = _safe_ratio(mvc, total)
+        duration_rate = _safe_ratio(duration, total)
+        rates[f"{side}_muscle_compliance"] = (
+            weights.w_completion * completion
+            + weights.w_intensity * intensity
+            + weights.w_duration * duration_rate
+        ) * 100
+        rates[f"completion_rate_{side}"] = completion
+        rates[f"intensity_rate_{side}"] = np.minimum(intensity, 1.0)
+        rates[f"duration_rate_{side}"] = np.minimum(duration_rate, 1.0)
+
+    left = rates["left_muscle_compliance"]
+    right = rates["right_muscle_compliance"]
+    overall_compliance = (left + right) / 2
+
+    # S_symmetry = (1 - |left - right| / (left + right)) × 100
+    symmetry = (1 - _safe_ratio(np.abs(left - right), left + right)) * 100
+    symmetry = np.where(left + right == 0, 0.0, symmetry)
+
+    # Effort from RPE; unexpected values get the mapping's default score
+    has_rpe = ~np.isnan(metrics.rpe)
+    rpe_index = np.where(has_rpe, metrics.rpe, -1)
+    in_scale = has_rpe & (rpe_index >= 0) & (rpe_index <= RPE_SCALE_MAX) & (rpe_index == np.round(rpe_index))
+    effort = np.where(
+        in_scale, rpe_lookup[np.clip(rpe_index, 0, RPE_SCALE_MAX).astype(int)], RPEMapping().default_score
+    )
+
+    has_game = ~np.isnan(metrics.game_points_achieved) & ~np.isnan(metrics.game_points_max)
+    game = _safe_ratio(metrics.game_points_achieved, metrics.game_points_max) * 100
+    game = np.where(has_game, game, 0.0)
+
+    # C_BFR = 1 inside the 45-55% AOP window; missing BFR data is compliant
+    has_bfr = ~np.isnan(metrics.bfr_pressure_aop)
+    bfr_gate = np.where(
+        has_bfr,
+        (metrics.bfr_pressure_aop >= BFR_MIN_AOP) & (metrics.bfr_pressure_aop <= BFR_MAX_AOP),
+        True,
+    )
+    compliance = overall_compliance * bfr_gate
+
+    # Overall score with weights renormalized over available components.
+    # Missing RPE counts with the default session RPE (see WeightManager).
+    default_effort = float(
+        ScoringDefaults().DEFAULT_RPE_MAPPING.get(str(SessionDefaults.RPE_POST_SESSION), {}).get("score", 100.0)
+    )
+    effort_for_overall = np.where(has_rpe, effort, default_effort)
+    game_weight = np.where(has_game, weights.w_game, 0.0)
+    total_weight = weights.w_compliance + weights.w_symmetry + weights.w_effort + game_weight
+    overall = (
+        weights.w_compliance * compliance
+        + weights.w_symmetry * symmetry
+        + weights.w_effort * effort_for_overall
+        + game_weight * game
+    ) / total_weight
+
+    return {
+        "overall_score": overall,
+        "compliance_score": compliance,
+        "symmetry_score": symmetry,
+        "effort_score": np.where(has_rpe, effort, 0.0),
+        "game_score": game,
+        "bfr_compliant": bfr_gate,
+        **rates,
+    }
+
+
+class CohortRescoringService:
+    """Bulk recomputation of performance_scores."""
+
+    def __init__(self, supabase_client=None):
+        self.client = supabase_client or get_supabase_client(use_service_key=True)
+        self.config_cache = get_scoring_config_cache()
+        # Resolves the configuration of sessions without a scoring_config_id
+        self.scoring_service = PerformanceScoringService(self.client, config_cache=self.config_cache)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _chunks(items: list[str], size: int) -> Iterator[list[str]]:
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
+    def _load_sessions(
+        self, session_ids: list[str] | None, scoring_config_id: str | None
+    ) -> list[dict[str, Any]]:
+        """Fetch (id, scoring_config_id, patient_id) for the cohort."""
+        if session_ids:
+            rows = []
+            for chunk in self._chunks(session_ids, LOAD_CHUNK_SIZE):
+                query = self.client.table("therapy_sessions").select("id, scoring_config_id, patient_id").in_("id", chunk)
+                if scoring_config_id:
+                    query = query.eq("scoring_config_id", scoring_config_id)
+                rows.extend(query.execute().data or [])
+            return rows
+
+        rows = []
+        start = 0
+        while True:
+            query = self.client.table("therapy_sessions").select("id, scoring_config_id, patient_id")
+            if scoring_config_id:
+                query = query.eq("scoring_config_id", scoring_config_id)
+            page = query.order("id").range(start, start + PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            start += PAGE_SIZE
+
+    def _load_rows_by_session(self, table: str, columns: str, session_ids: list[str]) -> dict[str, list[dict]]:
+        """Fetch rows of a session-scoped table, grouped by session_id."""
+        grouped: dict[str, list[dict]] = {}
+        for chunk in self._chunks(session_ids, LOAD_CHUNK_SIZE):
+            result = self.client.table(table).select(columns).in_("session_id", chunk).execute()
+            for row in result.data or []:
+                grouped.setdefault(row["session_id"], []).append(row)
+        return grouped
+
+    def load_cohort_metrics(
+        self, session_ids: list[str] | None = None, scoring_config_id: str | None = None
+    ) -> CohortMetrics:
+        """Bulk-load scoring inputs for a cohort into columnar arrays.
+
+        Args:
+            session_ids: Restrict to these sessions (default: all)
+            scoring_config_id: Restrict to sessions scored with this configuration
+
+        Returns:
+            CohortMetrics with each session's effective scoring configuration;
+            sessions without left/right EMG statistics are listed in `skipped`
+        """
+        sessions = self._load_sessions(session_ids, scoring_config_id)
+        ids = [row["id"] for row in sessions]
+
+        emg = self._load_rows_by_session(
+            "emg_statistics", "session_id, channel_name, contraction_quality_metrics", ids
+        )
+        bfr = self._load_rows_by_session("bfr_monitoring", "session_id, actual_pressure_aop", ids)
+        perf = self._load_rows_by_session(
+            "performance_scores", "session_id, rpe_post_session, game_points_achieved, game_points_max", ids
+        )
+
+        columns: dict[str, list] = {
+            name: []
+            for name in (
+                "left_total", "left_mvc", "left_duration",
+                "right_total", "right_mvc", "right_duration",
+                "bfr_pressure_aop", "rpe", "game_points_achieved", "game_points_max",
+            )
+        }
+        kept_ids: list[str] = []
+        config_ids: list[str | None] = []
+        skipped: list[str] = []
+        resolved_config_ids: dict[str | None, str | None] = {}
+
+        for session in sessions:
+            session_id = session["id"]
+            channels = emg.get(session_id, [])
+            # Map CH1 to left and CH2 to right for compatibility
+            left = next((s for s in channels if "left" in s["channel_name"].lower() or s["channel_name"] == "CH1"), None)
+            right = next((s for s in channels if "right" in s["channel_name"].lower() or s["channel_name"] == "CH2"), None)
+            if left is None or right is None:
+                skipped.append(session_id)
+                continue
+
+            for side, stats in (("left", left), ("right", right)):
+                quality = stats.get("contraction_quality_metrics") or {}
+                compliant = quality.get("overall_compliant_contractions", 0)
+                columns[f"{side}_total"].append(quality.get("total_contractions", 0))
+                columns[f"{side}_mvc"].append(quality.get("mvc75_compliant_contractions", compliant))
+                columns[f"{side}_duration"].append(quality.get("duration_compliant_contractions", compliant))
+
+            bfr_row = (bfr.get(session_id) or [{}])[0]
+            perf_row = (perf.get(session_id) or [{}])[0]
+            columns["bfr_pressure_aop"].append(bfr_row.get("actual_pressure_aop"))
+            columns["rpe"].append(perf_row.get("rpe_post_session"))
+            columns["game_points_achieved"].append(perf_row.get("game_points_achieved"))
+            columns["game_points_max"].append(perf_row.get("game_points_max"))
+
+            kept_ids.append(session_id)
+            config_ids.append(
+                session.get("scoring_config_id") or self._resolve_config_id(session.get("patient_id"), resolved_config_ids)
+            )
+
+        # None -> NaN for the optional columns
+        arrays = {name: np.array(values, dtype=float) for name, values in columns.items()}
+
+        return CohortMetrics(
+            session_ids=kept_ids,
+            scoring_config_ids=config_ids,
+            expected_contractions=np.full(len(kept_ids), SessionMetrics.expected_contractions_per_muscle, dtype=float),
+            skipped=skipped,
+            **arrays,
+        )
+
+    def _resolve_config_id(self, patient_id: str | None, resolved: dict[str | None, str | None]) -> str | None:
+        """Configuration for a session without scoring_config_id, once per patient.
+
+        Same resolution as PerformanceScoringService: the patient's current
+        configuration, else the global default.
+        """
+        if patient_id not in resolved:
+            resolved[patient_id] = self.scoring_service._get_session_scoring_config_id(None, patient_id)
+        return resolved[patient_id]
+
+    def _load_configuration(self, config_id: str | None) -> dict[str, Any] | None:
+        if not config_id:
+            return None
+
+        def load(cid: str) -> dict[str, Any] | None:
+            result = self.client.table("scoring_configuration").select("*").eq("id", cid).limit(1).execute()
+            return result.data[0] if result.data else None
+
+        return self.config_cache.get_or_load(config_id, load)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def build_score_rows(
+        metrics: CohortMetrics, scores: dict[str, np.ndarray], scoring_config_id: str | None
+    ) -> list[dict[str, Any]]:
+        """Turn score arrays into performance_scores rows."""
+        columns = {name: values.tolist() for name, values in scores.items()}
+        pressures = metrics.bfr_pressure_aop.tolist()
+
+        rows = []
+        for i, session_id in enumerate(metrics.session_ids):
+            row = {name: values[i] for name, values in columns.items()}
+            row["session_id"] = session_id
+            row["bfr_compliant"] = bool(row["bfr_compliant"])
+            row["bfr_pressure_aop"] = None if np.isnan(pressures[i]) else pressures[i]
+            if scoring_config_id is not None:
+                row["scoring_config_id"] = scoring_config_id
+            rows.append(row)
+        return rows
+
+    def _upsert_scores(self, rows: list[dict[str, Any]]) -> int:
+        written = 0
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            chunk = rows[start : start + UPSERT_CHUNK_SIZE]
+            self.client.table("performance_scores").upsert(chunk, on_conflict="session_id").execute()
+            written += len(chunk)
+        return written
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+
+    def rescore(
+        self,
+        session_ids: list[str] | None = None,
+        scoring_config_id: str | None = None,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """Recompute and store performance scores for a cohort.
+
+        Each session is scored with its own scoring configuration.
+
+        Args:
+            session_ids: Restrict to these sessions (default: all)
+            scoring_config_id: Restrict to sessions scored with this configuration
+            dry_run: Compute but do not write
+
+        Returns:
+            Run summary (counts and timings)
+        """
+        started = time.perf_counter()
+        metrics = self.load_cohort_metrics(session_ids, scoring_config_id)
+        loaded = time.perf_counter()
+
+        config_ids = np.array([cid or "" for cid in metrics.scoring_config_ids], dtype=object)
+        groups = []
+        for config_id in dict.fromkeys(metrics.scoring_config_ids):
+            group = metrics.select(config_ids == (config_id or ""))
+            config = self._load_configuration(config_id)
+            scores = compute_cohort_scores(group, build_scoring_weights(config), build_rpe_lookup(config))
+            groups.append(self.build_score_rows(group, scores, config_id))
+        computed = time.perf_counter()
+
+        written = 0
+        if not dry_run:
+            for rows in groups:
+                written += self._upsert_scores(rows)
+        finished = time.perf_counter()
+
+        summary = {
+            "sessions_loaded": len(metrics) + len(metrics.skipped),
+            "sessions_rescored": sum(len(rows) for rows in groups),
+            "sessions_written": written,
+            "sessions_skipped": len(metrics.skipped),
+            "configurations": len(groups),
+            "dry_run": dry_run,
+            "load_ms": round((loaded - started) * 1000, 1),
+            "compute_ms": round((computed - loaded) * 1000, 1),
+            "write_ms": round((finished - computed) * 1000, 1),
+        }
+        logger.info(f"📊 Cohort rescoring finished: {summary}")
+        return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Recompute performance_scores for a cohort of sessions")
+    parser.add_argument("--scoring-config-id", help="Only sessions scored with this configuration")
+    parser.add_argument("--session-id", action="append", dest="session_ids", help="Session UUID (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Compute scores without writing them")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    summary = CohortRescoringService().rescore(
+        session_ids=args.session_ids, scoring_config_id=args.scoring_config_id, dry_run=args.dry_run
+    )
+    logger.info(f"Summary:\n{json.dumps(summary, indent=2)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
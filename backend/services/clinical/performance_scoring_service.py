@@ -47,10 +47,11 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from config import SessionDefaults, ScoringDefaults
-from utils.date_extraction import extract_session_date_from_filename
 
 from database.supabase_client import get_supabase_client
 from services.clinical.repositories.scoring_configuration_repository import ScoringConfigurationRepository
+from services.clinical.repositories.session_count_repository import SessionCountRepository, session_day_for
+from services.clinical.scoring_config_cache import ScoringConfigCache, get_scoring_config_cache
 from services.clinical.weight_manager import WeightManager
 
 logger = logging.getLogger(__name__)
@@ -158,9 +159,11 @@ class PerformanceScoringService:
     with support for partial data (some scores can be calculated later)
     """
 
-    def __init__(self, supabase_client=None):
+    def __init__(self, supabase_client=None, config_cache: ScoringConfigCache | None = None):
         self.client = supabase_client or get_supabase_client(use_service_key=True)
         self.scoring_repo = ScoringConfigurationRepository(supabase_client)  # Repository for scoring config
+        self.config_cache = config_cache or get_scoring_config_cache()  # Shared, invalidated on config writes
+        self.session_count_repo = SessionCountRepository(self.client)  # Adherence session counts
         self.weights = ScoringWeights()
         self.rpe_mapping = RPEMapping()  # Default RPE mapping
         self.weight_manager = WeightManager(base_weights=self.weights)  # Mathematical weight management
@@ -205,10 +208,9 @@ class PerformanceScoringService:
                 patient_id = session_query.data[0].get("patient_id")
                 direct_config_id = session_query.data[0].get("scoring_config_id")
             
-            # Get the appropriate scoring config ID using our intelligent function
-            # If session already has scoring_config_id, it will be used (immutable)
-            # Otherwise, falls back to patient's current config or global default
-            scoring_config_id = self._get_session_scoring_config_id(session_id, patient_id)
+            # A session's scoring_config_id is immutable, so use it directly.
+            # Otherwise fall back to patient's current config or global default
+            scoring_config_id = direct_config_id or self._get_session_scoring_config_id(session_id, patient_id)
             self.scoring_config_id = scoring_config_id  # Store for later use in result
             
             if not scoring_config_id:
@@ -218,16 +220,9 @@ class PerformanceScoringService:
                 return ScoringWeights()
             
             # Load the specific configuration
-            weights_query = (
-                self.client.table("scoring_configuration")
-                .select("*")
-                .eq("id", scoring_config_id)
-                .limit(1)
-                .execute()
-            )
+            config = self._get_scoring_configuration(scoring_config_id)
 
-            if weights_query.data:
-                config = weights_query.data[0]
+            if config:
                 return ScoringWeights(
                     w_compliance=config.get("weight_compliance", 0.50),  # 50% default from metricsDefinitions.md
                     w_symmetry=config.get("weight_symmetry", 0.25),     # 25% default
@@ -245,6 +240,28 @@ class PerformanceScoringService:
             logger.warning(f"Failed to load scoring weights from database: {e}, using defaults")
             return self.weights
 
+    def _get_scoring_configuration(self, scoring_config_id: str) -> dict | None:
+        """Fetch a scoring_configuration row through the versioned config cache.
+
+        Args:
+            scoring_config_id: scoring_configuration UUID
+
+        Returns:
+            Configuration row or None if not found
+        """
+
+        def load(config_id: str) -> dict | None:
+            result = (
+                self.client.table("scoring_configuration")
+                .select("*")
+                .eq("id", config_id)
+                .limit(1)
+                .execute()
+            )
+            return result.data[0] if result.data else None
+
+        return self.config_cache.get_or_load(scoring_config_id, load)
+
     def _load_rpe_mapping_from_database(self, session_id: str) -> RPEMapping:
         """Load configurable RPE mapping from the scoring_configuration.rpe_mapping JSONB field.
         RPE mappings are stored per scoring configuration, not in a separate table.
@@ -257,17 +274,11 @@ class PerformanceScoringService:
                 logger.info("📊 No scoring config ID available, using default RPE mapping")
                 return self.rpe_mapping
 
-            # Load the scoring configuration's RPE mapping
-            config_query = (
-                self.client.table("scoring_configuration")
-                .select("rpe_mapping")
-                .eq("id", scoring_config_id)
-                .limit(1)
-                .execute()
-            )
+            # Same (cached) row the weights were loaded from
+            config = self._get_scoring_configuration(scoring_config_id)
 
-            if config_query.data and config_query.data[0].get("rpe_mapping"):
-                rpe_data = config_query.data[0]["rpe_mapping"]
+            if config and config.get("rpe_mapping"):
+                rpe_data = config["rpe_mapping"]
                 logger.info("📊 Using RPE mapping from scoring configuration JSONB field")
                 
                 # The JSONB format can be used directly - create a simple lookup function
@@ -972,92 +983,114 @@ class PerformanceScoringService:
         try:
             # Use provided sessions_completed if available, otherwise count from database
             if sessions_completed is None:
-                # Try to count from storage or therapy_sessions table
-                patient_result = (
-                    self.client.table("patients")
-                    .select("patient_code")
-                    .eq("id", patient_id)
-                    .execute()
-                )
-                
-                if patient_result.data and patient_result.data[0].get("patient_code"):
-                    patient_code = patient_result.data[0]["patient_code"]
-                    
-                    # Count C3D files from storage bucket with temporal filtering
-                    storage_files = self.client.storage.from_("c3d-examples").list()
-                    
-                    # Calculate cutoff date for protocol day boundary
-                    # Protocol day 7 means we want files from the last 7 days (including today)
-                    # Use date-only comparison to avoid timezone and time-of-day issues
-                    today = datetime.now(timezone.utc).date()
-                    cutoff_date = today - timedelta(days=protocol_day - 1)
-                    
-                    # Filter files for this patient within protocol day boundary
-                    # GHOSTLY C3D filenames pattern: Ghostly_Emg_YYYYMMDD_HH-MM-SS-SSSS.c3d
-                    completed_sessions = 0
-                    for file in storage_files:
-                        filename = file.get("name", "")
-                        if filename.endswith(".c3d") and filename.startswith("Ghostly_Emg_"):
-                            # Extract session date from filename
-                            session_date = extract_session_date_from_filename(filename)
-                            # Count only sessions within protocol day boundary
-                            # Files from the last 'protocol_day' days should be counted
-                            # Use date-only comparison to avoid timezone issues
-                            if session_date and session_date.date() >= cutoff_date:
-                                completed_sessions += 1
-                else:
-                    # Fallback to therapy_sessions table if patient_code not found
+                # Protocol day 7 means sessions from the last 7 days (including today)
+                # Use date-only comparison to avoid timezone and time-of-day issues
+                today = datetime.now(timezone.utc).date()
+                cutoff_date = today - timedelta(days=protocol_day - 1)
+
+                # Indexed per-patient, per-day counts (maintained at webhook ingestion)
+                completed_sessions = self.session_count_repo.count_sessions_since(patient_id, cutoff_date)
+
+                if completed_sessions is None:
+                    # Index not deployed: count this patient's sessions directly
                     sessions = (
                         self.client.table("therapy_sessions")
-                        .select("id, session_date, file_path")
+                        .select("file_path, session_date, created_at")
                         .eq("patient_id", patient_id)
                         .not_.is_("file_path", "null")
                         .execute()
                     )
-                    completed_sessions = len(sessions.data) if sessions.data else 0
+                    completed_sessions = sum(
+                        1
+                        for session in sessions.data or []
+                        if session_day_for(
+                            session["file_path"], session.get("session_date") or session.get("created_at")
+                        ) >= cutoff_date
+                    )
             else:
                 # Use the provided sessions_completed value
                 completed_sessions = sessions_completed
             
-            # Calculate expected sessions using the specification formula
-            # Expected rate: 15 Game Sessions per 7 days ≈ 2.14 × protocol_day
-            # From metricsDefinitions.md: Expected rate: 15 Game Sessions per 7 days ≈ 2.14 × t
-            expected_sessions_per_day = 15.0 / 7.0  # ≈ 2.14 sessions per day
-            expected_sessions = expected_sessions_per_day * protocol_day
-
-            # Cap adherence score at 100% (clinical business rule)
-            adherence_score = min(100, (
-                (completed_sessions / expected_sessions) * 100 if expected_sessions > 0 else 0
-            ))
-
-            # Determine clinical threshold category
-            if adherence_score >= 85:
-                category = "Excellent"
-                interpretation = "Meeting/exceeding frequency targets"
-            elif adherence_score >= 70:
-                category = "Good"
-                interpretation = "Adequate with minor gaps"
-            elif adherence_score >= 50:
-                category = "Moderate"
-                interpretation = "Suboptimal, intervention consideration"
-            else:
-                category = "Poor"
-                interpretation = "Significant concern, support needed"
-
-            return {
-                "patient_id": patient_id,
-                "protocol_day": protocol_day,
-                "adherence_score": adherence_score,
-                "completed_sessions": completed_sessions,
-                "expected_sessions": expected_sessions,
-                "category": category,
-                "interpretation": interpretation,
-            }
+            return self._build_adherence_result(patient_id, protocol_day, completed_sessions)
 
         except Exception as e:
             logger.exception(f"Error calculating adherence score: {e!s}")
             return {"error": str(e)}
 
+    def calculate_adherence_scores(self, protocol_days: dict[str, int]) -> dict[str, dict]:
+        """Calculate adherence for many patients with one grouped index query.
+
+        Args:
+            protocol_days: patient_id -> protocol day
+
+        Returns:
+            patient_id -> result of calculate_adherence_score
+        """
+        results: dict[str, dict] = {}
+        eligible = {}
+        for patient_id, protocol_day in protocol_days.items():
+            if protocol_day < 3:
+                results[patient_id] = self.calculate_adherence_score(patient_id, protocol_day)
+            else:
+                eligible[patient_id] = protocol_day
+
+        if not eligible:
+            return results
+
+        today = datetime.now(timezone.utc).date()
+        cutoffs = {pid: today - timedelta(days=day - 1) for pid, day in eligible.items()}
+        day_counts = self.session_count_repo.get_day_counts(list(eligible), min(cutoffs.values()))
+
+        for patient_id, protocol_day in eligible.items():
+            if day_counts is None:
+                # Index not deployed: per-patient fallback
+                results[patient_id] = self.calculate_adherence_score(patient_id, protocol_day)
+                continue
+
+            completed_sessions = sum(
+                count for day, count in day_counts.get(patient_id, {}).items() if day >= cutoffs[patient_id]
+            )
+            results[patient_id] = self._build_adherence_result(patient_id, protocol_day, completed_sessions)
+
+        return results
+
+    def _build_adherence_result(self, patient_id: str, protocol_day: int, completed_sessions: int) -> dict:
+        """Adherence score, clinical category and interpretation for a session count."""
+        # Calculate expected sessions using the specification formula
+        # Expected rate: 15 Game Sessions per 7 days ≈ 2.14 × protocol_day
+        # From metricsDefinitions.md: Expected rate: 15 Game Sessions per 7 days ≈ 2.14 × t
+        expected_sessions_per_day = 15.0 / 7.0  # ≈ 2.14 sessions per day
+        expected_sessions = expected_sessions_per_day * protocol_day
+
+        # Cap adherence score at 100% (clinical business rule)
+        adherence_score = min(100, (
+            (completed_sessions / expected_sessions) * 100 if expected_sessions > 0 else 0
+        ))
+
+        # Determine clinical threshold category
+        if adherence_score >= 85:
+            category = "Excellent"
+            interpretation = "Meeting/exceeding frequency targets"
+        elif adherence_score >= 70:
+            category = "Good"
+            interpretation = "Adequate with minor gaps"
+        elif adherence_score >= 50:
+            category = "Moderate"
+            interpretation = "Suboptimal, intervention consideration"
+        else:
+            category = "Poor"
+            interpretation = "Significant concern, support needed"
+
+        return {
+            "patient_id": patient_id,
+            "protocol_day": protocol_day,
+            "adherence_score": adherence_score,
+            "completed_sessions": completed_sessions,
+            "expected_sessions": expected_sessions,
+            "category": category,
+            "interpretation": interpretation,
+        }
+
 # Removed unnecessary async wrapper - use calculate_performance_scores directly
     # This method was just an async wrapper around the synchronous calculate_performance_scores
     # which violates the project's synchronous Supabase architecture
@@ -9,6 +9,7 @@ Repositories:
 - PatientRepository: Patient profiles + PII data (RGPD compliant)
 - TherapySessionRepository: Session lifecycle + metadata
 - EMGDataRepository: EMG statistics + processing parameters
+- SessionCountRepository: Per-patient daily session counts (adherence index)
 
 Note: UserRepository moved to services.user.repositories (proper domain separation)
 
@@ -16,6 +17,7 @@ Note: UserRepository moved to services.user.repositories (proper domain separati
 
 from services.clinical.repositories.emg_data_repository import EMGDataRepository
 from services.clinical.repositories.patient_repository import PatientRepository
+from services.clinical.repositories.session_count_repository import SessionCountRepository
 from services.clinical.repositories.therapy_session_repository import (
     TherapySessionRepository,
 )
@@ -29,5 +31,6 @@ __all__ = [
     "EMGDataRepository",
     "PatientRepository",
     "RepositoryError",
+    "SessionCountRepository",
     "TherapySessionRepository",
 ]
@@ -244,3 +244,31 @@ class PatientRepository(AbstractRepository[PatientCreate, PatientUpdate, Patient
         except Exception as e:
             self.logger.exception(f"Failed to get patient by code {patient_code}: {e!s}")
             raise RepositoryError(f"Failed to get patient by code: {e!s}") from e
+
+    def get_patients_by_codes(self, patient_codes: list[str]) -> dict[str, dict[str, Any]]:
+        """Get several patients by patient_code in a single query.
+
+        Args:
+            patient_codes: Patient codes (e.g., ['P039', 'P040'])
+
+        Returns:
+            Dict: patient_code -> patient data (unknown codes are omitted)
+        """
+        try:
+            codes = sorted({code.upper() for code in patient_codes if code})
+            if not codes:
+                return {}
+
+            result = (
+                self.client.table("patients")
+                .select("*")
+                .in_("patient_code", codes)
+                .execute()
+            )
+
+            data = self._handle_supabase_response(result, "get", "patients by codes")
+            return {patient["patient_code"]: patient for patient in data or []}
+
+        except Exception as e:
+            self.logger.exception(f"Failed to get patients by codes {patient_codes}: {e!s}")
+            raise RepositoryError(f"Failed to get patients by codes: {e!s}") from e
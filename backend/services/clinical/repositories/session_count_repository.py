@@ -0,0 +1,233 @@
+"""Session Count Repository - per-patient, per-day therapy session counts.
+
+Backs adherence scoring with the patient_session_day_counts index instead
+of listing the storage bucket. Rows are incremented when the webhook
+creates sessions; `rebuild_from_sessions` is the backfill job.
+
+Backfill (maintenance window, with webhook ingestion paused):
+    python -m services.clinical.repositories.session_count_repository
+"""
+
+import json
+import logging
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Any
+
+from database.supabase_client import get_supabase_client
+from utils.date_extraction import extract_session_date_from_filename
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "patient_session_day_counts"
+PAGE_SIZE = 1000
+IN_FILTER_CHUNK_SIZE = 200
+UPSERT_CHUNK_SIZE = 500
+
+
+def session_day_for(file_path: str | None, fallback: datetime | str | None = None) -> date:
+    """Day a session counts towards: recording date from the GHOSTLY filename.
+
+    Args:
+        file_path: Storage path of the C3D file
+        fallback: session_date/created_at used when the filename has no date
+
+    Returns:
+        Session day (today in UTC when nothing else is known)
+    """
+    session_date = extract_session_date_from_filename(file_path) if file_path else None
+    if session_date:
+        return session_date.date()
+
+    if isinstance(fallback, str):
+        try:
+            fallback = datetime.fromisoformat(fallback.replace("Z", "+00:00"))
+        except ValueError:
+            fallback = None
+    if isinstance(fallback, datetime):
+        if fallback.tzinfo is not None:
+            fallback = fallback.astimezone(timezone.utc)
+        return fallback.date()
+
+    return datetime.now(timezone.utc).date()
+
+
+class SessionCountRepository:
+    """Repository for the patient_session_day_counts index."""
+
+    def __init__(self, supabase_client=None):
+        """Initialize repository with Supabase client."""
+        self.client = supabase_client or get_supabase_client(use_service_key=True)
+
+    def record_sessions(self, patient_id: str, session_days: list[date]) -> bool:
+        """Add newly created sessions to the index.
+
+        Args:
+            patient_id: Patient UUID
+            session_days: One day per created session
+
+        Returns:
+            True if the index was updated
+        """
+        if not patient_id or not session_days:
+            return False
+
+        days = {day.isoformat(): count for day, count in Counter(session_days).items()}
+        try:
+            self.client.rpc(
+                "increment_patient_session_counts", {"p_patient_id": patient_id, "p_days": days}
+            ).execute()
+            return True
+        except Exception as e:
+            # Never block ingestion on the index; the backfill job repairs it
+            logger.warning(f"Failed to update session count index for patient {patient_id}: {e!s}")
+            return False
+
+    def count_sessions_since(self, patient_id: str, since: date) -> int | None:
+        """Count a patient's sessions recorded on or after a day.
+
+        Args:
+            patient_id: Patient UUID
+            since: First day to count (inclusive)
+
+        Returns:
+            Session count, or None if the index is unavailable
+        """
+        try:
+            result = (
+                self.client.table(TABLE_NAME)
+                .select("session_count")
+                .eq("patient_id", patient_id)
+                .gte("session_day", since.isoformat())
+                .execute()
+            )
+        except Exception as e:
+            logger.warning(f"Session count index unavailable: {e!s}")
+            return None
+
+        if not isinstance(result.data, list):
+            return None
+        return sum(int(row.get("session_count") or 0) for row in result.data)
+
+    def get_day_counts(self, patient_ids: list[str], since: date) -> dict[str, dict[date, int]] | None:
+        """Daily session counts for many patients in one grouped query.
+
+        Args:
+            patient_ids: Patient UUIDs
+            since: First day to return (inclusive)
+
+        Returns:
+            patient_id -> {day: count}, or None if the index is unavailable
+        """
+        counts: dict[str, dict[date, int]] = {}
+        try:
+            for offset in range(0, len(patient_ids), IN_FILTER_CHUNK_SIZE):
+                result = (
+                    self.client.table(TABLE_NAME)
+                    .select("patient_id, session_day, session_count")
+                    .in_("patient_id", patient_ids[offset : offset + IN_FILTER_CHUNK_SIZE])
+                    .gte("session_day", since.isoformat())
+                    .execute()
+                )
+                if not isinstance(result.data, list):
+                    return None
+                for row in result.data:
+                    day = date.fromisoformat(str(row["session_day"]))
+                    counts.setdefault(row["patient_id"], {})[day] = int(row.get("session_count") or 0)
+        except Exception as e:
+            logger.warning(f"Session count index unavailable: {e!s}")
+            return None
+
+        return counts
+
+    def rebuild_from_sessions(self) -> dict[str, int]:
+        """Backfill: recount every patient's sessions from therapy_sessions.
+
+        Counts are upserted (overwritten) per (patient, day) and days that no
+        longer have sessions are deleted, so the job is idempotent. It is a
+        maintenance-window job: the scan and the writes are separate requests,
+        so a webhook increment landing in between would be overwritten. Pause
+        ingestion while it runs.
+
+        Returns:
+            Number of sessions scanned, index rows written and stale rows deleted
+        """
+        counts: Counter = Counter()
+        scanned = 0
+        start = 0
+        while True:
+            page = (
+                self.client.table("therapy_sessions")
+                .select("patient_id, file_path, session_date, created_at")
+                .not_.is_("patient_id", "null")
+                .not_.is_("file_path", "null")
+                .order("id")
+                .range(start, start + PAGE_SIZE - 1)
+                .execute()
+            ).data or []
+
+            for session in page:
+                day = session_day_for(session["file_path"], session.get("session_date") or session.get("created_at"))
+                counts[(session["patient_id"], day)] += 1
+            scanned += len(page)
+
+            if len(page) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+
+        rows: list[dict[str, Any]] = [
+            {"patient_id": patient_id, "session_day": day.isoformat(), "session_count": count}
+            for (patient_id, day), count in counts.items()
+        ]
+        for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            self.client.table(TABLE_NAME).upsert(
+                rows[offset : offset + UPSERT_CHUNK_SIZE], on_conflict="patient_id,session_day"
+            ).execute()
+
+        # Days whose sessions were deleted (or re-dated) since the index was built
+        stale: dict[str, list[str]] = {}
+        for patient_id, day in self._load_index_days():
+            if (patient_id, date.fromisoformat(day)) not in counts:
+                stale.setdefault(patient_id, []).append(day)
+        for patient_id, days in stale.items():
+            for offset in range(0, len(days), IN_FILTER_CHUNK_SIZE):
+                (
+                    self.client.table(TABLE_NAME)
+                    .delete()
+                    .eq("patient_id", patient_id)
+                    .in_("session_day", days[offset : offset + IN_FILTER_CHUNK_SIZE])
+                    .execute()
+                )
+        rows_deleted = sum(len(days) for days in stale.values())
+
+        logger.info(
+            f"📇 Session count index rebuilt: {scanned} sessions, {len(rows)} patient-days, "
+            f"{rows_deleted} stale days removed"
+        )
+        return {"sessions_scanned": scanned, "rows_written": len(rows), "rows_deleted": rows_deleted}
+
+    def _load_index_days(self) -> list[tuple[str, str]]:
+        """All (patient_id, session_day) keys currently in the index."""
+        keys: list[tuple[str, str]] = []
+        start = 0
+        while True:
+            page = (
+                self.client.table(TABLE_NAME)
+                .select("patient_id, session_day")
+                .order("patient_id")
+                .order("session_day")
+                .range(start, start + PAGE_SIZE - 1)
+                .execute()
+            ).data or []
+
+            keys.extend((row["patient_id"], str(row["session_day"])) for row in page)
+
+            if len(page) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+        return keys
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.info(f"Summary:\n{json.dumps(SessionCountRepository().rebuild_from_sessions(), indent=2)}")
@@ -32,6 +32,38 @@ from models.clinical.session import (
 
 logger = logging.getLogger(__name__)
 
+# PostgreSQL SQLSTATE for unique_violation
+UNIQUE_VIOLATION_CODE = "23505"
+# PostgREST error code when an RPC function does not exist (migration not applied)
+FUNCTION_NOT_FOUND_CODE = "PGRST202"
+
+
+class DuplicateDeliveryError(RepositoryError):
+    """Raised when a webhook delivery key already owns a therapy session."""
+
+    def __init__(self, message: str, session: dict[str, Any]):
+        super().__init__(message)
+        self.session = session
+
+
+class PersistenceFunctionUnavailableError(RepositoryError):
+    """Raised when the persist_processed_session RPC is not deployed."""
+
+
+def _has_error_code(error: BaseException, code: str) -> bool:
+    """Check an exception chain for a PostgREST/PostgreSQL error code."""
+    current: BaseException | None = error
+    while current is not None:
+        if getattr(current, "code", None) == code:
+            return True
+        current = current.__cause__
+    return False
+
+
+def _is_unique_violation(error: BaseException) -> bool:
+    """Check an exception chain for a PostgREST unique_violation error."""
+    return _has_error_code(error, UNIQUE_VIOLATION_CODE)
+
 
 class TherapySessionRepository(
     AbstractRepository[TherapySessionCreate, TherapySessionUpdate, TherapySession]
@@ -181,6 +213,64 @@ class TherapySessionRepository(
             self.logger.exception(f"Failed to get session by file hash {file_hash}: {e!s}")
             raise RepositoryError(f"Failed to get session by file hash: {e!s}") from e
 
+    def get_sessions_by_file_hashes(self, file_hashes: list[str]) -> dict[str, dict[str, Any]]:
+        """Get therapy sessions for several C3D file hashes in one request.
+
+        Args:
+            file_hashes: SHA-256 hashes of C3D files
+
+        Returns:
+            Dict mapping file hash -> session data (hashes without a session are omitted)
+        """
+        try:
+            if not file_hashes:
+                return {}
+
+            result = (
+                self.client.table("therapy_sessions")
+                .select("*")
+                .in_("file_hash", sorted(set(file_hashes)))
+                .execute()
+            )
+
+            data = self._handle_supabase_response(result, "get", "sessions by file hash")
+            sessions: dict[str, dict[str, Any]] = {}
+            for session in data:
+                sessions.setdefault(session["file_hash"], session)
+            return sessions
+
+        except Exception as e:
+            self.logger.exception(f"Failed to get sessions by file hash: {e!s}")
+            raise RepositoryError(f"Failed to get sessions by file hash: {e!s}") from e
+
+    def get_session_by_delivery_key(self, delivery_key: str) -> dict[str, Any] | None:
+        """Get therapy session created by a given webhook delivery.
+
+        Args:
+            delivery_key: Webhook delivery key (bucket, object name, version digest)
+
+        Returns:
+            Optional[Dict]: Session data or None if not found
+        """
+        try:
+            if not delivery_key or not isinstance(delivery_key, str):
+                raise RepositoryError("Invalid delivery_key provided")
+
+            result = (
+                self.client.table("therapy_sessions")
+                .select("*")
+                .eq("webhook_delivery_key", delivery_key)
+                .limit(1)
+                .execute()
+            )
+
+            data = self._handle_supabase_response(result, "get", "session by delivery key")
+            return data[0] if data else None
+
+        except Exception as e:
+            self.logger.exception(f"Failed to get session by delivery key {delivery_key}: {e!s}")
+            raise RepositoryError(f"Failed to get session by delivery key: {e!s}") from e
+
     def update_therapy_session(
         self, session_code: str, update_data: dict[str, Any]
     ) -> dict[str, Any]:
@@ -229,6 +319,29 @@ class TherapySessionRepository(
         Returns:
             str: Next sequential session code (format: P###S###)
             
+        Raises:
+            RepositoryError: If generation fails
+        """
+        return self.generate_next_session_codes(patient_code, 1)[0]
+
+    def generate_next_session_codes(self, patient_code: str, count: int) -> list[str]:
+        """Generate the next `count` sequential session codes for a patient.
+        
+        Codes are reserved atomically through the reserve_session_codes RPC
+        (per-patient counter row), so concurrent webhooks never receive the
+        same code and the cost does not grow with the session history. Only
+        when the RPC is not deployed (PGRST202, migration not applied) or
+        returns no number (mocked client) is the highest existing code
+        looked up instead; any other RPC failure is raised, since the
+        history scan can hand the same code to concurrent webhooks.
+        
+        Args:
+            patient_code: Patient code (format: P###)
+            count: Number of consecutive codes to allocate
+            
+        Returns:
+            list[str]: Consecutive session codes (format: P###S###)
+            
         Raises:
             RepositoryError: If generation fails
         """
@@ -236,37 +349,141 @@ class TherapySessionRepository(
             # Validate patient code format
             if not patient_code or not patient_code.startswith('P'):
                 raise RepositoryError(f"Invalid patient code format: {patient_code}")
+            if count < 1:
+                raise RepositoryError(f"Invalid session code count: {count}")
             
-            # Query for the highest existing session number for this patient
-            result = (
-                self.client.table("therapy_sessions")
-                .select("session_code")
-                .like("session_code", f"{patient_code}S%")
-                .order("session_code", desc=True)
-                .limit(1)
-                .execute()
-            )
-            
-            if result.data:
-                # Extract the last session number and increment
-                last_code = result.data[0]["session_code"]
-                # Extract number from P###S### format
-                last_num = int(last_code.split('S')[1])
-                next_num = last_num + 1
-            else:
-                # First session for this patient
-                next_num = 1
+            next_num = self._reserve_session_numbers(patient_code, count)
+            if next_num is None:
+                next_num = self._next_session_number_from_history(patient_code)
             
             # Format with zero-padding
-            session_code = f"{patient_code}S{next_num:03d}"
+            session_codes = [f"{patient_code}S{num:03d}" for num in range(next_num, next_num + count)]
             
-            self.logger.info(f"Generated session code: {session_code}")
-            return session_code
+            self.logger.info(f"Generated session codes: {session_codes[0]}..{session_codes[-1]}")
+            return session_codes
             
         except Exception as e:
             error_msg = f"Failed to generate session code for {patient_code}: {e!s}"
             self.logger.error(error_msg, exc_info=True)
             raise RepositoryError(error_msg) from e
+
+    def _reserve_session_numbers(self, patient_code: str, count: int) -> int | None:
+        """Reserve `count` session numbers via the per-patient counter RPC.
+        
+        Returns:
+            int | None: First reserved number, or None if the RPC is not deployed
+
+        Raises:
+            Exception: Any RPC failure other than a missing function
+        """
+        try:
+            result = self.client.rpc(
+                "reserve_session_codes",
+                {"p_patient_code": patient_code, "p_count": count}
+            ).execute()
+            
+            first_num = result.data
+            if isinstance(first_num, list) and len(first_num) == 1:
+                first_num = first_num[0]
+            if isinstance(first_num, int) and not isinstance(first_num, bool) and first_num >= 1:
+                return first_num
+            
+            self.logger.warning(f"Unexpected reserve_session_codes result for {patient_code}: {first_num!r}")
+            return None
+            
+        except Exception as e:
+            if not _has_error_code(e, FUNCTION_NOT_FOUND_CODE):
+                raise
+            self.logger.warning(f"reserve_session_codes not deployed, using session history: {e!s}")
+            return None
+
+    def _next_session_number_from_history(self, patient_code: str) -> int:
+        """Fallback: next session number after the highest existing session code."""
+        # Query for the highest existing session number for this patient
+        result = (
+            self.client.table("therapy_sessions")
+            .select("session_code")
+            .like("session_code", f"{patient_code}S%")
+            .order("session_code", desc=True)
+            .limit(1)
+            .execute()
+        )
+        
+        if result.data:
+            # Extract the last session number and increment
+            last_code = result.data[0]["session_code"]
+            # Extract number from P###S### format
+            return int(last_code.split('S')[1]) + 1
+        
+        # First session for this patient
+        return 1
+
+    def build_session_row(
+        self,
+        session_code: str,
+        file_path: str,
+        file_metadata: dict[str, Any] | None = None,
+        patient_id: str | None = None,
+        therapist_id: str | None = None,
+        delivery_key: str | None = None
+    ) -> dict[str, Any]:
+        """Build the therapy_sessions insert payload for a new webhook/upload session."""
+        # Generate file hash for deduplication
+        import hashlib
+        file_hash_input = f"{file_path}:{file_metadata.get('size', 0) if file_metadata else 0}"
+        file_hash = hashlib.sha256(file_hash_input.encode()).hexdigest()
+        
+        # Prepare session data with session_code as primary key column
+        session_data = {
+            "session_code": session_code,  # Primary key column
+            "file_path": file_path,
+            "file_hash": file_hash,
+            "file_size_bytes": file_metadata.get("size", 0) if file_metadata else 0,
+            "processing_status": "processing",  # Start as processing
+            "game_metadata": file_metadata or {},  # Store file metadata only
+            "patient_id": patient_id,
+            "therapist_id": therapist_id,
+        }
+        if delivery_key:
+            session_data["webhook_delivery_key"] = delivery_key
+        return session_data
+
+    def create_sessions_bulk(self, sessions_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Insert several therapy sessions in a single request.
+
+        Args:
+            sessions_data: Session rows (see build_session_row)
+
+        Returns:
+            List[Dict]: Created sessions, in insertion order
+
+        Raises:
+            RepositoryError: If the insert fails (the whole batch is rejected)
+        """
+        try:
+            if not sessions_data:
+                return []
+
+            rows = []
+            for session_data in sessions_data:
+                data = self._prepare_timestamps(session_data.copy())
+                if data.get("patient_id"):
+                    data["patient_id"] = self._validate_uuid(data["patient_id"], "patient_id")
+                if data.get("therapist_id"):
+                    data["therapist_id"] = self._validate_uuid(data["therapist_id"], "therapist_id")
+                data.setdefault("processing_status", "pending")
+                rows.append(data)
+
+            result = self.client.table("therapy_sessions").insert(rows).execute()
+            created_sessions = self._handle_supabase_response(result, "bulk create", "therapy sessions")
+
+            self.logger.info(f"✅ Created {len(created_sessions)} therapy sessions in one request")
+            return created_sessions
+
+        except Exception as e:
+            error_msg = f"Failed to bulk create therapy sessions: {e!s}"
+            self.logger.error(error_msg, exc_info=True)
+            raise RepositoryError(error_msg) from e
     
     def create_session_with_code(
         self, 
@@ -274,7 +491,8 @@ class TherapySessionRepository(
         file_path: str,
         file_metadata: dict[str, Any] | None = None,
         patient_id: str | None = None,
-        therapist_id: str | None = None
+        therapist_id: str | None = None,
+        delivery_key: str | None = None
     ) -> tuple[str, str, dict[str, Any]]:
         """Create a new therapy session with auto-generated chronological code.
         
@@ -287,36 +505,36 @@ class TherapySessionRepository(
             file_metadata: Optional file metadata
             patient_id: Optional patient UUID
             therapist_id: Optional therapist UUID
+            delivery_key: Optional webhook delivery key (unique per storage object version)
             
         Returns:
             tuple: (session_code, session_data)
             
         Raises:
+            DuplicateDeliveryError: If delivery_key already owns a session
             RepositoryError: If creation fails
         """
         try:
             # Generate next sequential session code for human readability
             session_code = self.generate_next_session_code(patient_code)
             
-            # Generate file hash for deduplication
-            import hashlib
-            file_hash_input = f"{file_path}:{file_metadata.get('size', 0) if file_metadata else 0}"
-            file_hash = hashlib.sha256(file_hash_input.encode()).hexdigest()
-            
-            # Prepare session data with session_code as primary key column
-            session_data = {
-                "session_code": session_code,  # Primary key column
-                "file_path": file_path,
-                "file_hash": file_hash,
-                "file_size_bytes": file_metadata.get("size", 0) if file_metadata else 0,
-                "processing_status": "processing",  # Start as processing
-                "game_metadata": file_metadata or {},  # Store file metadata only
-                "patient_id": patient_id,
-                "therapist_id": therapist_id,
-            }
+            session_data = self.build_session_row(
+                session_code, file_path, file_metadata, patient_id, therapist_id, delivery_key
+            )
             
-            # Create the session
-            created_session = self.create_therapy_session(session_data)
+            # Create the session (unique index on webhook_delivery_key rejects retried deliveries)
+            try:
+                created_session = self.create_therapy_session(session_data)
+            except RepositoryError as create_error:
+                if not delivery_key or not _is_unique_violation(create_error):
+                    raise
+                existing = self.get_session_by_delivery_key(delivery_key)
+                if not existing:
+                    raise
+                raise DuplicateDeliveryError(
+                    f"Delivery {delivery_key[:16]} already created session {existing.get('session_code')}",
+                    existing,
+                ) from create_error
             
             # Return both human-readable code and UUID
             # session_code: For display/logging (P###S###)
@@ -325,6 +543,8 @@ class TherapySessionRepository(
             
             return session_code, session_uuid, created_session
             
+        except DuplicateDeliveryError:
+            raise
         except Exception as e:
             error_msg = f"Failed to create session with code: {e!s}"
             self.logger.error(error_msg, exc_info=True)
@@ -365,6 +585,48 @@ class TherapySessionRepository(
             self.logger.error(error_msg, exc_info=True)
             raise RepositoryError(error_msg) from e
     
+    def persist_processed_session(
+        self, session_id: str | UUID, document: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Write all results of a processed session in one transaction.
+
+        Calls the persist_processed_session RPC, which replaces the session's
+        emg_statistics, session_settings, bfr_monitoring and performance_scores
+        rows and updates therapy_sessions atomically.
+
+        Args:
+            session_id: Therapy session UUID
+            document: JSON document with emg_statistics, session_settings,
+                bfr_monitoring, performance_scores and session_update keys
+
+        Returns:
+            Dict: Row counts written per table
+
+        Raises:
+            PersistenceFunctionUnavailableError: If the RPC is not deployed
+            RepositoryError: If the transaction failed (nothing was written)
+        """
+        try:
+            validated_id = self._validate_uuid(session_id, "session_id")
+
+            result = self.client.rpc(
+                "persist_processed_session",
+                {"p_session_id": validated_id, "p_document": document},
+            ).execute()
+
+            data = self._handle_supabase_response(result, "persist", "processed session")
+            self.logger.info(f"💾 Persisted processed session {validated_id} in one transaction: {data}")
+            return data if isinstance(data, dict) else {}
+
+        except Exception as e:
+            if _has_error_code(e, FUNCTION_NOT_FOUND_CODE):
+                raise PersistenceFunctionUnavailableError(
+                    "persist_processed_session RPC is not available"
+                ) from e
+            error_msg = f"Failed to persist processed session {session_id}: {e!s}"
+            self.logger.error(error_msg, exc_info=True)
+            raise RepositoryError(error_msg) from e
+
     def get_sessions_by_patient_code(self, patient_code: str) -> list[dict[str, Any]]:
         """Get all sessions for a patient by patient code.
         
@@ -0,0 +1,280 @@
+"""Scoring Configuration Cache.
+============================
+
+In-process cache of scoring_configuration rows keyed by config id.
+
+Scoring a session needs the configuration weights and RPE mapping, which
+change a few times a month. Rows are stamped with the cache version at
+load time; every write through the scoring_config routes bumps the version,
+which makes all older entries stale at once. A load that raced with an
+invalidation is never stored, because its stamp is already outdated.
+
+Cross-worker invalidation uses Redis pub/sub: each write publishes on
+INVALIDATION_CHANNEL and every worker's listener thread bumps its local
+version. Redis is only touched from background threads (publisher and
+listener), so the async routes that invalidate never wait on it, and a
+failed connection is retried after REDIS_RETRY_BACKOFF_SECONDS instead of
+on every write. Without Redis the TTL bounds how long other workers can
+serve a stale configuration.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+from uuid import uuid4
+
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    redis = None
+
+from config import REDIS_KEY_PREFIX, REDIS_URL, SCORING_CONFIG_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = f"{REDIS_KEY_PREFIX}scoring_config:invalidate"
+REDIS_RETRY_BACKOFF_SECONDS = 30.0
+
+
+class ScoringConfigCache:
+    """Versioned, thread-safe cache of scoring configurations."""
+
+    def __init__(self, ttl_seconds: int = SCORING_CONFIG_CACHE_TTL_SECONDS, redis_url: str | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url or REDIS_URL
+        self.worker_id = uuid4().hex
+
+        # config_id -> (version stamp, loaded_at monotonic, row)
+        self._entries: dict[str, tuple[int, float, dict[str, Any]]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self._redis_lock = threading.Lock()
+        self._publisher: ThreadPoolExecutor | None = None
+        self._listener_thread: threading.Thread | None = None
+        self._stop_listener = threading.Event()
+
+    @property
+    def version(self) -> int:
+        """Current cache version (bumped on every invalidation)."""
+        return self._version
+
+    def get(self, config_id: str) -> dict[str, Any] | None:
+        """Return a cached configuration if it is current and not expired."""
+        with self._lock:
+            entry = self._entries.get(config_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stamp, loaded_at, row = entry
+            if stamp != self._version or time.monotonic() - loaded_at > self.ttl_seconds:
+                del self._entries[config_id]
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return row
+
+    def set(self, config_id: str, row: dict[str, Any], version: int | None = None) -> bool:
+        """Store a configuration loaded at `version` (ignored if stale)."""
+        with self._lock:
+            stamp = self._version if version is None else version
+            if stamp != self._version:
+                return False
+            self._entries[config_id] = (stamp, time.monotonic(), row)
+            return True
+
+    def get_or_load(
+        self, config_id: str, loader: Callable[[str], dict[str, Any] | None]
+    ) -> dict[str, Any] | None:
+        """Return the configuration, loading it with `loader` on a miss.
+
+        Args:
+            config_id: scoring_configuration UUID
+            loader: Fetches the row from the database (None if not found)
+
+        Returns:
+            Configuration row or None
+        """
+        if not isinstance(config_id, str) or not config_id:
+            return loader(config_id)
+
+        cached = self.get(config_id)
+        if cached is not None:
+            return cached
+
+        version = self._version
+        row = loader(config_id)
+        if isinstance(row, dict):
+            self.set(config_id, row, version)
+        return row
+
+    def invalidate(self, config_id: str | None = None, publish: bool = True) -> None:
+        """Drop all cached configurations.
+
+        A single write (e.g. activation) can change which configuration
+        sessions resolve to, so the whole cache is versioned out.
+
+        Args:
+            config_id: Changed configuration (for logging and subscribers)
+            publish: Notify other workers over Redis pub/sub
+        """
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self.invalidations += 1
+
+        logger.info(f"♻️ Scoring configuration cache invalidated (config={config_id or 'all'}, version={self._version})")
+
+        if publish:
+            self.publish_invalidation(config_id)
+
+    def publish_invalidation(self, config_id: str | None) -> Future | None:
+        """Notify other workers from the publisher thread (never blocks the caller)."""
+        if not REDIS_AVAILABLE:
+            return None
+        if self._publisher is None:
+            self._publisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring-config-publish")
+        return self._publisher.submit(self._publish_invalidation, config_id)
+
+    def _get_redis(self):
+        if not REDIS_AVAILABLE:
+            return None
+        with self._redis_lock:
+            if self._redis is None:
+                if time.monotonic() < self._redis_retry_at:
+                    return None
+                try:
+                    client = redis.Redis.from_url(self.redis_url, socket_timeout=5)
+                    client.ping()
+                    self._redis = client
+                except Exception as e:
+                    self._redis_retry_at = time.monotonic() + REDIS_RETRY_BACKOFF_SECONDS
+                    logger.warning(
+                        f"⚠️ Redis unavailable for scoring config invalidation "
+                        f"(retry in {REDIS_RETRY_BACKOFF_SECONDS:.0f}s): {e!s}"
+                    )
+                    return None
+            return self._redis
+
+    def _drop_redis(self) -> None:
+        """Forget a broken connection; reconnect after the backoff."""
+        with self._redis_lock:
+            self._redis = None
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_BACKOFF_SECONDS
+
+    def _publish_invalidation(self, config_id: str | None) -> None:
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps({"worker_id": self.worker_id, "config_id": config_id}),
+            )
+        except Exception as e:
+            self._drop_redis()
+            logger.warning(f"Failed to publish scoring config invalidation: {e!s}")
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        if message.get("type") != "message":
+            return
+        try:
+            payload = json.loads(message["data"])
+        except (TypeError, ValueError, KeyError):
+            payload = {}
+        if payload.get("worker_id") == self.worker_id:
+            return
+        self.invalidate(payload.get("config_id"), publish=False)
+
+    def start_listener(self) -> bool:
+        """Subscribe to cross-worker invalidations in a daemon thread.
+
+        The thread connects (and reconnects after errors) itself, so
+        application startup does not wait on Redis.
+        """
+        if not REDIS_AVAILABLE:
+            return False
+        if self._listener_thread is not None and self._listener_thread.is_alive():
+            return True
+
+        self._stop_listener.clear()
+
+        def listen() -> None:
+            pubsub = None
+            while not self._stop_listener.is_set():
+                try:
+                    if pubsub is None:
+                        client = self._get_redis()
+                        if client is None:
+                            self._stop_listener.wait(1.0)
+                            continue
+                        pubsub = client.pubsub(ignore_subscribe_messages=True)
+                        pubsub.subscribe(INVALIDATION_CHANNEL)
+                    message = pubsub.get_message(timeout=1.0)
+                    if message:
+                        self._handle_message(message)
+                except Exception as e:
+                    logger.warning(f"Scoring config invalidation listener error: {e!s}")
+                    if pubsub is not None:
+                        pubsub.close()
+                        pubsub = None
+                    self._drop_redis()
+            if pubsub is not None:
+                pubsub.close()
+
+        self._listener_thread = threading.Thread(
+            target=listen, name="scoring-config-invalidation", daemon=True
+        )
+        self._listener_thread.start()
+        logger.info("📡 Listening for scoring configuration invalidations")
+        return True
+
+    def stop_listener(self) -> None:
+        """Stop the invalidation listener and publisher threads."""
+        self._stop_listener.set()
+        if self._listener_thread is not None:
+            self._listener_thread.join(timeout=2.0)
+            self._listener_thread = None
+        if self._publisher is not None:
+            self._publisher.shutdown(wait=False)
+            self._publisher = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Cache counters for monitoring."""
+        return {
+            "entries": len(self._entries),
+            "version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "listening": self._listener_thread is not None and self._listener_thread.is_alive(),
+        }
+
+
+# Singleton instance
+_cache_instance: ScoringConfigCache | None = None
+
+
+def get_scoring_config_cache() -> ScoringConfigCache:
+    """Get singleton scoring configuration cache."""
+    global _cache_instance
+
+    if _cache_instance is None:
+        _cache_instance = ScoringConfigCache()
+
+    return _cache_instance
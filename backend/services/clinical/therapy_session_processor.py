@@ -61,11 +61,26 @@ from config import (
     DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS,
     DEFAULT_TARGET_CONTRACTIONS_CH1,
     DEFAULT_TARGET_CONTRACTIONS_CH2,
+    ENABLE_TRANSACTIONAL_SESSION_PERSISTENCE,
     MAX_FILE_SIZE,
+    SIGNAL_PYRAMID_ENABLED,
     SessionDefaults
 )
+from database.executor import run_db
+from fastapi.concurrency import run_in_threadpool
 from models.api.request_response import ProcessingOptions, GameSessionParameters
 from services.c3d.processor import GHOSTLYC3DProcessor
+from services.cache.cache_warmer import build_session_cache_payload
+from services.cache.redis_cache_service import get_cache_service
+from services.clinical.repositories.session_count_repository import (
+    SessionCountRepository,
+    session_day_for,
+)
+from services.clinical.repositories.therapy_session_repository import (
+    DuplicateDeliveryError,
+    PersistenceFunctionUnavailableError,
+)
+from services.data.signal_pyramid_store import SignalPyramidStore
 # C3DUtils import removed - metadata extraction handled internally by GHOSTLYC3DProcessor
 
 
@@ -136,17 +151,42 @@ class TherapySessionProcessor:
         session_repo, 
         cache_service, 
         performance_service,
-        supabase_client
+        supabase_client,
+        session_count_repo=None,
+        analytics_cache=None,
+        pyramid_store=None
     ):
-        """Initialize with required services using dependency injection."""
+        """Initialize with required services using dependency injection.
+
+        analytics_cache stores processed analytics (defaults to the Redis
+        cache service singleton, created on first use). pyramid_store writes
+        chart pyramids next to the C3D file (defaults to SignalPyramidStore).
+        """
         self.c3d_processor = c3d_processor
         self.emg_data_repo = emg_data_repo
         self.session_repo = session_repo
         self.cache_service = cache_service
         self.performance_service = performance_service
         self.supabase_client = supabase_client
+        self.session_count_repo = session_count_repo or SessionCountRepository(supabase_client)
+        self._analytics_cache = analytics_cache
+        self._pyramid_store = pyramid_store
         logger.info("🏗️ TherapySessionProcessor initialized with dependencies")
 
+    @property
+    def analytics_cache(self):
+        """Session analytics cache (RedisCacheService)."""
+        if self._analytics_cache is None:
+            self._analytics_cache = get_cache_service()
+        return self._analytics_cache
+
+    @property
+    def pyramid_store(self):
+        """Signal pyramid storage (SignalPyramidStore)."""
+        if self._pyramid_store is None:
+            self._pyramid_store = SignalPyramidStore(self.supabase_client)
+        return self._pyramid_store
+
     @property
     def scoring_service(self):
         """Alias for performance_service for backward compatibility with tests."""
@@ -158,7 +198,8 @@ class TherapySessionProcessor:
         file_metadata: dict[str, Any],
         patient_id: str | None = None,
         therapist_id: str | None = None,
-    ) -> str:
+        delivery_key: str | None = None,
+    ) -> dict[str, Any]:
         """Creates a new therapy session record following DRY/SOLID principles.
 
         This method properly delegates to the repository layer for session creation,
@@ -170,9 +211,12 @@ class TherapySessionProcessor:
             file_metadata: Metadata from Supabase Storage (e.g., size).
             patient_id: Optional UUID of the patient.
             therapist_id: Optional UUID of the therapist.
+            delivery_key: Optional webhook delivery key; a retried delivery
+                returns the session it already created, flagged "duplicate".
 
         Returns:
-            The session_code of the created or existing therapy session.
+            {"session_code", "session_id", "duplicate"} of the created or existing
+            therapy session (same shape as the create_sessions_batch entries).
 
         Raises:
             TherapySessionError: If the session creation fails in the database.
@@ -187,34 +231,154 @@ class TherapySessionProcessor:
             file_hash = self._generate_file_hash(file_path, file_metadata)
             
             # Check for existing session (idempotency)
-            existing = self.session_repo.get_session_by_file_hash(file_hash)
+            existing = await run_db(self.session_repo.get_session_by_file_hash, file_hash)
             if existing:
-                # Extract human-readable code from game_metadata JSONB
-                game_metadata = existing.get('game_metadata', {})
-                session_code_existing = game_metadata.get('session_code', 'Unknown')
-                logger.info(f"♻️ Found existing session: {session_code_existing}")
-                return session_code_existing
+                return self._existing_session_result(existing)
 
             # Delegate session creation to repository (proper separation of concerns)
             # Repository returns: (human_readable_code, uuid_for_fk, full_record)
-            session_code, session_uuid, _ = self.session_repo.create_session_with_code(
-                patient_code=patient_code,
-                file_path=file_path,
-                file_metadata=file_metadata,
-                patient_id=patient_id,
-                therapist_id=therapist_id
-            )
-            
-            # Store UUID for webhook response
-            self._last_session_uuid = session_uuid
+            try:
+                session_code, session_uuid, _ = await run_db(
+                    self.session_repo.create_session_with_code,
+                    patient_code=patient_code,
+                    file_path=file_path,
+                    file_metadata=file_metadata,
+                    patient_id=patient_id,
+                    therapist_id=therapist_id,
+                    delivery_key=delivery_key
+                )
+            except DuplicateDeliveryError as duplicate:
+                # Retried webhook delivery: DB unique index already holds this object version
+                session_code_existing = duplicate.session.get("session_code")
+                logger.info(f"♻️ Duplicate webhook delivery for existing session: {session_code_existing}")
+                return {
+                    "session_code": session_code_existing,
+                    "session_id": duplicate.session.get("id"),
+                    "duplicate": True,
+                }
+
+            await self._record_session_days([(patient_id, file_path)])
             
             logger.info(f"✅ Created therapy session: {session_code} (UUID: {session_uuid})")
-            return session_code  # Return human-readable code
+            return {"session_code": session_code, "session_id": session_uuid, "duplicate": False}
 
         except Exception as e:
             logger.error(f"Failed to create session: {e!s}", exc_info=True)
             raise TherapySessionError(f"Session creation failed: {e!s}") from e
 
+    async def create_sessions_batch(
+        self, deliveries: list[dict[str, Any]]
+    ) -> list[dict[str, Any] | Exception]:
+        """Create therapy sessions for a burst of uploads with bulk database calls.
+
+        Re-uploaded files are matched to their existing session by file hash
+        (as in create_session) in one lookup; session codes for the new files
+        are allocated once per patient and all rows are inserted in a single
+        request. If the bulk insert is rejected (e.g. one retried delivery
+        hits the webhook_delivery_key unique index), each delivery falls back
+        to create_session so the others still succeed.
+
+        Args:
+            deliveries: Dicts with file_path, file_metadata, patient_id,
+                therapist_id and delivery_key (same meaning as create_session).
+
+        Returns:
+            One entry per delivery, in order: {"session_code", "session_id",
+            "duplicate"} on success, or the exception raised for that delivery.
+        """
+        if not deliveries:
+            return []
+
+        try:
+            # Check for existing sessions (idempotency), one lookup for the batch
+            file_hashes = [
+                self._generate_file_hash(delivery["file_path"], delivery.get("file_metadata") or {})
+                for delivery in deliveries
+            ]
+            existing_by_hash = await run_db(self.session_repo.get_sessions_by_file_hashes, file_hashes)
+            batch_results: list[dict[str, Any] | None] = [
+                self._existing_session_result(existing_by_hash[file_hash]) if file_hash in existing_by_hash else None
+                for file_hash in file_hashes
+            ]
+
+            # Allocate consecutive codes per patient (one lookup per patient, not per file)
+            indexes_by_patient: dict[str, list[int]] = {}
+            first_index_by_hash: dict[str, int] = {}
+            for index, delivery in enumerate(deliveries):
+                if batch_results[index] is None and first_index_by_hash.setdefault(file_hashes[index], index) == index:
+                    patient_code = self._extract_patient_code(delivery["file_path"]) or "P000"
+                    indexes_by_patient.setdefault(patient_code, []).append(index)
+
+            session_rows: dict[int, dict[str, Any]] = {}
+            for patient_code, indexes in indexes_by_patient.items():
+                codes = await run_db(self.session_repo.generate_next_session_codes, patient_code, len(indexes))
+                for index, session_code in zip(indexes, codes):
+                    delivery = deliveries[index]
+                    session_rows[index] = self.session_repo.build_session_row(
+                        session_code,
+                        delivery["file_path"],
+                        delivery.get("file_metadata"),
+                        delivery.get("patient_id"),
+                        delivery.get("therapist_id"),
+                        delivery.get("delivery_key"),
+                    )
+
+            created_sessions = await run_db(self.session_repo.create_sessions_bulk, list(session_rows.values()))
+            uuid_by_code = {session["session_code"]: session.get("id") for session in created_sessions}
+            await self._record_session_days(
+                [(deliveries[index].get("patient_id"), deliveries[index]["file_path"]) for index in session_rows]
+            )
+
+            logger.info(f"✅ Created {len(created_sessions)} therapy sessions in batch")
+            for index, row in session_rows.items():
+                batch_results[index] = {
+                    "session_code": row["session_code"],
+                    "session_id": uuid_by_code.get(row["session_code"]),
+                    "duplicate": False,
+                }
+            # The same file twice in one burst: later deliveries reuse the first one's
+            # session and are flagged as duplicates so the file is processed once
+            first_delivery_by_hash: dict[str, int] = {}
+            results: list[dict[str, Any] | Exception] = []
+            for index, file_hash in enumerate(file_hashes):
+                first = first_delivery_by_hash.setdefault(file_hash, index)
+                results.append(batch_results[index] if first == index else {**batch_results[first], "duplicate": True})
+            return results
+
+        except Exception as e:
+            logger.warning(f"Bulk session creation failed, falling back to per-file creation: {e!s}")
+
+        results: list[dict[str, Any] | Exception] = []
+        for delivery in deliveries:
+            try:
+                results.append(
+                    await self.create_session(
+                        file_path=delivery["file_path"],
+                        file_metadata=delivery.get("file_metadata") or {},
+                        patient_id=delivery.get("patient_id"),
+                        therapist_id=delivery.get("therapist_id"),
+                        delivery_key=delivery.get("delivery_key"),
+                    )
+                )
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _record_session_days(self, sessions: list[tuple[str | None, str]]) -> None:
+        """Add newly created sessions to the per-patient daily count index.
+
+        Args:
+            sessions: (patient_id, file_path) per created session; sessions
+                without a resolved patient are not indexed
+        """
+        days_by_patient: dict[str, list] = {}
+        for patient_id, file_path in sessions:
+            if patient_id:
+                days_by_patient.setdefault(patient_id, []).append(session_day_for(file_path))
+
+        for patient_id, days in days_by_patient.items():
+            await run_db(self.session_count_repo.record_sessions, patient_id, days)
+
     async def process_c3d_file(
         self, session_code: str, bucket: str, object_path: str
     ) -> dict[str, Any]:
@@ -232,7 +396,7 @@ class TherapySessionProcessor:
         
         try:
             # Get existing session details
-            session = self.session_repo.get_therapy_session(session_code)
+            session = await run_db(self.session_repo.get_therapy_session, session_code)
             if not session:
                 raise DatabaseError(f"Session {session_code} not found")
 
@@ -267,23 +431,35 @@ class TherapySessionProcessor:
             
             # Run the complete C3D processing pipeline
             # The processor already extracts all metadata via C3DUtils
-            processing_result = self.c3d_processor.process_file(
-                processing_opts, session_params, include_signals=False
+            # CPU-bound (seconds per file): run it off the event loop
+            processing_result = await run_in_threadpool(
+                self.c3d_processor.process_file, processing_opts, session_params, include_signals=False
             )
             
-            # Populate all database tables with processing results
-            await self._populate_database_tables(
-                session_code, session_uuid, processing_result, file_data, processing_opts, session_params
-            )
+            # Single-transaction write when the persistence RPC is enabled
+            persisted = False
+            if ENABLE_TRANSACTIONAL_SESSION_PERSISTENCE:
+                persisted = await self._persist_session_transactionally(
+                    session_code, session_uuid, processing_result, processing_opts, session_params
+                )
             
-            # Update session status and metadata
-            await self._update_session_metadata(session_code, processing_result)
-            self.session_repo.update_therapy_session(
-                session_code, {"processing_status": "completed"}
-            )
+            if not persisted:
+                # Populate all database tables with processing results
+                await self._populate_database_tables(
+                    session_code, session_uuid, processing_result, file_data, processing_opts, session_params
+                )
+                
+                # Update session status and metadata
+                await self._update_session_metadata(session_code, processing_result)
+                await run_db(
+                    self.session_repo.update_therapy_session, session_code, {"processing_status": "completed"}
+                )
             
             # Cache analytics for performance
-            await self._cache_session_analytics(session_uuid, processing_result)
+            await self._cache_session_analytics(session_uuid, processing_result, session.get("patient_id"))
+
+            # Multi-resolution chart data so JIT requests skip the C3D decode
+            await self._store_signal_pyramid(bucket, object_path)
             
             logger.info(f"🎉 Completed C3D file processing: {session_code}")
             
@@ -303,11 +479,10 @@ class TherapySessionProcessor:
             # Update session status to failed if session exists
             try:
                 error_message = str(e)[:500]  # Truncate long error messages
-                self.session_repo.update_therapy_session(
-                    session_code, {
-                        "processing_status": "failed",
-                        "processing_error_message": error_message
-                    }
+                await run_db(
+                    self.session_repo.update_therapy_session,
+                    session_code,
+                    {"processing_status": "failed", "processing_error_message": error_message},
                 )
             except Exception as update_error:
                 logger.error(f"Failed to update session status to failed: {update_error!s}")
@@ -354,16 +529,16 @@ class TherapySessionProcessor:
         
         try:
             # Step 1: Create therapy session record
-            session_code = await self.create_session(
+            created = await self.create_session(
                 file_path, file_metadata, patient_id, therapist_id
             )
+            session_code = created["session_code"]
             
             # Step 2: Get session UUID from the created session
-            if hasattr(self, '_last_session_uuid'):
-                session_uuid = self._last_session_uuid
-            else:
+            session_uuid = created["session_id"]
+            if not session_uuid:
                 # Fallback: look up session by code
-                session = self.session_repo.get_therapy_session(session_code)
+                session = await run_db(self.session_repo.get_therapy_session, session_code)
                 session_uuid = session.get("id") if session else None
             
             if not session_uuid:
@@ -396,8 +571,9 @@ class TherapySessionProcessor:
             
             # Run the complete C3D processing pipeline
             # The processor already extracts all metadata via C3DUtils
-            processing_result = self.c3d_processor.process_file(
-                processing_opts, session_params, include_signals=False
+            # CPU-bound (seconds per file): run it off the event loop
+            processing_result = await run_in_threadpool(
+                self.c3d_processor.process_file, processing_opts, session_params, include_signals=False
             )
             
             # Step 5: Populate all database tables with processing results
@@ -407,12 +583,12 @@ class TherapySessionProcessor:
             
             # Step 6: Update session status and metadata
             await self._update_session_metadata(session_code, processing_result)
-            self.session_repo.update_therapy_session(
-                session_code, {"processing_status": "completed"}
+            await run_db(
+                self.session_repo.update_therapy_session, session_code, {"processing_status": "completed"}
             )
             
             # Step 7: Cache analytics for performance
-            await self._cache_session_analytics(session_code, processing_result)
+            await self._cache_session_analytics(session_uuid, processing_result, patient_id)
             
             logger.info(f"🎉 Completed therapy session processing: {session_code}")
             
@@ -433,11 +609,10 @@ class TherapySessionProcessor:
             if session_code:
                 try:
                     error_message = str(e)[:500]  # Truncate long error messages
-                    self.session_repo.update_therapy_session(
-                        session_code, {
-                            "processing_status": "failed",
-                            "processing_error_message": error_message
-                        }
+                    await run_db(
+                        self.session_repo.update_therapy_session,
+                        session_code,
+                        {"processing_status": "failed", "processing_error_message": error_message},
                     )
                 except Exception as update_error:
                     logger.error(f"Failed to update session status to failed: {update_error!s}")
@@ -538,10 +713,19 @@ class TherapySessionProcessor:
     def _generate_file_hash(self, file_path: str, file_metadata: dict[str, Any]) -> str:
         """Generate consistent file hash for duplicate detection.
         
-        Uses combination of path and metadata for deterministic hashing.
+        Uses combination of path and metadata for deterministic hashing
+        (same value as the file_hash stored by build_session_row).
         """
         hash_input = f"{file_path}:{file_metadata.get('size', 0)}"
-        return hashlib.sha256(hash_input.encode()).hexdigest()[:16]
+        return hashlib.sha256(hash_input.encode()).hexdigest()
+
+    def _existing_session_result(self, existing: dict[str, Any]) -> dict[str, Any]:
+        """create_session result for a session found by file hash."""
+        session_code_existing = existing.get("session_code") or existing.get("game_metadata", {}).get(
+            "session_code", "Unknown"
+        )
+        logger.info(f"♻️ Found existing session: {session_code_existing}")
+        return {"session_code": session_code_existing, "session_id": existing.get("id"), "duplicate": False}
 
     async def _download_file(self, bucket: str, object_path: str) -> bytes:
         """Download file from Supabase Storage (test-compatible method signature).
@@ -560,7 +744,7 @@ class TherapySessionProcessor:
             logger.info(f"📥 Downloading from bucket '{bucket}': {object_path}")
             
             # Download file content directly
-            response = self.supabase_client.storage.from_(bucket).download(object_path)
+            response = await run_db(self.supabase_client.storage.from_(bucket).download, object_path)
             
             if not response:
                 raise FileProcessingError(f"Empty response from storage download: {bucket}/{object_path}")
@@ -626,7 +810,7 @@ class TherapySessionProcessor:
             logger.info(f"📥 Downloading validated path from bucket '{bucket_name}': {object_path}")
             
             # Download file content
-            response = self.supabase_client.storage.from_(bucket_name).download(object_path)
+            response = await run_db(self.supabase_client.storage.from_(bucket_name).download, object_path)
             
             if not response:
                 raise FileProcessingError(f"Empty response from storage download: {file_path}")
@@ -694,7 +878,7 @@ class TherapySessionProcessor:
         
         try:
             # Parallel execution of independent database operations for better performance
-            # Following asyncio.gather best practices from aiohttp documentation
+            # Blocking Supabase calls are offloaded via run_db, so these writes overlap
             
             # Step 1: Independent operations that can run in parallel
             parallel_tasks = []
@@ -1256,58 +1440,13 @@ class TherapySessionProcessor:
     ) -> None:
         """Calculate and store performance scores."""
         try:
-            logger.info(f"📊 Starting performance score calculation for session {session_uuid}")
-            
-            # Use the synchronous performance service (follows project's sync Supabase architecture)
-            score_result = self.performance_service.calculate_performance_scores(session_uuid)
-            
-            logger.info(f"📊 Performance service returned: {list(score_result.keys())}")
-            
-            # Check for error in result
-            if "error" in score_result:
-                logger.error(f"❌ Performance service error: {score_result['error']}")
+            # The performance service reads emg_statistics and scoring config synchronously
+            performance_data = await run_db(
+                self._build_performance_scores_record, session_uuid, overall_score, analytics
+            )
+            if performance_data is None:
                 return
 
-            # Get scoring config ID - will use fallback from config.py if needed
-            scoring_config_id = score_result.get("scoring_config_id")
-            if not scoring_config_id:
-                # This should rarely happen now that we have fallback, but handle gracefully
-                logger.error(
-                    f"Failed to get scoring configuration for session {session_uuid}. "
-                    "This indicates a database connectivity issue. Performance scores will be skipped."
-                )
-                return  # Skip only if we truly can't get any config (DB error)
-            
-            logger.info(f"📊 Using scoring_config_id: {scoring_config_id}")
-
-            # Create performance record matching actual database schema
-            # Schema has: overall_score, compliance_score, symmetry_score, effort_score, game_score
-            performance_data = {
-                "session_id": session_uuid,
-                "overall_score": score_result.get("overall_score", overall_score),
-                "compliance_score": score_result.get("compliance_score", 0.0),
-                "symmetry_score": score_result.get("symmetry_score", 0.0),
-                "effort_score": score_result.get("effort_score", 0.0),
-                "game_score": score_result.get("game_score", 0.0),
-                "scoring_config_id": scoring_config_id,
-                # Channel-specific compliance scores
-                "left_muscle_compliance": score_result.get("left_muscle_compliance", 0.0),
-                "right_muscle_compliance": score_result.get("right_muscle_compliance", 0.0),
-                # Detailed rate metrics
-                "completion_rate_left": score_result.get("completion_rate_left", 0.0),
-                "completion_rate_right": score_result.get("completion_rate_right", 0.0),
-                "intensity_rate_left": score_result.get("intensity_rate_left", 0.0),
-                "intensity_rate_right": score_result.get("intensity_rate_right", 0.0),
-                "duration_rate_left": score_result.get("duration_rate_left", 0.0),
-                "duration_rate_right": score_result.get("duration_rate_right", 0.0),
-                # BFR and game data
-                "bfr_compliant": score_result.get("bfr_compliant", True),
-                "bfr_pressure_aop": score_result.get("bfr_pressure_aop"),
-                "rpe_post_session": score_result.get("rpe_post_session"),
-                "game_points_achieved": score_result.get("game_points_achieved"),
-                "game_points_max": score_result.get("game_points_max"),
-            }
-
             # Store in database
             logger.info(f"📊 Attempting to upsert performance_scores with {len(performance_data)} fields")
             logger.debug(f"📊 Performance data keys: {list(performance_data.keys())}")
@@ -1324,6 +1463,84 @@ class TherapySessionProcessor:
             logger.exception(f"Failed to populate performance scores: {e!s}")
             raise DatabaseError(f"Performance scores population failed: {e!s}") from e
 
+    def _build_performance_scores_record(
+        self,
+        session_uuid: str,
+        overall_score: float,
+        analytics: dict[str, Any],
+        session_metrics=None,
+    ) -> dict[str, Any] | None:
+        """Calculate performance scores and build the performance_scores row.
+
+        Args:
+            session_uuid: Therapy session UUID
+            overall_score: Fallback overall score from processing
+            analytics: Per-channel analytics
+            session_metrics: Optional in-memory SessionMetrics; when None the
+                performance service reads emg_statistics from the database
+
+        Returns:
+            Row dict, or None when scores cannot be calculated
+        """
+        logger.info(f"📊 Starting performance score calculation for session {session_uuid}")
+        
+        # Use the synchronous performance service (follows project's sync Supabase architecture)
+        if session_metrics is not None:
+            score_result = self.performance_service.calculate_performance_scores(
+                session_uuid, session_metrics
+            )
+        else:
+            score_result = self.performance_service.calculate_performance_scores(session_uuid)
+        
+        logger.info(f"📊 Performance service returned: {list(score_result.keys())}")
+        
+        # Check for error in result
+        if "error" in score_result:
+            logger.error(f"❌ Performance service error: {score_result['error']}")
+            return None
+
+        # Get scoring config ID - will use fallback from config.py if needed
+        scoring_config_id = score_result.get("scoring_config_id")
+        if not scoring_config_id:
+            # This should rarely happen now that we have fallback, but handle gracefully
+            logger.error(
+                f"Failed to get scoring configuration for session {session_uuid}. "
+                "This indicates a database connectivity issue. Performance scores will be skipped."
+            )
+            return None  # Skip only if we truly can't get any config (DB error)
+        
+        logger.info(f"📊 Using scoring_config_id: {scoring_config_id}")
+
+        # Create performance record matching actual database schema
+        # Schema has: overall_score, compliance_score, symmetry_score, effort_score, game_score
+        performance_data = {
+            "session_id": session_uuid,
+            "overall_score": score_result.get("overall_score", overall_score),
+            "compliance_score": score_result.get("compliance_score", 0.0),
+            "symmetry_score": score_result.get("symmetry_score", 0.0),
+            "effort_score": score_result.get("effort_score", 0.0),
+            "game_score": score_result.get("game_score", 0.0),
+            "scoring_config_id": scoring_config_id,
+            # Channel-specific compliance scores
+            "left_muscle_compliance": score_result.get("left_muscle_compliance", 0.0),
+            "right_muscle_compliance": score_result.get("right_muscle_compliance", 0.0),
+            # Detailed rate metrics
+            "completion_rate_left": score_result.get("completion_rate_left", 0.0),
+            "completion_rate_right": score_result.get("completion_rate_right", 0.0),
+            "intensity_rate_left": score_result.get("intensity_rate_left", 0.0),
+            "intensity_rate_right": score_result.get("intensity_rate_right", 0.0),
+            "duration_rate_left": score_result.get("duration_rate_left", 0.0),
+            "duration_rate_right": score_result.get("duration_rate_right", 0.0),
+            # BFR and game data
+            "bfr_compliant": score_result.get("bfr_compliant", True),
+            "bfr_pressure_aop": score_result.get("bfr_pressure_aop"),
+            "rpe_post_session": score_result.get("rpe_post_session"),
+            "game_points_achieved": score_result.get("game_points_achieved"),
+            "game_points_max": score_result.get("game_points_max"),
+        }
+
+        return performance_data
+
     async def _populate_database_tables(
         self, 
         session_code: str,
@@ -1366,51 +1583,119 @@ class TherapySessionProcessor:
             logger.exception(f"Database population failed: {e!s}")
             raise TherapySessionError(f"Database population failed: {e!s}") from e
 
+    async def _persist_session_transactionally(
+        self,
+        session_code: str,
+        session_uuid: str,
+        processing_result: dict[str, Any],
+        processing_opts,
+        session_params
+    ) -> bool:
+        """Write all session tables and the completed status in one RPC call.
+
+        Performance scores are computed from the in-memory analytics (not
+        from emg_statistics rows, which only exist after the transaction).
+
+        Returns:
+            bool: True if persisted, False if the RPC is not deployed (caller
+            falls back to per-table writes)
+
+        Raises:
+            DatabaseError: If the transaction failed (nothing was written)
+        """
+        if "metadata" not in processing_result:
+            raise ValueError("No metadata found in processing result")
+        if "analytics" not in processing_result:
+            raise ValueError("No analytics found in processing result")
+
+        analytics = processing_result["analytics"]
+
+        emg_statistics = [
+            self._build_emg_statistics_record(
+                session_uuid, channel_name, channel_data, analytics, session_params
+            )
+            for channel_name, channel_data in analytics.items()
+        ]
+
+        performance_scores = None
+        session_metrics = (
+            self._create_session_metrics_from_analytics(session_uuid, analytics) if analytics else None
+        )
+        if session_metrics is not None:
+            performance_scores = await run_db(
+                self._build_performance_scores_record,
+                session_uuid,
+                self._calculate_overall_score(processing_result),
+                analytics,
+                session_metrics,
+            )
+
+        session_update = self._build_session_metadata_update(processing_result)
+        session_update["processing_status"] = "completed"
+        session_update["processed_at"] = datetime.now(timezone.utc).isoformat()
+
+        document = {
+            "emg_statistics": emg_statistics,
+            "session_settings": await self._build_session_settings_record(
+                session_code, session_uuid, processing_opts, session_params
+            ),
+            "bfr_monitoring": self._build_bfr_monitoring_records(session_uuid, session_params),
+            "performance_scores": performance_scores,
+            "session_update": session_update,
+        }
+
+        try:
+            counts = await run_db(self.session_repo.persist_processed_session, session_uuid, document)
+        except PersistenceFunctionUnavailableError:
+            logger.warning("persist_processed_session RPC not deployed - using per-table writes")
+            return False
+        except Exception as e:
+            raise DatabaseError(f"Transactional persistence failed for session {session_code}: {e!s}") from e
+
+        logger.info(f"✅ Session {session_code} persisted in one transaction: {counts}")
+        return True
+
     async def _cache_session_analytics(
         self, 
         session_uuid: str, 
-        processing_result: dict[str, Any]
+        processing_result: dict[str, Any],
+        patient_id: str | None = None
     ) -> None:
         """Cache session analytics in Redis for fast access."""
         try:
-            # Calculate summary statistics
             analytics = processing_result.get("analytics", {})
-            summary = {
-                "channels": list(analytics.keys()),
-                "total_channels": len(analytics),
-                "overall_compliance": 0.0,
-                "processed_at": datetime.now(timezone.utc).isoformat()
-            }
-            
-            # Calculate average compliance across channels
-            if analytics:
-                total_compliance = sum(
-                    channel.get("compliance_rate", 0.0) 
-                    for channel in analytics.values()
-                )
-                summary["overall_compliance"] = total_compliance / len(analytics)
-            
-            cache_data = {
-                "session_id": session_uuid,
-                "analytics": analytics,
-                "summary": summary,
-                "metadata": processing_result.get("metadata", {}),
-                "cache_version": "2.1"
-            }
+            cache_data = build_session_cache_payload(
+                session_uuid, analytics, processing_result.get("metadata", {})
+            )
             
-            # Note: Caching disabled - method not implemented in CacheService
-            # This is non-critical for the workflow as noted in the exception handler
-            # await self.cache_service.set_session_analytics(session_uuid, cache_data)
+            cached = await self.analytics_cache.aset_session_analytics(
+                session_uuid, cache_data, patient_id=patient_id
+            )
             
             logger.info(
-                f"📊 Session analytics processed for {session_uuid}: "
-                f"{len(analytics)} channels, {summary['overall_compliance']:.1%} overall compliance"
+                f"📊 Session analytics {'cached' if cached else 'processed'} for {session_uuid}: "
+                f"{len(analytics)} channels, {cache_data['summary']['overall_compliance']:.1%} overall compliance"
             )
             
         except Exception as e:
             logger.exception(f"Failed to cache session analytics: {e!s}")
             # Don't raise - caching is not critical for the workflow
 
+    async def _store_signal_pyramid(self, bucket: str, object_path: str) -> None:
+        """Store the min/max signal pyramid next to the C3D file for JIT chart requests."""
+        if not SIGNAL_PYRAMID_ENABLED:
+            return
+
+        emg_data = getattr(self.c3d_processor, "emg_data", None)
+        if not isinstance(emg_data, dict) or not emg_data:
+            return
+
+        try:
+            await run_db(self.pyramid_store.save, bucket, object_path, emg_data)
+        except Exception as e:
+            logger.warning(f"Failed to store signal pyramid for {bucket}/{object_path}: {e!s}")
+            # Don't raise - JIT requests fall back to decoding the C3D file
+
     async def _update_session_metadata(
         self,
         session_code: str,
@@ -1418,33 +1703,9 @@ class TherapySessionProcessor:
     ) -> None:
         """Update session metadata with processing results."""
         try:
-            metadata = processing_result.get("metadata", {})
+            update_data = self._build_session_metadata_update(processing_result)
             
-            # Extract game session date from metadata
-            session_date = None
-            if "time" in metadata:
-                try:
-                    # Parse the time string and convert to ISO format with timezone
-                    time_str = metadata["time"]
-                    # Assuming the time is in format "2025-08-28 15:30:00"
-                    if "T" not in time_str and " " in time_str:
-                        # Convert to ISO format
-                        date_part, time_part = time_str.split(" ")
-                        session_date = f"{date_part}T{time_part}+00:00"
-                    else:
-                        session_date = time_str
-                except Exception as date_error:
-                    logger.warning(f"Failed to parse session date from metadata: {date_error!s}")
-            
-            update_data = {
-                "game_metadata": metadata,
-                "processing_time_ms": processing_result.get("processing_time_ms", 0)
-            }
-            
-            if session_date:
-                update_data["session_date"] = session_date
-            
-            self.session_repo.update_therapy_session(session_code, update_data)
+            await run_db(self.session_repo.update_therapy_session, session_code, update_data)
             
             logger.info(f"📊 Session metadata updated for {session_code}")
             
@@ -1452,12 +1713,42 @@ class TherapySessionProcessor:
             logger.exception(f"Failed to update session metadata: {e!s}")
             # Don't raise - metadata update is not critical
 
+    def _build_session_metadata_update(self, processing_result: dict[str, Any]) -> dict[str, Any]:
+        """Build the therapy_sessions update (game metadata, session date, timing)."""
+        metadata = processing_result.get("metadata", {})
+        
+        # Extract game session date from metadata
+        session_date = None
+        if "time" in metadata:
+            try:
+                # Parse the time string and convert to ISO format with timezone
+                time_str = metadata["time"]
+                # Assuming the time is in format "2025-08-28 15:30:00"
+                if "T" not in time_str and " " in time_str:
+                    # Convert to ISO format
+                    date_part, time_part = time_str.split(" ")
+                    session_date = f"{date_part}T{time_part}+00:00"
+                else:
+                    session_date = time_str
+            except Exception as date_error:
+                logger.warning(f"Failed to parse session date from metadata: {date_error!s}")
+        
+        update_data = {
+            "game_metadata": metadata,
+            "processing_time_ms": processing_result.get("processing_time_ms", 0)
+        }
+        
+        if session_date:
+            update_data["session_date"] = session_date
+        
+        return update_data
+
     async def _get_patient_duration_targets(self, patient_id: str) -> tuple[float, float] | None:
         """Get patient-specific duration targets from database."""
         try:
-            response = self.supabase_client.table("patients").select(
+            response = await run_db(self.supabase_client.table("patients").select(
                 "current_mvc75_ch1, current_mvc75_ch2, current_target_ch1_ms, current_target_ch2_ms"
-            ).eq("id", patient_id).execute()
+            ).eq("id", patient_id).execute)
             
             if response.data and len(response.data) > 0:
                 patient = response.data[0]
@@ -1478,7 +1769,7 @@ class TherapySessionProcessor:
         """Upsert data into table with conflict resolution."""
         try:
             logger.debug(f"📝 Upserting to {table_name} with conflict on {conflict_column}")
-            response = self.supabase_client.table(table_name).upsert(data).execute()
+            response = await run_db(self.supabase_client.table(table_name).upsert(data).execute)
             if hasattr(response, 'error') and response.error:
                 logger.error(f"❌ Upsert error for {table_name}: {response.error}")
                 raise DatabaseError(f"Upsert failed for {table_name}: {response.error}")
@@ -1490,7 +1781,7 @@ class TherapySessionProcessor:
     async def _bulk_insert_table(self, table_name: str, records: list[dict[str, Any]]) -> None:
         """Bulk insert records into table."""
         try:
-            response = self.supabase_client.table(table_name).insert(records).execute()
+            response = await run_db(self.supabase_client.table(table_name).insert(records).execute)
             if hasattr(response, 'error') and response.error:
                 raise DatabaseError(f"Bulk insert failed for {table_name}: {response.error}")
         except Exception as e:
@@ -1508,7 +1799,7 @@ class TherapySessionProcessor:
             dict: Session details or None if not found
         """
         try:
-            session = self.session_repo.get_therapy_session(session_code)
+            session = await run_db(self.session_repo.get_therapy_session, session_code)
             if not session:
                 return None
             
@@ -1537,7 +1828,7 @@ class TherapySessionProcessor:
         """
         try:
             # Use repository pattern for domain separation
-            self.session_repo.update_session_status(session_code, status, error_message)
+            await run_db(self.session_repo.update_session_status, session_code, status, error_message)
             logger.info(f"📊 Session {session_code} status: {status}")
         except Exception as e:
             logger.error(f"Failed to update session status: {e!s}", exc_info=True)
@@ -1561,7 +1852,7 @@ class TherapySessionProcessor:
         """
         try:
             # Get session code from UUID
-            session = self.session_repo.get_therapy_session_by_uuid(session_uuid)
+            session = await run_db(self.session_repo.get_therapy_session_by_uuid, session_uuid)
             if not session:
                 raise SessionNotFoundError(f"Session {session_uuid} not found")
             
@@ -1592,109 +1883,9 @@ class TherapySessionProcessor:
         Schema v2.1 compliance - ensures all session configuration is properly stored
         """
         try:
-            # Determine therapeutic targets with per-channel flexibility
-            # Priority: C3D metadata > session parameters > development defaults
-            target_ch1 = DEFAULT_TARGET_CONTRACTIONS_CH1
-            target_ch2 = DEFAULT_TARGET_CONTRACTIONS_CH2
-            
-            if hasattr(session_params, 'c3d_metadata') and session_params.c3d_metadata:
-                metadata = session_params.c3d_metadata
-                target_ch1 = metadata.get('target_contractions_ch1') or target_ch1
-                target_ch2 = metadata.get('target_contractions_ch2') or target_ch2
-            
-            # Session parameters can override defaults (graceful fallback for missing attributes)
-            if session_params:
-                target_ch1 = getattr(session_params, 'target_contractions_ch1', target_ch1) or target_ch1
-                target_ch2 = getattr(session_params, 'target_contractions_ch2', target_ch2) or target_ch2
-
-            # Determine per-channel duration targets with priority cascade
-            # Priority 1: Session parameters (if available)
-            # Priority 2: Patient profile from database
-            # Priority 3: Config default from ProcessingConstants
-            target_duration_ch1 = ProcessingConstants.DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS
-            target_duration_ch2 = ProcessingConstants.DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS
-            
-            # Priority 1: Check session parameters for duration targets
-            # Note: c3d_metadata attribute may not exist in current GameSessionParameters
-            # This is handled gracefully with getattr fallback
-            if session_params:
-                c3d_metadata = getattr(session_params, 'c3d_metadata', None)
-                if c3d_metadata:
-                    target_duration_ch1 = c3d_metadata.get('target_duration_ch1', target_duration_ch1)
-                    target_duration_ch2 = c3d_metadata.get('target_duration_ch2', target_duration_ch2)
-                    if c3d_metadata.get('target_duration_ch1') or c3d_metadata.get('target_duration_ch2'):
-                        logger.info(f"📊 Using duration targets from session metadata: CH1={target_duration_ch1}ms, CH2={target_duration_ch2}ms")
-            
-            # Priority 2: Check patient profile if not found in C3D
-            patient_id = getattr(session_params, 'patient_id', None)
-            if not patient_id:
-                # Try to get patient_id from session
-                session_info = await self.get_session_status(session_code)
-                if session_info:
-                    patient_id = session_info.get('patient_id')
-            
-            if patient_id and (target_duration_ch1 is None or target_duration_ch2 is None):
-                patient_durations = await self._get_patient_duration_targets(patient_id)
-                if patient_durations:
-                    duration_ch1_from_patient, duration_ch2_from_patient = patient_durations
-                    if target_duration_ch1 is None and duration_ch1_from_patient is not None:
-                        target_duration_ch1 = duration_ch1_from_patient
-                        logger.info(f"📊 Using CH1 duration from patient profile: {target_duration_ch1}ms")
-                    if target_duration_ch2 is None and duration_ch2_from_patient is not None:
-                        target_duration_ch2 = duration_ch2_from_patient
-                        logger.info(f"📊 Using CH2 duration from patient profile: {target_duration_ch2}ms")
-            
-            # Priority 3: Ensure values are valid (already set to defaults above)
-            if target_duration_ch1 <= 0:
-                target_duration_ch1 = ProcessingConstants.DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS
-                logger.info(f"📊 Using default CH1 duration from config: {target_duration_ch1}ms")
-            if target_duration_ch2 <= 0:
-                target_duration_ch2 = ProcessingConstants.DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS
-                logger.info(f"📊 Using default CH2 duration from config: {target_duration_ch2}ms")
-
-            session_settings_data = {
-                "session_id": session_uuid,
-                # Therapeutic targets (flexible per-channel)
-                "target_contractions_ch1": target_ch1,
-                "target_contractions_ch2": target_ch2,
-                # Per-channel duration targets in milliseconds
-                "target_duration_ch1_ms": float(target_duration_ch1),
-                "target_duration_ch2_ms": float(target_duration_ch2),
-                # Note: therapist_id removed from session_settings as per schema optimization
-                # MVC configuration from processing options
-                "mvc_threshold_percentage": getattr(
-                    processing_opts, "mvc_threshold_percentage", 75.0
-                ),
-                # BFR settings - enabled by default for GHOSTLY+ protocol
-                "bfr_enabled": getattr(session_params, "bfr_enabled", True) if session_params else True,
-                # Note: Removed deprecated fields:
-                # - duration_threshold_seconds (replaced by per-channel targets)
-                # - target_contractions (redundant sum)
-                # - expected_contractions_per_muscle (redundant average)
-            }
-
-            # Validate critical thresholds
-            if (
-                session_settings_data["mvc_threshold_percentage"] <= 0
-                or session_settings_data["mvc_threshold_percentage"] > 100
-            ):
-                logger.warning(
-                    f"Invalid MVC threshold {session_settings_data['mvc_threshold_percentage']}%, using default 75%"
-                )
-                session_settings_data["mvc_threshold_percentage"] = 75.0
-
-            # Validate duration targets
-            if session_settings_data["target_duration_ch1_ms"] <= 0:
-                logger.warning(
-                    f"Invalid CH1 duration target {session_settings_data['target_duration_ch1_ms']}ms, using default 2000ms"
-                )
-                session_settings_data["target_duration_ch1_ms"] = 2000.0
-            
-            if session_settings_data["target_duration_ch2_ms"] <= 0:
-                logger.warning(
-                    f"Invalid CH2 duration target {session_settings_data['target_duration_ch2_ms']}ms, using default 2000ms"
-                )
-                session_settings_data["target_duration_ch2_ms"] = 2000.0
+            session_settings_data = await self._build_session_settings_record(
+                session_code, session_uuid, processing_opts, session_params
+            )
 
             # Use upsert to handle potential duplicates
             await self._upsert_table("session_settings", session_settings_data, "session_id")
@@ -1710,6 +1901,120 @@ class TherapySessionProcessor:
             logger.exception(f"Session settings population failed: {e!s}")
             raise DatabaseError(f"Session settings population failed: {e!s}") from e
 
+    async def _build_session_settings_record(
+        self,
+        session_code: str,
+        session_uuid: str,
+        processing_opts: ProcessingOptions,
+        session_params: GameSessionParameters,
+    ) -> dict[str, Any]:
+        """Build the session_settings row (targets, MVC threshold, BFR flag)."""
+        # Determine therapeutic targets with per-channel flexibility
+        # Priority: C3D metadata > session parameters > development defaults
+        target_ch1 = DEFAULT_TARGET_CONTRACTIONS_CH1
+        target_ch2 = DEFAULT_TARGET_CONTRACTIONS_CH2
+        
+        if hasattr(session_params, 'c3d_metadata') and session_params.c3d_metadata:
+            metadata = session_params.c3d_metadata
+            target_ch1 = metadata.get('target_contractions_ch1') or target_ch1
+            target_ch2 = metadata.get('target_contractions_ch2') or target_ch2
+        
+        # Session parameters can override defaults (graceful fallback for missing attributes)
+        if session_params:
+            target_ch1 = getattr(session_params, 'target_contractions_ch1', target_ch1) or target_ch1
+            target_ch2 = getattr(session_params, 'target_contractions_ch2', target_ch2) or target_ch2
+
+        # Determine per-channel duration targets with priority cascade
+        # Priority 1: Session parameters (if available)
+        # Priority 2: Patient profile from database
+        # Priority 3: Config default from ProcessingConstants
+        target_duration_ch1 = ProcessingConstants.DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS
+        target_duration_ch2 = ProcessingConstants.DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS
+        
+        # Priority 1: Check session parameters for duration targets
+        # Note: c3d_metadata attribute may not exist in current GameSessionParameters
+        # This is handled gracefully with getattr fallback
+        if session_params:
+            c3d_metadata = getattr(session_params, 'c3d_metadata', None)
+            if c3d_metadata:
+                target_duration_ch1 = c3d_metadata.get('target_duration_ch1', target_duration_ch1)
+                target_duration_ch2 = c3d_metadata.get('target_duration_ch2', target_duration_ch2)
+                if c3d_metadata.get('target_duration_ch1') or c3d_metadata.get('target_duration_ch2'):
+                    logger.info(f"📊 Using duration targets from session metadata: CH1={target_duration_ch1}ms, CH2={target_duration_ch2}ms")
+        
+        # Priority 2: Check patient profile if not found in C3D
+        patient_id = getattr(session_params, 'patient_id', None)
+        if not patient_id:
+            # Try to get patient_id from session
+            session_info = await self.get_session_status(session_code)
+            if session_info:
+                patient_id = session_info.get('patient_id')
+        
+        if patient_id and (target_duration_ch1 is None or target_duration_ch2 is None):
+            patient_durations = await self._get_patient_duration_targets(patient_id)
+            if patient_durations:
+                duration_ch1_from_patient, duration_ch2_from_patient = patient_durations
+                if target_duration_ch1 is None and duration_ch1_from_patient is not None:
+                    target_duration_ch1 = duration_ch1_from_patient
+                    logger.info(f"📊 Using CH1 duration from patient profile: {target_duration_ch1}ms")
+                if target_duration_ch2 is None and duration_ch2_from_patient is not None:
+                    target_duration_ch2 = duration_ch2_from_patient
+                    logger.info(f"📊 Using CH2 duration from patient profile: {target_duration_ch2}ms")
+        
+        # Priority 3: Ensure values are valid (already set to defaults above)
+        if target_duration_ch1 <= 0:
+            target_duration_ch1 = ProcessingConstants.DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS
+            logger.info(f"📊 Using default CH1 duration from config: {target_duration_ch1}ms")
+        if target_duration_ch2 <= 0:
+            target_duration_ch2 = ProcessingConstants.DEFAULT_THERAPEUTIC_DURATION_THRESHOLD_MS
+            logger.info(f"📊 Using default CH2 duration from config: {target_duration_ch2}ms")
+
+        session_settings_data = {
+            "session_id": session_uuid,
+            # Therapeutic targets (flexible per-channel)
+            "target_contractions_ch1": target_ch1,
+            "target_contractions_ch2": target_ch2,
+            # Per-channel duration targets in milliseconds
+            "target_duration_ch1_ms": float(target_duration_ch1),
+            "target_duration_ch2_ms": float(target_duration_ch2),
+            # Note: therapist_id removed from session_settings as per schema optimization
+            # MVC configuration from processing options
+            "mvc_threshold_percentage": getattr(
+                processing_opts, "mvc_threshold_percentage", 75.0
+            ),
+            # BFR settings - enabled by default for GHOSTLY+ protocol
+            "bfr_enabled": getattr(session_params, "bfr_enabled", True) if session_params else True,
+            # Note: Removed deprecated fields:
+            # - duration_threshold_seconds (replaced by per-channel targets)
+            # - target_contractions (redundant sum)
+            # - expected_contractions_per_muscle (redundant average)
+        }
+
+        # Validate critical thresholds
+        if (
+            session_settings_data["mvc_threshold_percentage"] <= 0
+            or session_settings_data["mvc_threshold_percentage"] > 100
+        ):
+            logger.warning(
+                f"Invalid MVC threshold {session_settings_data['mvc_threshold_percentage']}%, using default 75%"
+            )
+            session_settings_data["mvc_threshold_percentage"] = 75.0
+
+        # Validate duration targets
+        if session_settings_data["target_duration_ch1_ms"] <= 0:
+            logger.warning(
+                f"Invalid CH1 duration target {session_settings_data['target_duration_ch1_ms']}ms, using default 2000ms"
+            )
+            session_settings_data["target_duration_ch1_ms"] = 2000.0
+        
+        if session_settings_data["target_duration_ch2_ms"] <= 0:
+            logger.warning(
+                f"Invalid CH2 duration target {session_settings_data['target_duration_ch2_ms']}ms, using default 2000ms"
+            )
+            session_settings_data["target_duration_ch2_ms"] = 2000.0
+
+        return session_settings_data
+
     async def _upsert_table_with_composite_key(
         self, 
         table_name: str, 
@@ -1728,7 +2033,7 @@ class TherapySessionProcessor:
                     query = query.eq(key, data[key])
             
             # Check if record exists
-            response = query.execute()
+            response = await run_db(query.execute)
             
             if response.data and len(response.data) > 0:
                 # Record exists, update it
@@ -1737,14 +2042,14 @@ class TherapySessionProcessor:
                     if key in data:
                         update_query = update_query.eq(key, data[key])
                 
-                update_response = update_query.execute()
+                update_response = await run_db(update_query.execute)
                 if hasattr(update_response, 'error') and update_response.error:
                     raise DatabaseError(f"Update failed for {table_name}: {update_response.error}")
                     
                 logger.info(f"📝 Updated existing record in {table_name}")
             else:
                 # Record doesn't exist, insert it
-                insert_response = self.supabase_client.table(table_name).insert(data).execute()
+                insert_response = await run_db(self.supabase_client.table(table_name).insert(data).execute)
                 if hasattr(insert_response, 'error') and insert_response.error:
                     raise DatabaseError(f"Insert failed for {table_name}: {insert_response.error}")
                     
@@ -1767,62 +2072,68 @@ class TherapySessionProcessor:
         Uses development defaults when BFR data not available from C3D metadata.
         """
         try:
-            # Import SessionDefaults here to avoid circular imports
-            from config import SessionDefaults
-            
-            analytics = processing_result.get("analytics", {})
+            bfr_records = self._build_bfr_monitoring_records(session_uuid, session_params)
             
-            # Create BFR monitoring records for each channel
-            for channel_name in ["CH1", "CH2"]:
-                # Get channel-specific BFR data from session parameters or use defaults
-                target_pressure_aop = ProcessingConstants.TARGET_PRESSURE_AOP  # 50.0% from config
-                actual_pressure_aop = ProcessingConstants.TARGET_PRESSURE_AOP  # 50.0% from config
-                
-                # Check if session_params has per-channel BFR data (graceful fallback)
-                if session_params:
-                    bfr_pressure_per_channel = getattr(session_params, 'bfr_pressure_per_channel', None)
-                    if bfr_pressure_per_channel and channel_name in bfr_pressure_per_channel:
-                        channel_bfr = bfr_pressure_per_channel[channel_name]
-                        target_pressure_aop = channel_bfr.get('target_pressure_aop', target_pressure_aop)
-                        actual_pressure_aop = channel_bfr.get('actual_pressure_aop', actual_pressure_aop)
-                
-                # Calculate cuff pressure from AOP percentage (conversion factor: AOP * 3.0)
-                cuff_pressure_mmhg = actual_pressure_aop * 3.0
-                
-                # Determine safety compliance (40-60% AOP is considered safe range)
-                safety_compliant = 40.0 <= actual_pressure_aop <= 60.0
-                
-                # Determine measurement method (sensor if both values present, calculated otherwise)
-                measurement_method = "sensor" if target_pressure_aop and actual_pressure_aop else "calculated"
-                
-                bfr_data = {
-                    "session_id": session_uuid,
-                    "channel_name": channel_name,
-                    "target_pressure_aop": target_pressure_aop,
-                    "actual_pressure_aop": actual_pressure_aop,
-                    "cuff_pressure_mmhg": cuff_pressure_mmhg,
-                    "safety_compliant": safety_compliant,
-                    "measurement_method": measurement_method,
-                    # Blood pressure fields removed per user request - no longer computed
-                    # "systolic_bp_mmhg": None,
-                    # "diastolic_bp_mmhg": None,
-                    # Note: compliance_score and safety_alert_triggered are calculated fields in the database
-                }
-                
-                # Use composite key upsert for proper per-channel handling
-                await self._upsert_table_with_composite_key(
+            # Use composite key upsert for proper per-channel handling (channels are independent rows)
+            await asyncio.gather(*(
+                self._upsert_table_with_composite_key(
                     "bfr_monitoring", bfr_data, ["session_id", "channel_name"]
                 )
+                for bfr_data in bfr_records
+            ))
             
             logger.info(
                 f"🩸 BFR monitoring populated for session {session_code}: "
-                f"CH1 AOP={target_pressure_aop}%, CH2 AOP={target_pressure_aop}%"
+                + ", ".join(f"{r['channel_name']} AOP={r['target_pressure_aop']}%" for r in bfr_records)
             )
             
         except Exception as e:
             logger.exception(f"BFR monitoring population failed: {e!s}")
             raise DatabaseError(f"BFR monitoring population failed: {e!s}") from e
 
+    def _build_bfr_monitoring_records(
+        self, session_uuid: str, session_params: GameSessionParameters
+    ) -> list[dict[str, Any]]:
+        """Build one bfr_monitoring row per channel (CH1, CH2)."""
+        bfr_records = []
+        for channel_name in ["CH1", "CH2"]:
+            # Get channel-specific BFR data from session parameters or use defaults
+            target_pressure_aop = ProcessingConstants.TARGET_PRESSURE_AOP  # 50.0% from config
+            actual_pressure_aop = ProcessingConstants.TARGET_PRESSURE_AOP  # 50.0% from config
+            
+            # Check if session_params has per-channel BFR data (graceful fallback)
+            if session_params:
+                bfr_pressure_per_channel = getattr(session_params, 'bfr_pressure_per_channel', None)
+                if bfr_pressure_per_channel and channel_name in bfr_pressure_per_channel:
+                    channel_bfr = bfr_pressure_per_channel[channel_name]
+                    target_pressure_aop = channel_bfr.get('target_pressure_aop', target_pressure_aop)
+                    actual_pressure_aop = channel_bfr.get('actual_pressure_aop', actual_pressure_aop)
+            
+            # Calculate cuff pressure from AOP percentage (conversion factor: AOP * 3.0)
+            cuff_pressure_mmhg = actual_pressure_aop * 3.0
+            
+            # Determine safety compliance (40-60% AOP is considered safe range)
+            safety_compliant = 40.0 <= actual_pressure_aop <= 60.0
+            
+            # Determine measurement method (sensor if both values present, calculated otherwise)
+            measurement_method = "sensor" if target_pressure_aop and actual_pressure_aop else "calculated"
+            
+            bfr_records.append({
+                "session_id": session_uuid,
+                "channel_name": channel_name,
+                "target_pressure_aop": target_pressure_aop,
+                "actual_pressure_aop": actual_pressure_aop,
+                "cuff_pressure_mmhg": cuff_pressure_mmhg,
+                "safety_compliant": safety_compliant,
+                "measurement_method": measurement_method,
+                # Blood pressure fields removed per user request - no longer computed
+                # "systolic_bp_mmhg": None,
+                # "diastolic_bp_mmhg": None,
+                # Note: compliance_score and safety_alert_triggered are calculated fields in the database
+            })
+        
+        return bfr_records
+
     def _cleanup_temp_file(self, file_path: str) -> None:
         """Clean up temporary file with comprehensive error handling.
         
@@ -5,5 +5,6 @@ Services for data persistence and metadata management.
 """
 
 from services.data.metadata_service import MetadataService
+from services.data.signal_pyramid_store import SignalPyramidStore
 
-__all__ = ["MetadataService"]
+__all__ = ["MetadataService", "SignalPyramidStore"]
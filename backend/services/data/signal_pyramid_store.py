@@ -0,0 +1,180 @@
+"""Signal Pyramid Store.
+====================
+
+Persists the min/max signal pyramid of a processed session next to its C3D
+file in Supabase Storage ("<object>.c3d.pyramid", see emg.signal_pyramid)
+and serves chart windows from it.
+
+A window read never downloads the whole artifact: the header comes from a
+ranged read of the first HEADER_PROBE_BYTES through a short-lived signed URL,
+then one ranged read per signal fetches only the buckets of the chosen level
+that cover the window. Windows that need finer resolution than level 0, and
+sessions processed before pyramids existed, return None so callers fall back
+to decoding the C3D file.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+import numpy as np
+
+from config import SIGNAL_PYRAMID_BASE_BUCKET, SIGNAL_PYRAMID_LEVEL_FACTOR, SIGNAL_PYRAMID_MIN_BUCKETS
+from emg.decimation import window_indices
+from emg.signal_pyramid import (
+    PYRAMID_SIGNALS,
+    bucket_range,
+    byte_range,
+    choose_level,
+    decode_buckets,
+    decode_header,
+    encode_pyramid,
+    header_length,
+)
+
+logger = logging.getLogger(__name__)
+
+PYRAMID_SUFFIX = ".pyramid"
+HEADER_PROBE_BYTES = 16 * 1024  # Covers the header of typical sessions in one read
+SIGNED_URL_TTL_SECONDS = 60
+RANGE_READ_TIMEOUT_SECONDS = 10.0
+
+
+class SignalPyramidStore:
+    """Writes and reads signal pyramids in Supabase Storage."""
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+
+    @staticmethod
+    def artifact_path(object_path: str) -> str:
+        """Storage path of the pyramid for a C3D object path."""
+        return f"{object_path}{PYRAMID_SUFFIX}"
+
+    def save(self, bucket: str, object_path: str, emg_data: dict[str, dict[str, Any]]) -> int:
+        """Build the pyramid of every channel and upload it next to the C3D file.
+
+        Args:
+            bucket: Storage bucket of the C3D file
+            object_path: C3D object path within the bucket
+            emg_data: GHOSTLYC3DProcessor.emg_data after processing
+
+        Returns:
+            Artifact size in bytes
+        """
+        channels = {
+            name: {signal: channel.get(signal) for signal in PYRAMID_SIGNALS}
+            for name, channel in emg_data.items()
+            if isinstance(channel, dict)
+        }
+        sampling_rate = next(
+            (channel.get("sampling_rate") for channel in emg_data.values() if channel.get("sampling_rate")), None
+        )
+        if not channels or not sampling_rate:
+            raise ValueError("No channel signals to build a pyramid from")
+
+        artifact = encode_pyramid(
+            channels,
+            sampling_rate,
+            base_bucket=SIGNAL_PYRAMID_BASE_BUCKET,
+            level_factor=SIGNAL_PYRAMID_LEVEL_FACTOR,
+            min_buckets=SIGNAL_PYRAMID_MIN_BUCKETS,
+        )
+        self.supabase.storage.from_(bucket).upload(
+            self.artifact_path(object_path),
+            artifact,
+            file_options={"content-type": "application/octet-stream", "upsert": "true"},
+        )
+        logger.info(f"🗻 Stored signal pyramid for {bucket}/{object_path} ({len(artifact)} bytes)")
+        return len(artifact)
+
+    def _signed_url(self, bucket: str, object_path: str) -> str:
+        signed = self.supabase.storage.from_(bucket).create_signed_url(
+            self.artifact_path(object_path), SIGNED_URL_TTL_SECONDS
+        )
+        return signed.get("signedURL") or signed["signedUrl"]
+
+    @staticmethod
+    def _read_range(url: str, start: int, end: int) -> bytes:
+        """Bytes [start, end) of the artifact."""
+        response = httpx.get(url, headers={"Range": f"bytes={start}-{end - 1}"}, timeout=RANGE_READ_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        if response.status_code == 200:  # Range ignored: whole object returned
+            return response.content[start:end]
+        return response.content
+
+    def read_window(
+        self,
+        bucket: str,
+        object_path: str,
+        channel_name: str,
+        start_ms: float | None,
+        end_ms: float | None,
+        max_points: int,
+        include_rms: bool = True,
+    ) -> dict[str, Any] | None:
+        """Min/max view of a channel window, shaped like the JIT extraction result.
+
+        Every bucket contributes its (min, max) pair at the bucket's centre
+        time, so at most max_points samples are returned.
+
+        Returns:
+            Signal data dict, or None when the pyramid cannot serve the window
+        """
+        try:
+            url = self._signed_url(bucket, object_path)
+            head = self._read_range(url, 0, HEADER_PROBE_BYTES)
+            data_start = header_length(head)
+            if data_start > len(head):
+                head += self._read_range(url, len(head), data_start)
+            header = decode_header(head)
+        except Exception as e:
+            logger.debug(f"No signal pyramid for {bucket}/{object_path}: {e!s}")
+            return None
+
+        channel = next(
+            (name for name in header["channels"] if name == channel_name or name.lower() == channel_name.lower()),
+            None,
+        )
+        if channel is None:
+            return None
+
+        entry = header["channels"][channel]
+        sampling_rate = header["sampling_rate"]
+        total_samples = entry["total_samples"]
+        start, stop = window_indices(total_samples, sampling_rate, start_ms, end_ms)
+
+        data_levels = header["arrays"][entry["signals"]["data"]]
+        level = choose_level(data_levels, stop - start, max(max_points // 2 - 1, 1))
+        if level is None:
+            return None
+        level_index = data_levels.index(level)
+
+        signals = {"data": entry["signals"]["data"]}
+        if include_rms and "rms_envelope" in entry["signals"]:
+            signals["rms_envelope"] = entry["signals"]["rms_envelope"]
+
+        result: dict[str, Any] = {}
+        for name, array_key in signals.items():
+            signal_level = header["arrays"][array_key][level_index]
+            first, last = bucket_range(signal_level, start, stop)
+            begin, end = byte_range(signal_level, first, last)
+            buckets = decode_buckets(self._read_range(url, data_start + begin, data_start + end))
+            result[name] = buckets.reshape(-1)
+
+        first, last = bucket_range(level, start, stop)
+        centres = np.minimum((np.arange(first, last) + 0.5) * level["bucket_size"], total_samples) / sampling_rate
+        result.update(
+            {
+                "time_axis": np.repeat(centres, 2),
+                "sampling_rate": float(sampling_rate),
+                "duration_seconds": total_samples / sampling_rate,
+                "total_samples": total_samples,
+                "window_start_ms": start * 1000.0 / sampling_rate,
+                "window_end_ms": stop * 1000.0 / sampling_rate,
+                "bucket_size": level["bucket_size"],
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+        return result
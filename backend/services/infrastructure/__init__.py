@@ -4,6 +4,16 @@
 Services for security, webhooks, and system utilities.
 """
 
+from services.infrastructure.webhook_coalescer import WebhookCoalescer
+from services.infrastructure.webhook_idempotency import (
+    WebhookIdempotencyStore,
+    get_webhook_idempotency_store,
+)
 from services.infrastructure.webhook_security import WebhookSecurity
 
-__all__ = ["WebhookSecurity"]
+__all__ = [
+    "WebhookCoalescer",
+    "WebhookIdempotencyStore",
+    "WebhookSecurity",
+    "get_webhook_idempotency_store",
+]
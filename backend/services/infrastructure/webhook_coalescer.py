@@ -0,0 +1,113 @@
+"""Webhook Coalescer.
+=================
+
+Micro-batching for bursts of webhook deliveries.
+When a clinic tablet syncs, dozens of storage events arrive within seconds.
+The coalescer hands a delivery to the batch handler at once when no batch is
+running; deliveries that arrive while one is running are held for a short
+window and handed over as one group, so per-file database round-trips
+become per-batch round-trips. A lone webhook is never delayed.
+
+Each caller still awaits its own result, so webhook responses keep
+returning the session_code of their file.
+
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ItemType = TypeVar("ItemType")
+ResultType = TypeVar("ResultType")
+
+
+class WebhookCoalescer(Generic[ItemType, ResultType]):
+    """Gather items submitted while a batch is running and process them together.
+
+    The first item of an idle coalescer is flushed immediately; later items
+    wait for the window (or a full batch). The batch handler receives the
+    items in submission order and must return one entry per item; an entry
+    that is an Exception is raised to that item's caller only.
+    """
+
+    def __init__(
+        self,
+        batch_handler: Callable[[list[ItemType]], Awaitable[list[ResultType | Exception]]],
+        window_seconds: float,
+        max_batch_size: int,
+    ):
+        self.batch_handler = batch_handler
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[ItemType, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        # Running flushes: referenced so they are not garbage-collected mid-batch
+        self._batch_tasks: set[asyncio.Task] = set()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of items waiting for the current window to close."""
+        return len(self._pending)
+
+    async def submit(self, item: ItemType) -> ResultType:
+        """Queue an item and wait for the result of its batch."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size or not (self._batch_tasks or self._flush_task):
+            # Full batch, or nothing else in flight: flush now instead of waiting for the window
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+                self._flush_task = None
+            self._start_flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+        return await future
+
+    def _start_flush(self) -> None:
+        task = asyncio.create_task(self._flush())
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._flush_task = None
+        self._start_flush()
+
+    async def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        items = [item for item, _ in batch]
+        logger.info(f"📦 Flushing webhook batch of {len(items)} deliveries")
+
+        try:
+            results = await self.batch_handler(items)
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch handler returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            logger.exception(f"Webhook batch handler failed: {e!s}")
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Coalescer settings and current backlog."""
+        return {
+            "window_seconds": self.window_seconds,
+            "max_batch_size": self.max_batch_size,
+            "pending": self.pending_count,
+        }
@@ -0,0 +1,89 @@
+"""Webhook Idempotency Service.
+==========================
+
+Delivery deduplication for Supabase Storage webhooks.
+Supabase retries deliveries, so the same object can arrive several times.
+
+Two layers:
+- Redis (fast path): delivery key -> session_code with a TTL, checked before
+  any database or CPU work is done
+- Database (fallback): unique index on therapy_sessions.webhook_delivery_key,
+  which catches retries when Redis is unavailable or the key has expired
+
+"""
+
+import hashlib
+import logging
+from typing import Any
+
+from config import WEBHOOK_IDEMPOTENCY_TTL_SECONDS
+from services.cache.redis_cache import RedisCache, get_redis_cache
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookIdempotencyStore:
+    """Redis-backed record of already handled webhook deliveries.
+
+    Degrades to a no-op when Redis is unavailable; the database unique
+    index then remains the source of truth for duplicate detection.
+    """
+
+    KEY_NAMESPACE = "webhook_delivery"
+
+    def __init__(self, cache: RedisCache | None = None, ttl_seconds: int = WEBHOOK_IDEMPOTENCY_TTL_SECONDS):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def delivery_key(bucket: str, object_name: str, object_version: str | None) -> str:
+        """Build a stable key for one storage object version.
+
+        Args:
+            bucket: Storage bucket id
+            object_name: Object path inside the bucket
+            object_version: Storage object version or eTag (empty if unknown)
+
+        Returns:
+            str: SHA-256 hex digest identifying the delivery
+        """
+        raw = f"{bucket}/{object_name}@{object_version or ''}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_key(self, delivery_key: str) -> str:
+        return f"{self.KEY_NAMESPACE}:{delivery_key}"
+
+    async def get(self, delivery_key: str) -> dict[str, Any] | None:
+        """Return the recorded session for a delivery, or None if unseen."""
+        if not self.cache:
+            return None
+
+        cached = await self.cache.get(self._cache_key(delivery_key))
+        if cached and cached.get("session_code"):
+            return cached
+        return None
+
+    async def remember(self, delivery_key: str, session_code: str, session_id: str | None) -> bool:
+        """Record the session created for a delivery."""
+        if not self.cache:
+            return False
+
+        return await self.cache.set(
+            self._cache_key(delivery_key),
+            {"session_code": session_code, "session_id": session_id},
+            self.ttl_seconds,
+        )
+
+
+# Singleton instance
+_store_instance: WebhookIdempotencyStore | None = None
+
+
+async def get_webhook_idempotency_store() -> WebhookIdempotencyStore:
+    """Get singleton idempotency store bound to the shared Redis cache."""
+    global _store_instance
+
+    if _store_instance is None:
+        _store_instance = WebhookIdempotencyStore(await get_redis_cache())
+
+    return _store_instance
@@ -34,7 +34,7 @@ class TestAdminPasswordReset:
             assert any(c.islower() for c in password_parts), "Should contain lowercase"
             assert any(c.isdigit() for c in password_parts), "Should contain digits"
     
-    @patch('api.routes.admin.get_supabase_client')
+    @patch('api.dependencies.role_cache.get_supabase_client')
     @patch('api.dependencies.auth.get_supabase_client')
     def test_password_reset_endpoint_unauthorized(self, mock_auth_client, mock_admin_client):
         """Test that non-admin users cannot reset passwords."""
@@ -70,7 +70,7 @@ class TestAdminPasswordReset:
         assert "Admin access required" in response.json()["message"]
     
     @patch('api.routes.admin.AdminService')
-    @patch('api.routes.admin.get_supabase_client')
+    @patch('api.dependencies.role_cache.get_supabase_client')
     @patch('api.dependencies.auth.get_supabase_client')
     def test_password_reset_endpoint_success(self, mock_auth_client, mock_route_client, mock_admin_service_class):
         """Test successful password reset by admin."""
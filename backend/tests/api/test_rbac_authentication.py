@@ -48,8 +48,9 @@ class TestRBACAuthentication:
         """Mock HTTP credentials"""
         return HTTPAuthorizationCredentials(scheme="Bearer", credentials="mock-token")
     
+    @patch('api.dependencies.role_cache.get_supabase_client')
     @patch('api.rbac.get_supabase_client')
-    async def test_get_current_user_role_success(self, mock_supabase, mock_credentials):
+    async def test_get_current_user_role_success(self, mock_supabase, mock_service_supabase, mock_credentials):
         """Test successful role extraction"""
         # Mock Supabase responses
         mock_user = Mock()
@@ -63,9 +64,11 @@ class TestRBACAuthentication:
         mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = mock_profile
         
         mock_supabase.return_value = mock_client
+        mock_service_supabase.return_value = mock_client
         
         role = await get_current_user_role(mock_credentials)
         assert role == 'THERAPIST'
+        mock_service_supabase.assert_called_once_with(use_service_key=True)
     
     @patch('api.rbac.get_supabase_client')
     async def test_get_current_user_role_invalid_token(self, mock_supabase, mock_credentials):
@@ -80,8 +83,9 @@ class TestRBACAuthentication:
         assert exc_info.value.status_code == 401
         assert "Invalid authentication token" in str(exc_info.value.detail)
     
+    @patch('api.dependencies.role_cache.get_supabase_client')
     @patch('api.rbac.get_supabase_client')
-    async def test_get_current_user_role_no_profile(self, mock_supabase, mock_credentials):
+    async def test_get_current_user_role_no_profile(self, mock_supabase, mock_service_supabase, mock_credentials):
         """Test missing user profile"""
         mock_user = Mock()
         mock_user.user.id = 'user-123'
@@ -94,6 +98,7 @@ class TestRBACAuthentication:
         mock_client.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = mock_profile
         
         mock_supabase.return_value = mock_client
+        mock_service_supabase.return_value = mock_client
         
         # Should return None when no profile found (RLS will handle access)
         role = await get_current_user_role(mock_credentials)
@@ -347,6 +347,26 @@ def protect_trial_scoring_config():
         print(f"⚠️ Scoring configuration protection warning: {e}")
 
 
+@pytest.fixture(autouse=True)
+def reset_scoring_config_cache():
+    """Keep cached scoring configurations from leaking between tests."""
+    from services.clinical.scoring_config_cache import get_scoring_config_cache
+
+    get_scoring_config_cache().invalidate(publish=False)
+    yield
+    get_scoring_config_cache().invalidate(publish=False)
+
+
+@pytest.fixture(autouse=True)
+def reset_role_cache():
+    """Keep cached user roles from leaking between tests."""
+    from api.dependencies.role_cache import get_role_cache
+
+    get_role_cache().invalidate()
+    yield
+    get_role_cache().invalidate()
+
+
 # =====================================================
 # Cleanup Fixtures for Supabase Storage and Database
 # =====================================================
@@ -553,7 +573,8 @@ def mock_therapy_processor():
         session_repo=MagicMock(),
         cache_service=mock_cache_service,
         performance_service=mock_performance_service,
-        supabase_client=mock_supabase_client
+        supabase_client=mock_supabase_client,
+        analytics_cache=AsyncMock()
     )
     
     # Add additional repository attributes that tests expect
@@ -501,7 +501,11 @@ def mock_session_processor():
     with patch('services.clinical.therapy_session_processor.TherapySessionProcessor.create_session') as mock_create:
         with patch('services.clinical.therapy_session_processor.TherapySessionProcessor.process_c3d_file') as mock_process:
             with patch('services.clinical.repositories.therapy_session_repository.TherapySessionRepository.update_session_status') as mock_update:
-                mock_create.return_value = "550e8400-e29b-41d4-a716-446655440002"  # Valid UUID format
+                mock_create.return_value = {
+                    "session_code": "P039S001",
+                    "session_id": "550e8400-e29b-41d4-a716-446655440002",  # Valid UUID format
+                    "duplicate": False,
+                }
                 mock_process.return_value = True
                 mock_update.return_value = None  # Void method
                 yield mock_create, mock_process, mock_update
@@ -76,7 +76,7 @@ class TestTherapySessionProcessorCore:
                 patient_id="patient-123"
             )
 
-        assert result == test_session_code
+        assert result == {"session_code": test_session_code, "session_id": test_session_id, "duplicate": False}
         processor.session_repo.create_session_with_code.assert_called_once()
 
     @pytest.mark.asyncio
@@ -9,9 +9,12 @@ from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 import tempfile
 import os
+import struct
+from pathlib import Path
 
 from api.main import app
 from services.c3d.processor import GHOSTLYC3DProcessor
+from services.c3d.reader import C3DReader
 
 client = TestClient(app)
 
@@ -233,6 +236,34 @@ class TestUploadErrorHandling:
         finally:
             os.unlink(temp_file_path)
 
+    def test_too_long_recording_is_not_reported_as_too_short(self, tmp_path):
+        """A recording over the clinical maximum gets its own reason and guidance."""
+        sample_file = Path(__file__).parent / "samples" / "Ghostly_Emg_20230321_17-23-09-0409.c3d"
+        if not sample_file.exists():
+            pytest.skip("Sample C3D file not available")
+
+        # Header and parameter blocks only, with the last frame moved past 10 minutes at 990 Hz
+        head = bytearray(C3DReader.read_file_head(str(sample_file)))
+        (first_frame,) = struct.unpack_from("<H", head, 6)
+        struct.pack_into("<H", head, 8, first_frame + 65000 - 1)
+        long_file = tmp_path / "long.c3d"
+        long_file.write_bytes(bytes(head))
+
+        with open(long_file, 'rb') as f:
+            response = client.post(
+                "/upload",
+                files={"file": ("long.c3d", f, "application/octet-stream")},
+                data={"include_signals": "false"}
+            )
+
+        assert response.status_code == 422
+        error_data = response.json()
+        assert error_data['error_type'] == 'emg_validation_failure'
+        assert error_data['processing_context']['failure_reason'] == 'excessive_signal_duration'
+        assert error_data['c3d_metadata']['duration_seconds'] > error_data['clinical_requirements']['max_duration_seconds']
+        assert error_data['user_guidance']['primary_recommendation'].startswith('Record shorter EMG sessions')
+        assert 'fatigue' in error_data['clinical_requirements']['reason']
+
 
 class TestUploadErrorHandlingEdgeCases:
     """Test edge cases for upload error handling."""
@@ -0,0 +1,119 @@
+"""Tests for header-only C3D prevalidation (C3DReader.prevalidate).
+
+The sample file's header and parameter blocks are patched in place to
+produce recordings that are too short, too long or have no analog channels.
+"""
+
+import struct
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from emg.signal_processing import ProcessingParameters
+from services.c3d.processor import GHOSTLYC3DProcessor
+from services.c3d.reader import (
+    BLOCK_SIZE,
+    EXCESSIVE_SIGNAL_DURATION,
+    INSUFFICIENT_SIGNAL_DURATION,
+    NO_EMG_DATA,
+    C3DPrevalidationError,
+    C3DReader,
+)
+
+SAMPLE_FILE = Path(__file__).resolve().parents[2] / "samples" / "Ghostly_Emg_20230321_17-23-09-0409.c3d"
+
+
+@pytest.fixture
+def sample_head() -> bytes:
+    if not SAMPLE_FILE.exists():
+        pytest.skip("Sample C3D file not available")
+    return C3DReader.read_file_head(str(SAMPLE_FILE))
+
+
+def with_frame_count(head: bytes, frame_count: int) -> bytes:
+    """Header with the last frame moved so the recording has frame_count frames."""
+    (first_frame,) = struct.unpack_from("<H", head, 6)
+    patched = bytearray(head)
+    struct.pack_into("<H", patched, 8, first_frame + frame_count - 1)
+    return bytes(patched)
+
+
+class TestReadFileHead:
+    def test_reads_header_and_parameter_blocks_only(self, sample_head):
+        parameter_start = sample_head[0]
+        parameter_blocks = sample_head[(parameter_start - 1) * BLOCK_SIZE + 2]
+
+        assert len(sample_head) == (parameter_start - 1 + parameter_blocks) * BLOCK_SIZE
+        assert len(sample_head) < SAMPLE_FILE.stat().st_size
+
+    def test_parses_parameter_groups(self, sample_head):
+        reader = C3DReader()
+        param_offset = (sample_head[0] - 1) * BLOCK_SIZE
+        groups = reader._parse_parameter_groups(sample_head, param_offset, sample_head[param_offset + 2])
+
+        assert groups["ANALOG"]["LABELS"] == ["CH1 Raw", "CH2 Raw", "CH1 activated", "CH2 activated"]
+        assert groups["ANALOG"]["USED"] == 4
+
+
+class TestPrevalidate:
+    def test_sample_recording(self, sample_head):
+        recording = C3DReader().prevalidate(sample_head)
+
+        assert recording["prevalidated"] is True
+        assert recording["frame_count"] == 74280
+        assert recording["sampling_rate"] == pytest.approx(990.0)
+        assert recording["channel_count"] == 4
+        assert recording["duration_seconds"] == pytest.approx(75.03, abs=0.01)
+
+    def test_rejects_short_recording(self, sample_head):
+        with pytest.raises(C3DPrevalidationError, match="duration insufficient") as exc_info:
+            C3DReader().prevalidate(with_frame_count(sample_head, 10))
+
+        assert exc_info.value.reason == INSUFFICIENT_SIGNAL_DURATION
+        recording = exc_info.value.recording
+        assert recording["frame_count"] == 300
+        assert recording["duration_seconds"] < ProcessingParameters.MIN_CLINICAL_DURATION_SECONDS
+
+    def test_rejects_long_recording(self, sample_head):
+        with pytest.raises(C3DPrevalidationError, match="too long") as exc_info:
+            C3DReader().prevalidate(with_frame_count(sample_head, 65000))
+
+        assert exc_info.value.reason == EXCESSIVE_SIGNAL_DURATION
+
+    def test_rejects_recording_without_channels(self, sample_head):
+        reader = C3DReader()
+        with patch.object(reader, "_read_parameters", return_value={"processor_type": 84, "analog_used": 0}):
+            with pytest.raises(C3DPrevalidationError, match="No EMG data loaded") as exc_info:
+                reader.prevalidate(sample_head)
+
+        assert exc_info.value.reason == NO_EMG_DATA
+
+    def test_non_intel_files_are_left_to_full_decode(self, sample_head):
+        reader = C3DReader()
+        with patch.object(reader, "_read_parameters", return_value={"processor_type": 85}):
+            recording = reader.prevalidate(with_frame_count(sample_head, 10))
+
+        assert recording["prevalidated"] is False
+
+
+class TestProcessorLoadFile:
+    def test_short_file_is_rejected_before_decode(self, sample_head, tmp_path):
+        short_file = tmp_path / "short.c3d"
+        short_file.write_bytes(with_frame_count(sample_head, 10))
+
+        with patch("services.c3d.processor.C3DUtils.load_c3d_file") as load_c3d_file:
+            with pytest.raises(C3DPrevalidationError):
+                GHOSTLYC3DProcessor(str(short_file)).load_file()
+
+        load_c3d_file.assert_not_called()
+
+    def test_unreadable_header_falls_through_to_decode(self, tmp_path):
+        broken_file = tmp_path / "broken.c3d"
+        broken_file.write_bytes(b"not a c3d file")
+
+        with patch("services.c3d.processor.C3DUtils.load_c3d_file", return_value=None) as load_c3d_file:
+            with pytest.raises(ValueError, match="Error loading C3D file"):
+                GHOSTLYC3DProcessor(str(broken_file)).load_file()
+
+        load_c3d_file.assert_called_once()
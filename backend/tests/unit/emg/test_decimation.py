@@ -0,0 +1,51 @@
+"""Chart decimation: peaks survive where plain striding aliases them."""
+
+import numpy as np
+import pytest
+
+from emg.decimation import decimation_indices, lttb_indices, minmax_indices
+
+
+def burst_signal(length=100_000, peak_at=54_321):
+    rng = np.random.default_rng(7)
+    x = rng.normal(0, 0.01, size=length)
+    x[peak_at] = 5.0  # single-sample spike a stride would skip
+    return x
+
+
+@pytest.mark.parametrize("mode", ["minmax", "lttb"])
+def test_peak_survives(mode):
+    sig = burst_signal()
+
+    idx = decimation_indices(mode, [sig], 500)
+
+    assert len(idx) <= 500
+    assert idx[0] == 0 and idx[-1] == len(sig) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert sig[idx].max() == 5.0
+    assert sig[::200].max() < 5.0  # striding misses it
+
+
+def test_minmax_keeps_extrema_of_every_signal():
+    sig = burst_signal()
+    envelope = np.zeros_like(sig)
+    envelope[12_345] = 1.0
+
+    idx = minmax_indices([sig, envelope], 1000)
+
+    assert len(idx) <= 1000
+    assert 54_321 in idx and 12_345 in idx
+
+
+def test_short_signals_are_untouched():
+    assert lttb_indices(np.arange(10.0), 20).tolist() == list(range(10))
+    assert minmax_indices([np.arange(10.0)], 20).tolist() == list(range(10))
+
+
+def test_lttb_returns_requested_count():
+    assert len(lttb_indices(np.sin(np.linspace(0, 50, 10_000)), 300)) == 300
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        decimation_indices("fft", [np.arange(10.0)], 5)
@@ -0,0 +1,61 @@
+"""Signal pyramid levels and artifact layout."""
+
+import numpy as np
+
+from emg.signal_pyramid import (
+    build_levels,
+    bucket_range,
+    byte_range,
+    choose_level,
+    decode_buckets,
+    decode_header,
+    encode_pyramid,
+    header_length,
+)
+
+
+def test_levels_keep_extrema():
+    sig = np.zeros(10_000)
+    sig[4321] = 3.0
+    sig[77] = -2.0
+
+    levels = build_levels(sig, base_bucket=8, level_factor=4, min_buckets=16)
+
+    assert [len(level) for level in levels] == [1250, 313, 79, 20, 5]
+    for level in levels:
+        assert level[:, 1].max() == 3.0 and level[:, 0].min() == -2.0
+    assert levels[0][4321 // 8, 1] == 3.0
+
+
+def test_shared_arrays_are_stored_once():
+    sig = np.arange(1000.0)
+    blob = encode_pyramid({"CH1": {"data": sig}, "CH1 Raw": {"data": sig}}, 1000.0, 8, 4, 16)
+
+    header = decode_header(blob)
+
+    assert header["channels"]["CH1"]["signals"] == header["channels"]["CH1 Raw"]["signals"] == {"data": "a0"}
+    assert list(header["arrays"]) == ["a0"]
+    assert header_length(blob) % 4 == 0
+
+
+def test_window_bytes_decode_to_level_buckets():
+    sig = np.sin(np.linspace(0, 20, 50_000))
+    blob = encode_pyramid({"CH1": {"data": sig}}, 1000.0, 8, 4, 64)
+    header = decode_header(blob)
+    levels = header["arrays"]["a0"]
+
+    level = choose_level(levels, 20_000, 300)
+    first, last = bucket_range(level, 10_000, 30_000)
+    begin, end = byte_range(level, first, last)
+    buckets = decode_buckets(blob[header_length(blob) + begin : header_length(blob) + end])
+
+    assert level["bucket_size"] == 128
+    assert len(buckets) == last - first <= 300
+    window = sig[first * 128 : last * 128].astype(np.float32)
+    assert buckets[:, 1].max() == window.max()
+
+
+def test_fine_windows_need_full_resolution():
+    levels = [{"bucket_size": 8, "buckets": 100, "offset": 0}]
+
+    assert choose_level(levels, 1000, 500) is None
@@ -0,0 +1,118 @@
+"""Batch Adherence Tests.
+
+A dashboard gets adherence for all of a therapist's patients with one
+patients query and one grouped session-count query.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from api.routes.scoring_config import AdherenceBatchRequest, _calculate_protocol_day, get_batch_adherence
+from services.clinical.performance_scoring_service import PerformanceScoringService
+
+TODAY = datetime.now(timezone.utc).date()
+
+
+class TestBatchAdherenceService:
+    @pytest.fixture
+    def service(self):
+        service = PerformanceScoringService(supabase_client=MagicMock())
+        service.session_count_repo = MagicMock()
+        return service
+
+    def test_one_grouped_query_with_per_patient_cutoffs(self, service):
+        service.session_count_repo.get_day_counts.return_value = {
+            "p1": {TODAY: 3, TODAY - timedelta(days=5): 4},
+            "p2": {TODAY: 2, TODAY - timedelta(days=5): 6},
+        }
+
+        results = service.calculate_adherence_scores({"p1": 7, "p2": 3, "p3": 2})
+
+        # Earliest cutoff covers every patient's window
+        service.session_count_repo.get_day_counts.assert_called_once_with(["p1", "p2"], TODAY - timedelta(days=6))
+        assert results["p1"]["completed_sessions"] == 7
+        assert results["p2"]["completed_sessions"] == 2  # day-5 sessions are outside a 3-day window
+        assert results["p3"]["adherence_score"] is None
+        service.session_count_repo.count_sessions_since.assert_not_called()
+
+    def test_patients_without_sessions_score_zero(self, service):
+        service.session_count_repo.get_day_counts.return_value = {}
+
+        results = service.calculate_adherence_scores({"p1": 7})
+
+        assert results["p1"]["completed_sessions"] == 0
+        assert results["p1"]["category"] == "Poor"
+
+    def test_falls_back_per_patient_without_index(self, service):
+        service.session_count_repo.get_day_counts.return_value = None
+        service.session_count_repo.count_sessions_since.return_value = 5
+
+        results = service.calculate_adherence_scores({"p1": 7, "p2": 7})
+
+        assert service.session_count_repo.count_sessions_since.call_count == 2
+        assert results["p2"]["completed_sessions"] == 5
+
+
+class TestProtocolDay:
+    def test_counts_days_since_treatment_start(self):
+        start = (datetime.now(timezone.utc) - timedelta(days=4)).isoformat()
+        assert _calculate_protocol_day({"treatment_start_date": start}, "P001") == 5
+
+    def test_capped_at_trial_duration(self):
+        assert _calculate_protocol_day({"treatment_start_date": "2020-01-01T00:00:00+00:00"}, "P001") == 14
+
+
+class TestBatchAdherenceEndpoint:
+    @pytest.fixture
+    def cache(self):
+        cache = MagicMock()
+        cache.get = AsyncMock(return_value=None)
+        cache.set = AsyncMock(return_value=True)
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_therapist_patients_in_one_request(self, cache):
+        start = (datetime.now(timezone.utc) - timedelta(days=6)).isoformat()
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(data=[
+            {"id": "u2", "patient_code": "P002", "treatment_start_date": start, "total_sessions_planned": 30},
+            {"id": "u1", "patient_code": "P001", "treatment_start_date": start, "total_sessions_planned": 30},
+        ])
+        service = MagicMock()
+        service.calculate_adherence_scores.return_value = {
+            "u1": {"patient_id": "u1", "adherence_score": 80.0},
+            "u2": {"patient_id": "u2", "adherence_score": 40.0},
+        }
+
+        with patch("api.routes.scoring_config.get_supabase_client", return_value=supabase), \
+             patch("api.routes.scoring_config.get_redis_cache", AsyncMock(return_value=cache)), \
+             patch("services.clinical.performance_scoring_service.PerformanceScoringService", return_value=service):
+            response = await get_batch_adherence(AdherenceBatchRequest(therapist_id="t1"))
+
+        supabase.table.return_value.select.return_value.eq.assert_called_once_with("therapist_id", "t1")
+        service.calculate_adherence_scores.assert_called_once_with({"u2": 7, "u1": 7})
+        assert [p["patient_id"] for p in response["patients"]] == ["P001", "P002"]
+        assert response["patients"][0]["protocol_day"] == 7
+        assert response["cached"] is False
+        cache.set.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_response_skips_database(self, cache):
+        cache.get.return_value = {"patients": [{"patient_id": "P001"}], "not_found": ["P009"]}
+
+        with patch("api.routes.scoring_config.get_supabase_client") as get_client, \
+             patch("api.routes.scoring_config.get_redis_cache", AsyncMock(return_value=cache)):
+            response = await get_batch_adherence(AdherenceBatchRequest(patient_codes=["P001", "P009"]))
+
+        get_client.assert_not_called()
+        assert response == {"patients": [{"patient_id": "P001"}], "not_found": ["P009"], "cached": True}
+
+    @pytest.mark.asyncio
+    async def test_requires_patients_or_therapist(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_batch_adherence(AdherenceBatchRequest())
+
+        assert exc_info.value.status_code == 400
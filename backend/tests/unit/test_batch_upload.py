@@ -0,0 +1,123 @@
+"""Batch Upload Tests.
+
+/upload/batch analyzes files in the C3D process pool and streams each
+file's result or error as soon as it is ready.
+"""
+
+import asyncio
+import json
+import os
+import pickle
+import tempfile
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes.upload import router, stream_batch_upload_events
+from models import GameSessionParameters, ProcessingOptions
+from services.c3d.process_pool import process_c3d_file
+
+DELAYS = {"fast.c3d": 0.0, "broken.c3d": 0.02, "slow.c3d": 0.05}
+
+
+async def _fake_process(tmp_path, filename, processing_opts, session_params, file_metadata, include_signals):
+    """Stands in for pool processing: files finish in DELAYS order, broken.c3d fails."""
+    await asyncio.sleep(DELAYS.get(filename, 0.0))
+    if filename == "broken.c3d":
+        raise ValueError("Error loading C3D file")
+    return {"source_filename": filename, "emg_signals": {"CH1": {}} if include_signals else {}}
+
+
+@pytest.fixture
+def processing():
+    with patch("api.routes.upload.process_batch_file", side_effect=_fake_process) as process:
+        yield process
+
+
+def _tmp_file() -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".c3d") as tmp:
+        tmp.write(b"c3d")
+        return tmp.name
+
+
+def _events(files, rejected=()):
+    return stream_batch_upload_events(
+        files, list(rejected), ProcessingOptions(), GameSessionParameters(), {}, include_signals=False
+    )
+
+
+class TestBatchEvents:
+    async def test_results_stream_in_completion_order(self, processing):
+        paths = [_tmp_file(), _tmp_file(), _tmp_file()]
+        files = [(0, ("slow.c3d", paths[0])), (1, ("fast.c3d", paths[1])), (2, ("broken.c3d", paths[2]))]
+        rejected = [{"event": "error", "index": 3, "filename": "notes.txt", "detail": "File must be a C3D file"}]
+
+        events = [event async for event in _events(files, rejected)]
+
+        assert [(event["event"], event.get("index")) for event in events] == [
+            ("error", 3),
+            ("result", 1),
+            ("error", 2),
+            ("result", 0),
+            ("complete", None),
+        ]
+        assert "Error loading C3D file" in events[2]["detail"]
+        assert events[-1] == {"event": "complete", "files": 4, "succeeded": 2, "failed": 2}
+        assert not any(os.path.exists(path) for path in paths)
+
+    async def test_closing_stream_cancels_pending_files(self, processing):
+        paths = [_tmp_file(), _tmp_file()]
+        events = _events([(0, ("fast.c3d", paths[0])), (1, ("slow.c3d", paths[1]))])
+
+        assert (await anext(events))["index"] == 0
+        await events.aclose()
+        await asyncio.sleep(0)
+
+        assert not os.path.exists(paths[1])
+
+    async def test_closing_stream_removes_files_that_never_started(self, processing):
+        paths = [_tmp_file(), _tmp_file()]
+        rejected = [{"event": "error", "index": 2, "filename": "notes.txt", "detail": "File must be a C3D file"}]
+        events = _events([(0, ("fast.c3d", paths[0])), (1, ("slow.c3d", paths[1]))], rejected)
+
+        assert (await anext(events))["index"] == 2
+        await events.aclose()
+
+        processing.assert_not_called()
+        assert not any(os.path.exists(path) for path in paths)
+
+
+class TestBatchRoute:
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    def test_streams_ndjson_per_file(self, client, processing):
+        files = [("files", ("fast.c3d", b"c3d")), ("files", ("notes.txt", b"text"))]
+        response = client.post("/upload/batch", files=files, params={"include_signals": "false"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        events = [json.loads(line) for line in response.content.splitlines()]
+        assert [event["event"] for event in events] == ["error", "result", "complete"]
+        assert events[0]["filename"] == "notes.txt"
+        assert events[1]["emg_signals"] == {}
+        assert processing.call_args.args[-1] is False  # include_signals
+
+    def test_rejects_oversized_batches(self, client, processing):
+        with patch("api.routes.upload.MAX_BATCH_UPLOAD_FILES", 1):
+            files = [("files", ("a.c3d", b"c3d")), ("files", ("b.c3d", b"c3d"))]
+            response = client.post("/upload/batch", files=files)
+
+        assert response.status_code == 413
+        processing.assert_not_called()
+
+
+class TestProcessPool:
+    def test_worker_function_is_picklable(self):
+        # Spawned workers receive the callable by reference
+        assert pickle.loads(pickle.dumps(process_c3d_file)) is process_c3d_file
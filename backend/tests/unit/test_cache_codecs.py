@@ -0,0 +1,64 @@
+"""Cache Codec Tests.
+
+The msgpack codec stores NumPy arrays as raw buffers, compresses large
+frames and still reads values written by the JSON codecs.
+"""
+
+import gzip
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("msgpack")
+
+from services.cache.codec_benchmark import run_benchmark
+from services.cache.codecs import FRAME_MAGIC, FRAME_LZ4, FRAME_RAW, FRAME_ZSTD, MsgpackCodec, resolve_codec
+
+
+class TestMsgpackCodec:
+    def test_round_trips_numpy_arrays(self):
+        codec = MsgpackCodec()
+        signal = np.linspace(0, 1, 1000, dtype=np.float32).reshape(10, 100)
+
+        decoded = codec.decode(codec.encode({"CH1": {"rms": np.float64(0.5), "signal": signal, "n": np.int64(3)}}))
+
+        np.testing.assert_array_equal(decoded["CH1"]["signal"], signal)
+        assert decoded["CH1"]["signal"].dtype == np.float32
+        assert decoded["CH1"]["rms"] == 0.5
+        assert decoded["CH1"]["n"] == 3
+
+    def test_small_payloads_are_not_compressed(self):
+        data = MsgpackCodec(threshold_bytes=1024).encode({"a": 1})
+
+        assert data.startswith(FRAME_MAGIC)
+        assert data[len(FRAME_MAGIC)] == FRAME_RAW
+
+    @pytest.mark.parametrize("compression,frame", [("zstd", FRAME_ZSTD), ("lz4", FRAME_LZ4)])
+    def test_large_payloads_are_compressed(self, compression, frame):
+        pytest.importorskip("zstandard" if compression == "zstd" else "lz4")
+        codec = MsgpackCodec(compression=compression, threshold_bytes=64)
+        value = {"signal": np.zeros(10_000)}
+
+        data = codec.encode(value)
+
+        assert data[len(FRAME_MAGIC)] == frame
+        assert len(data) < 80_000
+        np.testing.assert_array_equal(codec.decode(data)["signal"], value["signal"])
+
+    def test_reads_legacy_json_values(self):
+        codec = MsgpackCodec()
+
+        assert codec.decode(gzip.compress(json.dumps({"a": 1}).encode())) == {"a": 1}
+        assert codec.decode(b'{"a": 1}') == {"a": 1}
+
+    def test_unknown_codec_falls_back(self):
+        assert resolve_codec("does-not-exist").name == "gzip-json"
+
+
+def test_benchmark_covers_every_codec():
+    results = run_benchmark(channels=1, samples=1000, iterations=1)
+
+    sizes = {result["codec"]: result["size_bytes"] for result in results}
+    assert {"json", "gzip-json", "msgpack"} <= set(sizes)
+    assert sizes["msgpack"] < sizes["json"]
@@ -0,0 +1,127 @@
+"""Cache Stampede Protection Tests.
+
+An expired hot key is recomputed once: concurrent misses share one loader
+call per worker, workers coordinate through a Redis lease, and entries are
+refreshed early in the background.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.cache.cache_patterns import CachePatterns
+from services.cache.redis_cache import RedisCache
+
+
+def _slow_loader(calls: list, value="analytics", delay=0.02):
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return loader
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_run_loader_once(self):
+        patterns = CachePatterns(RedisCache())
+        calls = []
+        loader = _slow_loader(calls)
+
+        results = await asyncio.gather(*(patterns.cache_aside_get("session:1", loader) for _ in range(20)))
+
+        assert results == ["analytics"] * 20
+        assert len(calls) == 1
+        assert patterns.get_stats()["coalesced"] == 19
+
+        # Later reads are cache hits
+        assert await patterns.cache_aside_get("session:1", loader) == "analytics"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_waiters(self):
+        patterns = CachePatterns(RedisCache())
+        calls = []
+        loader = _slow_loader(calls, delay=0.1)
+
+        leader = asyncio.create_task(patterns.cache_aside_get("session:1", loader))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(patterns.cache_aside_get("session:1", loader))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await waiter == "analytics"
+        assert leader.cancelled()
+        assert len(calls) == 1
+        assert patterns.get_stats()["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_loader_failure_is_not_cached(self):
+        patterns = CachePatterns(RedisCache())
+        failing = AsyncMock(side_effect=RuntimeError("database down"))
+
+        assert await patterns.cache_aside_get("session:1", failing) is None
+        assert await patterns.cache_aside_get("session:1", AsyncMock(return_value="ok")) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_waits_for_worker_holding_the_lease(self):
+        cache = MagicMock()
+        cache._cache_key.side_effect = lambda key: f"emg_analysis:{key}"
+        cache.redis.set = AsyncMock(return_value=None)  # Lease held by another worker
+        cache.get = AsyncMock(side_effect=[None, None, {"data": "from-other-worker"}])
+        patterns = CachePatterns(cache, lock_poll_ms=1)
+        loader = AsyncMock()
+
+        assert await patterns.cache_aside_get("session:1", loader) == "from-other-worker"
+
+        loader.assert_not_called()
+        cache.redis.set.assert_awaited_once()
+        assert cache.redis.set.await_args.kwargs == {"nx": True, "px": patterns.lock_lease_ms}
+        assert patterns.get_stats()["lock_waits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lease_holder_loads_and_releases(self):
+        cache = MagicMock()
+        cache._cache_key.side_effect = lambda key: f"emg_analysis:{key}"
+        cache.redis.set = AsyncMock(return_value=True)
+        cache.redis.eval = AsyncMock(return_value=1)
+        cache.get = AsyncMock(return_value=None)
+        cache.set = AsyncMock(return_value=True)
+        patterns = CachePatterns(cache)
+
+        assert await patterns.cache_aside_get("session:1", AsyncMock(return_value="fresh"), ttl=60) == "fresh"
+
+        stored = cache.set.await_args.args[1]
+        assert stored["data"] == "fresh"
+        assert stored["expires_at"] == pytest.approx(time.time() + 60, abs=5)
+        token = cache.redis.set.await_args.args[1]
+        assert cache.redis.eval.await_args.args[1:] == (1, "emg_analysis:lock:session:1", token)
+
+
+class TestEarlyRefresh:
+    @pytest.mark.asyncio
+    async def test_expensive_entry_near_expiry_refreshes_in_background(self):
+        cache = RedisCache()
+        await cache.set("session:1", {"data": "stale", "compute_ms": 5000.0, "expires_at": time.time() + 0.001})
+        patterns = CachePatterns(cache)
+        loader = AsyncMock(return_value="fresh")
+
+        # Stale value is served immediately; the refresh happens behind it
+        assert await patterns.cache_aside_get("session:1", loader) == "stale"
+        await asyncio.gather(*patterns._refresh_tasks)
+
+        loader.assert_awaited_once()
+        assert await patterns.cache_aside_get("session:1", loader) == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_fresh_entries_are_not_refreshed(self):
+        cache = RedisCache()
+        await cache.set("session:1", {"data": "value", "compute_ms": 1.0, "expires_at": time.time() + 3600})
+        patterns = CachePatterns(cache)
+        loader = AsyncMock()
+
+        assert await patterns.cache_aside_get("session:1", loader) == "value"
+        assert patterns._refresh_tasks == []
@@ -0,0 +1,149 @@
+"""Cache Tag Index Tests.
+
+Tagged writes keep per-session, per-patient and per-version key sets, so
+invalidation and listing read one set; pattern deletes use SCAN, never KEYS.
+"""
+
+import fnmatch
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.cache.cache_patterns import CachePatterns
+from services.cache.redis_cache import RedisCache
+from services.cache.redis_cache_service import session_cache_tags
+from services.cache.tiered_cache import _MISSING, TieredCache
+
+
+class InMemoryRedis:
+    """Just enough of redis.asyncio for the tiered cache (no KEYS on purpose)."""
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.publish = AsyncMock(return_value=0)
+        self.scan_calls = 0
+
+    def pipeline(self, transaction=False):
+        return _Pipeline(self)
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def pttl(self, key):
+        return 60_000 if key in self.values else -2
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+        return True
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+        return len(members)
+
+    async def expire(self, key, ttl, nx=False, gt=False):
+        return True
+
+    async def exists(self, *keys):
+        return sum(key in self.values or key in self.sets for key in keys)
+
+    async def unlink(self, *keys):
+        return sum(self.values.pop(key, None) is not None or self.sets.pop(key, None) is not None for key in keys)
+
+    delete = unlink
+
+    async def scan_iter(self, match=None, count=None):
+        self.scan_calls += 1
+        for key in list(self.values):
+            if fnmatch.fnmatchcase(key, match):
+                yield key.encode()
+
+    async def sscan_iter(self, key, count=None):
+        for member in list(self.sets.get(key, ())):
+            yield member.encode()
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+@pytest.fixture
+def cache():
+    tiered = TieredCache(key_prefix="t")
+    tiered.redis = InMemoryRedis()
+    return tiered
+
+
+class TestTaggedWrites:
+    @pytest.mark.asyncio
+    async def test_write_indexes_key_under_each_tag(self, cache):
+        await cache.set("session:s1:analytics", {"v": 1}, tags=["patient:p1", "version:2.1.0"])
+
+        assert cache.redis.sets["t:tag:patient:p1"] == {"t:session:s1:analytics"}
+        assert await cache.tag_members("version:2.1.0") == ["t:session:s1:analytics"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_patient_reads_one_set(self, cache):
+        await cache.set("session:s1:analytics", 1, tags=["patient:p1"])
+        await cache.set("session:s2:analytics", 2, tags=["patient:p1"])
+        await cache.set("session:s3:analytics", 3, tags=["patient:p2"])
+
+        assert await cache.invalidate_tag("patient:p1") == 2
+
+        assert set(cache.redis.values) == {"t:session:s3:analytics"}
+        assert "t:tag:patient:p1" not in cache.redis.sets
+        assert cache.local.get("t:session:s1:analytics") is _MISSING
+        assert cache.redis.scan_calls == 0
+        published = [call.args[1] for call in cache.redis.publish.await_args_list]
+        assert "t:session:s2:analytics" in published[-1]
+
+    @pytest.mark.asyncio
+    async def test_live_members_prune_expired_keys(self, cache):
+        await cache.set("a", 1, tags=["sessions"])
+        await cache.set("b", 2, tags=["sessions"])
+        del cache.redis.values["t:b"]  # Expired in Redis
+
+        assert await cache.tag_members("sessions", live_only=True) == ["t:a"]
+        assert cache.redis.sets["t:tag:sessions"] == {"t:a"}
+
+    @pytest.mark.asyncio
+    async def test_pattern_delete_uses_scan(self, cache):
+        for index in range(5):
+            await cache.set(f"session:{index}", index)
+        await cache.set("other", 0)
+
+        with patch("services.cache.tiered_cache.DELETE_CHUNK_SIZE", 2):
+            assert await cache.delete_pattern("session:*") == 5
+
+        assert set(cache.redis.values) == {"t:other"}
+        assert cache.local.get("t:session:0") is _MISSING
+
+
+class TestAdapters:
+    @pytest.mark.asyncio
+    async def test_patterns_invalidate_tag(self):
+        redis_cache = RedisCache()
+        redis_cache.tiered.redis = InMemoryRedis()
+        await redis_cache.set("dashboard:p1", {"v": 1}, tags=["patient:p1"])
+
+        assert await CachePatterns(redis_cache).invalidate_tag("patient:p1") == 1
+        assert await redis_cache.get("dashboard:p1") is None
+
+    def test_session_tags(self):
+        assert session_cache_tags("s1", "p1", "2.1.0") == ["session:s1", "version:2.1.0", "sessions", "patient:p1"]
+        assert "patient:None" not in session_cache_tags("s1")
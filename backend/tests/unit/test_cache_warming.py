@@ -0,0 +1,163 @@
+"""Cache Warming Tests.
+
+Processing stores analytics under the session UUID; the warmer preloads
+recent sessions that are not cached with one statistics query per chunk and
+one pipelined write, and only the worker holding the lease runs on schedule.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.cache.cache_warmer import SessionCacheWarmer, build_session_cache_payload
+from services.cache.tiered_cache import TieredCache
+from services.clinical.therapy_session_processor import TherapySessionProcessor
+from tests.unit.test_cache_tags import InMemoryRedis
+
+
+def _supabase(sessions, statistics):
+    client = MagicMock()
+    sessions_query = MagicMock()
+    sessions_query.select.return_value.or_.return_value.order.return_value.limit.return_value.execute.return_value = (
+        MagicMock(data=sessions)
+    )
+    statistics_query = MagicMock()
+    statistics_query.select.return_value.in_.return_value.execute.return_value = MagicMock(data=statistics)
+    client.table.side_effect = lambda name: sessions_query if name == "therapy_sessions" else statistics_query
+    return client, statistics_query
+
+
+@pytest.fixture
+def cache_service():
+    service = MagicMock()
+    service.acached_session_ids = AsyncMock(return_value={"s1"})
+    service.aset_many_session_analytics = AsyncMock(side_effect=lambda entries, patient_ids: len(entries))
+    service.aacquire_lease = AsyncMock(return_value=True)
+    return service
+
+
+class TestTieredCachePrimitives:
+    @pytest.mark.asyncio
+    async def test_batch_write_indexes_each_key_under_its_own_tags(self):
+        cache = TieredCache(key_prefix="t")
+        cache.redis = InMemoryRedis()
+
+        await cache.set_many(
+            {"a": 1, "b": 2}, tags=["sessions"], key_tags={"a": ["patient:p1"], "b": ["patient:p2"]}
+        )
+
+        assert cache.redis.sets["t:tag:sessions"] == {"t:a", "t:b"}
+        assert cache.redis.sets["t:tag:patient:p1"] == {"t:a"}
+        assert cache.redis.sets["t:tag:patient:p2"] == {"t:b"}
+
+    @pytest.mark.asyncio
+    async def test_exists_many_checks_both_tiers(self):
+        cache = TieredCache(key_prefix="t")
+        cache.redis = InMemoryRedis()
+        await cache.set("a", 1)
+        cache.redis.values["t:c"] = b"remote only"
+
+        assert await cache.exists_many(["a", "b", "c"]) == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_lease_is_exclusive(self):
+        cache = TieredCache(key_prefix="t")
+        cache.redis = MagicMock()
+        cache.redis.set = AsyncMock(side_effect=[True, None])
+
+        assert await cache.acquire_lease("cache_warm", 60) is True
+        assert await cache.acquire_lease("cache_warm", 60) is False
+        cache.redis.set.assert_awaited_with("t:lease:cache_warm", cache.worker_id, nx=True, px=60_000)
+
+
+class TestSessionCacheWarmer:
+    @pytest.mark.asyncio
+    async def test_warms_uncached_sessions_in_one_batch(self, cache_service):
+        sessions = [
+            {"id": "s1", "patient_id": "p1"},
+            {"id": "s2", "patient_id": "p1", "session_code": "P001S002"},
+            {"id": "s3", "patient_id": "p2"},  # No statistics yet
+        ]
+        statistics = [
+            {"id": 1, "session_id": "s2", "channel_name": "CH1", "compliance_rate": 0.8, "mvc_value": 1e-4},
+            {"id": 2, "session_id": "s2", "channel_name": "CH2", "compliance_rate": 0.6, "mvc_value": 2e-4},
+        ]
+        client, statistics_query = _supabase(sessions, statistics)
+        warmer = SessionCacheWarmer(supabase_client=client, cache_service=cache_service)
+
+        summary = await warmer.warm(hours=12)
+
+        statistics_query.select.return_value.in_.assert_called_once_with("session_id", ["s2", "s3"])
+        entries, patient_ids = cache_service.aset_many_session_analytics.await_args.args
+        assert list(entries) == ["s2"]
+        assert entries["s2"]["analytics"]["CH1"] == {"compliance_rate": 0.8, "mvc_value": 1e-4}
+        assert entries["s2"]["summary"]["overall_compliance"] == pytest.approx(0.7)
+        assert entries["s2"]["metadata"] == {"session_code": "P001S002"}
+        assert patient_ids == {"s2": "p1"}
+        assert summary["sessions_found"] == 3
+        assert summary["already_cached"] == 1
+        assert summary["warmed"] == 1
+        assert summary["skipped_without_statistics"] == 1
+        assert warmer.get_status()["last_run"] == summary
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_warm(self, cache_service):
+        client, statistics_query = _supabase([{"id": "s1", "patient_id": "p1"}], [])
+        warmer = SessionCacheWarmer(supabase_client=client, cache_service=cache_service)
+
+        summary = await warmer.warm()
+
+        statistics_query.select.assert_not_called()
+        assert summary["warmed"] == 0
+        assert summary["hours"] == warmer.lookback_hours
+
+    @pytest.mark.asyncio
+    async def test_schedule_runs_only_with_lease(self, cache_service):
+        cache_service.aacquire_lease.return_value = False
+        warmer = SessionCacheWarmer(supabase_client=MagicMock(), cache_service=cache_service)
+        warmer.warm = AsyncMock()
+
+        assert warmer.start(interval_minutes=5, initial_delay=0.0) is True
+        await asyncio.sleep(0.01)
+
+        cache_service.aacquire_lease.assert_awaited_once_with("cache_warm", 300)
+        warmer.warm.assert_not_awaited()
+        assert warmer.get_status()["scheduled"] is True
+
+        warmer.stop()
+        assert warmer.start(interval_minutes=0) is False
+        assert warmer.get_status()["scheduled"] is False
+
+
+class TestProcessingStoresAnalytics:
+    def test_payload_summary(self):
+        payload = build_session_cache_payload("s1", {"CH1": {"compliance_rate": 1.0}, "CH2": {}})
+
+        assert payload["session_id"] == "s1"
+        assert payload["summary"]["channels"] == ["CH1", "CH2"]
+        assert payload["summary"]["overall_compliance"] == 0.5
+        assert payload["cache_version"] == "2.1"
+
+    @pytest.mark.asyncio
+    async def test_processor_caches_by_session_uuid(self):
+        analytics_cache = MagicMock()
+        analytics_cache.aset_session_analytics = AsyncMock(return_value=True)
+        processor = TherapySessionProcessor(
+            c3d_processor=MagicMock(),
+            emg_data_repo=MagicMock(),
+            session_repo=MagicMock(),
+            cache_service=MagicMock(),
+            performance_service=MagicMock(),
+            supabase_client=MagicMock(),
+            analytics_cache=analytics_cache,
+        )
+
+        await processor._cache_session_analytics(
+            "uuid-1", {"analytics": {"CH1": {"compliance_rate": 0.9}}}, patient_id="p1"
+        )
+
+        session_id, cache_data = analytics_cache.aset_session_analytics.await_args.args
+        assert session_id == "uuid-1"
+        assert cache_data["analytics"] == {"CH1": {"compliance_rate": 0.9}}
+        assert analytics_cache.aset_session_analytics.await_args.kwargs == {"patient_id": "p1"}
@@ -0,0 +1,231 @@
+"""Cohort Rescoring Tests.
+
+The vectorized engine must produce the same scores as the per-session
+PerformanceScoringService, and must write them with bulk upserts.
+"""
+
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from services.clinical.cohort_rescoring_service import (
+    CohortMetrics,
+    CohortRescoringService,
+    build_rpe_lookup,
+    build_scoring_weights,
+    compute_cohort_scores,
+)
+from services.clinical.performance_scoring_service import PerformanceScoringService, SessionMetrics
+
+SESSIONS = [
+    # left total/mvc/dur, right total/mvc/dur, bfr, rpe, game achieved/max
+    (12, 10, 9, 11, 8, 10, 50.0, 5, None, None),
+    (15, 15, 12, 6, 3, 6, None, None, 80, 100),
+    (0, 0, 0, 0, 0, 0, None, 9, None, None),
+    (10, 7, 7, 12, 12, 11, 60.0, 3, 40, 0),
+    (8, 4, 6, 9, 9, 2, 44.9, 42, 10, 20),
+]
+
+
+def make_session_metrics():
+    return [
+        SessionMetrics(
+            session_id=str(uuid4()),
+            left_total_contractions=lt,
+            left_good_contractions=lm,
+            left_mvc_contractions=lm,
+            left_duration_contractions=ld,
+            right_total_contractions=rt,
+            right_good_contractions=rm,
+            right_mvc_contractions=rm,
+            right_duration_contractions=rd,
+            bfr_pressure_aop=bfr,
+            rpe_post_session=rpe,
+            game_points_achieved=ga,
+            game_points_max=gm,
+        )
+        for lt, lm, ld, rt, rm, rd, bfr, rpe, ga, gm in SESSIONS
+    ]
+
+
+def to_columns(metrics: list[SessionMetrics]) -> CohortMetrics:
+    def column(attr):
+        return np.array([getattr(m, attr) for m in metrics], dtype=float)
+
+    return CohortMetrics(
+        session_ids=[m.session_id for m in metrics],
+        scoring_config_ids=[None] * len(metrics),
+        left_total=column("left_total_contractions"),
+        left_mvc=column("left_mvc_contractions"),
+        left_duration=column("left_duration_contractions"),
+        right_total=column("right_total_contractions"),
+        right_mvc=column("right_mvc_contractions"),
+        right_duration=column("right_duration_contractions"),
+        expected_contractions=column("expected_contractions_per_muscle"),
+        bfr_pressure_aop=column("bfr_pressure_aop"),
+        rpe=column("rpe_post_session"),
+        game_points_achieved=column("game_points_achieved"),
+        game_points_max=column("game_points_max"),
+    )
+
+
+class TestVectorizedScores:
+    def test_matches_per_session_scoring(self):
+        metrics = make_session_metrics()
+        service = PerformanceScoringService(supabase_client=MagicMock())
+        service._load_scoring_weights_from_database = MagicMock(return_value=service.weights)
+        service._load_rpe_mapping_from_database = MagicMock(return_value=service.rpe_mapping)
+
+        scores = compute_cohort_scores(to_columns(metrics), build_scoring_weights(None), build_rpe_lookup(None))
+
+        for i, session in enumerate(metrics):
+            expected = service.calculate_performance_scores(session.session_id, session)
+            for column, values in scores.items():
+                assert values[i] == pytest.approx(float(expected[column])), (i, column)
+
+    def test_jsonb_rpe_mapping_is_used(self):
+        lookup = build_rpe_lookup({"rpe_mapping": {"5": {"score": 90.0}}})
+
+        assert lookup[5] == 90.0
+        assert lookup[0] == 50.0
+        assert len(lookup) == 11
+
+
+class TestRescoreRun:
+    @pytest.fixture
+    def client(self):
+        session_ids = [str(uuid4()), str(uuid4()), str(uuid4())]
+        config_id = str(uuid4())
+        tables = {
+            "therapy_sessions": [
+                {"id": session_ids[0], "scoring_config_id": config_id},
+                {"id": session_ids[1], "scoring_config_id": config_id},
+                {"id": session_ids[2], "scoring_config_id": None},
+            ],
+            "emg_statistics": [
+                {"session_id": sid, "channel_name": channel, "contraction_quality_metrics": {
+                    "total_contractions": 12, "overall_compliant_contractions": 10,
+                }}
+                for sid in session_ids[:2] for channel in ("CH1", "CH2")
+            ],
+            "bfr_monitoring": [],
+            "performance_scores": [{"session_id": session_ids[0], "rpe_post_session": 5,
+                                    "game_points_achieved": None, "game_points_max": None}],
+            "scoring_configuration": [{"id": config_id, "weight_compliance": 0.4, "weight_symmetry": 0.3,
+                                       "weight_effort": 0.3, "weight_game": 0.0}],
+        }
+
+        client = MagicMock()
+        upserts = []
+
+        def table(name):
+            query = MagicMock()
+            for method in ("select", "in_", "eq", "order", "range", "limit"):
+                getattr(query, method).return_value = query
+            query.execute.return_value = MagicMock(data=tables[name])
+            query.upsert.side_effect = lambda rows, on_conflict=None: upserts.append((rows, on_conflict)) or query
+            return query
+
+        client.table.side_effect = table
+        client.upserts = upserts
+        client.session_ids = session_ids
+        client.config_id = config_id
+        return client
+
+    def test_scores_by_config_and_bulk_upserts(self, client):
+        summary = CohortRescoringService(client).rescore()
+
+        assert summary["sessions_loaded"] == 3
+        assert summary["sessions_rescored"] == 2
+        assert summary["sessions_skipped"] == 1
+        assert len(client.upserts) == 1
+        rows, on_conflict = client.upserts[0]
+        assert on_conflict == "session_id"
+        assert [row["session_id"] for row in rows] == client.session_ids[:2]
+        assert all(row["scoring_config_id"] == client.config_id for row in rows)
+        assert rows[0]["effort_score"] == 100.0
+        assert rows[1]["effort_score"] == 0.0
+        assert rows[0]["bfr_pressure_aop"] is None
+
+    def test_dry_run_does_not_write(self, client):
+        summary = CohortRescoringService(client).rescore(dry_run=True)
+
+        assert summary["sessions_rescored"] == 2
+        assert summary["sessions_written"] == 0
+        assert client.upserts == []
+
+
+class TestNullConfigSessions:
+    """Sessions without scoring_config_id use the configuration the per-session path resolves."""
+
+    @pytest.fixture
+    def client(self):
+        metrics = make_session_metrics()
+        config_id = str(uuid4())
+        patient_id = str(uuid4())
+        tables = {
+            "therapy_sessions": [
+                {"id": m.session_id, "scoring_config_id": None, "patient_id": patient_id} for m in metrics
+            ],
+            "emg_statistics": [
+                {"session_id": m.session_id, "channel_name": channel, "contraction_quality_metrics": {
+                    "total_contractions": total, "mvc75_compliant_contractions": mvc,
+                    "duration_compliant_contractions": duration,
+                }}
+                for m in metrics
+                for channel, total, mvc, duration in (
+                    ("CH1", m.left_total_contractions, m.left_mvc_contractions, m.left_duration_contractions),
+                    ("CH2", m.right_total_contractions, m.right_mvc_contractions, m.right_duration_contractions),
+                )
+            ],
+            "bfr_monitoring": [
+                {"session_id": m.session_id, "actual_pressure_aop": m.bfr_pressure_aop}
+                for m in metrics if m.bfr_pressure_aop is not None
+            ],
+            "performance_scores": [
+                {"session_id": m.session_id, "rpe_post_session": m.rpe_post_session,
+                 "game_points_achieved": m.game_points_achieved, "game_points_max": m.game_points_max}
+                for m in metrics
+            ],
+            "scoring_configuration": [{
+                "id": config_id, "weight_compliance": 0.50, "weight_symmetry": 0.25, "weight_effort": 0.25,
+                "weight_game": 0.00, "weight_completion": 0.5, "weight_intensity": 0.3, "weight_duration": 0.2,
+                "rpe_mapping": {"3": {"score": 70.0}, "5": {"score": 95.0}, "9": {"score": 5.0}},
+            }],
+        }
+
+        client = MagicMock()
+        upserts = []
+
+        def table(name):
+            query = MagicMock()
+            for method in ("select", "in_", "eq", "order", "range", "limit"):
+                getattr(query, method).return_value = query
+            query.execute.return_value = MagicMock(data=tables[name])
+            query.upsert.side_effect = lambda rows, on_conflict=None: upserts.append((rows, on_conflict)) or query
+            return query
+
+        client.table.side_effect = table
+        client.rpc.return_value.execute.return_value = MagicMock(data=config_id)
+        client.upserts = upserts
+        client.metrics = metrics
+        client.config_id = config_id
+        return client
+
+    def test_matches_per_session_scoring(self, client):
+        summary = CohortRescoringService(client).rescore()
+
+        assert summary["sessions_rescored"] == len(client.metrics)
+        # Resolved once for the patient, not once per session
+        assert client.rpc.call_count == 1
+        rows = [row for chunk, _ in client.upserts for row in chunk]
+        assert all(row["scoring_config_id"] == client.config_id for row in rows)
+
+        service = PerformanceScoringService(supabase_client=client)
+        for row, session in zip(rows, client.metrics, strict=True):
+            expected = service.calculate_performance_scores(session.session_id, session)
+            assert expected["scoring_config_id"] == client.config_id
+            for column in ("overall_score", "compliance_score", "symmetry_score", "effort_score", "game_score"):
+                assert row[column] == pytest.approx(expected[column]), (session.session_id, column)
@@ -0,0 +1,100 @@
+"""Database Executor Tests.
+
+Blocking Supabase calls offloaded with run_db must overlap when gathered
+and must not block the event loop, including during a webhook processing job.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi.concurrency import run_in_threadpool
+
+from database.executor import run_db
+
+
+class TestRunDb:
+    @pytest.mark.asyncio
+    async def test_returns_result_and_forwards_arguments(self):
+        def blocking_call(a, b, scale=1):
+            return (a + b) * scale
+
+        assert await run_db(blocking_call, 1, 2, scale=10) == 30
+
+    @pytest.mark.asyncio
+    async def test_runs_outside_event_loop_thread(self):
+        loop_thread = threading.get_ident()
+        worker_thread = await run_db(threading.get_ident)
+        assert worker_thread != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_gathered_calls_overlap(self):
+        def slow_execute():
+            time.sleep(0.2)
+            return "ok"
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(run_db(slow_execute) for _ in range(3)))
+        elapsed = time.perf_counter() - start
+
+        assert results == ["ok", "ok", "ok"]
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate(self):
+        def failing_execute():
+            raise RuntimeError("postgrest error")
+
+        with pytest.raises(RuntimeError, match="postgrest error"):
+            await run_db(failing_execute)
+
+
+class TestWebhookJobKeepsLoopResponsive:
+    @pytest.mark.asyncio
+    async def test_loop_keeps_serving_during_process_c3d_file(self, mock_therapy_processor, tmp_path):
+        def slow(result=None):
+            def call(*args, **kwargs):
+                time.sleep(0.15)
+                return result
+
+            return call
+
+        c3d_file = tmp_path / "session.c3d"
+        c3d_file.write_bytes(b"c3d")
+        processor = mock_therapy_processor
+        processor.session_repo.get_therapy_session = MagicMock(side_effect=slow({"id": str(uuid4())}))
+        processor.session_repo.update_therapy_session = MagicMock(side_effect=slow())
+        processor.c3d_processor = MagicMock()
+        processor.c3d_processor.process_file.side_effect = slow({"metadata": {}, "analytics": {}})
+        processor._download_file_from_storage = AsyncMock(return_value=str(c3d_file))
+        processor._populate_database_tables = AsyncMock()
+        processor._cache_session_analytics = AsyncMock()
+        processor._store_signal_pyramid = AsyncMock()
+
+        gaps = []
+
+        async def heartbeat():
+            # Stand-in for the requests the loop serves meanwhile
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        # The first anyio worker call loads its backend (one-off at startup)
+        await run_in_threadpool(lambda: None)
+        ticker = asyncio.create_task(heartbeat())
+        try:
+            with patch("services.clinical.therapy_session_processor.ENABLE_TRANSACTIONAL_SESSION_PERSISTENCE", False):
+                result = await processor.process_c3d_file("P001S001", "c3d-examples", "P001/session.c3d")
+        finally:
+            ticker.cancel()
+
+        assert result["success"] is True
+        # get session, process_file, metadata update, status update: ~0.6 s of blocking work
+        assert sum(gaps) > 0.5
+        assert max(gaps) < 0.1
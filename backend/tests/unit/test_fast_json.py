@@ -0,0 +1,74 @@
+"""Fast JSON Path Tests.
+
+Signal arrays stay NumPy from the processor to the response body and are
+written by orjson without `tolist()` or per-sample pydantic validation.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from api.responses import NumpyJSONResponse
+from api.routes.signals import _extract_single_channel_jit
+from utils.numpy_encoder import dumps
+
+
+class TestDumps:
+    def test_arrays_and_scalars(self):
+        payload = {
+            "data": np.linspace(0.0, 1.0, 5),
+            "strided": np.arange(10, dtype=np.float32)[::2],
+            "half": np.array([1.5, 2.5], dtype=np.float16),
+            "count": np.int64(3),
+            "ok": np.bool_(True),
+        }
+
+        decoded = json.loads(dumps(payload))
+
+        assert decoded["data"] == [0.0, 0.25, 0.5, 0.75, 1.0]
+        assert decoded["strided"] == [0.0, 2.0, 4.0, 6.0, 8.0]
+        assert decoded["half"] == [1.5, 2.5]
+        assert decoded["count"] == 3
+        assert decoded["ok"] is True
+
+    def test_complex_nan_and_non_string_keys(self):
+        decoded = json.loads(dumps({1: np.array([1 + 2j]), "nan": np.array([np.nan])}))
+
+        assert decoded["1"] == [{"real": 1.0, "imag": 2.0}]
+        assert decoded["nan"] == [None]
+
+    def test_response_renders_numpy(self):
+        response = NumpyJSONResponse({"data": np.array([1.0, 2.0])})
+
+        assert json.loads(response.body) == {"data": [1.0, 2.0]}
+
+
+class TestJitExtraction:
+    async def test_arrays_are_passed_through(self):
+        signal = np.arange(8, dtype=np.float64)
+        processor = MagicMock()
+        processor.extract_emg_data.return_value = {
+            "CH1": {"data": signal, "time_axis": signal / 1000.0, "sampling_rate": 1000.0, "rms_envelope": signal}
+        }
+
+        with patch("api.routes.signals.GHOSTLYC3DProcessor", return_value=processor):
+            result = await _extract_single_channel_jit(
+                file_data=b"c3d", channel_name="ch1", include_rms=True, downsample_factor=2, session_id="s1"
+            )
+
+        assert isinstance(result["data"], np.ndarray)
+        assert json.loads(dumps(result["rms_envelope"])) == [0.0, 2.0, 4.0, 6.0]
+
+    async def test_empty_channel_is_not_found(self):
+        processor = MagicMock()
+        processor.extract_emg_data.return_value = {
+            "CH1": {"data": np.array([]), "time_axis": np.array([]), "sampling_rate": 1000.0}
+        }
+
+        with patch("api.routes.signals.GHOSTLYC3DProcessor", return_value=processor):
+            result = await _extract_single_channel_jit(
+                file_data=b"c3d", channel_name="CH1", include_rms=False, downsample_factor=1, session_id="s1"
+            )
+
+        assert result is None
@@ -0,0 +1,175 @@
+"""JIT Signal Window Tests.
+
+Clients ask for the visible time window at screen resolution; the route
+slices the decoded arrays by sampling rate instead of returning the whole
+recording. The batch route serves several channels from one decode.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes.signals import _extract_channel_batch_jit, _extract_single_channel_jit, router
+from emg.decimation import window_indices
+
+SAMPLING_RATE = 1000.0
+
+
+@pytest.fixture
+def channel():
+    """Ten seconds of a 1 kHz channel whose sample values are their indices."""
+    signal = np.arange(10_000, dtype=np.float64)
+    processor = MagicMock()
+    processor.extract_emg_data.return_value = {
+        "CH1": {
+            "data": signal,
+            "time_axis": signal / SAMPLING_RATE,
+            "sampling_rate": SAMPLING_RATE,
+            "rms_envelope": signal * 2,
+        }
+    }
+    with patch("api.routes.signals.GHOSTLYC3DProcessor", return_value=processor):
+        yield
+
+
+async def _extract(**params):
+    return await _extract_single_channel_jit(file_data=b"c3d", channel_name="CH1", session_id="s1", **params)
+
+
+class TestWindowIndices:
+    @pytest.mark.parametrize(
+        "start_ms, end_ms, expected",
+        [
+            (None, None, (0, 10_000)),
+            (1500, 2500, (1500, 2500)),
+            (1500.4, 2500.2, (1500, 2501)),
+            (9_000, 60_000, (9_000, 10_000)),
+            (20_000, None, (10_000, 10_000)),
+        ],
+    )
+    def test_clipped_to_recording(self, start_ms, end_ms, expected):
+        assert window_indices(10_000, SAMPLING_RATE, start_ms, end_ms) == expected
+
+
+class TestJitWindow:
+    async def test_window_slices_all_arrays(self, channel):
+        result = await _extract(start_ms=2000, end_ms=3000)
+
+        assert result["data"][0] == 2000 and result["data"][-1] == 2999
+        assert result["time_axis"][0] == pytest.approx(2.0)
+        assert result["rms_envelope"][0] == 4000
+        assert (result["window_start_ms"], result["window_end_ms"]) == (2000.0, 3000.0)
+        assert result["duration_seconds"] == 10.0
+        assert result["total_samples"] == 10_000
+
+    async def test_max_points_bounds_window(self, channel):
+        result = await _extract(start_ms=0, end_ms=5000, max_points=1000)
+
+        assert len(result["data"]) <= 1000
+        assert result["time_axis"][-1] < 5.0
+
+    async def test_downsample_factor_still_applies(self, channel):
+        result = await _extract(downsample_factor=4, max_points=5000)
+
+        assert len(result["data"]) == 2500
+
+    @pytest.mark.parametrize("decimation", ["minmax", "lttb"])
+    async def test_decimation_keeps_time_axis_aligned(self, channel, decimation):
+        result = await _extract(max_points=500, decimation=decimation)
+
+        assert len(result["data"]) <= 500
+        np.testing.assert_allclose(result["time_axis"], result["data"] / SAMPLING_RATE)
+        np.testing.assert_allclose(result["rms_envelope"], result["data"] * 2)
+        assert result["data"][-1] == 9_999
+
+
+class TestJitBatch:
+    @pytest.fixture
+    def session(self):
+        """Two decoded channels (plus the processor's "Raw" duplicates) behind a stored session."""
+        signal = np.arange(10_000, dtype=np.float64)
+        emg_data = {}
+        for offset, name in enumerate(["CH1", "CH2"]):
+            emg_data[name] = {
+                "data": signal + offset,
+                "time_axis": signal / SAMPLING_RATE,
+                "sampling_rate": SAMPLING_RATE,
+                "rms_envelope": (signal + offset) * 2,
+                "activated_data": None,
+                "processed_data": None,
+            }
+            emg_data[f"{name} Raw"] = emg_data[name].copy()
+        emg_data["CH1 activated"] = {"data": signal * 3, "time_axis": signal / SAMPLING_RATE}
+
+        processor = MagicMock()
+        processor.extract_emg_data.return_value = emg_data
+        metadata_service = MagicMock()
+        metadata_service.get_by_id = AsyncMock(return_value={"file_path": "c3d-examples/p1/session.c3d"})
+        supabase = MagicMock()
+        supabase.storage.from_.return_value.download.return_value = b"c3d"
+
+        with (
+            patch("api.routes.signals.GHOSTLYC3DProcessor", return_value=processor) as processor_cls,
+            patch("api.routes.signals.MetadataService", return_value=metadata_service),
+            patch("api.routes.signals.get_supabase_client", return_value=supabase),
+        ):
+            yield {"processor": processor_cls, "metadata": metadata_service, "supabase": supabase}
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    async def test_defaults_to_recorded_channels_raw_and_rms(self, session):
+        batch = await _extract_channel_batch_jit(file_data=b"c3d", channel_names=None, kinds=["raw", "rms"])
+
+        assert list(batch["channels"]) == ["CH1", "CH2"]
+        assert set(batch["channels"]["CH2"]) == {"time_axis", "data", "rms_envelope"}
+        assert batch["channels"]["CH2"]["data"][0] == 1
+        assert batch["missing_channels"] == []
+
+    async def test_kinds_and_window_apply_to_every_channel(self, session):
+        processed = np.full(10_000, 0.5)
+        with patch("api.routes.signals.preprocess_emg_signal", return_value={"processed_signal": processed}):
+            batch = await _extract_channel_batch_jit(
+                file_data=b"c3d",
+                channel_names=["ch1", "CH2", "CH9"],
+                kinds=["processed", "activated"],
+                start_ms=2000,
+                end_ms=3000,
+                max_points=100,
+                decimation="minmax",
+            )
+
+        ch1 = batch["channels"]["ch1"]
+        assert set(ch1) == {"time_axis", "processed_data", "activated_data"}
+        assert len(ch1["time_axis"]) <= 100
+        np.testing.assert_allclose(ch1["activated_data"], ch1["time_axis"] * SAMPLING_RATE * 3)
+        assert "activated_data" not in batch["channels"]["CH2"]
+        assert batch["missing_channels"] == ["CH9"]
+        assert (batch["window_start_ms"], batch["window_end_ms"]) == (2000.0, 3000.0)
+
+    def test_route_shares_one_lookup_download_and_decode(self, session, client):
+        response = client.get(
+            "/signals/jit/2b8c3f7e-0d1a-4c6e-9f3b-5a7d2e1c4b90/batch",
+            params={"channels": ["CH1", "CH2"], "kinds": ["raw", "rms"], "max_points": 500},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert list(body["channels"]) == ["CH1", "CH2"]
+        assert len(body["channels"]["CH1"]["data"]) <= 500
+        session["metadata"].get_by_id.assert_awaited_once()
+        session["supabase"].storage.from_.return_value.download.assert_called_once_with("p1/session.c3d")
+        session["processor"].assert_called_once()
+
+    def test_route_404_when_no_channel_found(self, session, client):
+        response = client.get(
+            "/signals/jit/2b8c3f7e-0d1a-4c6e-9f3b-5a7d2e1c4b90/batch", params={"channels": ["EMG9"]}
+        )
+
+        assert response.status_code == 404
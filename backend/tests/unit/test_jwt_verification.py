@@ -0,0 +1,196 @@
+"""Local JWT Verification Tests.
+
+Tokens are verified in-process (shared secret with rotation, cached JWKS
+with kid-based refresh); the auth server is only asked when no key material
+is available. Roles come from a bounded TTL cache.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from api.dependencies.auth import authenticate_token
+from api.dependencies.jwt_verifier import KeyUnavailableError, SupabaseJWTVerifier, TokenVerificationError
+from api.dependencies.role_cache import _MISSING, RoleCache, get_role_cache, get_user_role
+
+SECRET = "current-secret-with-enough-bytes-for-hs256"
+PREVIOUS_SECRET = "previous-secret-with-enough-bytes-for-hs256"
+
+
+def _claims(**overrides):
+    claims = {"sub": "user-1", "email": "t@example.com", "aud": "authenticated", "exp": int(time.time()) + 300}
+    claims.update(overrides)
+    return claims
+
+
+def _rsa_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    public_jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_key, public_jwk
+
+
+def _jwks_response(*keys):
+    response = MagicMock()
+    response.json.return_value = {"keys": list(keys)}
+    return response
+
+
+class TestSharedSecret:
+    def test_verifies_locally(self):
+        verifier = SupabaseJWTVerifier(secrets=[SECRET])
+
+        claims = verifier.verify(jwt.encode(_claims(), SECRET, algorithm="HS256"))
+
+        assert claims["sub"] == "user-1"
+        assert verifier.local_verifications == 1
+
+    def test_previous_secret_accepted_during_rotation(self):
+        verifier = SupabaseJWTVerifier(secrets=[SECRET, PREVIOUS_SECRET])
+
+        assert verifier.verify(jwt.encode(_claims(), PREVIOUS_SECRET, algorithm="HS256"))["sub"] == "user-1"
+
+    @pytest.mark.parametrize(
+        "token",
+        [
+            jwt.encode(_claims(exp=int(time.time()) - 60), SECRET, algorithm="HS256"),
+            jwt.encode(_claims(aud="anon"), SECRET, algorithm="HS256"),
+            jwt.encode(_claims(), "some-other-secret-with-enough-bytes-x", algorithm="HS256"),
+            "not-a-jwt",
+        ],
+        ids=["expired", "wrong-audience", "wrong-secret", "malformed"],
+    )
+    def test_rejects_invalid_tokens(self, token):
+        with pytest.raises(TokenVerificationError):
+            SupabaseJWTVerifier(secrets=[SECRET]).verify(token)
+
+    def test_without_secret_key_is_unavailable(self):
+        verifier = SupabaseJWTVerifier(jwks_url="https://example.supabase.co/jwks")
+
+        with pytest.raises(KeyUnavailableError):
+            verifier.verify(jwt.encode(_claims(), SECRET, algorithm="HS256"))
+
+
+class TestJwks:
+    def test_keys_are_cached(self):
+        private_key, public_jwk = _rsa_key("k1")
+        verifier = SupabaseJWTVerifier(jwks_url="https://example.supabase.co/jwks")
+        token = jwt.encode(_claims(), private_key, algorithm="RS256", headers={"kid": "k1"})
+
+        with patch("api.dependencies.jwt_verifier.httpx.get", return_value=_jwks_response(public_jwk)) as get:
+            assert verifier.refresh_jwks()
+            verifier.verify(token)
+            verifier.verify(token)
+
+        assert get.call_count == 1
+
+    def test_verify_never_waits_for_the_jwks(self):
+        private_key, public_jwk = _rsa_key("k1")
+        verifier = SupabaseJWTVerifier(jwks_url="https://example.supabase.co/jwks")
+        token = jwt.encode(_claims(), private_key, algorithm="RS256", headers={"kid": "k1"})
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(5)
+            return _jwks_response(public_jwk)
+
+        with patch("api.dependencies.jwt_verifier.httpx.get", side_effect=slow_get):
+            started = time.perf_counter()
+            with pytest.raises(KeyUnavailableError):
+                verifier.verify(token)  # Falls back to the auth server meanwhile
+            assert time.perf_counter() - started < 1
+
+            release.set()
+            verifier._refresh_future.result(timeout=5)
+
+        assert verifier.verify(token)["sub"] == "user-1"
+
+    def test_unknown_kid_refreshes_once_per_cooldown(self):
+        old_key, old_jwk = _rsa_key("k1")
+        new_key, new_jwk = _rsa_key("k2")
+        verifier = SupabaseJWTVerifier(jwks_url="https://example.supabase.co/jwks", refresh_cooldown_seconds=0)
+        responses = [_jwks_response(old_jwk), _jwks_response(old_jwk, new_jwk)]
+
+        new_token = jwt.encode(_claims(), new_key, algorithm="RS256", headers={"kid": "k2"})
+
+        with patch("api.dependencies.jwt_verifier.httpx.get", side_effect=responses) as get:
+            verifier.refresh_jwks()
+            verifier.verify(jwt.encode(_claims(), old_key, algorithm="RS256", headers={"kid": "k1"}))
+            with pytest.raises(KeyUnavailableError):
+                verifier.verify(new_token)
+            verifier._refresh_future.result(timeout=5)
+            claims = verifier.verify(new_token)
+
+        assert claims["sub"] == "user-1"
+        assert get.call_count == 2
+
+        verifier.refresh_cooldown_seconds = 3600
+        with patch("api.dependencies.jwt_verifier.httpx.get") as get, pytest.raises(KeyUnavailableError):
+            verifier.verify(jwt.encode(_claims(), new_key, algorithm="RS256", headers={"kid": "k3"}))
+        assert verifier._refresh_future.done()
+        get.assert_not_called()
+
+
+class TestAuthenticateToken:
+    def test_local_verification_skips_auth_server(self):
+        supabase = MagicMock()
+        with patch("api.dependencies.auth.get_jwt_verifier", return_value=SupabaseJWTVerifier(secrets=[SECRET])):
+            user = authenticate_token(jwt.encode(_claims(), SECRET, algorithm="HS256"), supabase)
+
+        assert user["id"] == "user-1"
+        supabase.auth.get_user.assert_not_called()
+
+    def test_invalid_token_is_401(self):
+        with patch("api.dependencies.auth.get_jwt_verifier", return_value=SupabaseJWTVerifier(secrets=[SECRET])):
+            with pytest.raises(HTTPException) as exc_info:
+                authenticate_token("not-a-jwt", MagicMock())
+
+        assert exc_info.value.status_code == 401
+
+    def test_falls_back_to_auth_server(self):
+        supabase = MagicMock()
+        supabase.auth.get_user.return_value.user = MagicMock(id="user-2", email="r@example.com")
+        verifier = SupabaseJWTVerifier(jwks_url="https://example.supabase.co/jwks")
+
+        with patch("api.dependencies.auth.get_jwt_verifier", return_value=verifier):
+            user = authenticate_token(jwt.encode(_claims(), SECRET, algorithm="HS256"), supabase)
+
+        assert user["id"] == "user-2"
+        assert verifier.fallbacks == 1
+
+
+class TestRoleCache:
+    def test_role_loaded_once_with_service_client(self):
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.single.return_value.execute.return_value = (
+            MagicMock(data={"role": "THERAPIST"})
+        )
+
+        with patch("api.dependencies.role_cache.get_supabase_client", return_value=supabase) as get_client:
+            assert get_user_role("user-1") == "THERAPIST"
+            assert get_user_role("user-1") == "THERAPIST"
+
+            assert supabase.table.call_count == 1
+            get_role_cache().invalidate("user-1")
+            get_user_role("user-1")
+            assert supabase.table.call_count == 2
+
+        get_client.assert_called_with(use_service_key=True)
+
+    def test_bounded_and_expiring(self):
+        cache = RoleCache(ttl_seconds=60, max_entries=2)
+        cache.set("a", "ADMIN")
+        cache.set("b", None)
+        cache.set("c", "THERAPIST")
+
+        assert cache.get("b") is None
+        assert cache.get_stats()["entries"] == 2
+        assert cache.get("a") is _MISSING  # Least recently used
+
+        with patch("api.dependencies.role_cache.time.monotonic", return_value=time.monotonic() + 61):
+            assert cache.get("c") is _MISSING
@@ -0,0 +1,159 @@
+"""Scoring Configuration Cache Tests.
+
+Scoring configurations are loaded once per version; writes bump the
+version so stale rows are never served, and invalidations from other
+workers arrive over Redis pub/sub without blocking the writer.
+"""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from services.clinical.performance_scoring_service import PerformanceScoringService
+from services.clinical.scoring_config_cache import ScoringConfigCache
+
+
+@pytest.fixture
+def cache():
+    return ScoringConfigCache(ttl_seconds=60)
+
+
+class TestScoringConfigCache:
+    def test_loads_once_then_hits(self, cache):
+        loader = MagicMock(return_value={"id": "c1", "weight_compliance": 0.5})
+
+        first = cache.get_or_load("c1", loader)
+        second = cache.get_or_load("c1", loader)
+
+        assert first == second == {"id": "c1", "weight_compliance": 0.5}
+        loader.assert_called_once_with("c1")
+        assert cache.get_stats()["hits"] == 1
+
+    def test_invalidation_forces_reload(self, cache):
+        loader = MagicMock(side_effect=[{"weight_compliance": 0.5}, {"weight_compliance": 0.7}])
+
+        cache.get_or_load("c1", loader)
+        cache.invalidate("c1", publish=False)
+
+        assert cache.get_or_load("c1", loader) == {"weight_compliance": 0.7}
+        assert cache.version == 1
+
+    def test_load_racing_an_invalidation_is_not_stored(self, cache):
+        def loader(config_id):
+            # A write lands while the old row is being fetched
+            cache.invalidate(config_id, publish=False)
+            return {"weight_compliance": 0.5}
+
+        cache.get_or_load("c1", loader)
+
+        assert cache.get("c1") is None
+
+    def test_expired_entries_are_reloaded(self):
+        cache = ScoringConfigCache(ttl_seconds=0)
+        loader = MagicMock(return_value={"weight_compliance": 0.5})
+
+        cache.get_or_load("c1", loader)
+        time.sleep(0.01)
+        cache.get_or_load("c1", loader)
+
+        assert loader.call_count == 2
+
+    def test_missing_rows_are_not_cached(self, cache):
+        loader = MagicMock(return_value=None)
+
+        cache.get_or_load("c1", loader)
+        cache.get_or_load("c1", loader)
+
+        assert loader.call_count == 2
+
+    def test_remote_invalidation_ignores_own_messages(self, cache):
+        cache.set("c1", {"weight_compliance": 0.5})
+
+        cache._handle_message({"type": "message", "data": json.dumps({"worker_id": cache.worker_id})})
+        assert cache.get("c1") is not None
+
+        cache._handle_message({"type": "message", "data": json.dumps({"worker_id": "other", "config_id": "c1"})})
+        assert cache.get("c1") is None
+
+    def test_invalidation_is_published(self, cache):
+        cache._redis = MagicMock()
+
+        cache.invalidate("c1")
+        cache._publisher.shutdown(wait=True)
+
+        channel, payload = cache._redis.publish.call_args.args
+        assert channel.endswith("scoring_config:invalidate")
+        assert json.loads(payload) == {"worker_id": cache.worker_id, "config_id": "c1"}
+
+    def test_invalidation_does_not_wait_for_redis(self, cache):
+        cache._redis = MagicMock()
+        cache._redis.publish.side_effect = lambda *args: time.sleep(0.5)
+
+        start = time.perf_counter()
+        cache.invalidate("c1")
+        elapsed = time.perf_counter() - start
+        cache._publisher.shutdown(wait=True)
+
+        assert elapsed < 0.1
+        assert cache.version == 1
+        cache._redis.publish.assert_called_once()
+
+    def test_failed_connect_backs_off(self, cache):
+        with patch("services.clinical.scoring_config_cache.redis.Redis.from_url") as from_url:
+            from_url.return_value.ping.side_effect = ConnectionError("connection refused")
+
+            assert cache._get_redis() is None
+            assert cache._get_redis() is None
+
+        from_url.assert_called_once()
+
+    def test_failed_publish_drops_connection(self, cache):
+        cache._redis = MagicMock()
+        cache._redis.publish.side_effect = ConnectionError("connection reset")
+
+        cache._publish_invalidation("c1")
+
+        assert cache._redis is None
+        assert cache._get_redis() is None  # backing off
+
+    def test_listener_start_does_not_connect_on_caller(self, cache):
+        cache._get_redis = MagicMock(return_value=None)
+
+        try:
+            assert cache.start_listener() is True
+            assert cache.get_stats()["listening"] is True
+        finally:
+            cache.stop_listener()
+
+
+class TestScoringServiceUsesCache:
+    def test_weights_and_rpe_mapping_share_one_query(self, cache):
+        session_id = str(uuid4())
+        config_id = str(uuid4())
+        client = MagicMock()
+
+        sessions = MagicMock()
+        sessions.select.return_value.eq.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=[{"patient_id": None, "scoring_config_id": config_id}]
+        )
+        configs = MagicMock()
+        configs.select.return_value.eq.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=[{"id": config_id, "weight_compliance": 0.6, "rpe_mapping": {"5": {"score": 80.0}}}]
+        )
+        client.table.side_effect = lambda name: sessions if name == "therapy_sessions" else configs
+
+        service = PerformanceScoringService(supabase_client=client, config_cache=cache)
+        service._get_session_scoring_config_id = MagicMock()
+
+        for _ in range(2):
+            weights = service._load_scoring_weights_from_database(session_id)
+            rpe_mapping = service._load_rpe_mapping_from_database(session_id)
+
+        assert weights.w_compliance == 0.6
+        assert rpe_mapping.get_effort_score(5) == 80.0
+        assert configs.select.return_value.eq.return_value.limit.return_value.execute.call_count == 1
+        # Session already carries its immutable config id: no resolution RPC
+        service._get_session_scoring_config_id.assert_not_called()
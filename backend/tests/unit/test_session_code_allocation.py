@@ -0,0 +1,71 @@
+"""Session Code Allocation Tests.
+
+Session codes are reserved through the reserve_session_codes RPC (one call
+for N codes); the history scan is only used when the RPC is not deployed.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.clinical.repositories.therapy_session_repository import TherapySessionRepository
+from services.shared.repositories.base.abstract_repository import RepositoryError
+
+
+class PostgrestError(Exception):
+    """Stand-in for postgrest APIError carrying an error code."""
+
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+
+def _history_query(client):
+    return client.table.return_value.select.return_value.like.return_value.order.return_value.limit.return_value
+
+
+class TestSessionCodeAllocation:
+    def test_rpc_reserves_range_in_one_call(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.return_value = MagicMock(data=41)
+        repo = TherapySessionRepository(client)
+
+        codes = repo.generate_next_session_codes("P007", 3)
+
+        assert codes == ["P007S041", "P007S042", "P007S043"]
+        client.rpc.assert_called_once_with(
+            "reserve_session_codes", {"p_patient_code": "P007", "p_count": 3}
+        )
+        client.table.assert_not_called()
+
+    def test_falls_back_to_history_when_rpc_missing(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.side_effect = PostgrestError("PGRST202")
+        _history_query(client).execute.return_value = MagicMock(data=[{"session_code": "P007S009"}])
+        repo = TherapySessionRepository(client)
+
+        assert repo.generate_next_session_code("P007") == "P007S010"
+
+    def test_first_session_without_history(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.side_effect = PostgrestError("PGRST202")
+        _history_query(client).execute.return_value = MagicMock(data=[])
+        repo = TherapySessionRepository(client)
+
+        assert repo.generate_next_session_code("P007") == "P007S001"
+
+    @pytest.mark.parametrize("error", [PostgrestError("57014"), PostgrestError("PGRST000"), TimeoutError("read timeout")])
+    def test_transient_rpc_errors_do_not_fall_back_to_history(self, error):
+        client = MagicMock()
+        client.rpc.return_value.execute.side_effect = error
+        repo = TherapySessionRepository(client)
+
+        with pytest.raises(RepositoryError):
+            repo.generate_next_session_codes("P007", 2)
+        client.table.assert_not_called()
+
+    def test_invalid_patient_code_rejected(self):
+        repo = TherapySessionRepository(MagicMock())
+
+        with pytest.raises(RepositoryError):
+            repo.generate_next_session_codes("X007", 1)
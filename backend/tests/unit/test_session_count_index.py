@@ -0,0 +1,134 @@
+"""Session Count Index Tests.
+
+Adherence reads per-patient daily session counts maintained at webhook
+ingestion instead of listing the storage bucket.
+"""
+
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from services.clinical.repositories.session_count_repository import (
+    SessionCountRepository,
+    session_day_for,
+)
+
+
+class TestSessionDay:
+    def test_uses_recording_date_from_filename(self):
+        assert session_day_for("P001/Ghostly_Emg_20250828_15-30-00-1234.c3d") == date(2025, 8, 28)
+
+    def test_falls_back_to_session_timestamp(self):
+        assert session_day_for("P001/upload.c3d", "2025-08-27T23:30:00+00:00") == date(2025, 8, 27)
+
+    def test_defaults_to_today(self):
+        assert session_day_for("P001/upload.c3d") == datetime.now(timezone.utc).date()
+
+
+class TestSessionCountRepository:
+    def test_records_sessions_grouped_by_day(self):
+        client = MagicMock()
+        repo = SessionCountRepository(client)
+        patient_id = str(uuid4())
+
+        assert repo.record_sessions(patient_id, [date(2025, 8, 28), date(2025, 8, 28), date(2025, 8, 29)])
+
+        client.rpc.assert_called_once_with(
+            "increment_patient_session_counts",
+            {"p_patient_id": patient_id, "p_days": {"2025-08-28": 2, "2025-08-29": 1}},
+        )
+
+    def test_index_failure_does_not_raise(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.side_effect = Exception("relation does not exist")
+
+        assert SessionCountRepository(client).record_sessions(str(uuid4()), [date(2025, 8, 28)]) is False
+
+    def test_counts_sum_days_since_cutoff(self):
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.eq.return_value.gte.return_value
+        query.execute.return_value = MagicMock(data=[{"session_count": 3}, {"session_count": 2}])
+
+        count = SessionCountRepository(client).count_sessions_since("patient", date(2025, 8, 22))
+
+        assert count == 5
+        client.table.return_value.select.return_value.eq.return_value.gte.assert_called_once_with(
+            "session_day", "2025-08-22"
+        )
+
+    def test_missing_index_returns_none(self):
+        client = MagicMock()
+        client.table.return_value.select.return_value.eq.return_value.gte.return_value.execute.side_effect = (
+            Exception("relation does not exist")
+        )
+
+        assert SessionCountRepository(client).count_sessions_since("patient", date(2025, 8, 22)) is None
+
+    def test_rebuild_upserts_recounted_days(self):
+        client = MagicMock()
+        patient_id = str(uuid4())
+        sessions = client.table.return_value.select.return_value.not_.is_.return_value.not_.is_.return_value
+        sessions.order.return_value.range.return_value.execute.return_value = MagicMock(data=[
+            {"patient_id": patient_id, "file_path": "P001/Ghostly_Emg_20250828_15-30-00-1234.c3d"},
+            {"patient_id": patient_id, "file_path": "P001/Ghostly_Emg_20250828_16-30-00-1234.c3d"},
+        ])
+
+        index = client.table.return_value.select.return_value.order.return_value.order.return_value
+        index.range.return_value.execute.return_value = MagicMock(data=[])
+
+        summary = SessionCountRepository(client).rebuild_from_sessions()
+
+        assert summary == {"sessions_scanned": 2, "rows_written": 1, "rows_deleted": 0}
+        client.table.return_value.upsert.assert_called_once_with(
+            [{"patient_id": patient_id, "session_day": "2025-08-28", "session_count": 2}],
+            on_conflict="patient_id,session_day",
+        )
+        client.table.return_value.delete.assert_not_called()
+
+    def test_rebuild_deletes_days_without_sessions(self):
+        client = MagicMock()
+        patient_id = str(uuid4())
+        sessions = client.table.return_value.select.return_value.not_.is_.return_value.not_.is_.return_value
+        sessions.order.return_value.range.return_value.execute.return_value = MagicMock(data=[
+            {"patient_id": patient_id, "file_path": "P001/Ghostly_Emg_20250828_15-30-00-1234.c3d"},
+        ])
+        index = client.table.return_value.select.return_value.order.return_value.order.return_value
+        index.range.return_value.execute.return_value = MagicMock(data=[
+            {"patient_id": patient_id, "session_day": "2025-08-27"},
+            {"patient_id": patient_id, "session_day": "2025-08-28"},
+        ])
+
+        summary = SessionCountRepository(client).rebuild_from_sessions()
+
+        assert summary["rows_deleted"] == 1
+        delete = client.table.return_value.delete.return_value
+        delete.eq.assert_called_once_with("patient_id", patient_id)
+        delete.eq.return_value.in_.assert_called_once_with("session_day", ["2025-08-27"])
+
+
+class TestIngestionUpdatesIndex:
+    @pytest.mark.asyncio
+    async def test_created_session_is_indexed(self, mock_therapy_processor):
+        processor = mock_therapy_processor
+        processor.session_count_repo = MagicMock()
+        processor.session_repo.get_session_by_file_hash.return_value = None
+        processor.session_repo.create_session_with_code.return_value = ("P001S001", str(uuid4()), {})
+        patient_id = str(uuid4())
+
+        await processor.create_session(
+            "c3d-examples/P001/Ghostly_Emg_20250828_15-30-00-1234.c3d", {"size": 1}, patient_id=patient_id
+        )
+
+        processor.session_count_repo.record_sessions.assert_called_once_with(patient_id, [date(2025, 8, 28)])
+
+    @pytest.mark.asyncio
+    async def test_existing_session_is_not_counted_twice(self, mock_therapy_processor):
+        processor = mock_therapy_processor
+        processor.session_count_repo = MagicMock()
+        processor.session_repo.get_session_by_file_hash.return_value = {"game_metadata": {"session_code": "P001S001"}}
+
+        await processor.create_session("c3d-examples/P001/file.c3d", {"size": 1}, patient_id=str(uuid4()))
+
+        processor.session_count_repo.record_sessions.assert_not_called()
@@ -0,0 +1,96 @@
+"""Signal Pyramid Store Tests.
+
+Processing stores the pyramid next to the C3D file; JIT min/max requests
+read the header and one level window with ranged reads.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from services.clinical.therapy_session_processor import TherapySessionProcessor
+from services.data.signal_pyramid_store import SignalPyramidStore
+
+SAMPLING_RATE = 1000.0
+
+
+def _emg_data():
+    signal = np.zeros(120_000)
+    signal[60_003] = 4.0
+    channel = {"data": signal, "rms_envelope": np.abs(signal), "sampling_rate": SAMPLING_RATE}
+    return {"CH1": channel, "CH1 Raw": channel.copy()}
+
+
+@pytest.fixture
+def stored():
+    """A store whose bucket holds the pyramid of _emg_data, served with HTTP ranges."""
+    supabase = MagicMock()
+    store = SignalPyramidStore(supabase)
+    store.save("c3d-examples", "P001/session.c3d", _emg_data())
+    artifact = supabase.storage.from_.return_value.upload.call_args.args[1]
+    supabase.storage.from_.return_value.create_signed_url.return_value = {"signedURL": "https://signed"}
+    ranges = []
+
+    def ranged_get(url, headers, timeout):
+        start, end = (int(value) for value in headers["Range"].removeprefix("bytes=").split("-"))
+        ranges.append((start, end))
+        return MagicMock(status_code=206, content=artifact[start : end + 1])
+
+    with patch("services.data.signal_pyramid_store.httpx.get", side_effect=ranged_get):
+        yield store, supabase, artifact, ranges
+
+
+class TestSignalPyramidStore:
+    def test_saved_next_to_c3d_file(self, stored):
+        _, supabase, _, _ = stored
+
+        upload = supabase.storage.from_.return_value.upload.call_args
+        assert upload.args[0] == "P001/session.c3d.pyramid"
+        assert upload.kwargs["file_options"]["upsert"] == "true"
+
+    def test_window_reads_only_needed_bytes(self, stored):
+        store, _, artifact, ranges = stored
+
+        result = store.read_window("c3d-examples", "P001/session.c3d", "ch1", 30_000, 90_000, 1000)
+
+        assert len(result["data"]) <= 1000
+        assert len(result["time_axis"]) == len(result["data"]) == len(result["rms_envelope"])
+        assert result["data"].max() == 4.0
+        assert 30.0 <= result["time_axis"][0] and result["time_axis"][-1] <= 90.0 + result["bucket_size"] / SAMPLING_RATE
+        assert result["total_samples"] == 120_000
+        assert sum(end - start + 1 for start, end in ranges[1:]) < len(artifact) // 20
+
+    def test_fine_zoom_falls_back(self, stored):
+        store, _, _, _ = stored
+
+        assert store.read_window("c3d-examples", "P001/session.c3d", "CH1", 1000, 2000, 1000) is None
+
+    def test_missing_artifact_falls_back(self):
+        supabase = MagicMock()
+        supabase.storage.from_.return_value.create_signed_url.side_effect = Exception("Object not found")
+
+        assert SignalPyramidStore(supabase).read_window("b", "missing.c3d", "CH1", None, None, 1000) is None
+
+
+class TestProcessingPipeline:
+    async def test_pyramid_stored_after_processing(self):
+        pyramid_store = MagicMock()
+        c3d_processor = MagicMock(emg_data=_emg_data())
+        processor = TherapySessionProcessor(
+            c3d_processor, MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock(), pyramid_store=pyramid_store
+        )
+
+        await processor._store_signal_pyramid("c3d-examples", "P001/session.c3d")
+
+        pyramid_store.save.assert_called_once_with("c3d-examples", "P001/session.c3d", c3d_processor.emg_data)
+
+    async def test_store_failure_is_not_fatal(self):
+        pyramid_store = MagicMock()
+        pyramid_store.save.side_effect = Exception("storage down")
+        c3d_processor = MagicMock(emg_data=_emg_data())
+        processor = TherapySessionProcessor(
+            c3d_processor, MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock(), pyramid_store=pyramid_store
+        )
+
+        await processor._store_signal_pyramid("c3d-examples", "P001/session.c3d")
@@ -0,0 +1,101 @@
+"""Binary Signal Transport Tests.
+
+Signal endpoints stay JSON by default and return float32 frames (or Arrow
+when pyarrow is installed) when the client asks for them in Accept.
+"""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from api.responses import signal_response
+from utils.signal_transport import (
+    FRAME_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    HAS_PYARROW,
+    decode_frame,
+    encode_arrow,
+    encode_frame,
+    negotiate_media_type,
+)
+
+
+class TestNegotiation:
+    @pytest.mark.parametrize(
+        "accept, expected",
+        [
+            (None, JSON_MEDIA_TYPE),
+            ("*/*", JSON_MEDIA_TYPE),
+            (FRAME_MEDIA_TYPE, FRAME_MEDIA_TYPE),
+            (f"{FRAME_MEDIA_TYPE}, application/json;q=0.5", FRAME_MEDIA_TYPE),
+            (f"application/json, {FRAME_MEDIA_TYPE}", JSON_MEDIA_TYPE),
+            (f"*/*, {FRAME_MEDIA_TYPE}", FRAME_MEDIA_TYPE),
+            (f"{FRAME_MEDIA_TYPE};q=0", JSON_MEDIA_TYPE),
+            ("text/csv", JSON_MEDIA_TYPE),
+        ],
+    )
+    def test_json_unless_binary_preferred(self, accept, expected):
+        assert negotiate_media_type(accept) == expected
+
+
+class TestFrame:
+    def test_round_trip(self):
+        signal = np.linspace(-1.0, 1.0, 7)
+        channels = {"CH1": {"data": signal, "time_axis": signal[::-1], "rms_envelope": None}}
+
+        frame = encode_frame({"sampling_rate": np.float64(1000.0)}, channels)
+        metadata, decoded = decode_frame(frame)
+
+        assert metadata == {"sampling_rate": 1000.0}
+        np.testing.assert_allclose(decoded["CH1"]["data"], signal.astype(np.float32))
+        np.testing.assert_allclose(decoded["CH1"]["time_axis"], signal[::-1].astype(np.float32))
+        assert decoded["CH1"]["rms_envelope"] is None
+
+    def test_data_section_is_aligned(self):
+        frame = encode_frame({"note": "x" * 3}, {"CH1": {"data": np.ones(3)}})
+
+        (header_length,) = struct.unpack_from("<I", frame, 4)
+        header = json.loads(frame[8 : 8 + header_length])
+
+        assert (8 + header_length) % 4 == 0
+        assert header["channels"]["CH1"]["data"] == {"offset": 0, "length": 3}
+        assert len(frame) == 8 + header_length + 3 * 4
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow not installed")
+class TestArrow:
+    def test_signals_of_different_lengths_are_kept(self):
+        import pyarrow.ipc
+
+        channels = {"CH1": {"data": np.arange(5.0), "rms_envelope": np.arange(3.0), "time_axis": None}}
+
+        reader = pyarrow.ipc.open_stream(encode_arrow({"sampling_rate": 1000.0}, channels))
+        table = reader.read_all()
+        lengths = json.loads(reader.schema.metadata[b"lengths"])
+
+        assert lengths["CH1"]["data"] == 5
+        assert lengths["CH1"]["rms_envelope"] == 3
+        assert lengths["CH1"]["time_axis"] is None
+        assert table.column("data").to_pylist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+        rms = table.column("rms_envelope").to_pylist()
+        assert rms[: lengths["CH1"]["rms_envelope"]] == [0.0, 1.0, 2.0]
+        assert rms[3:] == [None, None]
+
+
+class TestSignalResponse:
+    def test_json_by_default(self):
+        response = signal_response(None, {"data": np.array([1.0])}, {}, {"CH1": {"data": np.array([1.0])}})
+
+        assert response.media_type == JSON_MEDIA_TYPE
+        assert response.headers["vary"] == "Accept"
+        assert json.loads(response.body) == {"data": [1.0]}
+
+    def test_frame_when_requested(self):
+        response = signal_response(FRAME_MEDIA_TYPE, {}, {"channel_name": "CH1"}, {"CH1": {"data": np.array([2.0])}})
+
+        metadata, channels = decode_frame(response.body)
+        assert response.media_type == FRAME_MEDIA_TYPE
+        assert metadata == {"channel_name": "CH1"}
+        assert channels["CH1"]["data"].tolist() == [2.0]
@@ -0,0 +1,70 @@
+"""Supabase Client Registry Tests.
+
+One long-lived client per key type; JWT scoping reuses the anon client's
+HTTP session and only adds a per-request Authorization header.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from postgrest import SyncPostgrestClient
+
+from database import supabase_client as registry
+
+ENV = {"SUPABASE_URL": "https://example.supabase.co", "SUPABASE_ANON_KEY": "anon", "SUPABASE_SERVICE_KEY": "service"}
+
+
+class _FakeClient:
+    """Just the table/rpc surface of supabase.Client, over a real PostgREST builder."""
+
+    def __init__(self, url, key, options=None):
+        self.key = key
+        self.options = options
+        self.postgrest = SyncPostgrestClient(f"{url}/rest/v1", headers={"Authorization": f"Bearer {key}"})
+
+    def table(self, name):
+        return self.postgrest.from_(name)
+
+    def rpc(self, fn, params=None, **kwargs):
+        return self.postgrest.rpc(fn, params or {}, **kwargs)
+
+
+@pytest.fixture
+def create_client():
+    registry.reset_client()
+    with patch.dict("os.environ", ENV), patch.object(registry, "create_client", side_effect=_FakeClient) as create:
+        yield create
+    registry.reset_client()
+
+
+class TestClientRegistry:
+    def test_service_client_is_reused(self, create_client):
+        first = registry.get_supabase_client(use_service_key=True)
+
+        assert registry.get_supabase_client(use_service_key=True) is first
+        assert registry.get_supabase_client() is not first
+        assert create_client.call_count == 2
+        assert registry.get_client_registry_stats()["reused"] == 1
+
+    def test_jwt_scope_shares_anon_session(self, create_client):
+        anon = registry.get_supabase_client()
+        scoped = registry.get_supabase_client(jwt_token="user-token")
+
+        query = scoped.table("patients").select("*").eq("id", "p1")
+
+        assert query.session is anon.postgrest.session
+        assert query.headers["Authorization"] == "Bearer user-token"
+        assert anon.postgrest.session.headers["Authorization"] == "Bearer anon"
+        assert anon.table("patients").select("*").headers.get("Authorization") is None
+        assert create_client.call_count == 1
+
+    def test_jwt_scope_applies_to_rpc_and_writes(self, create_client):
+        scoped = registry.get_supabase_client(jwt_token="user-token")
+
+        assert scoped.rpc("get_role", {"uid": "u1"}).headers["Authorization"] == "Bearer user-token"
+        assert scoped.table("notes").insert({"a": 1}).headers["Authorization"] == "Bearer user-token"
+
+    def test_missing_environment(self):
+        registry.reset_client()
+        with patch.dict("os.environ", {"SUPABASE_URL": ""}), pytest.raises(ValueError):
+            registry.get_supabase_client(use_service_key=True)
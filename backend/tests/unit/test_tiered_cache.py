@@ -0,0 +1,186 @@
+"""Tiered Cache Tests.
+
+In-process LRU (L1) in front of Redis (L2): hot reads stay local, writes
+are invalidated on other workers via pub/sub, and both legacy cache APIs
+keep working as adapters.
+"""
+
+import gzip
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.cache.cache_patterns import CachePatterns
+from services.cache.codecs import GzipJsonCodec, JsonCodec, get_codec
+from services.cache.redis_cache import RedisCache
+from services.cache.tiered_cache import _MISSING, LocalLRU, TieredCache
+
+
+def _redis_with_pipeline(results):
+    """Async Redis double whose pipeline returns `results`."""
+    client = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results)
+    client.pipeline.return_value = pipe
+    client.publish = AsyncMock(return_value=1)
+    client.delete = AsyncMock(return_value=1)
+    return client, pipe
+
+
+class TestLocalLRU:
+    def test_evicts_least_recently_used_by_count(self):
+        lru = LocalLRU(max_entries=2, max_bytes=1000, ttl_seconds=60)
+        lru.set("a", 1, 10)
+        lru.set("b", 2, 10)
+        lru.get("a")
+        lru.set("c", 3, 10)
+
+        assert lru.get("b") is _MISSING
+        assert lru.get("a") == 1
+        assert lru.evictions == 1
+
+    def test_evicts_by_size(self):
+        lru = LocalLRU(max_entries=10, max_bytes=100, ttl_seconds=60)
+        lru.set("a", 1, 60)
+        lru.set("b", 2, 60)
+
+        assert lru.get("a") is _MISSING
+        assert lru.total_bytes == 60
+
+    def test_oversized_value_is_not_stored(self):
+        lru = LocalLRU(max_entries=10, max_bytes=100, ttl_seconds=60)
+
+        assert lru.set("a", 1, 101) is False
+        assert len(lru) == 0
+
+    def test_entries_expire(self, monkeypatch):
+        lru = LocalLRU(max_entries=10, max_bytes=100, ttl_seconds=5)
+        lru.set("a", 1, 10, ttl_seconds=60)  # Capped at the L1 TTL
+        now = time.monotonic()
+
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+
+        assert lru.get("a") is _MISSING
+        assert lru.total_bytes == 0
+
+
+class TestCodecs:
+    def test_gzip_codec_reads_uncompressed_values(self):
+        codec = GzipJsonCodec()
+
+        assert codec.decode(codec.encode({"a": 1})) == {"a": 1}
+        assert codec.decode(b'{"a": 1}') == {"a": 1}
+        assert gzip.decompress(codec.encode([1])) == b"[1]"
+
+    def test_unknown_codec(self):
+        assert isinstance(get_codec("json"), JsonCodec)
+        with pytest.raises(ValueError):
+            get_codec("pickle")
+
+
+class TestTieredCache:
+    @pytest.mark.asyncio
+    async def test_without_redis_serves_from_l1(self):
+        cache = TieredCache(key_prefix="t")
+
+        assert await cache.set("k", {"v": 1}) is True
+        assert await cache.get("k") == {"v": 1}
+        assert await cache.delete("k") is True
+        assert await cache.get("k") is None
+        assert cache.get_stats()["l1_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_l2_hit_fills_l1(self):
+        cache = TieredCache(key_prefix="t")
+        cache.redis, pipe = _redis_with_pipeline([json.dumps({"v": 1}).encode(), 30_000])
+
+        assert await cache.get("k") == {"v": 1}
+        assert await cache.get("k") == {"v": 1}
+
+        pipe.execute.assert_awaited_once()  # Second read never left the process
+        pipe.get.assert_called_once_with("t:k")
+        stats = cache.get_stats()
+        assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 1, 0)
+        assert stats["latency"]["get_l2"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_l1_never_outlives_redis_entry(self):
+        cache = TieredCache(key_prefix="t", l1_ttl_seconds=60)
+        cache.redis, _ = _redis_with_pipeline([json.dumps(1).encode(), 0])
+
+        await cache.get("k")
+
+        assert cache.local.get("t:k") is _MISSING
+
+    @pytest.mark.asyncio
+    async def test_set_writes_redis_and_publishes_invalidation(self):
+        cache = TieredCache(key_prefix="t", codec="gzip-json")
+        cache.redis, pipe = _redis_with_pipeline([True])
+
+        assert await cache.set("k", {"v": 1}, ttl=10) is True
+
+        key, ttl, data = pipe.setex.call_args.args
+        assert (key, ttl) == ("t:k", 10)
+        assert json.loads(gzip.decompress(data)) == {"v": 1}
+        channel, message = cache.redis.publish.await_args.args
+        assert json.loads(message) == {"worker_id": cache.worker_id, "keys": ["t:k"]}
+        assert cache.local.get("t:k") == data
+
+    @pytest.mark.asyncio
+    async def test_get_many_pipelines_only_l1_misses(self):
+        cache = TieredCache(key_prefix="t")
+        cache.local.set("t:a", b'"local"', 7)
+        cache.redis, pipe = _redis_with_pipeline([b'"remote"', -1, None, -2])
+
+        assert await cache.get_many(["a", "b", "c"]) == {"a": "local", "b": "remote"}
+        assert [call.args[0] for call in pipe.get.call_args_list] == ["t:b", "t:c"]
+
+    @pytest.mark.asyncio
+    async def test_l1_hits_return_independent_copies(self):
+        cache = TieredCache(key_prefix="t")
+        value = {"channels": {"CH1": [1, 2]}}
+        await cache.set("k", value)
+
+        value["channels"]["CH1"].append(3)
+        first = await cache.get("k")
+        first["channels"]["CH1"].clear()
+
+        assert await cache.get("k") == {"channels": {"CH1": [1, 2]}}
+
+    def test_invalidation_from_other_worker_drops_l1(self):
+        cache = TieredCache(key_prefix="t")
+        cache.local.set("t:a", 1, 1)
+        cache.local.set("t:b", 2, 1)
+
+        cache._handle_message(json.dumps({"worker_id": "other", "keys": ["t:a"]}))
+        assert cache.local.get("t:a") is _MISSING
+        assert cache.local.get("t:b") == 2
+
+        cache._handle_message(json.dumps({"worker_id": cache.worker_id, "keys": None}))
+        assert cache.local.get("t:b") == 2  # Own message ignored
+
+        cache._handle_message(json.dumps({"worker_id": "other", "keys": None}))
+        assert len(cache.local) == 0
+
+
+class TestAdapters:
+    @pytest.mark.asyncio
+    async def test_redis_cache_keeps_its_api(self):
+        cache = RedisCache()
+
+        assert await cache.set("session:1", {"score": 80}) is True
+        cached = await cache.get("session:1")
+
+        assert cached["score"] == 80
+        assert cached["cache_version"] == "1.0"
+        assert await cache.exists("session:1") is True
+        assert cache._cache_key("session:1") == "emg_analysis:session:1"
+
+    @pytest.mark.asyncio
+    async def test_cache_patterns_batch_through_l1(self):
+        patterns = CachePatterns(RedisCache())
+
+        assert await patterns.batch_set({"a": 1, "b": 2}) == {"a": True, "b": True}
+        assert await patterns.batch_get(["a", "b", "c"]) == {"a": 1, "b": 2}
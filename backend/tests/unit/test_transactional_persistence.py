@@ -0,0 +1,121 @@
+"""Transactional Session Persistence Tests.
+
+A processed session is written with one persist_processed_session RPC
+call; when the function is not deployed the processor falls back to the
+per-table writes.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from services.clinical.repositories.therapy_session_repository import (
+    PersistenceFunctionUnavailableError,
+    TherapySessionRepository,
+)
+from services.shared.repositories.base.abstract_repository import RepositoryError
+
+
+class PostgrestError(Exception):
+    """Stand-in for postgrest APIError carrying an error code."""
+
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+
+@pytest.fixture
+def processing_result():
+    return {
+        "metadata": {"time": "2025-08-28 15:30:00", "player_name": "P001"},
+        "analytics": {
+            "CH1": {"contraction_count": 12, "good_contraction_count": 10},
+            "CH2": {"contraction_count": 12, "good_contraction_count": 9},
+        },
+        "processing_time_ms": 1234,
+    }
+
+
+class TestRepositoryRpc:
+    def test_sends_whole_document_in_one_call(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.return_value = MagicMock(data={"emg_statistics": 2}, count=None)
+        repo = TherapySessionRepository(client)
+        session_id = str(uuid4())
+        document = {"emg_statistics": [{}, {}], "session_update": {"processing_status": "completed"}}
+
+        counts = repo.persist_processed_session(session_id, document)
+
+        assert counts == {"emg_statistics": 2}
+        client.rpc.assert_called_once_with(
+            "persist_processed_session", {"p_session_id": session_id, "p_document": document}
+        )
+
+    def test_missing_function_is_reported_separately(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.side_effect = PostgrestError("PGRST202")
+        repo = TherapySessionRepository(client)
+
+        with pytest.raises(PersistenceFunctionUnavailableError):
+            repo.persist_processed_session(str(uuid4()), {})
+
+    def test_transaction_errors_raise_repository_error(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.side_effect = PostgrestError("23503")
+        repo = TherapySessionRepository(client)
+
+        with pytest.raises(RepositoryError) as exc_info:
+            repo.persist_processed_session(str(uuid4()), {})
+
+        assert not isinstance(exc_info.value, PersistenceFunctionUnavailableError)
+
+
+class TestProcessorTransactionalPath:
+    @pytest.fixture
+    def processor(self, mock_therapy_processor):
+        processor = mock_therapy_processor
+        processor.performance_service = MagicMock()
+        processor.performance_service.calculate_performance_scores.return_value = {
+            "scoring_config_id": str(uuid4()),
+            "overall_score": 0.8,
+            "compliance_score": 0.9,
+        }
+        processor._build_emg_statistics_record = MagicMock(
+            side_effect=lambda session_uuid, channel, *args: {"session_id": session_uuid, "channel_name": channel}
+        )
+        processor._build_session_settings_record = AsyncMock(return_value={"session_id": "s"})
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_builds_document_and_calls_rpc_once(self, processor, processing_result):
+        session_uuid = str(uuid4())
+        processor.session_repo.persist_processed_session = MagicMock(return_value={})
+
+        persisted = await processor._persist_session_transactionally(
+            "P001S001", session_uuid, processing_result, MagicMock(), MagicMock()
+        )
+
+        assert persisted is True
+        processor.session_repo.persist_processed_session.assert_called_once()
+        sent_id, document = processor.session_repo.persist_processed_session.call_args.args
+        assert sent_id == session_uuid
+        assert [r["channel_name"] for r in document["emg_statistics"]] == ["CH1", "CH2"]
+        assert [r["channel_name"] for r in document["bfr_monitoring"]] == ["CH1", "CH2"]
+        assert document["performance_scores"]["session_id"] == session_uuid
+        assert document["session_update"]["processing_status"] == "completed"
+        assert document["session_update"]["session_date"] == "2025-08-28T15:30:00+00:00"
+        # Scores come from in-memory analytics, not from emg_statistics rows
+        assert processor.performance_service.calculate_performance_scores.call_args.args[1] is not None
+
+    @pytest.mark.asyncio
+    async def test_returns_false_when_rpc_not_deployed(self, processor, processing_result):
+        processor.session_repo.persist_processed_session = MagicMock(
+            side_effect=PersistenceFunctionUnavailableError("missing")
+        )
+
+        persisted = await processor._persist_session_transactionally(
+            "P001S001", str(uuid4()), processing_result, MagicMock(), MagicMock()
+        )
+
+        assert persisted is False
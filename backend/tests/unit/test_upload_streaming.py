@@ -0,0 +1,99 @@
+"""Streamed Upload Tests.
+
+With Accept: application/x-ndjson the upload route sends analytics first,
+then performance analysis, then the signals in per-channel chunks.
+"""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from api.responses import ndjson_response
+from api.routes.upload import stream_upload_events
+from models import GameSessionParameters
+from utils.signal_transport import JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE, negotiate_media_type
+
+
+def _signals(samples: int) -> dict:
+    signal = np.arange(samples, dtype=np.float64)
+    return {
+        "sampling_rate": 1000.0,
+        "time_axis": signal / 1000.0,
+        "data": signal,
+        "rms_envelope": signal * 2,
+        "activated_data": None,
+        "processed_data": None,
+    }
+
+
+async def _collect(events) -> list[dict]:
+    return [event async for event in events]
+
+
+class TestNegotiation:
+    def test_ndjson_only_where_offered(self):
+        assert negotiate_media_type(NDJSON_MEDIA_TYPE) == JSON_MEDIA_TYPE
+        assert negotiate_media_type(NDJSON_MEDIA_TYPE, extra_media_types=(NDJSON_MEDIA_TYPE,)) == NDJSON_MEDIA_TYPE
+        assert negotiate_media_type("*/*", extra_media_types=(NDJSON_MEDIA_TYPE,)) == JSON_MEDIA_TYPE
+
+
+class TestStreamUploadEvents:
+    @pytest.fixture
+    def scoring(self):
+        """Clinical scoring stub; set .side_effect to make it fail."""
+
+        def add_scores(data, _params):
+            data["performance_analysis"] = {"overall_score": 80.0}
+            return data
+
+        with patch("api.routes.upload.add_clinical_analysis", side_effect=add_scores) as scoring:
+            yield scoring
+
+    @staticmethod
+    def _events():
+        response_body = {"file_id": "f1", "analytics": {"CH1": {}}, "emg_signals": {}, "performance_analysis": None}
+        emg_signals = {"CH1": _signals(25), "CH2": _signals(10)}
+        return stream_upload_events(response_body, {}, emg_signals, GameSessionParameters(), chunk_samples=10)
+
+    async def test_analytics_before_scores_before_signals(self, scoring):
+        events = await _collect(self._events())
+
+        assert [event["event"] for event in events] == [
+            "analytics",
+            "performance_analysis",
+            "signals",
+            "signals",
+            "signals",
+            "signals",
+            "complete",
+        ]
+        assert "performance_analysis" not in events[0]
+        assert events[0]["emg_signals"]["CH1"] == {"sampling_rate": 1000.0, "total_samples": 25}
+        assert events[1]["performance_analysis"] == {"overall_score": 80.0}
+
+    async def test_signal_chunks_cover_each_channel(self, scoring):
+        events = await _collect(self._events())
+        ch1 = [event for event in events if event.get("channel") == "CH1"]
+
+        assert [event["offset"] for event in ch1] == [0, 10, 20]
+        np.testing.assert_array_equal(np.concatenate([event["data"] for event in ch1]), np.arange(25))
+        assert ch1[0]["activated_data"] is None
+
+    async def test_failure_reported_in_band(self, scoring):
+        scoring.side_effect = RuntimeError("scoring unavailable")
+
+        events = await _collect(self._events())
+
+        assert [event["event"] for event in events] == ["analytics", "error"]
+        assert "scoring unavailable" in events[-1]["message"]
+
+    async def test_ndjson_response_writes_one_event_per_line(self, scoring):
+        response = ndjson_response(self._events())
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        lines = body.splitlines()
+
+        assert response.media_type == NDJSON_MEDIA_TYPE
+        assert json.loads(lines[0])["event"] == "analytics"
+        assert json.loads(lines[2])["data"] == list(range(10))
@@ -0,0 +1,248 @@
+"""Webhook Burst Coalescing Tests.
+
+A burst of storage events must be grouped into one batch, allocate session
+codes per patient in one lookup, and insert all sessions in one request.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from api.routes import webhooks
+from services.clinical.repositories.therapy_session_repository import TherapySessionRepository
+from services.infrastructure.webhook_coalescer import WebhookCoalescer
+
+
+class TestWebhookCoalescer:
+    @pytest.mark.asyncio
+    async def test_burst_is_handled_as_one_batch(self):
+        batches = []
+
+        async def handler(items):
+            batches.append(list(items))
+            return [item * 10 for item in items]
+
+        coalescer = WebhookCoalescer(handler, window_seconds=0.01, max_batch_size=50)
+        results = await asyncio.gather(*(coalescer.submit(i) for i in range(5)))
+
+        assert results == [0, 10, 20, 30, 40]
+        assert batches == [[0, 1, 2, 3, 4]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting_for_window(self):
+        batches = []
+
+        async def handler(items):
+            batches.append(list(items))
+            return list(items)
+
+        coalescer = WebhookCoalescer(handler, window_seconds=60, max_batch_size=3)
+        results = await asyncio.wait_for(
+            asyncio.gather(*(coalescer.submit(i) for i in range(3))), timeout=1
+        )
+
+        assert results == [0, 1, 2]
+        assert batches == [[0, 1, 2]]
+        assert coalescer.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_lone_item_is_not_delayed_by_window(self):
+        async def handler(items):
+            return list(items)
+
+        coalescer = WebhookCoalescer(handler, window_seconds=60, max_batch_size=50)
+
+        assert await asyncio.wait_for(coalescer.submit("only"), timeout=1) == "only"
+
+    @pytest.mark.asyncio
+    async def test_items_arriving_during_a_batch_are_grouped(self):
+        batches = []
+        release = asyncio.Event()
+
+        async def handler(items):
+            batches.append(list(items))
+            if len(batches) == 1:
+                await release.wait()
+            return list(items)
+
+        coalescer = WebhookCoalescer(handler, window_seconds=0.01, max_batch_size=50)
+        first = asyncio.create_task(coalescer.submit(0))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        later = [asyncio.create_task(coalescer.submit(i)) for i in range(1, 4)]
+        await asyncio.sleep(0.05)
+        release.set()
+
+        assert await asyncio.gather(first, *later) == [0, 1, 2, 3]
+        assert batches == [[0], [1, 2, 3]]
+
+    @pytest.mark.asyncio
+    async def test_running_flush_is_referenced(self):
+        release = asyncio.Event()
+
+        async def handler(items):
+            await release.wait()
+            return list(items)
+
+        coalescer = WebhookCoalescer(handler, window_seconds=60, max_batch_size=1)
+        submitted = asyncio.create_task(coalescer.submit("a"))
+        await asyncio.sleep(0)
+
+        assert len(coalescer._batch_tasks) == 1
+        release.set()
+        assert await submitted == "a"
+        await asyncio.sleep(0)
+        assert not coalescer._batch_tasks
+
+    @pytest.mark.asyncio
+    async def test_per_item_exception_only_fails_that_caller(self):
+        async def handler(items):
+            return [ValueError("bad") if item == "bad" else item for item in items]
+
+        coalescer = WebhookCoalescer(handler, window_seconds=0.01, max_batch_size=50)
+        results = await asyncio.gather(
+            coalescer.submit("ok"), coalescer.submit("bad"), return_exceptions=True
+        )
+
+        assert results[0] == "ok"
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_handler_failure_fails_whole_batch(self):
+        async def handler(items):
+            raise RuntimeError("database down")
+
+        coalescer = WebhookCoalescer(handler, window_seconds=0.01, max_batch_size=50)
+        results = await asyncio.gather(
+            coalescer.submit(1), coalescer.submit(2), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class TestBulkSessionCreation:
+    def test_generate_next_session_codes_are_consecutive(self):
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.like.return_value
+        query.order.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=[{"session_code": "P001S003"}]
+        )
+        repo = TherapySessionRepository(client)
+
+        assert repo.generate_next_session_codes("P001", 3) == ["P001S004", "P001S005", "P001S006"]
+        client.table.return_value.select.return_value.like.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_processor_batch_uses_one_allocation_per_patient_and_one_insert(
+        self, mock_therapy_processor
+    ):
+        processor = mock_therapy_processor
+        repo = processor.session_repo
+        repo.get_sessions_by_file_hashes = MagicMock(return_value={})
+        repo.generate_next_session_codes = MagicMock(
+            side_effect=lambda code, count: [f"{code}S{n:03d}" for n in range(1, count + 1)]
+        )
+        repo.build_session_row = MagicMock(
+            side_effect=lambda code, path, *args: {"session_code": code, "file_path": path}
+        )
+        repo.create_sessions_bulk = MagicMock(
+            side_effect=lambda rows: [{**row, "id": f"uuid-{row['session_code']}"} for row in rows]
+        )
+
+        deliveries = [
+            {"file_path": "c3d-examples/P001/a.c3d"},
+            {"file_path": "c3d-examples/P002/b.c3d"},
+            {"file_path": "c3d-examples/P001/c.c3d"},
+        ]
+        results = await processor.create_sessions_batch(deliveries)
+
+        assert [r["session_code"] for r in results] == ["P001S001", "P002S001", "P001S002"]
+        assert results[0]["session_id"] == "uuid-P001S001"
+        assert repo.generate_next_session_codes.call_count == 2
+        repo.create_sessions_bulk.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_processor_batch_reuses_sessions_of_reuploaded_files(self, mock_therapy_processor):
+        processor = mock_therapy_processor
+        repo = processor.session_repo
+        reuploaded_hash = processor._generate_file_hash("c3d-examples/P001/a.c3d", {"size": 1})
+        repo.get_sessions_by_file_hashes = MagicMock(
+            return_value={reuploaded_hash: {"id": "uuid-old", "session_code": "P001S001"}}
+        )
+        repo.generate_next_session_codes = MagicMock(return_value=["P001S002"])
+        repo.build_session_row = MagicMock(
+            side_effect=lambda code, path, *args: {"session_code": code, "file_path": path}
+        )
+        repo.create_sessions_bulk = MagicMock(
+            side_effect=lambda rows: [{**row, "id": f"uuid-{row['session_code']}"} for row in rows]
+        )
+
+        results = await processor.create_sessions_batch([
+            {"file_path": "c3d-examples/P001/a.c3d", "file_metadata": {"size": 1}},
+            {"file_path": "c3d-examples/P001/b.c3d", "file_metadata": {"size": 2}},
+            {"file_path": "c3d-examples/P001/b.c3d", "file_metadata": {"size": 2}},
+        ])
+
+        assert results[0] == {"session_code": "P001S001", "session_id": "uuid-old", "duplicate": False}
+        assert results[1] == {"session_code": "P001S002", "session_id": "uuid-P001S002", "duplicate": False}
+        assert results[2] == {"session_code": "P001S002", "session_id": "uuid-P001S002", "duplicate": True}
+        repo.generate_next_session_codes.assert_called_once_with("P001", 1)
+        assert len(repo.create_sessions_bulk.call_args.args[0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_processor_batch_falls_back_per_file_when_bulk_fails(self, mock_therapy_processor):
+        processor = mock_therapy_processor
+        repo = processor.session_repo
+        repo.get_sessions_by_file_hashes = MagicMock(return_value={})
+        repo.generate_next_session_codes = MagicMock(return_value=["P001S001", "P001S002"])
+        repo.build_session_row = MagicMock(return_value={"session_code": "P001S001"})
+        repo.create_sessions_bulk = MagicMock(side_effect=Exception("unique violation"))
+        repo.get_session_by_file_hash = MagicMock(return_value=None)
+        repo.create_session_with_code = MagicMock(
+            side_effect=[
+                ("P001S001", "uuid-1", {"id": "uuid-1", "session_code": "P001S001"}),
+                Exception("storage error"),
+            ]
+        )
+
+        results = await processor.create_sessions_batch([
+            {"file_path": "c3d-examples/P001/a.c3d", "file_metadata": {"size": 1}},
+            {"file_path": "c3d-examples/P001/b.c3d", "file_metadata": {"size": 2}},
+        ])
+
+        assert results[0] == {"session_code": "P001S001", "session_id": "uuid-1", "duplicate": False}
+        assert isinstance(results[1], Exception)
+
+
+class TestWebhookBatchHandler:
+    @pytest.mark.asyncio
+    async def test_repeated_file_in_burst_is_processed_once(self, mock_therapy_processor):
+        processor = mock_therapy_processor
+        repo = processor.session_repo
+        repo.get_sessions_by_file_hashes = MagicMock(return_value={})
+        repo.generate_next_session_codes = MagicMock(return_value=["P001S001"])
+        repo.build_session_row = MagicMock(
+            side_effect=lambda code, path, *args: {"session_code": code, "file_path": path}
+        )
+        repo.create_sessions_bulk = MagicMock(
+            side_effect=lambda rows: [{**row, "id": f"uuid-{row['session_code']}"} for row in rows]
+        )
+        deliveries = [
+            {"delivery_key": f"key-{n}", "file_path": "c3d-examples/P001/a.c3d", "file_metadata": {"size": 1},
+             "bucket": "c3d-examples", "object_path": "P001/a.c3d"}
+            for n in range(2)
+        ]
+        process_batch = AsyncMock()
+
+        with (
+            patch.object(webhooks, "get_therapy_session_processor", return_value=processor),
+            patch.object(webhooks, "get_webhook_idempotency_store", AsyncMock(return_value=AsyncMock())),
+            patch.object(webhooks, "_process_c3d_batch_background", process_batch),
+        ):
+            results = await webhooks._create_sessions_for_batch(deliveries)
+            await asyncio.sleep(0)
+
+        assert [result["duplicate"] for result in results] == [False, True]
+        process_batch.assert_awaited_once()
+        assert process_batch.await_args.args[0] == [("P001S001", "c3d-examples", "P001/a.c3d")]
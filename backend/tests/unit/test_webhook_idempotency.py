@@ -0,0 +1,109 @@
+"""Webhook Idempotency Tests.
+
+Retried Supabase Storage deliveries must return the original session_code
+without creating a new session or scheduling another processing run.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.clinical.repositories.therapy_session_repository import (
+    DuplicateDeliveryError,
+    TherapySessionRepository,
+)
+from services.infrastructure.webhook_idempotency import WebhookIdempotencyStore
+from services.shared.repositories.base.abstract_repository import RepositoryError
+
+
+class UniqueViolation(Exception):
+    """Stand-in for postgrest APIError carrying a SQLSTATE code."""
+
+    code = "23505"
+
+
+class TestDeliveryKey:
+    def test_same_object_version_gives_same_key(self):
+        key_a = WebhookIdempotencyStore.delivery_key("c3d-examples", "P001/a.c3d", "v1")
+        key_b = WebhookIdempotencyStore.delivery_key("c3d-examples", "P001/a.c3d", "v1")
+        assert key_a == key_b
+
+    def test_new_version_gives_new_key(self):
+        key_v1 = WebhookIdempotencyStore.delivery_key("c3d-examples", "P001/a.c3d", "v1")
+        key_v2 = WebhookIdempotencyStore.delivery_key("c3d-examples", "P001/a.c3d", "v2")
+        assert key_v1 != key_v2
+
+
+class TestIdempotencyStore:
+    @pytest.mark.asyncio
+    async def test_remember_then_get_returns_session(self):
+        storage = {}
+        cache = MagicMock()
+        cache.set = AsyncMock(side_effect=lambda key, data, ttl: storage.__setitem__(key, data) or True)
+        cache.get = AsyncMock(side_effect=lambda key: storage.get(key))
+        store = WebhookIdempotencyStore(cache, ttl_seconds=60)
+
+        assert await store.get("abc") is None
+        await store.remember("abc", "P001S001", "uuid-1")
+
+        cached = await store.get("abc")
+        assert cached["session_code"] == "P001S001"
+        assert cached["session_id"] == "uuid-1"
+        assert cache.set.call_args.args[2] == 60
+
+    @pytest.mark.asyncio
+    async def test_without_redis_is_noop(self):
+        store = WebhookIdempotencyStore(cache=None)
+        assert await store.get("abc") is None
+        assert await store.remember("abc", "P001S001", None) is False
+
+
+class TestDatabaseFallback:
+    def test_unique_violation_raises_duplicate_with_existing_session(self):
+        repo = TherapySessionRepository(MagicMock())
+        existing = {"id": "uuid-1", "session_code": "P001S001"}
+        repo.generate_next_session_code = MagicMock(return_value="P001S002")
+        insert_error = RepositoryError("insert failed")
+        insert_error.__cause__ = UniqueViolation()
+        repo.create_therapy_session = MagicMock(side_effect=insert_error)
+        repo.get_session_by_delivery_key = MagicMock(return_value=existing)
+
+        with pytest.raises(DuplicateDeliveryError) as exc_info:
+            repo.create_session_with_code(
+                patient_code="P001",
+                file_path="c3d-examples/P001/a.c3d",
+                file_metadata={"size": 10},
+                delivery_key="k" * 64,
+            )
+
+        assert exc_info.value.session == existing
+        sent = repo.create_therapy_session.call_args.args[0]
+        assert sent["webhook_delivery_key"] == "k" * 64
+
+    def test_other_errors_are_not_treated_as_duplicates(self):
+        repo = TherapySessionRepository(MagicMock())
+        repo.generate_next_session_code = MagicMock(return_value="P001S002")
+        repo.create_therapy_session = MagicMock(side_effect=RepositoryError("network down"))
+        repo.get_session_by_delivery_key = MagicMock()
+
+        with pytest.raises(RepositoryError) as exc_info:
+            repo.create_session_with_code(
+                patient_code="P001", file_path="c3d-examples/P001/a.c3d", delivery_key="k" * 64
+            )
+
+        assert not isinstance(exc_info.value, DuplicateDeliveryError)
+        repo.get_session_by_delivery_key.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_processor_flags_duplicate_delivery(self, mock_therapy_processor):
+        processor = mock_therapy_processor
+        processor.session_repo.get_session_by_file_hash = MagicMock(return_value=None)
+        processor.session_repo.create_session_with_code = MagicMock(
+            side_effect=DuplicateDeliveryError("dup", {"id": "uuid-1", "session_code": "P001S001"})
+        )
+
+        created = await processor.create_session(
+            file_path="c3d-examples/P001/a.c3d", file_metadata={"size": 10}, delivery_key="k" * 64
+        )
+
+        assert created == {"session_code": "P001S001", "session_id": "uuid-1", "duplicate": True}
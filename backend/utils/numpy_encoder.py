@@ -4,88 +4,146 @@ Provides JSON serialization support for NumPy data types commonly used
 in EMG analysis results. This encoder ensures that numpy arrays and scalars
 can be safely serialized for API responses and data storage.
 
+`dumps` is the fast path: orjson writes numeric arrays straight from their
+buffers (no `tolist()`; strided views are made contiguous first), and
+`numpy_default` handles the rest (complex, float16, long double, object
+arrays). Without orjson it
+falls back to the standard library with `NumpyEncoder`. NaN and infinity
+are written as null.
+
 Usage:
-    import json
-    from utils.numpy_encoder import NumpyEncoder
-    
+    from utils.numpy_encoder import dumps
+
     data = {"result": np.float32(1.23), "array": np.array([1, 2, 3])}
-    json_string = json.dumps(data, cls=NumpyEncoder)
+    json_bytes = dumps(data)
 
+`NumpyEncoder` remains for code that needs `json.dumps(..., cls=NumpyEncoder)`.
 """
 
 import json
+from typing import Any
+
 import numpy as np
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if HAS_ORJSON else 0
+
+
+def numpy_default(obj: Any) -> Any:
+    """Convert NumPy types to JSON-serializable types.
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        JSON-serializable representation of the object
+
+    Raises:
+        TypeError: If obj is not a NumPy type
+    """
+    # Handle NumPy arrays (orjson only gets here for dtypes it cannot write natively)
+    if isinstance(obj, np.ndarray):
+        if np.iscomplexobj(obj):
+            return [numpy_default(value) for value in obj]
+        return obj.tolist()
+
+    # Handle NumPy scalar types
+    if isinstance(obj, np.integer):
+        return int(obj)
+
+    if isinstance(obj, np.floating):
+        return float(obj)
+
+    if isinstance(obj, np.complexfloating):
+        return {"real": float(obj.real), "imag": float(obj.imag)}
+
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+
+    # Handle NumPy string types
+    if isinstance(obj, np.str_):
+        return str(obj)
+
+    # Handle bytes
+    if isinstance(obj, np.bytes_):
+        return obj.decode("utf-8")
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _orjson_default(obj: Any) -> Any:
+    # Strided views (e.g. signal[::2]) are copied once and written natively
+    if isinstance(obj, np.ndarray) and not obj.flags.c_contiguous and obj.dtype.kind in "biuf":
+        return np.ascontiguousarray(obj)
+    return numpy_default(obj)
+
 
 class NumpyEncoder(json.JSONEncoder):
     """JSON encoder that handles NumPy data types.
-    
+
     Converts NumPy arrays and scalars to native Python types that
-    can be JSON serialized safely.
+    can be JSON serialized safely. Prefer `dumps` for large payloads.
     """
-    
+
     def default(self, obj):
-        """Convert NumPy types to JSON-serializable types.
-        
-        Args:
-            obj: Object to encode
-            
-        Returns:
-            JSON-serializable representation of the object
-        """
-        # Handle NumPy arrays
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        
-        # Handle NumPy scalar types
-        if isinstance(obj, np.integer):
-            return int(obj)
-        
-        if isinstance(obj, np.floating):
-            return float(obj)
-        
-        if isinstance(obj, np.complexfloating):
-            return {"real": float(obj.real), "imag": float(obj.imag)}
-        
-        if isinstance(obj, np.bool_):
-            return bool(obj)
-            
-        # Handle NumPy string types
-        if isinstance(obj, (np.str_, np.unicode_)):
-            return str(obj)
-        
-        # Handle bytes
-        if isinstance(obj, np.bytes_):
-            return obj.decode('utf-8')
-            
-        # Let the base class handle other types
-        return super().default(obj)
+        """Convert NumPy types to JSON-serializable types (see numpy_default)."""
+        try:
+            return numpy_default(obj)
+        except TypeError:
+            # Let the base class handle other types
+            return super().default(obj)
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize data containing NumPy types to UTF-8 JSON bytes.
+
+    Args:
+        data: Data to serialize
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON document as bytes
+    """
+    if HAS_ORJSON:
+        options = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=_orjson_default, option=options)
+    return json.dumps(data, cls=NumpyEncoder, indent=2 if indent else None).encode("utf-8")
 
 
 def serialize_numpy_data(data):
     """Convenience function to serialize data containing NumPy types.
-    
+
     Args:
         data: Data structure potentially containing NumPy types
-        
+
     Returns:
         JSON string with NumPy types properly serialized
     """
-    return json.dumps(data, cls=NumpyEncoder, indent=2)
+    return dumps(data, indent=True).decode("utf-8")
 
 
 def safe_json_dumps(data, **kwargs):
     """Safe JSON dumps that handles NumPy types automatically.
-    
+
     Args:
         data: Data to serialize
-        **kwargs: Additional arguments for json.dumps
-        
+        **kwargs: Additional arguments for json.dumps (uses the standard library)
+
     Returns:
         JSON string with NumPy types handled
     """
+    if not kwargs:
+        return dumps(data).decode("utf-8")
+
     # Set NumpyEncoder as default if no cls specified
-    if 'cls' not in kwargs:
-        kwargs['cls'] = NumpyEncoder
-        
-    return json.dumps(data, **kwargs)
\ No newline at end of file
+    if "cls" not in kwargs:
+        kwargs["cls"] = NumpyEncoder
+
+    return json.dumps(data, **kwargs)
@@ -0,0 +1,26 @@
+-- ================================================================
+-- WEBHOOK DELIVERY IDEMPOTENCY
+-- ================================================================
+-- Description: Deduplicate retried Supabase Storage webhook deliveries
+--
+-- The backend derives a delivery key from (bucket, object name, object
+-- version/eTag). Redis holds delivery key -> session_code with a TTL; this
+-- unique index is the fallback when Redis is unavailable or the key expired.
+-- A retried delivery then fails the insert with unique_violation (23505) and
+-- the backend returns the session created by the first delivery.
+-- ================================================================
+
+BEGIN;
+
+ALTER TABLE public.therapy_sessions
+ADD COLUMN IF NOT EXISTS webhook_delivery_key TEXT;
+
+COMMENT ON COLUMN public.therapy_sessions.webhook_delivery_key IS
+    'SHA-256 of bucket/object@version for webhook retry deduplication (NULL for non-webhook sessions)';
+
+-- Partial unique index: sessions created outside the webhook keep NULL
+CREATE UNIQUE INDEX IF NOT EXISTS uq_therapy_sessions_webhook_delivery_key
+ON public.therapy_sessions(webhook_delivery_key)
+WHERE webhook_delivery_key IS NOT NULL;
+
+COMMIT;
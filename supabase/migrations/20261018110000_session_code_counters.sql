@@ -0,0 +1,97 @@
+-- ================================================================
+-- ATOMIC SESSION CODE ALLOCATION
+-- ================================================================
+-- Description: Per-patient counters for P###S### session codes
+--
+-- Session codes used to be derived from
+--   SELECT session_code ... LIKE 'P###S%' ORDER BY session_code DESC LIMIT 1
+-- for every new session. That scan grows with history and two concurrent
+-- webhooks can read the same maximum and collide on the same code.
+--
+-- reserve_session_codes() bumps a single counter row under its row lock and
+-- returns the first number of the reserved range, so N codes cost one call
+-- regardless of how many sessions the patient already has.
+-- ================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.session_code_counters (
+    patient_code TEXT PRIMARY KEY,
+    last_session_number INTEGER NOT NULL DEFAULT 0 CHECK (last_session_number >= 0),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE public.session_code_counters IS
+    'Last allocated session number per patient code (backs reserve_session_codes)';
+
+-- Backend uses the service role; no client access
+ALTER TABLE public.session_code_counters ENABLE ROW LEVEL SECURITY;
+
+-- Seed counters from existing sessions
+INSERT INTO public.session_code_counters (patient_code, last_session_number)
+SELECT
+    substring(session_code FROM '^(P[0-9]+)S[0-9]+$') AS patient_code,
+    MAX(substring(session_code FROM '^P[0-9]+S([0-9]+)$')::INTEGER) AS last_session_number
+FROM public.therapy_sessions
+WHERE session_code ~ '^P[0-9]+S[0-9]+$'
+GROUP BY 1
+ON CONFLICT (patient_code) DO UPDATE
+SET last_session_number = GREATEST(
+    public.session_code_counters.last_session_number,
+    EXCLUDED.last_session_number
+);
+
+CREATE OR REPLACE FUNCTION public.reserve_session_codes(
+    p_patient_code TEXT,
+    p_count INTEGER DEFAULT 1
+)
+RETURNS INTEGER
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_last INTEGER;
+    v_seed INTEGER;
+BEGIN
+    IF p_patient_code IS NULL OR p_patient_code !~ '^P[0-9]+$' THEN
+        RAISE EXCEPTION 'Invalid patient code format: %', p_patient_code;
+    END IF;
+
+    IF p_count IS NULL OR p_count < 1 THEN
+        RAISE EXCEPTION 'Invalid session code count: %', p_count;
+    END IF;
+
+    UPDATE session_code_counters
+    SET last_session_number = last_session_number + p_count,
+        updated_at = NOW()
+    WHERE patient_code = p_patient_code
+    RETURNING last_session_number INTO v_last;
+
+    IF NOT FOUND THEN
+        -- First allocation through the counter: start after any existing session
+        SELECT COALESCE(MAX(substring(session_code FROM '^P[0-9]+S([0-9]+)$')::INTEGER), 0)
+        INTO v_seed
+        FROM therapy_sessions
+        WHERE session_code LIKE p_patient_code || 'S%'
+          AND session_code ~ '^P[0-9]+S[0-9]+$';
+
+        INSERT INTO session_code_counters (patient_code, last_session_number)
+        VALUES (p_patient_code, v_seed + p_count)
+        ON CONFLICT (patient_code) DO UPDATE
+        SET last_session_number = session_code_counters.last_session_number + p_count,
+            updated_at = NOW()
+        RETURNING last_session_number INTO v_last;
+    END IF;
+
+    -- First number of the reserved range [v_last - p_count + 1, v_last]
+    RETURN v_last - p_count + 1;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.reserve_session_codes(TEXT, INTEGER) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.reserve_session_codes(TEXT, INTEGER) TO service_role;
+
+COMMENT ON FUNCTION public.reserve_session_codes(TEXT, INTEGER) IS
+    'Atomically reserve p_count consecutive session numbers for a patient; returns the first one';
+
+COMMIT;
@@ -0,0 +1,133 @@
+-- ================================================================
+-- TRANSACTIONAL SESSION PERSISTENCE
+-- ================================================================
+-- Description: Persist a processed therapy session in one round-trip
+--
+-- The webhook background job used to write a processed session with ~8
+-- separate PostgREST calls (emg_statistics insert, session_settings and
+-- bfr_monitoring upserts, performance_scores upsert, therapy_sessions
+-- metadata + status updates). A failure half-way left a session with some
+-- tables populated and others missing.
+--
+-- persist_processed_session() receives the whole result as one JSONB
+-- document and writes every table inside the function's transaction:
+--
+--   {
+--     "emg_statistics":     [ {row}, ... ],
+--     "session_settings":   {row},
+--     "bfr_monitoring":     [ {row}, ... ],
+--     "performance_scores": {row} | null,
+--     "session_update":     {therapy_sessions columns to set}
+--   }
+--
+-- Child rows are replaced (delete + insert by session_id), so reprocessing
+-- a session is idempotent and no per-table unique constraint is required.
+-- Column lists are taken from the JSON keys, matching PostgREST semantics:
+-- omitted columns keep their defaults.
+-- ================================================================
+
+BEGIN;
+
+-- Replace all rows of a session-scoped table with the given JSON records
+CREATE OR REPLACE FUNCTION public._replace_session_rows(
+    p_table TEXT,
+    p_session_id UUID,
+    p_records JSONB
+)
+RETURNS INTEGER
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_columns TEXT;
+    v_count INTEGER;
+BEGIN
+    EXECUTE format('DELETE FROM public.%I WHERE session_id = $1', p_table) USING p_session_id;
+
+    IF p_records IS NULL OR jsonb_typeof(p_records) <> 'array' OR jsonb_array_length(p_records) = 0 THEN
+        RETURN 0;
+    END IF;
+
+    SELECT string_agg(quote_ident(key), ', ')
+    INTO v_columns
+    FROM (
+        SELECT DISTINCT jsonb_object_keys(record) AS key
+        FROM jsonb_array_elements(p_records) AS record
+    ) keys;
+
+    EXECUTE format(
+        'INSERT INTO public.%1$I (%2$s) SELECT %2$s FROM jsonb_populate_recordset(NULL::public.%1$I, $1)',
+        p_table, v_columns
+    ) USING p_records;
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.persist_processed_session(
+    p_session_id UUID,
+    p_document JSONB
+)
+RETURNS JSONB
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_update JSONB := COALESCE(p_document->'session_update', '{}'::jsonb);
+    v_columns TEXT;
+    v_emg_rows INTEGER;
+    v_settings_rows INTEGER;
+    v_bfr_rows INTEGER;
+    v_score_rows INTEGER := 0;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM therapy_sessions WHERE id = p_session_id) THEN
+        RAISE EXCEPTION 'Therapy session % not found', p_session_id;
+    END IF;
+
+    v_emg_rows := _replace_session_rows('emg_statistics', p_session_id, p_document->'emg_statistics');
+
+    v_settings_rows := _replace_session_rows(
+        'session_settings', p_session_id,
+        CASE WHEN jsonb_typeof(p_document->'session_settings') = 'object'
+             THEN jsonb_build_array(p_document->'session_settings') END
+    );
+
+    v_bfr_rows := _replace_session_rows('bfr_monitoring', p_session_id, p_document->'bfr_monitoring');
+
+    -- Scores are skipped (existing row kept) when scoring was not possible
+    IF jsonb_typeof(p_document->'performance_scores') = 'object' THEN
+        v_score_rows := _replace_session_rows(
+            'performance_scores', p_session_id, jsonb_build_array(p_document->'performance_scores')
+        );
+    END IF;
+
+    IF v_update <> '{}'::jsonb THEN
+        SELECT string_agg(quote_ident(key), ', ')
+        INTO v_columns
+        FROM jsonb_object_keys(v_update) AS key;
+
+        EXECUTE format(
+            'UPDATE public.therapy_sessions SET (%1$s) = (SELECT %1$s FROM jsonb_populate_record(NULL::public.therapy_sessions, $1)) WHERE id = $2',
+            v_columns
+        ) USING v_update, p_session_id;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'session_id', p_session_id,
+        'emg_statistics', v_emg_rows,
+        'session_settings', v_settings_rows,
+        'bfr_monitoring', v_bfr_rows,
+        'performance_scores', v_score_rows
+    );
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public._replace_session_rows(TEXT, UUID, JSONB) FROM PUBLIC;
+REVOKE ALL ON FUNCTION public.persist_processed_session(UUID, JSONB) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.persist_processed_session(UUID, JSONB) TO service_role;
+
+COMMENT ON FUNCTION public.persist_processed_session(UUID, JSONB) IS
+    'Atomically write emg_statistics, session_settings, bfr_monitoring, performance_scores and therapy_sessions updates for one processed session';
+
+COMMIT;
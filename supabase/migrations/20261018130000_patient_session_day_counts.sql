@@ -0,0 +1,88 @@
+-- ================================================================
+-- PER-PATIENT DAILY SESSION COUNT INDEX
+-- ================================================================
+-- Description: Session counts per patient and day for adherence scoring
+--
+-- Adherence used to list the whole c3d-examples bucket and parse every
+-- filename with extract_session_date_from_filename() to count one
+-- patient's sessions, so /scoring/adherence/{patient_code} cost O(bucket).
+--
+-- patient_session_day_counts keeps one row per (patient, session day).
+-- The webhook increments it when a therapy session is created, and
+-- adherence reads it with a single indexed range scan on the primary key.
+--
+-- The session day is the recording date from the GHOSTLY filename
+-- (Ghostly_Emg_YYYYMMDD_...), falling back to the session/creation date.
+-- The seed below mirrors that rule; the Python backfill job
+-- (services.clinical.repositories.session_count_repository) rebuilds the
+-- index with the application's own date parser.
+-- ================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.patient_session_day_counts (
+    patient_id UUID NOT NULL REFERENCES public.patients(id) ON DELETE CASCADE,
+    session_day DATE NOT NULL,
+    session_count INTEGER NOT NULL DEFAULT 0 CHECK (session_count >= 0),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (patient_id, session_day)
+);
+
+COMMENT ON TABLE public.patient_session_day_counts IS
+    'Therapy sessions per patient and recording day (backs adherence scoring)';
+
+-- Backend uses the service role; no client access
+ALTER TABLE public.patient_session_day_counts ENABLE ROW LEVEL SECURITY;
+
+-- Seed from existing sessions
+INSERT INTO public.patient_session_day_counts (patient_id, session_day, session_count)
+SELECT
+    patient_id,
+    COALESCE(
+        to_date(substring(file_path FROM '(?i)ghostly[_ ]*emg[_ ]*([0-9]{8})'), 'YYYYMMDD'),
+        (COALESCE(session_date, created_at) AT TIME ZONE 'UTC')::DATE
+    ) AS session_day,
+    COUNT(*) AS session_count
+FROM public.therapy_sessions
+WHERE patient_id IS NOT NULL
+  AND file_path IS NOT NULL
+GROUP BY 1, 2
+ON CONFLICT (patient_id, session_day) DO UPDATE
+SET session_count = EXCLUDED.session_count,
+    updated_at = NOW();
+
+-- Add sessions to the index: p_days maps 'YYYY-MM-DD' to a session count
+CREATE OR REPLACE FUNCTION public.increment_patient_session_counts(
+    p_patient_id UUID,
+    p_days JSONB
+)
+RETURNS INTEGER
+SET search_path = public
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    IF p_patient_id IS NULL OR p_days IS NULL OR jsonb_typeof(p_days) <> 'object' THEN
+        RAISE EXCEPTION 'Invalid session count increment for patient %', p_patient_id;
+    END IF;
+
+    INSERT INTO patient_session_day_counts (patient_id, session_day, session_count)
+    SELECT p_patient_id, key::DATE, value::INTEGER
+    FROM jsonb_each_text(p_days)
+    ON CONFLICT (patient_id, session_day) DO UPDATE
+    SET session_count = patient_session_day_counts.session_count + EXCLUDED.session_count,
+        updated_at = NOW();
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION public.increment_patient_session_counts(UUID, JSONB) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.increment_patient_session_counts(UUID, JSONB) TO service_role;
+
+COMMENT ON FUNCTION public.increment_patient_session_counts(UUID, JSONB) IS
+    'Atomically add session counts per day for a patient (called at webhook ingestion)';
+
+COMMIT;